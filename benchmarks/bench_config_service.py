@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cost of reading config through the layered ConfigService.
+
+* ``get()`` on the memoized merged view vs. a plain ``dict.get`` and vs. the
+  old ``configuration.load_config()`` style of re-reading JSON on every call,
+* ``refresh()`` when nothing changed (two ``stat`` calls + env scan),
+* layering and change notification: an env var, a CLI override and a user
+  file edit picked up by ``watch()``, with the edit-to-callback latency.
+
+Everything runs against files in a temp dir; the real configs are untouched.
+
+    python benchmarks/bench_config_service.py --calls 1000000
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from shadowcore_nexus.core.config_service import ConfigService  # noqa: E402
+
+
+def per_call_ns(fn, calls: int, repeat: int = 5) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for _ in range(calls):
+            fn()
+        samples.append((time.perf_counter_ns() - start) / calls)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=1000000)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    workdir = Path(tempfile.mkdtemp(prefix="scn_bench_config_"))
+    ok = True
+    try:
+        packaged = workdir / "packaged" / "daemon_config.json"
+        user = workdir / "home" / "user_config.json"
+        packaged.parent.mkdir()
+        packaged.write_text(json.dumps({"network_timeout": 10, "log_level": "INFO"}))
+        environ = {"SCN_CONFIG_MAX_THREADS": "16"}
+        service = ConfigService(packaged_path=packaged, user_path=user, environ=environ)
+        service.set("log_level", "WARNING")
+        service.flush()
+        plain = service.as_dict()
+
+        def reread():
+            with open(user, "r", encoding="utf-8") as f:
+                return json.load(f).get("log_level")
+
+        get_ns = per_call_ns(lambda: service.get("log_level"), args.calls)
+        dict_ns = per_call_ns(lambda: plain.get("log_level"), args.calls)
+        reread_ns = per_call_ns(reread, max(1, args.calls // 100))
+        refresh_ns = per_call_ns(service.refresh, max(1, args.calls // 100))
+        print(f"reads ({args.calls} calls, median of 5)")
+        print(f"  dict.get                    {dict_ns:10.0f} ns/call")
+        print(f"  ConfigService.get           {get_ns:10.0f} ns/call")
+        print(f"  json.load per call (old)    {reread_ns:10.0f} ns/call  ({reread_ns / get_ns:,.0f}x get)")
+        print(f"  refresh(), nothing changed  {refresh_ns:10.0f} ns/call")
+        ok &= get_ns < dict_ns * 5
+
+        layering = {key: (service.get(key), service.source(key))
+                    for key in ("network_timeout", "log_level", "max_threads", "debug_mode")}
+        print(f"layering: {layering}")
+        ok &= layering == {"network_timeout": (10, "packaged"), "log_level": ("WARNING", "user"),
+                           "max_threads": (16, "env"), "debug_mode": (True, "defaults")}
+
+        seen = []
+        changed = threading.Event()
+
+        def on_change(changes):
+            seen.append((time.perf_counter(), changes))
+            changed.set()
+
+        service.subscribe(on_change, keys=["log_level", "debug_mode"])
+        cli_changes = service.set_cli({"debug_mode": False, "verbose": None})
+        service.watch(debounce=0.02, poll_interval=0.05)
+        time.sleep(0.1)
+        changed.clear()
+        data = json.loads(user.read_text())
+        data["log_level"] = "DEBUG"
+        data["output_format"] = "json"
+        edited = time.perf_counter()
+        tmp = user.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data))
+        os.replace(tmp, user)
+        changed.wait(5)
+        service.stop()
+        latency = (seen[-1][0] - edited) * 1000 if changed.is_set() else float("nan")
+        print(f"notify: cli override -> {cli_changes}")
+        print(f"  user file edited -> subscriber got {seen[-1][1] if changed.is_set() else None} "
+              f"after {latency:.1f} ms (output_format filtered out)")
+        ok &= changed.is_set() and seen[-1][1] == {"log_level": ("WARNING", "DEBUG")}
+        ok &= service.get("output_format") == "json" and service.get("debug_mode") is False
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
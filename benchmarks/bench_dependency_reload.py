@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark: dependency-aware reload cost vs. hub size.
+
+Builds a hub of ``--modules`` independent modules plus one shared helper that
+``--dependents`` modules import directly and a chain of ``--chain`` modules
+imports transitively. Edits the helper and reports how many modules
+``reload_paths()`` re-imported, how long it took, and whether every
+dependent now sees the new helper. Reloading everything is shown for
+comparison. A warm run-pool worker that already ran a dependent must also
+return the new helper's version after ``invalidate()``.
+
+    python benchmarks/bench_dependency_reload.py --modules 1000 --dependents 20
+"""
+
+import argparse
+import logging
+import select
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from shadowcore_nexus.core.module_loader import ModuleLoader  # noqa: E402
+from shadowcore_nexus.core.module_runner import ModuleRunPool  # noqa: E402
+
+HELPER = "VERSION = {version}\n\nclass Logger:\n    version = VERSION\n"
+
+
+def make_hub(root: Path, modules: int, dependents: int, chain: int):
+    (root / "dep_helper.py").write_text(HELPER.format(version=1))
+    for i in range(modules):
+        (root / f"dep_plain_{i:05d}.py").write_text("def main():\n    return 0\n")
+    for i in range(dependents):
+        (root / f"dep_user_{i:03d}.py").write_text(
+            "from dep_helper import Logger\n\ndef main():\n    return Logger.version\n")
+    previous = "dep_helper"
+    for i in range(chain):
+        name = f"dep_chain_{i:03d}"
+        (root / f"{name}.py").write_text(
+            f"import {previous}\n\ndef main():\n    return {previous}.VERSION if hasattr({previous}, 'VERSION') "
+            f"else {previous}.main()\n")
+        previous = name
+
+
+def run_in_pool(pool: ModuleRunPool, entry, timeout: float = 10.0):
+    """Run ``entry`` in the pool and wait for its result (parent-side select loop)."""
+    handle = pool.submit(entry.key, entry.path, package_dir=entry.package_dir)
+    deadline = time.monotonic() + timeout
+    while not handle.done and time.monotonic() < deadline:
+        ready, _, _ = select.select([w.fileno() for w in pool.workers], [], [], 0.1)
+        for fd in ready:
+            pool.handle_ready(fd)
+    return handle.result if handle.state == "done" else handle.error
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--modules", type=int, default=1000)
+    parser.add_argument("--dependents", type=int, default=20)
+    parser.add_argument("--chain", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    root = Path(tempfile.mkdtemp(prefix="scn_bench_deps_"))
+    try:
+        make_hub(root, args.modules, args.dependents, args.chain)
+        loader = ModuleLoader(root, lazy=False, use_cache=False, workers=args.workers)
+        start = time.perf_counter()
+        loader.discover_all()
+        total = len(loader.entries)
+        print(f"hub: {total} modules loaded in {(time.perf_counter() - start) * 1000:.1f} ms "
+              f"({args.dependents} import the helper, chain of {args.chain})")
+
+        pool = ModuleRunPool(size=1).start()
+        user = loader.entries["dep_user_000"] if args.dependents else loader.entries["dep_chain_000"]
+        before = run_in_pool(pool, user)
+
+        stamps = {k: e.module for k, e in loader.entries.items()}
+        time.sleep(0.01)
+        helper = root / "dep_helper.py"
+        helper.write_text(HELPER.format(version=2))
+        start = time.perf_counter()
+        loader.reload_paths([str(helper)])
+        elapsed = (time.perf_counter() - start) * 1000
+        reloaded = sorted(k for k, e in loader.entries.items() if e.module is not stamps[k])
+        expected = 1 + args.dependents + args.chain
+        fresh = all(loader.entries[k].module.main() == 2 for k in reloaded if k != "dep_helper")
+        print(f"  reload_paths(helper)   {elapsed:9.2f} ms  re-imported {len(reloaded)}/{total} "
+              f"(expected {expected})  dependents see new helper: {fresh}")
+        pool.invalidate(loader.last_invalidated)
+        after = run_in_pool(pool, user)
+        pool.shutdown()
+        worker_fresh = (before, after) == ("1", "2")
+        print(f"  run-pool worker        {user.key} returned {before} before, {after} after "
+              f"invalidate({len(loader.last_invalidated)} keys): {worker_fresh}")
+
+        start = time.perf_counter()
+        loader.load_entries(list(loader.entries.values()))
+        print(f"  reload everything      {(time.perf_counter() - start) * 1000:9.2f} ms  "
+              f"re-imported {total}/{total}")
+        loader.unload_all()
+        if len(reloaded) != expected or not fresh or not worker_fresh:
+            sys.exit(1)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
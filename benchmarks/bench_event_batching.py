@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Benchmark: batched vs. unbatched event delivery for high-rate producers.
+
+Subscribers model a file logger that, like ``utils.logging.log_event``,
+opens and appends to its file on every call, and a counter. Reported for
+``EventBus`` and ``BatchingEventBus``:
+
+* throughput -- ``--events`` published as fast as possible, time until every
+  subscriber has seen every event, and time spent in the producer alone,
+* latency -- publish-to-delivery p50/p99 with the producer paced at
+  ``--rate`` events/s,
+* coalescing -- updates for ``--hosts`` hosts delivered as latest-per-host.
+
+    python benchmarks/bench_event_batching.py --events 200000 --rate 20000
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from shadowcore_nexus.core.event_system import BatchingEventBus, EventBus  # noqa: E402
+
+
+class Sinks:
+    """A file-logger and a counting subscriber; records delivery latencies."""
+
+    def __init__(self, path: str, sample_every: int):
+        self.path = path
+        self.count = 0
+        self.sample_every = sample_every
+        self.latencies = []
+
+    def log_one(self, data):
+        with open(self.path, "a") as fh:
+            fh.write(f"{data[0]} {data[1]:.6f}\n")
+
+    def count_one(self, data):
+        self.count += 1
+        if data[0] % self.sample_every == 0:
+            self.latencies.append(time.perf_counter() - data[1])
+
+    def log_batch(self, events):
+        with open(self.path, "a") as fh:
+            fh.write("".join(f"{data[0]} {data[1]:.6f}\n" for _, data in events))
+
+    def count_batch(self, events):
+        self.count += len(events)
+        now = time.perf_counter()
+        for _, data in events:
+            if data[0] % self.sample_every == 0:
+                self.latencies.append(now - data[1])
+
+
+def make_bus(batched: bool, sinks: Sinks, interval: float, max_batch: int):
+    if batched:
+        bus = BatchingEventBus(interval=interval, max_batch=max_batch)
+        bus.subscribe("scan.host.*", sinks.log_batch)
+        bus.subscribe("scan.#", sinks.count_batch)
+        bus.start()
+    else:
+        bus = EventBus()
+        bus.subscribe("scan.host.*", sinks.log_one)
+        bus.subscribe("scan.#", sinks.count_one)
+    return bus
+
+
+def run(batched: bool, events: int, rate: float, workdir: str, interval: float, max_batch: int):
+    """Returns (producer seconds, end-to-end seconds, latencies)."""
+    sinks = Sinks(os.path.join(workdir, "events.log"), sample_every=max(1, events // 2000))
+    bus = make_bus(batched, sinks, interval, max_batch)
+    per_ms = max(1, int(rate // 1000)) if rate else 0
+    start = time.perf_counter()
+    for i in range(events):
+        bus.publish("scan.host.up", (i, time.perf_counter()))
+        if per_ms and i % per_ms == per_ms - 1:
+            # Pace the producer in millisecond slots.
+            target = start + (i + 1) / rate
+            while time.perf_counter() < target:
+                time.sleep(0.0002)
+    produced = time.perf_counter() - start
+    if batched:
+        while sinks.count < events:
+            time.sleep(0.0005)
+        bus.stop()
+    total = time.perf_counter() - start
+    return produced, total, sinks.latencies
+
+
+def coalescing(events: int, hosts: int, interval: float):
+    bus = BatchingEventBus(capacity=events, interval=interval, max_batch=events)
+    got = []
+    bus.subscribe("scan.host.*", got.extend, coalesce_key=lambda event_type, data: data["ip"])
+    for i in range(events):
+        host = i % hosts
+        bus.publish("scan.host.up", {"ip": f"10.0.{host // 256}.{host % 256}", "seq": i})
+    bus.flush()
+    correct = all(data["seq"] >= events - hosts for _, data in got)
+    return len(got), bus.coalesced, correct
+
+
+def pct(samples, q):
+    if not samples:
+        return float("nan")
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(q * len(samples)))] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=200000)
+    parser.add_argument("--rate", type=float, default=20000, help="Paced rate for the latency run")
+    parser.add_argument("--interval", type=float, default=0.01, help="Batch flush interval (s)")
+    parser.add_argument("--max-batch", type=int, default=1024)
+    parser.add_argument("--hosts", type=int, default=1000)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    workdir = tempfile.mkdtemp(prefix="scn_bench_batch_")
+    try:
+        print(f"throughput: {args.events} events, 2 subscribers (file logger + counter)")
+        for label, batched in (("EventBus (per event)", False), ("BatchingEventBus", True)):
+            produced, total, _ = run(batched, args.events, 0, workdir, args.interval, args.max_batch)
+            print(f"  {label:22s} end-to-end {args.events / total:12,.0f}/s   "
+                  f"producer {args.events / produced:12,.0f}/s")
+
+        latency_events = int(args.rate * 2)
+        print(f"latency: {latency_events} events paced at {args.rate:,.0f}/s, "
+              f"interval {args.interval * 1000:.0f} ms, max_batch {args.max_batch}")
+        for label, batched in (("EventBus (per event)", False), ("BatchingEventBus", True)):
+            _, _, latencies = run(batched, latency_events, args.rate, workdir, args.interval,
+                                  args.max_batch)
+            print(f"  {label:22s} p50 {pct(latencies, 0.5):8.3f} ms   p99 {pct(latencies, 0.99):8.3f} ms   "
+                  f"mean {statistics.mean(latencies) * 1000:8.3f} ms")
+
+        delivered, coalesced, correct = coalescing(args.events, args.hosts, args.interval)
+        print(f"coalescing: {args.events} updates for {args.hosts} hosts -> {delivered} delivered, "
+              f"{coalesced} coalesced, latest state kept: {correct}")
+        if delivered != args.hosts or not correct:
+            sys.exit(1)
+    finally:
+        for name in os.listdir(workdir):
+            os.unlink(os.path.join(workdir, name))
+        os.rmdir(workdir)
+
+
+if __name__ == "__main__":
+    main()
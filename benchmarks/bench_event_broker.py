@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cross-process events through the Unix-socket broker.
+
+The broker and a publisher run in their own processes; a subscriber in this
+process asks for ``scan.host.#`` while the publisher alternates between
+``scan.host.up`` and ``noise.tick``, so half the traffic is filtered in the
+broker. Reported:
+
+* throughput -- messages/s through the broker (published) and delivered to
+  the subscriber while the publisher sends ``--messages`` as fast as it can,
+* latency -- publish-to-callback p50/p99 at ``--rate`` messages/s,
+* reconnect -- the broker is killed and restarted; events published while it
+  was down arrive once the clients reconnect.
+
+    python benchmarks/bench_event_broker.py --messages 100000 --rate 5000
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from shadowcore_nexus.core import event_broker  # noqa: E402
+from shadowcore_nexus.core.event_broker import EventBroker, EventClient  # noqa: E402
+
+
+def broker_process(path: str, stop, conn):
+    logging.disable(logging.CRITICAL)
+    broker = EventBroker(path).start()
+    stop.wait()
+    conn.send(broker.stats())
+    broker.stop()
+
+
+def publisher_process(path: str, messages: int, rate: float):
+    logging.disable(logging.CRITICAL)
+    client = EventClient(path).connect()
+    start = time.perf_counter()
+    for i in range(messages):
+        topic = "scan.host.up" if i % 2 == 0 else "noise.tick"
+        ip = f"10.0.{(i >> 8) & 255}.{i & 255}"
+        client.publish(topic, {"seq": i, "ip": ip, "t": time.perf_counter()})
+        if rate:
+            target = start + (i + 1) / rate
+            while time.perf_counter() < target:
+                time.sleep(0.0001)
+    client.publish("scan.host.done", {"seq": -1, "t": time.perf_counter()})
+    client.close()
+
+
+class Broker:
+    def __init__(self, ctx, path: str):
+        self.stop = ctx.Event()
+        self.conn, child = ctx.Pipe()
+        self.proc = ctx.Process(target=broker_process, args=(path, self.stop, child), daemon=True)
+        self.proc.start()
+        deadline = time.monotonic() + 5
+        while not os.path.exists(path) and time.monotonic() < deadline:
+            time.sleep(0.005)
+
+    def finish(self):
+        self.stop.set()
+        stats = self.conn.recv() if self.conn.poll(5) else {}
+        self.proc.join(5)
+        return stats
+
+    def kill(self):
+        self.proc.kill()
+        self.proc.join(5)
+
+
+class Collector:
+    def __init__(self):
+        self.count = 0
+        self.first = self.last = None
+        self.latencies = []
+        self.done = threading.Event()
+
+    def __call__(self, data):
+        now = time.perf_counter()
+        if data["seq"] == -1:
+            self.done.set()
+            return
+        if self.first is None:
+            self.first = now
+        self.last = now
+        self.count += 1
+        self.latencies.append(now - data["t"])
+
+
+def pct(samples, q):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(q * len(samples)))] * 1000 if samples else float("nan")
+
+
+def run(ctx, path: str, messages: int, rate: float):
+    broker = Broker(ctx, path)
+    collector = Collector()
+    sub = EventClient(path).connect()
+    sub.subscribe("scan.host.#", collector)
+    time.sleep(0.05)  # let the SUB reach the broker before publishing starts
+    pub = ctx.Process(target=publisher_process, args=(path, messages, rate))
+    pub.start()
+    collector.done.wait(120)
+    pub.join(30)
+    sub.close()
+    return collector, broker.finish()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=100000)
+    parser.add_argument("--rate", type=float, default=5000, help="Paced rate for the latency run")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    ctx = multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods()
+                                      else "spawn")
+    workdir = tempfile.mkdtemp(prefix="scn_bench_broker_")
+    path = os.path.join(workdir, "events.sock")
+    codec = "msgpack" if event_broker.msgpack is not None else "json"
+    ok = True
+    try:
+        collector, stats = run(ctx, path, args.messages, 0)
+        span = (collector.last - collector.first) if collector.count > 1 else float("nan")
+        print(f"throughput: {args.messages} published ({codec}), subscriber on scan.host.#")
+        print(f"  published {args.messages / span:10,.0f} msg/s   "
+              f"delivered {collector.count / span:10,.0f} msg/s ({collector.count:,} received)")
+        print(f"  broker: forwarded {stats.get('forwarded')}, filtered {stats.get('filtered')}, "
+              f"dropped {stats.get('dropped')}")
+        ok &= collector.count + stats.get("dropped", 0) == (args.messages + 1) // 2
+
+        latency_messages = int(args.rate * 2)
+        collector, _ = run(ctx, path, latency_messages, args.rate)
+        print(f"latency: {latency_messages} published at {args.rate:,.0f}/s")
+        print(f"  p50 {pct(collector.latencies, 0.5):8.3f} ms   p99 {pct(collector.latencies, 0.99):8.3f} ms"
+              f"   max {max(collector.latencies) * 1000:8.3f} ms")
+
+        broker = Broker(ctx, path)
+        got = Collector()
+        sub = EventClient(path, max_backoff=0.2).connect()
+        sub.subscribe("scan.host.#", got)
+        pub = EventClient(path, max_backoff=0.2).connect()
+        pub.publish("scan.host.up", {"seq": 0, "t": time.perf_counter()})
+        time.sleep(0.1)
+        broker.kill()
+        killed = time.perf_counter()
+        time.sleep(0.3)
+        queued = [pub.publish("scan.host.up", {"seq": i, "t": time.perf_counter()}) for i in range(1, 11)]
+        broker = Broker(ctx, path)
+        deadline = time.monotonic() + 10
+        while got.count < 11 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        recovered = time.perf_counter() - killed
+        print(f"reconnect: broker killed and restarted; {queued.count(False)} events queued while down, "
+              f"subscriber received {got.count}/11 within {recovered * 1000:.0f} ms "
+              f"(reconnects: pub {pub.reconnects}, sub {sub.reconnects})")
+        ok &= got.count == 11
+        pub.close()
+        sub.close()
+        broker.finish()
+    finally:
+        for name in os.listdir(workdir):
+            os.unlink(os.path.join(workdir, name))
+        os.rmdir(workdir)
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
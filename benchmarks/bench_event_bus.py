@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Benchmark: EventBus vs. AsyncEventBus throughput and slow-subscriber isolation.
+
+For 1, 10 and 100 subscribers, publishes ``--events`` events and reports
+events/s published (and deliveries/s) through:
+
+* the synchronous ``EventBus.publish``,
+* ``await AsyncEventBus.publish()`` on the bus loop,
+* ``AsyncEventBus.publish_threadsafe()`` from a producer thread.
+
+Then one subscriber is made slow (``--slow-ms`` per event) next to a fast
+one: with the synchronous bus the publisher is stalled by it, with the async
+bus (``drop-oldest``) the publisher and the fast subscriber are not.
+
+    python benchmarks/bench_event_bus.py --events 20000 --subscribers 1 10 100
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from shadowcore_nexus.core.event_system import AsyncEventBus, EventBus  # noqa: E402
+
+
+def bench_sync(events: int, subscribers: int):
+    bus = EventBus()
+    sink = [0]
+
+    def handler(data):
+        sink[0] += 1
+
+    for _ in range(subscribers):
+        bus.subscribe("scan.host", handler)
+    start = time.perf_counter()
+    for i in range(events):
+        bus.publish("scan.host", i)
+    return time.perf_counter() - start, sink[0]
+
+
+async def bench_async(events: int, subscribers: int, policy: str):
+    bus = AsyncEventBus(maxsize=1024, policy=policy)
+    sink = [0]
+
+    def handler(data):
+        sink[0] += 1
+
+    for _ in range(subscribers):
+        bus.subscribe("scan.host", handler)
+    start = time.perf_counter()
+    for i in range(events):
+        await bus.publish("scan.host", i)
+    await bus.drain()
+    elapsed = time.perf_counter() - start
+    await bus.close()
+    return elapsed, sink[0]
+
+
+async def bench_threadsafe(events: int, subscribers: int):
+    bus = AsyncEventBus(maxsize=1024, policy="block")
+    sink = [0]
+
+    def handler(data):
+        sink[0] += 1
+
+    for _ in range(subscribers):
+        bus.subscribe("scan.host", handler)
+    await bus.drain()  # binds the bus to this loop
+    done = threading.Event()
+
+    def producer():
+        for i in range(events):
+            bus.publish_threadsafe("scan.host", i)
+        done.set()
+
+    start = time.perf_counter()
+    thread = threading.Thread(target=producer)
+    thread.start()
+    while not done.is_set():
+        await asyncio.sleep(0.001)
+    await bus.drain()
+    elapsed = time.perf_counter() - start
+    thread.join()
+    await bus.close()
+    return elapsed, sink[0]
+
+
+def slow_sync(events: int, slow_ms: float) -> float:
+    bus = EventBus()
+    bus.subscribe("scan.host", lambda data: time.sleep(slow_ms / 1000))
+    bus.subscribe("scan.host", lambda data: None)
+    start = time.perf_counter()
+    for i in range(events):
+        bus.publish("scan.host", i)
+    return time.perf_counter() - start
+
+
+async def slow_async(events: int, slow_ms: float):
+    bus = AsyncEventBus(maxsize=64, policy="drop-oldest")
+    fast_done = asyncio.Event()
+
+    async def slow(data):
+        await asyncio.sleep(slow_ms / 1000)
+
+    def fast(data):
+        if data == events - 1:
+            fast_done.set()
+
+    slow_sub = bus.subscribe("scan.host", slow)
+    bus.subscribe("scan.host", fast)
+    start = time.perf_counter()
+    for i in range(events):
+        await bus.publish("scan.host", i)
+    publish_time = time.perf_counter() - start
+    await fast_done.wait()
+    fast_time = time.perf_counter() - start
+    await bus.close()
+    return publish_time, fast_time, slow_sub.dropped
+
+
+def rate(count: int, seconds: float) -> str:
+    return f"{count / seconds:12,.0f}/s" if seconds > 0 else "         inf"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--subscribers", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--slow-events", type=int, default=500)
+    parser.add_argument("--slow-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    print(f"events per run: {args.events}  (events/s published; deliveries/s and total delivered "
+          f"in parentheses -- drop-oldest sheds load when the publisher outruns subscribers)")
+    for n in args.subscribers:
+        print(f"subscribers: {n}")
+        rows = [
+            ("EventBus.publish (sync)", bench_sync(args.events, n)),
+            ("await publish (block)", asyncio.run(bench_async(args.events, n, "block"))),
+            ("await publish (drop-oldest)", asyncio.run(bench_async(args.events, n, "drop-oldest"))),
+            ("publish_threadsafe (block)", asyncio.run(bench_threadsafe(args.events, n))),
+        ]
+        for label, (seconds, delivered) in rows:
+            print(f"  {label:30s} {rate(args.events, seconds)}  "
+                  f"({rate(delivered, seconds).strip()}, {delivered}/{args.events * n})")
+
+    print(f"slow subscriber: {args.slow_ms:.1f} ms/event, {args.slow_events} events")
+    sync_time = slow_sync(args.slow_events, args.slow_ms)
+    print(f"  EventBus publisher blocked for   {sync_time * 1000:9.1f} ms")
+    publish_time, fast_time, dropped = asyncio.run(slow_async(args.slow_events, args.slow_ms))
+    print(f"  AsyncEventBus publisher took     {publish_time * 1000:9.1f} ms; fast subscriber done "
+          f"after {fast_time * 1000:.1f} ms; slow subscriber dropped {dropped} (drop-oldest, maxsize 64)")
+
+
+if __name__ == "__main__":
+    main()
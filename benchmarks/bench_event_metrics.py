@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cost of EventBus instrumentation, and what it exports.
+
+* publish cost per event with 3 handlers: plain bus, instrumented bus, and a
+  bus that was instrumented and disabled again (runs the plain publish),
+* log-bucketed histogram percentiles vs. exact ones on lognormal latencies,
+* a JSON + Prometheus snapshot covering EventBus, BatchingEventBus and
+  AsyncEventBus (handler that raises included), written to ``--output-dir``
+  (a temp dir by default) and checked line by line for exposition format.
+
+    python benchmarks/bench_event_metrics.py --events 200000
+"""
+
+import argparse
+import asyncio
+import collections
+import json
+import logging
+import random
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from shadowcore_nexus.core.event_metrics import EventMetrics, LogHistogram  # noqa: E402
+from shadowcore_nexus.core.event_system import AsyncEventBus, BatchingEventBus, EventBus  # noqa: E402
+
+PROM_LINE = re.compile(r'^[a-z_]+(\{([a-z_]+="([^"\\]|\\.)*",?)*\})? [0-9.e+-]+$')
+
+
+def publish_ns(bus: EventBus, events: int, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for i in range(events):
+            bus.publish("scan.host.up", i)
+        samples.append((time.perf_counter_ns() - start) / events)
+    return statistics.median(samples)
+
+
+def make_bus(**kwargs) -> EventBus:
+    bus = EventBus(**kwargs)
+    sink = collections.deque(maxlen=16)
+    bus.subscribe("scan.host.up", sink.append)
+    bus.subscribe("scan.#", lambda data: None)
+    bus.subscribe("scan.host.*", lambda data: data * 2)
+    return bus
+
+
+def histogram_accuracy(samples: int):
+    rng = random.Random(3)
+    values = [int(rng.lognormvariate(10, 1.2)) for _ in range(samples)]
+    hist = LogHistogram()
+    for v in values:
+        hist.record(v)
+    values.sort()
+    rows = []
+    for q in (0.5, 0.9, 0.99, 0.999):
+        exact = values[min(len(values) - 1, int(q * len(values)))]
+        rows.append((q, exact, hist.percentile(q)))
+    return rows, len(hist.counts)
+
+
+async def async_traffic(metrics: EventMetrics, events: int):
+    bus = AsyncEventBus(maxsize=256, metrics=metrics)
+
+    async def slow(data):
+        await asyncio.sleep(0)
+
+    bus.subscribe("scan.host.up", slow)
+    bus.subscribe("scan.#", lambda data: None)
+    for i in range(events):
+        await bus.publish("scan.host.up", i)
+    snapshot = metrics.snapshot()  # while queues are still full
+    await bus.drain()
+    await bus.close()
+    return snapshot["queues"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output-dir", help="Where to write the snapshot (default: temp dir)")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    plain = publish_ns(make_bus(), args.events, args.repeat)
+    metrics = EventMetrics()
+    instrumented = publish_ns(make_bus(metrics=metrics), args.events, args.repeat)
+    toggled = make_bus(metrics=EventMetrics())
+    toggled.disable_metrics()
+    disabled = publish_ns(toggled, args.events, args.repeat)
+    print(f"publish, 3 handlers ({args.events} events, median of {args.repeat})")
+    print(f"  plain EventBus              {plain:8.0f} ns/event")
+    print(f"  metrics enabled             {instrumented:8.0f} ns/event  (+{instrumented - plain:.0f} ns)")
+    print(f"  enabled then disabled       {disabled:8.0f} ns/event  ({(disabled / plain - 1) * 100:+.1f}%)")
+
+    rows, buckets = histogram_accuracy(args.events)
+    print(f"histogram: {args.events} lognormal samples in {buckets} buckets")
+    worst = 0.0
+    for q, exact, approx in rows:
+        err = abs(approx - exact) / exact
+        worst = max(worst, err)
+        print(f"  p{q * 100:<5g} exact {exact:10d}  histogram {approx:12.1f}  error {err * 100:5.2f}%")
+
+    batched = BatchingEventBus(metrics=metrics)
+    batched.subscribe("scan.#", lambda events: None)
+
+    def failing(data):
+        raise RuntimeError("boom")
+
+    bus = make_bus(metrics=metrics)
+    bus.subscribe("scan.fail", failing)
+    for i in range(1000):
+        batched.publish("scan.host.up", i)
+        try:
+            bus.publish("scan.fail", i)
+        except RuntimeError:
+            pass
+    queues = asyncio.run(async_traffic(metrics, 2000))
+    batched.flush()
+
+    out_dir = Path(args.output_dir or tempfile.mkdtemp(prefix="scn_bench_metrics_"))
+    try:
+        paths = metrics.write(out_dir)
+        snapshot = json.loads(paths["json"].read_text())
+        prom = paths["prometheus"].read_text().splitlines()
+        bad = [line for line in prom if not line.startswith("#") and not PROM_LINE.match(line)]
+        errors = {h["handler"].rsplit(".", 1)[-1]: h["errors"] for h in snapshot["handlers"] if h["errors"]}
+        print(f"export: {paths['json'].name} ({len(snapshot['handlers'])} handlers, "
+              f"{len(snapshot['published'])} topics), {paths['prometheus'].name} ({len(prom)} lines, "
+              f"{len(bad)} malformed)")
+        print(f"  handler errors {errors}; async queue depths while busy {queues}")
+        top = snapshot["handlers"][0]
+        print(f"  most expensive: {top['handler']} on {top['pattern']}: {top['calls']} calls, "
+              f"p50 {top['latency']['p50_us']:.2f} us, p99 {top['latency']['p99_us']:.2f} us")
+    finally:
+        if not args.output_dir:
+            shutil.rmtree(out_dir, ignore_errors=True)
+    if bad or worst > 0.05 or "publish" in vars(toggled) or not errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Benchmark: segmented history store vs. one file per history event.
+
+* append -- records/s through ``HistoryStore.append`` vs. the old
+  ``log_history`` (a new ``<ritual>_<timestamp>.log`` file per call),
+* query -- "all netmap_ritual runs in the last week" over ``--records``
+  records from 8 rituals spread over ``--days`` days: through the index
+  (warm, and cold from the sidecar files), against a full scan of every
+  segment and against globbing + reading the old per-event files,
+* migration -- old files (some from the same second, some multi-line) are
+  imported, then queried back; a torn last line left by a crashed writer
+  must not swallow the next record.
+
+    python benchmarks/bench_history_store.py --records 200000 --days 30
+"""
+
+import argparse
+import json
+import logging
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from shadowcore_nexus.core.history_store import HistoryStore, migrate_legacy  # noqa: E402
+
+RITUALS = ["netmap_ritual", "simulated_mapper", "scanner", "encoding",
+           "recon", "exfil_probe", "port_sweep", "beacon"]
+
+
+def old_log_history(directory: Path, ritual_name: str, details, ts: float):
+    timestamp = datetime.fromtimestamp(ts).strftime("%Y-%m-%d_%H-%M-%S")
+    with (directory / f"{ritual_name}_{timestamp}.log").open("w") as f:
+        f.write(f"Ritual: {ritual_name}\n")
+        f.write(f"Timestamp: {timestamp}\n")
+        f.write(f"Details: {details}\n")
+
+
+def old_query(directory: Path, ritual: str, since: float) -> int:
+    found = 0
+    for path in directory.glob(f"{ritual}_*.log"):
+        stamp = path.read_text().split("\n")[1][len("Timestamp: "):]
+        if datetime.strptime(stamp, "%Y-%m-%d_%H-%M-%S").timestamp() >= since:
+            found += 1
+    return found
+
+
+def full_scan(store: HistoryStore, ritual: str, since: float) -> int:
+    found = 0
+    for number in store.segments():
+        with open(store.segment_path(number), "rb") as f:
+            for line in f:
+                record = json.loads(line)
+                if record["ritual"] == ritual and record["ts"] >= since:
+                    found += 1
+    return found
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=200000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--segment-kb", type=int, default=1024)
+    parser.add_argument("--legacy", type=int, default=5000, help="Old-style files to write and migrate")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    rng = random.Random(5)
+    workdir = Path(tempfile.mkdtemp(prefix="scn_bench_history_"))
+    ok = True
+    try:
+        now = time.time()
+        start_ts = now - args.days * 86400
+        step = args.days * 86400 / args.records
+        store = HistoryStore(workdir / "store", segment_bytes=args.segment_kb * 1024)
+        t0 = time.perf_counter()
+        for i in range(args.records):
+            ritual = rng.choice(RITUALS)
+            store.append(ritual, f"Open Port on 10.0.{i >> 8 & 255}.{i & 255}: {i % 1024}",
+                         ts=start_ts + i * step)
+        append_rate = args.records / (time.perf_counter() - t0)
+        store.flush()
+
+        legacy_dir = workdir / "legacy"
+        legacy_dir.mkdir()
+        t0 = time.perf_counter()
+        for i in range(args.legacy):
+            ts = start_ts + i * (args.days * 86400 / args.legacy)
+            old_log_history(legacy_dir, RITUALS[i % len(RITUALS)], f"Host Found: 10.0.0.{i & 255}", ts)
+        old_rate = args.legacy / (time.perf_counter() - t0)
+        print(f"append: HistoryStore {append_rate:10,.0f} records/s   "
+              f"file per event {old_rate:10,.0f} records/s ({append_rate / old_rate:.1f}x)")
+        stats = store.stats()
+        print(f"  {stats['records']:,} records in {stats['segments']} segments "
+              f"({stats['bytes'] / 1e6:.1f} MB) vs {args.legacy:,} files for {args.legacy:,} records")
+
+        since = now - 7 * 86400
+        indexed, indexed_ms = timed(lambda: sum(1 for _ in store.query("netmap_ritual", since)))
+        cold, cold_ms = timed(lambda: sum(1 for _ in HistoryStore(store.directory).query("netmap_ritual", since)))
+        scanned, scan_ms = timed(full_scan, store, "netmap_ritual", since)
+        old_found, old_ms = timed(old_query, legacy_dir, "netmap_ritual", since)
+        print(f"query: netmap_ritual, last 7 of {args.days} days")
+        print(f"  index (warm)        {indexed_ms:8.1f} ms  {indexed:,} records")
+        print(f"  index (cold)        {cold_ms:8.1f} ms  {cold:,} records")
+        print(f"  full segment scan   {scan_ms:8.1f} ms  {scanned:,} records")
+        print(f"  old glob + read     {old_ms:8.1f} ms  {old_found:,} of {args.legacy:,} files "
+              f"(~{old_ms * args.records / args.legacy:,.0f} ms at {args.records:,})")
+        ok &= indexed == cold == scanned
+
+        migrated = HistoryStore(workdir / "migrated")
+        burst = datetime.fromtimestamp(now).strftime("%Y-%m-%d_%H-%M-%S")
+        for n, details in enumerate(["Host Found: 10.0.0.1", "ARP Scan Results:\n10.0.0.1 aa:bb\n10.0.0.2 cc:dd"]):
+            (legacy_dir / f"scanner_{burst}{'' if n == 0 else '_1'}.log").write_text(
+                f"Ritual: scanner\nTimestamp: {burst}\nDetails: {details}\n")
+        (legacy_dir / "notes.log").write_text("not a history file\n")
+        result, migrate_ms = timed(migrate_legacy, migrated, legacy_dir)
+        multi = [r for r in migrated.query("scanner", since=now - 5) if "\n" in r["details"]]
+        print(f"migrate: {result['migrated']:,} files in {migrate_ms:.0f} ms ({result['skipped']} skipped); "
+              f"{len(list(migrated.query('scanner', since=now - 5)))} same-second records kept, "
+              f"multi-line details intact: {multi[0]['details'].count(chr(10)) == 2 if multi else False}")
+        ok &= result == {"migrated": args.legacy + 2, "skipped": 1} and len(multi) == 1
+        ok &= len(list(legacy_dir.glob("*.log"))) == 1
+
+        migrated.close()
+        with open(migrated.segment_path(migrated.segments()[-1]), "ab") as f:
+            f.write(b'{"ts": 1, "ritual": "tor')
+        recovered = HistoryStore(workdir / "migrated")
+        recovered.append("netmap_ritual", "after crash")
+        tail = list(recovered.query("netmap_ritual", since=now - 60))
+        print(f"torn line: record appended after a crashed writer is readable: "
+              f"{[r['details'] for r in tail] == ['after crash']}")
+        ok &= [r["details"] for r in tail] == ["after crash"]
+        recovered.close()
+        store.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+LILITH watcher feed: inotify batch follower vs. the old 0.5 s polling tail.
+
+* latency -- single lines written at random intervals; time until the
+  follower hands them over (``follow_batches`` vs. the old seek/readline
+  loop that slept 0.5 s between polls),
+* burst   -- ``LogSink`` writes a burst with aggressive rotation while a
+  ``LogFeed`` widget runs in an urwid ``MainLoop`` on a pseudo-terminal.
+  Every line must arrive exactly once and in order, the scrollback must
+  stay bounded and screen redraws must stay under the FPS cap.
+
+Needs urwid for the burst part (skipped if missing).
+"""
+
+import argparse
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from shadowcore_nexus.utils.log_rotation import (RotationPolicy, follow_batches,  # noqa: E402
+                                                 wait_for_compression)
+from shadowcore_nexus.utils.log_sink import LogSink  # noqa: E402
+
+try:
+    import urwid
+except ImportError:
+    urwid = None
+
+
+def legacy_tail(path: Path, stop: threading.Event):
+    """The pre-inotify tail_log loop (seek to the end, readline, sleep 0.5 s)."""
+    with open(path, "r") as f:
+        f.seek(0, os.SEEK_END)
+        while not stop.is_set():
+            line = f.readline()
+            if not line:
+                time.sleep(0.5)
+                continue
+            yield [line.rstrip("\n")]
+
+
+def measure_latency(workdir: Path, follower, lines: int = 20):
+    path = workdir / "latency.log"
+    path.write_text("")
+    stop = threading.Event()
+    seen = {}
+
+    def consume():
+        for batch in follower(path, stop):
+            now = time.perf_counter()
+            for line in batch:
+                seen.setdefault(line, now)
+
+    thread = threading.Thread(target=consume, daemon=True)
+    thread.start()
+    time.sleep(0.3)
+    sent = {}
+    rng = random.Random(3)
+    with open(path, "a") as f:
+        for i in range(lines):
+            time.sleep(rng.uniform(0.05, 0.3))
+            sent[f"line {i}"] = time.perf_counter()
+            f.write(f"line {i}\n")
+            f.flush()
+    time.sleep(0.7)
+    stop.set()
+    with open(path, "a") as f:
+        f.write("bye\n")  # wake the follower so it sees stop
+    thread.join(timeout=2)
+    delays = [(seen[k] - t) * 1000 for k, t in sent.items() if k in seen]
+    return delays, len(sent) - len(delays)
+
+
+def run_burst(workdir: Path, total: int, fps: float, scrollback: int):
+    from shadowcore_nexus.interfaces.log_feed import LogFeed
+
+    path = workdir / "daemon.log"
+    path.write_text("")
+    feed = LogFeed(path, scrollback=scrollback, fps=fps, formatter=lambda line: line)
+    master, slave = os.openpty()
+    tty_in, tty_out = os.fdopen(slave, "rb", buffering=0), os.fdopen(os.dup(slave), "w")
+    screen = urwid.raw_display.Screen(input=tty_in, output=tty_out)
+    screen.set_terminal_properties(colors=16)
+    draws = []
+    original_draw = screen.draw_screen
+
+    def counting_draw(*args, **kwargs):
+        draws.append(time.monotonic())
+        return original_draw(*args, **kwargs)
+
+    screen.draw_screen = counting_draw
+    loop = urwid.MainLoop(urwid.LineBox(feed), screen=screen, handle_mouse=False)
+
+    def drain_pty():
+        while True:
+            try:
+                if not os.read(master, 1 << 16):
+                    return
+            except OSError:
+                return
+
+    threading.Thread(target=drain_pty, daemon=True).start()
+    sink = LogSink(path, batch_lines=256, flush_interval=0.01,
+                   rotation=RotationPolicy(max_bytes=256 << 10, keep=50))
+    result = {}
+
+    def writer():
+        time.sleep(0.3)
+        t0 = time.monotonic()
+        for i in range(total):
+            sink.write(f"burst {i:08d}\n")
+            if i % 5000 == 0:
+                time.sleep(0.01)  # bursty, not one flat stream
+        sink.flush()
+        result["write_s"] = time.monotonic() - t0
+        deadline = time.monotonic() + 20
+        while feed.received < total and time.monotonic() < deadline:
+            time.sleep(0.05)
+        time.sleep(0.3)  # let the last frame render
+        result["t0"] = t0
+        os.write(wake, b"q")
+
+    def on_quit(_data):
+        raise urwid.ExitMainLoop()
+
+    wake = loop.watch_pipe(on_quit)
+    feed.attach(loop)
+    threading.Thread(target=writer, daemon=True).start()
+    t_start = time.monotonic()
+    loop.run()
+    elapsed = time.monotonic() - t_start
+    feed.stop()
+    sink.close()
+    wait_for_compression(5)
+    os.close(master)
+
+    window = [t for t in draws if t >= result["t0"]]
+    worst = 0
+    for i, t in enumerate(window):  # most redraws in any one-second window
+        worst = max(worst, sum(1 for u in window[i:] if u - t < 1.0))
+    expected_tail = [f"burst {i:08d}" for i in range(total - len(feed.walker.lines), total)]
+    return {
+        "received": feed.received,
+        "renders": feed.redraws,
+        "draws": len(draws),
+        "max_draws_per_s": worst,
+        "scrollback": len(feed.walker.lines),
+        "tail_ok": list(feed.walker.lines) == expected_tail,
+        "write_s": result["write_s"],
+        "elapsed": elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, default=200_000, help="burst size")
+    parser.add_argument("--fps", type=float, default=10.0)
+    parser.add_argument("--scrollback", type=int, default=2000)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    failed = False
+    with tempfile.TemporaryDirectory(prefix="scn-logfeed-") as tmp:
+        workdir = Path(tmp)
+        print("wake-up latency (single lines at random 50-300 ms intervals)")
+        for label, follower in (
+            ("legacy 0.5 s poll", legacy_tail),
+            ("follow_batches", lambda path, stop: follow_batches(path, stop=stop)),
+        ):
+            delays, missed = measure_latency(workdir, follower)
+            print(f"  {label:<20} median {statistics.median(delays):7.1f} ms  "
+                  f"max {max(delays):7.1f} ms  missed {missed}")
+            if label == "follow_batches":
+                failed |= missed > 0 or statistics.median(delays) > 50
+
+        if urwid is None:
+            print("burst: skipped (urwid not installed)")
+        else:
+            r = run_burst(workdir, args.lines, args.fps, args.scrollback)
+            print(f"\nburst: {args.lines:,} lines in {r['write_s']:.2f}s with rotation every 256 KB")
+            print(f"  received {r['received']:,} (exactly once: {r['received'] == args.lines}), "
+                  f"scrollback {r['scrollback']:,} lines, newest in order: {r['tail_ok']}")
+            print(f"  {r['renders']} batch renders, {r['draws']} screen redraws in {r['elapsed']:.1f}s, "
+                  f"at most {r['max_draws_per_s']} in any second (cap {args.fps:g} fps)")
+            failed |= (r["received"] != args.lines or not r["tail_ok"]
+                       or r["scrollback"] > args.scrollback
+                       or r["max_draws_per_s"] > args.fps + 2)  # + the startup and final frames
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Indexed ``logs query`` vs. linear scans on a multi-GB synthetic daemon.log.
+
+Writes ``--gb`` GB of structured records spread over ``--days`` days, builds
+the sparse index, then runs a few typical queries three ways:
+
+* ``indexed``  -- ``log_index.query`` (bisect the index, search the mmapped range),
+* ``mmap scan`` -- the same search over the whole mapping (no index),
+* ``linear``   -- read the file line by line and parse every record.
+
+All three must return the same records. ``--keep`` reuses/keeps the log.
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from shadowcore_nexus.utils import log_index  # noqa: E402
+
+RITUALS = ["netmap_ritual", "scanner", "simulated_mapper", "encoding",
+           "recon_sweep", "port_probe", "dns_walk", "hash_check"]
+
+
+def generate(path: Path, gb: float, days: float, seed: int = 7) -> int:
+    """Write ~``gb`` GB of records ending now; returns the line count."""
+    rng = random.Random(seed)
+    target = int(gb * (1 << 30))
+    span = days * 86400
+    start = time.time() - span
+    messages = [f"Host Found: 10.0.{i // 256}.{i % 256}" for i in range(512)]
+    messages += [f"Open Port on 10.0.{i // 256}.{i % 256}: {p}" for i in range(256) for p in (22, 80, 443)]
+    messages += ["Ritual initiated on 10.0.0.0/16", "Ritual Completed.", "Payload Error: timeout"]
+    written = 0
+    n = 0
+    with open(path, "w", encoding="utf-8", buffering=8 << 20) as f:
+        while written < target:
+            block = []
+            # Time advances with the bytes written, so the log ends about now.
+            base = start + span * written / target
+            step = span * (written / n if n else 80) / target
+            for i in range(4096):
+                ts = base + i * step
+                block.append(log_index.format_record(rng.choice(messages), rng.choice(RITUALS),
+                                                     "ERROR" if n % 97 == 0 else "INFO", ts))
+                n += 1
+            chunk = "".join(block)
+            f.write(chunk)
+            written += len(chunk)
+    return n
+
+
+def linear(path: Path, since, until, ritual, grep):
+    import re
+    pattern = re.compile(grep) if grep else None
+    out = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            record = log_index.parse_record(line)
+            if record is None:
+                continue
+            if since is not None and record["ts"] < since:
+                continue
+            if until is not None and record["ts"] > until:
+                continue
+            if ritual is not None and record["ritual"] != ritual:
+                continue
+            if pattern is not None and not pattern.search(line):
+                continue
+            out.append(record)
+    return out
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--gb", type=float, default=2.0, help="log size in GB")
+    parser.add_argument("--days", type=float, default=14.0, help="time span of the log")
+    parser.add_argument("--dir", help="where to write the log (default: a temp dir)")
+    parser.add_argument("--keep", action="store_true", help="keep (and reuse) the generated log")
+    parser.add_argument("--skip-linear", action="store_true", help="skip the line-by-line baseline")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    workdir = Path(args.dir) if args.dir else Path(tempfile.mkdtemp(prefix="scn-logidx-"))
+    workdir.mkdir(parents=True, exist_ok=True)
+    path = workdir / "daemon.log"
+    try:
+        if args.keep and path.exists():
+            print(f"reusing {path} ({path.stat().st_size / (1 << 30):.2f} GB)")
+        else:
+            count, elapsed = timed(lambda: generate(path, args.gb, args.days))
+            print(f"generated {count:,} records, {path.stat().st_size / (1 << 30):.2f} GB in {elapsed:.1f}s")
+        entries, elapsed = timed(lambda: log_index.rebuild_index(path))
+        print(f"index: {entries:,} entries, {log_index.index_path(path).stat().st_size / 1024:.0f} KB, "
+              f"built in {elapsed * 1000:.0f} ms")
+
+        now = time.time()
+        mid = now - args.days * 86400 / 2
+        cases = [
+            ("last 15 min", dict(since=now - 900)),
+            ("1 h mid-log, ritual", dict(since=mid, until=mid + 3600, ritual="netmap_ritual")),
+            ("6 h mid-log, grep", dict(since=mid, until=mid + 6 * 3600, grep=r"Port on 10\.0\.0\.1\d: 22\b")),
+        ]
+        failed = False
+        print(f"\n{'query':<24}{'hits':>8}{'indexed':>12}{'mmap scan':>12}{'linear':>12}")
+        for label, kw in cases:
+            kw = dict(dict(since=None, until=None, ritual=None, grep=None), **kw)
+            fast, t_fast = timed(lambda: list(log_index.query(path, **kw)))
+            scan, t_scan = timed(lambda: list(log_index.query(path, use_index=False, **kw)))
+            if args.skip_linear:
+                slow, t_slow = scan, float("nan")
+            else:
+                slow, t_slow = timed(lambda: linear(path, **kw))
+            same = fast == scan == slow
+            failed |= not same or not fast
+            print(f"{label:<24}{len(fast):>8,}{t_fast * 1000:>10.1f}ms{t_scan * 1000:>10.0f}ms"
+                  f"{t_slow * 1000:>10.0f}ms  {'ok' if same else 'MISMATCH'}"
+                  f"{'' if fast else ' (no hits)'}")
+    finally:
+        if not args.keep:
+            for p in (path, log_index.index_path(path)):
+                try:
+                    os.unlink(p)
+                except OSError:
+                    pass
+            if not args.dir:
+                os.rmdir(workdir)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
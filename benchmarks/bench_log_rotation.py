@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Benchmark: log segment compression, and following a log across rotations.
+
+* compression -- ``--mb`` MB of daemon.log-style lines compressed with
+  ``compress_file`` at several gzip levels and lzma presets: MB/s of input
+  and on-disk size relative to the raw segment,
+* rotation -- ``--lines`` lines written through a ``LogSink`` that rotates
+  every ``--segment-kb`` KB (gzip, keep ``--keep``) while ``follow()`` tails
+  the live file; the follower must see every line exactly once and in order,
+  and retention must leave at most ``--keep`` compressed segments,
+* the same through ``RotatingLogHandler`` (what ``modules/logger.Logger``
+  uses) for ``--lines // 10`` records.
+
+    python benchmarks/bench_log_rotation.py --mb 32 --lines 200000
+"""
+
+import argparse
+import logging
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from shadowcore_nexus.utils import log_rotation  # noqa: E402
+from shadowcore_nexus.utils.log_rotation import (RotatingLogHandler, RotationPolicy,  # noqa: E402
+                                                 compress_file, follow, rotated_segments,
+                                                 wait_for_compression)
+from shadowcore_nexus.utils.log_sink import LogSink  # noqa: E402
+
+MESSAGES = ["Host Found: 10.0.{a}.{b}", "Open Port on 10.0.{a}.{b}: {port}",
+            "Simulated Mapper started on 10.0.{a}.0/24", "NetMap Ritual initiated on 10.0.{a}.0/24",
+            "Scanner Payload Error: timed out after {port} ms"]
+
+
+def sample_lines(n: int, rng: random.Random):
+    for i in range(n):
+        yield rng.choice(MESSAGES).format(a=rng.randrange(256), b=rng.randrange(256),
+                                          port=rng.choice((22, 80, 443, 3389, 8080, rng.randrange(65536))))
+
+
+def compression_table(workdir: Path, mb: int):
+    raw = workdir / "sample.log"
+    rng = random.Random(9)
+    with open(raw, "w") as f:
+        while f.tell() < mb << 20:
+            f.write("\n".join(sample_lines(10000, rng)) + "\n")
+    size = raw.stat().st_size
+    rows = []
+    codecs = [("gzip", 1), ("gzip", 6), ("gzip", 9)]
+    if log_rotation.lzma is not None:
+        codecs += [("lzma", 0), ("lzma", 6)]
+    for compression, level in codecs:
+        segment = workdir / f"seg-{compression}-{level}.log"
+        shutil.copyfile(raw, segment)
+        start = time.perf_counter()
+        out = compress_file(segment, compression, level)
+        elapsed = time.perf_counter() - start
+        rows.append((compression, level, size / elapsed / 1e6, out.stat().st_size / size))
+        out.unlink()
+    raw.unlink()
+    return size, rows
+
+
+class Follower:
+    def __init__(self, path: Path):
+        self.lines = []
+        self.stop = threading.Event()
+        self.thread = threading.Thread(target=self.run, args=(path,), daemon=True)
+        self.thread.start()
+
+    def run(self, path: Path):
+        for line in follow(path, from_end=False, poll_interval=0.005, stop=self.stop):
+            self.lines.append(line)
+
+    def wait_for(self, count: int, timeout: float = 30):
+        deadline = time.monotonic() + timeout
+        while len(self.lines) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.stop.set()
+        self.thread.join(5)
+        return self.lines
+
+
+def check(lines, expected: int) -> bool:
+    return [int(line.split()[0]) for line in lines] == list(range(expected))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mb", type=int, default=32)
+    parser.add_argument("--lines", type=int, default=200000)
+    parser.add_argument("--segment-kb", type=int, default=512)
+    parser.add_argument("--keep", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    workdir = Path(tempfile.mkdtemp(prefix="scn_bench_rotation_"))
+    ok = True
+    try:
+        size, rows = compression_table(workdir, args.mb)
+        print(f"compression of a {size / 1e6:.1f} MB segment")
+        for compression, level, rate, ratio in rows:
+            print(f"  {compression:<4} level {level}   {rate:8.1f} MB/s   on disk {ratio * 100:5.1f}% "
+                  f"({1 / ratio:4.1f}x smaller)")
+
+        policy = RotationPolicy(max_bytes=args.segment_kb << 10, max_age=None, keep=args.keep)
+        path = workdir / "daemon.log"
+        follower = Follower(path)
+        sink = LogSink(path, rotation=policy)
+        rng = random.Random(1)
+        raw_bytes = 0
+        start = time.perf_counter()
+        for i, message in enumerate(sample_lines(args.lines, rng)):
+            line = f"{i} {message}\n"
+            raw_bytes += len(line)
+            sink.write(line)
+        sink.flush()
+        elapsed = time.perf_counter() - start
+        seen = follower.wait_for(args.lines)
+        sink.close()
+        wait_for_compression(30)
+        segments = rotated_segments(path)
+        on_disk = sum(s.stat().st_size for s in segments) + path.stat().st_size
+        compressed = all(s.suffix == ".gz" for s in segments)
+        in_order = check(seen, args.lines)
+        print(f"LogSink: {args.lines:,} lines ({raw_bytes / 1e6:.1f} MB) in {elapsed:.2f} s, "
+              f"{sink.rotations} rotations")
+        print(f"  follower saw {len(seen):,} lines, exactly once and in order: {in_order}")
+        print(f"  kept {len(segments)} segments (all gzip: {compressed}) + live file = "
+              f"{on_disk / 1e6:.2f} MB on disk")
+        ok &= in_order and compressed and len(segments) <= args.keep and sink.rotations > len(segments)
+
+        records = args.lines // 10
+        log_path = workdir / "lan_scan.log"
+        handler = RotatingLogHandler(log_path, RotationPolicy(max_bytes=32 << 10, max_age=None,
+                                                             keep=records))
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        scan_logger = logging.getLogger("bench.rotation")
+        scan_logger.propagate = False
+        scan_logger.addHandler(handler)
+        scan_logger.setLevel(logging.INFO)
+        logging.disable(logging.NOTSET)
+        follower = Follower(log_path)
+        for i in range(records):
+            scan_logger.info(f"{i} Open Port on 10.0.0.{i & 255}: 22")
+        seen = follower.wait_for(records)
+        handler.close()
+        logging.disable(logging.CRITICAL)
+        wait_for_compression(30)
+        in_order = check(seen, records)
+        print(f"RotatingLogHandler: {records:,} records over {len(rotated_segments(log_path))} segments, "
+              f"follower exactly once and in order: {in_order}")
+        ok &= in_order
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
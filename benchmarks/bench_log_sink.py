@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark: log_event lines/s, old open-append-close vs. the buffered LogSink.
+
+* single thread: ``--lines`` lines through the old ``log_event`` (open, append
+  one line, close) and through a ``LogSink`` with each durability policy,
+  timed until the last line is on disk,
+* ``--threads`` threads logging concurrently: every line arrives exactly once
+  and each thread's lines stay in order,
+* exit: a child process logs and exits without flushing; the atexit hook
+  must have written every line.
+
+    python benchmarks/bench_log_sink.py --lines 200000 --threads 4
+"""
+
+import argparse
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC))
+
+from shadowcore_nexus.utils.log_sink import DURABILITY, LogSink  # noqa: E402
+
+EXIT_CHILD = """
+import sys
+sys.path.insert(0, sys.argv[1])
+from shadowcore_nexus.utils.log_sink import get_sink
+sink = get_sink(sys.argv[2])
+for i in range(int(sys.argv[3])):
+    sink.write(f"exit line {i}\\n")
+"""
+
+
+def old_log_event(path: Path, message: str):
+    with path.open("a") as f:
+        f.write(f"{message}\n")
+
+
+def count_lines(path: Path) -> int:
+    with open(path, "rb") as f:
+        return sum(chunk.count(b"\n") for chunk in iter(lambda: f.read(1 << 20), b""))
+
+
+def run_old(path: Path, lines: int) -> float:
+    start = time.perf_counter()
+    for i in range(lines):
+        old_log_event(path, f"Open Port on 10.0.{i >> 8 & 255}.{i & 255}: {i % 1024}")
+    return time.perf_counter() - start
+
+
+def run_sink(path: Path, lines: int, durability: str):
+    sink = LogSink(path, durability=durability)
+    start = time.perf_counter()
+    for i in range(lines):
+        sink.write(f"Open Port on 10.0.{i >> 8 & 255}.{i & 255}: {i % 1024}\n")
+    queued = time.perf_counter() - start
+    sink.flush()
+    total = time.perf_counter() - start
+    sink.close()
+    return queued, total, sink.batches
+
+
+def run_threads(path: Path, threads: int, lines: int) -> bool:
+    sink = LogSink(path, max_queue=1000)
+
+    def worker(n: int):
+        for i in range(lines):
+            sink.write(f"{n} {i}\n")
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    sink.close()
+    last = [-1] * threads
+    total = 0
+    with open(path) as f:
+        for line in f:
+            n, i = map(int, line.split())
+            if i != last[n] + 1:
+                return False
+            last[n] = i
+            total += 1
+    return total == threads * lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, default=200000)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    workdir = Path(tempfile.mkdtemp(prefix="scn_bench_log_sink_"))
+    ok = True
+    try:
+        old_lines = max(1, args.lines // 10)
+        elapsed = run_old(workdir / "old.log", old_lines)
+        old_rate = old_lines / elapsed
+        print(f"single thread ({args.lines} lines; old path timed on {old_lines})")
+        print(f"  open/append/close per line   {old_rate:12,.0f} lines/s")
+        for durability in DURABILITY:
+            path = workdir / f"sink_{durability}.log"
+            queued, total, batches = run_sink(path, args.lines, durability)
+            ok &= count_lines(path) == args.lines
+            print(f"  LogSink durability={durability:<5}  {args.lines / total:12,.0f} lines/s on disk "
+                  f"({args.lines / queued:,.0f}/s enqueue, {batches} batches, "
+                  f"{args.lines / total / old_rate:.1f}x)")
+
+        ordered = run_threads(workdir / "threads.log", args.threads, args.lines // args.threads)
+        print(f"threads: {args.threads} x {args.lines // args.threads} lines, all present and in order: {ordered}")
+        ok &= ordered
+
+        exit_path = workdir / "exit.log"
+        exit_lines = 5000
+        subprocess.run([sys.executable, "-c", EXIT_CHILD, str(SRC), str(exit_path), str(exit_lines)],
+                       check=True, env=dict(os.environ, PYTHONDONTWRITEBYTECODE="1"))
+        written = count_lines(exit_path) if exit_path.exists() else 0
+        print(f"exit: child logged {exit_lines} lines without flushing; {written} on disk after exit")
+        ok &= written == exit_lines
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark: eager import vs. manifest-only (lazy) module discovery.
+
+Generates a directory of synthetic hub modules, each with a simulated import
+cost, and times ``ModuleLoader.discover_all()`` in both modes, then cold vs.
+warm starts against the on-disk discovery cache.
+
+    python benchmarks/bench_module_discovery.py --modules 500
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from shadowcore_nexus.core.module_loader import ModuleLoader  # noqa: E402
+
+MODULE_TEMPLATE = '''\
+MODULE_META = {{"name": "Synthetic {index}", "version": "0.1.0"}}
+
+# Simulated import-time cost (stands in for scapy, requests, ...)
+_TABLE = [i * i for i in range({work})]
+
+def main():
+    return len(_TABLE)
+'''
+
+
+def make_modules(root: Path, count: int, work: int):
+    for i in range(count):
+        (root / f"synthetic_{i:04d}.py").write_text(MODULE_TEMPLATE.format(index=i, work=work))
+
+
+def purge(prefix="synthetic_"):
+    for name in [n for n in sys.modules if n.startswith(prefix)]:
+        del sys.modules[name]
+
+
+def time_discovery(root: Path, lazy: bool, cache_dir: Path = None):
+    purge()
+    start = time.perf_counter()
+    loader = ModuleLoader(root, lazy=lazy, use_cache=cache_dir is not None, cache_dir=cache_dir)
+    loader.discover_all()
+    elapsed = time.perf_counter() - start
+    return elapsed, loader
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--modules", type=int, default=500)
+    parser.add_argument("--work", type=int, default=20000, help="Loop size simulating import cost")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    root = Path(tempfile.mkdtemp(prefix="scn_bench_modules_"))
+    cache_root = Path(tempfile.mkdtemp(prefix="scn_bench_cache_"))
+    try:
+        make_modules(root, args.modules, args.work)
+        results = {}
+        for label, lazy in (("eager", False), ("lazy", True)):
+            timings = [time_discovery(root, lazy)[0] for _ in range(args.repeat)]
+            results[label] = min(timings)
+
+        _, loader = time_discovery(root, lazy=True)
+        entry = loader.get_entry("synthetic_0000")
+        start = time.perf_counter()
+        entry.ensure_loaded()
+        first_run = time.perf_counter() - start
+
+        print(f"modules: {args.modules}  (best of {args.repeat})")
+        print(f"  eager discover_all : {results['eager'] * 1000:9.1f} ms")
+        print(f"  lazy discover_all  : {results['lazy'] * 1000:9.1f} ms")
+        print(f"  speedup            : {results['eager'] / results['lazy']:9.1f} x")
+        print(f"  first-run import   : {first_run * 1000:9.2f} ms (one module, lazy mode)")
+
+        cold, warm = [], []
+        for i in range(args.repeat):
+            cache_dir = cache_root / f"run{i}"
+            cold.append(time_discovery(root, lazy=True, cache_dir=cache_dir)[0])
+            elapsed, loader = time_discovery(root, lazy=True, cache_dir=cache_dir)
+            warm.append(elapsed)
+        stats = loader.last_discovery
+        print(f"  cold start (cache) : {min(cold) * 1000:9.1f} ms")
+        print(f"  warm start (cache) : {min(warm) * 1000:9.1f} ms "
+              f"({stats['hits']} hits / {stats['misses']} misses)")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+        shutil.rmtree(cache_root, ignore_errors=True)
+        purge()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Benchmark: module index build and incremental updates on deep directory trees.
+
+Generates a tree of category directories ``--depth`` levels deep holding
+single-file modules and package modules (each with several submodules and a
+non-Python payload), ``--files`` Python files in total. Reported:
+
+* full index build (one ``os.scandir`` walk), a rebuild diffed against the
+  previous index, and a bare ``os.walk`` + ``stat`` pass for reference --
+  re-globbing the tree on every reload costs at least that much,
+* ``update()`` for a single changed file and for a file inside a package,
+* ``refresh()`` with nothing changed and after a handful of edits/additions,
+* that the incrementally maintained index equals a fresh build.
+
+    python benchmarks/bench_module_index.py --files 5000 --depth 6
+"""
+
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from shadowcore_nexus.core.module_index import ModuleIndex  # noqa: E402
+
+MODULE = 'MODULE_META = {{"name": "{name}"}}\ndef main():\n    return {n}\n'
+
+
+def make_tree(root: Path, files: int, depth: int, fanout: int, package_share: float,
+              package_size: int):
+    """Spread ``files`` .py files over a tree; returns (module files, package files)."""
+    rng = random.Random(7)
+    dirs = [root]
+    frontier = [root]
+    for level in range(depth):
+        nxt = []
+        for parent in frontier:
+            for i in range(fanout):
+                d = parent / f"cat{level}_{i}"
+                d.mkdir()
+                nxt.append(d)
+        dirs.extend(nxt)
+        frontier = nxt
+    singles, package_files = [], []
+    made = n = 0
+    while made < files:
+        parent = rng.choice(dirs)
+        if rng.random() < package_share:
+            pkg = parent / f"pkg_{n:05d}"
+            pkg.mkdir()
+            (pkg / "__init__.py").write_text(f'__package_name__ = "Pkg {n}"\ndef main():\n    pass\n')
+            (pkg / "README.md").write_text("payload\n")
+            for j in range(package_size - 1):
+                f = pkg / f"part_{j}.py"
+                f.write_text(f"VALUE = {j}\n")
+                package_files.append(f)
+            made += package_size
+        else:
+            f = parent / f"mod_{n:05d}.py"
+            f.write_text(MODULE.format(name=f"Mod {n}", n=n))
+            singles.append(f)
+            made += 1
+        n += 1
+    return singles, package_files
+
+
+def walk_rebuild(root: str):
+    """Baseline: relist and stat the whole tree (what a full re-glob costs)."""
+    found = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith((".", "_"))]
+        for name in filenames:
+            if name.endswith(".py"):
+                path = os.path.join(dirpath, name)
+                found[path] = os.stat(path).st_mtime_ns
+    return found
+
+
+def timed(func, repeat):
+    samples = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def touch(path: Path):
+    path.write_text(path.read_text() + "# edited\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=5000, help="Python files in the tree")
+    parser.add_argument("--depth", type=int, default=6)
+    parser.add_argument("--fanout", type=int, default=2)
+    parser.add_argument("--package-share", type=float, default=0.1,
+                        help="Fraction of modules that are packages")
+    parser.add_argument("--package-size", type=int, default=8, help="Python files per package")
+    parser.add_argument("--edits", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    root = Path(tempfile.mkdtemp(prefix="scn_bench_index_"))
+    try:
+        singles, package_files = make_tree(root, args.files, args.depth, args.fanout,
+                                           args.package_share, args.package_size)
+        build_ms, _ = timed(lambda: ModuleIndex(root).build(), args.repeat)
+        index = ModuleIndex(root)
+        index.build()
+        rebuild_ms, _ = timed(index.build, args.repeat)
+        walk_ms, _ = timed(lambda: walk_rebuild(str(root)), args.repeat)
+        packages = sum(1 for r in index.records.values() if r.kind == "package")
+        print(f"tree: {args.files} .py files, {len(index.categories)} category dirs, "
+              f"{len(index)} modules ({packages} packages)")
+        print(f"  index build (scandir)           {build_ms:9.2f} ms")
+        print(f"  rebuild + full diff             {rebuild_ms:9.2f} ms")
+        print(f"  os.walk + stat rebuild          {walk_ms:9.2f} ms")
+
+        single = singles[len(singles) // 2]
+        touch(single)
+        ms, delta = timed(lambda: index.update([str(single)]), 1)
+        print(f"  update(): one file changed      {ms:9.3f} ms  {delta}")
+        if package_files:
+            part = package_files[len(package_files) // 2]
+            touch(part)
+            ms, delta = timed(lambda: index.update([str(part)]), 1)
+            print(f"  update(): file in a package     {ms:9.3f} ms  {delta}")
+
+        ms, delta = timed(index.refresh, args.repeat)
+        print(f"  refresh(): nothing changed      {ms:9.2f} ms  {delta}")
+
+        rng = random.Random(11)
+        for f in rng.sample(singles, min(args.edits, len(singles))):
+            touch(f)
+        new_dir = root / "cat0_0" / "added_cat"
+        new_dir.mkdir()
+        (new_dir / "fresh.py").write_text(MODULE.format(name="Fresh", n=0))
+        ms, delta = timed(index.refresh, 1)
+        print(f"  refresh(): {args.edits} edits + new dir  {ms:9.2f} ms  "
+              f"added {len(delta.added)} changed {len(delta.changed)} removed {len(delta.removed)}")
+
+        fresh = ModuleIndex(root)
+        fresh.build()
+        same = ({k: r.signature for k, r in fresh.records.items()}
+                == {k: r.signature for k, r in index.records.items()})
+        print(f"  incremental index == fresh build: {same}")
+        if not same:
+            sys.exit(1)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
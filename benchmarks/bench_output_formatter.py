@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+OutputFormatter: per-run streaming NDJSON/CSV vs. one JSON + one CSV file per entity.
+
+Saves ``--records`` intel records (the shape ``IntelHarvester`` yields) with
+``save_json`` + ``save_csv`` in both modes and reports wall time (including
+``close()``) and the number of files (inodes) created. The streaming run must
+produce one NDJSON line per record, flattened CSV tables that read back as
+the same records, and a manifest that agrees. Console output goes to /dev/null.
+"""
+
+import argparse
+import contextlib
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from shadowcore_nexus.core.intel_csv import read_records  # noqa: E402
+from shadowcore_nexus.core.output_formatter import OutputFormatter  # noqa: E402
+
+
+def intel(i: int) -> dict:
+    name = f"entity-{i:06d}"
+    return {
+        'entity': name,
+        'emails': [f"ops@{name}.example", f"sec@{name}.example"],
+        'supply_chain': [{'vendor': f"vendor-{i % 97}", 'tier': 1 + i % 3}],
+        'financial_trail': {'revenue': 1000 + i, 'currency': 'USD'},
+        'legal_cases': [],
+    }
+
+
+def run(workdir: Path, records: int, split: bool):
+    out = workdir / ("split" if split else "stream")
+    out.mkdir()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        t0 = time.perf_counter()
+        with OutputFormatter(output_dir=f"{out}/", split_per_entity=split) as formatter:
+            for i in range(records):
+                data = intel(i)
+                formatter.save_json(data, data['entity'])
+                formatter.save_csv(data, data['entity'])
+        elapsed = time.perf_counter() - t0
+    files = list(out.iterdir())
+    size = sum(f.stat().st_size for f in files)
+    return elapsed, files, size, formatter
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=100_000)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory(prefix="scn-intel-") as tmp:
+        workdir = Path(tmp)
+        results = {}
+        for label, split in (("per-run stream", False), ("split per entity", True)):
+            elapsed, files, size, formatter = run(workdir, args.records, split)
+            results[label] = (elapsed, files, formatter)
+            print(f"{label:<18}{elapsed:8.2f} s  {args.records / elapsed:>9,.0f} rec/s  "
+                  f"{len(files):>7,} files  {size / (1 << 20):7.1f} MB")
+
+        elapsed, files, formatter = results["per-run stream"]
+        with open(formatter.paths["ndjson"], encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f]
+        manifest = json.loads(Path(formatter._path("manifest.json")).read_text())
+        ok = (len(lines) == args.records and lines[-1] == intel(args.records - 1)
+              and sum(1 for i, record in enumerate(read_records(formatter.paths["csv"]))
+                      if record == intel(i)) == args.records
+              and manifest["files"]["ndjson"]["records"] == args.records
+              and manifest["files"]["csv"]["records"] == args.records
+              and manifest["csv_tables"]["emails"]["rows"] == 2 * args.records
+              and len(files) == 4 + len(manifest["csv_tables"])
+              and manifest["entities"] == args.records)
+        split_files = len(results["split per entity"][1])
+        print(f"\nstreaming: {len(files)} files instead of {split_files:,}, "
+              f"{results['split per entity'][0] / elapsed:.1f}x faster; "
+              f"contents and manifest agree: {ok}")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark: serial vs. thread-pool module import in ``ModuleLoader``.
+
+Synthetic modules block for a few milliseconds at import time (standing in for
+file I/O, extension init or subprocess probes), a subset imports a shared
+helper module from the hub, and a couple of modules fail on import (one
+raises, one calls ``sys.exit``) to show that failures stay isolated.
+
+    python benchmarks/bench_parallel_import.py --modules 200 --workers 1 4 8
+"""
+
+import argparse
+import logging
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from shadowcore_nexus.core.module_loader import ModuleLoader  # noqa: E402
+
+MODULE_TEMPLATE = '''\
+import time
+{extra_import}
+MODULE_META = {{"name": "Parallel {index}"}}
+time.sleep({block})
+_TABLE = [i for i in range({work})]
+
+def main():
+    return len(_TABLE)
+'''
+
+HELPER = '''\
+import time
+time.sleep(0.01)
+VALUE = 42
+'''
+
+
+def make_modules(root: Path, count: int, block: float, work: int):
+    (root / "zz_shared_helper.py").write_text(HELPER)
+    for i in range(count):
+        extra = "from zz_shared_helper import VALUE" if i % 10 == 0 else ""
+        (root / f"par_{i:04d}.py").write_text(
+            MODULE_TEMPLATE.format(index=i, extra_import=extra, block=block, work=work))
+    (root / "par_broken_raise.py").write_text("raise RuntimeError('boom')\n")
+    (root / "par_broken_exit.py").write_text("import sys\nsys.exit(1)\n")
+
+
+def purge():
+    for name in [n for n in sys.modules if n.startswith(("par_", "zz_shared_helper"))]:
+        del sys.modules[name]
+
+
+def run(root: Path, workers: int):
+    purge()
+    loader = ModuleLoader(root, lazy=False, use_cache=False, workers=workers)
+    start = time.perf_counter()
+    loader.discover_all()
+    elapsed = time.perf_counter() - start
+    loaded = sum(1 for _, _, e in loader.get_list() if e.loaded)
+    order = [k for k, _, _ in loader.get_list()]
+    return elapsed, loaded, order
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--modules", type=int, default=200)
+    parser.add_argument("--block", type=float, default=0.003, help="Seconds each import blocks")
+    parser.add_argument("--work", type=int, default=2000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    root = Path(tempfile.mkdtemp(prefix="scn_bench_parallel_"))
+    sys.path.insert(0, str(root))  # lets modules import their hub sibling
+    try:
+        make_modules(root, args.modules, args.block, args.work)
+        total = args.modules + 3
+        baseline = None
+        reference_order = None
+        print(f"modules: {total} (2 failing), block {args.block * 1000:.1f} ms each")
+        for workers in args.workers:
+            elapsed, loaded, order = run(root, workers)
+            baseline = baseline or elapsed
+            reference_order = reference_order or order
+            print(f"  workers={workers:<3d} {elapsed * 1000:9.1f} ms  loaded {loaded}/{total}"
+                  f"  speedup {baseline / elapsed:5.2f}x  order stable: {order == reference_order}")
+    finally:
+        sys.path.remove(str(root))
+        shutil.rmtree(root, ignore_errors=True)
+        purge()
+
+
+if __name__ == "__main__":
+    main()
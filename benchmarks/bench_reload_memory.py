@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Memory check: traced allocations across repeated module reloads.
+
+Reloads a module that allocates a payload, registers a callback in a shared
+registry and creates a submodule, 1,000 times through ``ModuleLoader``, and
+compares ``tracemalloc`` usage after warm-up with usage at the end. A module
+that provides ``teardown()`` must stay flat; the same module without the hook
+is shown for comparison (its registered callbacks pin every old copy).
+
+Exits non-zero if the teardown case grows by more than ``--budget-kib``.
+
+    python benchmarks/bench_reload_memory.py --cycles 1000
+"""
+
+import argparse
+import gc
+import logging
+import shutil
+import sys
+import tempfile
+import tracemalloc
+import types
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from shadowcore_nexus.core.module_loader import ModuleLoader  # noqa: E402
+
+MODULE_SOURCE = '''\
+import sys
+import types
+
+import scn_bench_registry
+
+MODULE_META = {{"name": "Reload me"}}
+_PAYLOAD = [bytes(1024) for _ in range(64)]
+
+_sub = types.ModuleType(__name__ + ".state")
+_sub.table = [bytes(512) for _ in range(32)]
+sys.modules[_sub.__name__] = _sub
+
+def _on_event(data):
+    return len(_PAYLOAD)
+
+scn_bench_registry.CALLBACKS.append(_on_event)
+
+def main():
+    return len(scn_bench_registry.CALLBACKS)
+{teardown}
+'''
+
+TEARDOWN = '''
+def teardown():
+    scn_bench_registry.CALLBACKS.remove(_on_event)
+'''
+
+
+def measure(root: Path, teardown: bool, cycles: int, warmup: int):
+    registry = types.ModuleType("scn_bench_registry")
+    registry.CALLBACKS = []
+    sys.modules["scn_bench_registry"] = registry
+    (root / "reload_me.py").write_text(MODULE_SOURCE.format(teardown=TEARDOWN if teardown else ""))
+
+    loader = ModuleLoader(root, lazy=False, use_cache=False)
+    loader.discover_all()
+    entry = loader.get_entry("reload_me")
+
+    tracemalloc.start()
+    baseline = None
+    try:
+        for cycle in range(1, cycles + 1):
+            loader.load_entries([entry])
+            if cycle == warmup:
+                gc.collect()
+                baseline = tracemalloc.get_traced_memory()[0]
+        gc.collect()
+        final = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+        loader.unload_all()
+        del sys.modules["scn_bench_registry"]
+    return baseline, final, len(registry.CALLBACKS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--budget-kib", type=float, default=256.0)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    root = Path(tempfile.mkdtemp(prefix="scn_bench_reload_mem_"))
+    try:
+        results = {}
+        for label, teardown in (("with teardown()", True), ("without teardown()", False)):
+            baseline, final, callbacks = measure(root, teardown, args.cycles, args.warmup)
+            growth = (final - baseline) / 1024
+            results[label] = growth
+            print(f"  {label:20s} after {args.warmup:4d}: {baseline / 1024:9.1f} KiB  "
+                  f"after {args.cycles}: {final / 1024:9.1f} KiB  growth {growth:9.1f} KiB  "
+                  f"live callbacks {callbacks}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    growth = results["with teardown()"]
+    if growth > args.budget_kib:
+        print(f"FAIL: memory grew {growth:.1f} KiB across {args.cycles} reloads "
+              f"(budget {args.budget_kib:.0f} KiB)")
+        sys.exit(1)
+    print(f"OK: growth {growth:.1f} KiB within {args.budget_kib:.0f} KiB budget")
+
+
+if __name__ == "__main__":
+    main()
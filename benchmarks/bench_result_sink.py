@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Scan result logging: queue-backed JSONL sink vs. the old ``modules/logger.Logger``.
+
+Logs ``--records`` host/port results, first from one thread and then from
+``--threads`` threads spread over two loggers with separate files. It
+reports records per second, measured until every record is on disk, for:
+
+* ``legacy``        -- basicConfig + FileHandler + ``print`` per record,
+* ``sink, echo``    -- the new Logger with rate-limited console echo,
+* ``sink, no echo`` -- the new Logger with ``echo=False``.
+
+The sink rotates (and gzips) its files as it would inside the hub; rotated
+segments are counted too. Stdout goes to /dev/null while timing. Checks
+that every record lands once, in its own file, as valid JSON, and that the
+sink leaves the root logger untouched.
+"""
+
+import argparse
+import contextlib
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent / "src" / "shadowcore_nexus"
+sys.path.insert(0, str(ROOT.parent))
+
+from shadowcore_nexus.utils.log_rotation import (open_segment, rotated_segments,  # noqa: E402
+                                                 wait_for_compression)
+from shadowcore_nexus.utils.result_sink import Logger  # noqa: E402
+
+
+class LegacyLogger:
+    """modules/logger.Logger before the queue-backed sink."""
+
+    def __init__(self, log_file='netmap.log', json_mode=False):
+        self.json_mode = json_mode
+        handler = logging.FileHandler(log_file, delay=True)
+        logging.basicConfig(handlers=[handler], level=logging.INFO, format='%(message)s')
+        self.log_file = log_file
+
+    def log(self, data: dict):
+        timestamp = datetime.now().isoformat()
+        data['timestamp'] = timestamp
+        if self.json_mode:
+            log_entry = json.dumps(data)
+        else:
+            log_entry = f"[{timestamp}] " + ' | '.join(f"{k}: {v}" for k, v in data.items() if k != 'timestamp')
+        logging.info(log_entry)
+        print(log_entry)
+
+    def flush(self):
+        for handler in logging.getLogger().handlers:
+            handler.flush()
+
+
+def result(i: int) -> dict:
+    return {'IP': f"10.0.{(i >> 8) & 255}.{i & 255}", 'Port': 22 + i % 1000,
+            'Method': 'TCP SYN', 'Status': 'Open'}
+
+
+def run(make_logger, workdir: Path, records: int, threads: int, tag: str):
+    paths = [workdir / f"{tag}-a.log", workdir / f"{tag}-b.log"]
+    loggers = [make_logger(str(p)) for p in paths]
+    per_thread = records // threads
+
+    def work(t):
+        logger = loggers[t % 2]
+        base = t * per_thread
+        for i in range(base, base + per_thread):
+            logger.log(result(i))
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        t0 = time.perf_counter()
+        workers = [threading.Thread(target=work, args=(t,)) for t in range(threads)]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        for logger in loggers:
+            logger.flush()
+        elapsed = time.perf_counter() - t0
+        for logger in loggers:
+            if hasattr(logger, "close"):
+                logger.close()
+    wait_for_compression(30)
+    counts = [len(read_lines(p)) for p in paths]
+    return per_thread * threads / elapsed, counts, paths
+
+
+def read_lines(path: Path):
+    lines = []
+    for segment in rotated_segments(path) + ([path] if path.exists() else []):
+        with open_segment(segment) as f:
+            lines.extend(f)
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    root_handlers = list(logging.getLogger().handlers)
+    failed = False
+    with tempfile.TemporaryDirectory(prefix="scn-results-") as tmp:
+        workdir = Path(tmp)
+        print(f"{'':<16}{'1 thread':>16}{f'{args.threads} threads':>16}   lines per file (a / b)")
+        for label, make in (
+            ("sink, no echo", lambda p: Logger(p, echo=False)),
+            ("sink, echo", lambda p: Logger(p)),
+            ("legacy", LegacyLogger),
+        ):
+            tag = label.replace(", ", "-").replace(" ", "")
+            single, counts1, paths1 = run(make, workdir, args.records, 1, tag + "-1")
+            multi, counts, paths = run(make, workdir, args.records, args.threads, tag + "-n")
+            print(f"{label:<16}{single:>10,.0f} rec/s{multi:>10,.0f} rec/s   "
+                  f"{counts1[0]:,} / {counts1[1]:,}, {counts[0]:,} / {counts[1]:,}")
+            if label.startswith("sink"):
+                half = args.records // args.threads * (args.threads // 2)
+                ok = counts == [half, half] and counts1 == [args.records, 0]
+                records = [json.loads(line) for line in read_lines(paths[0])]
+                ok &= len({(r['IP'], r['Port']) for r in records}) == half and "timestamp" in records[0]
+                ok &= logging.getLogger().handlers == root_handlers
+                failed |= not ok
+    print("\nlegacy: basicConfig only takes effect once, so its second logger's file stays empty")
+    print(f"sink: all records once, per file, valid JSONL, root logger untouched: {not failed}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
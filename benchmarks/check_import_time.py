@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Import-time budget check for the non-UI CLI paths.
+
+Runs each entry point in a fresh interpreter under ``python -X importtime``,
+sums the self time of every import it triggered beyond what a bare
+``python -c pass`` already imports, and fails when a path goes
+over its budget, pulls in a module it must not (urwid, the TUI, the module
+runner), or changes ``sys.path`` on import. Budgets are generous on purpose;
+they are there to catch regressions like an eager urwid import or import-time
+config reads, not to measure small differences.
+
+    python benchmarks/check_import_time.py
+    python benchmarks/check_import_time.py --budget-scale 2 --repeat 5
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+FORBIDDEN = ("urwid", "shadowcore_nexus.interfaces.tui", "shadowcore_nexus.core.module_runner")
+
+# (label, interpreter args, budget in ms). pathlib alone is ~20 ms of this;
+# eagerly importing urwid and the TUI roughly doubles the CLI paths.
+CASES = [
+    ("import shadowcore_nexus", ["-c", "import shadowcore_nexus"], 5.0),
+    ("import core.paths", ["-c", "import shadowcore_nexus.core.paths"], 40.0),
+    ("import core.config", ["-c", "import shadowcore_nexus.core.config"], 50.0),
+    ("import core.handler", ["-c", "import shadowcore_nexus.core.handler"], 50.0),
+    ("import core.daemon_ops", ["-c", "import shadowcore_nexus.core.daemon_ops"], 50.0),
+    ("shadowcore_nexus --help", ["-m", "shadowcore_nexus", "--help"], 60.0),
+    ("shadowcore_nexus logs --help", ["-m", "shadowcore_nexus", "logs", "--help"], 60.0),
+    ("daemon_ops --list", ["-m", "shadowcore_nexus.core.daemon_ops", "--list"], 60.0),
+]
+
+# Imported as-is, sys.path must be left alone and the config must stay unread
+SIDE_EFFECT_PROBE = """
+import sys
+before = list(sys.path)
+import shadowcore_nexus.core.handler
+import shadowcore_nexus.core.daemon_ops
+from shadowcore_nexus.core import config, config_service
+assert sys.path == before, "sys.path changed on import"
+assert config_service._service is None, "config read on import"
+"""
+
+
+def parse_importtime(stderr: str):
+    """Return ({module: self_us}, total_self_us) from ``-X importtime`` output."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, _cumulative, name = line[len("import time:"):].split("|", 2)
+            modules[name.strip()] = int(self_us)
+        except ValueError:
+            continue
+    return modules, sum(modules.values())
+
+
+def run_case(argv, env, baseline=()):
+    proc = subprocess.run([sys.executable, "-X", "importtime"] + argv, env=env,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    modules, _ = parse_importtime(proc.stderr)
+    modules = {name: us for name, us in modules.items() if name not in baseline}
+    return proc.returncode, modules, sum(modules.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case; the fastest counts")
+    parser.add_argument("--budget-scale", type=float, default=1.0,
+                        help="multiply every budget (slow CI machines)")
+    parser.add_argument("--top", type=int, default=5, help="slowest imports to show on failure")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC), env.get("PYTHONPATH")]))
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+
+    _, baseline, _ = run_case(["-c", "pass"], env)
+    failures = []
+    for label, argv, budget in CASES:
+        budget *= args.budget_scale
+        best = None
+        for _ in range(max(1, args.repeat)):
+            code, modules, total = run_case(argv, env, baseline)
+            if best is None or total < best[2]:
+                best = (code, modules, total)
+        code, modules, total = best
+        ms = total / 1000
+        forbidden = [name for name in FORBIDDEN if name in modules]
+        status = "ok"
+        if code != 0:
+            status = f"exit {code}"
+        elif forbidden:
+            status = "imports " + ", ".join(forbidden)
+        elif ms > budget:
+            status = "over budget"
+        print(f"  {label:28s} {ms:8.1f} ms  (budget {budget:5.0f} ms, {len(modules):3d} modules)  {status}")
+        if status != "ok":
+            failures.append(label)
+            slowest = sorted(modules.items(), key=lambda kv: kv[1], reverse=True)[:args.top]
+            for name, us in slowest:
+                print(f"      {us / 1000:8.1f} ms  {name}")
+
+    probe = subprocess.run([sys.executable, "-c", SIDE_EFFECT_PROBE], env=env,
+                           stderr=subprocess.PIPE, text=True)
+    if probe.returncode != 0:
+        failures.append("side effects")
+        print(f"  {'import side effects':28s} FAIL: {probe.stderr.strip().splitlines()[-1]}")
+    else:
+        print(f"  {'import side effects':28s} ok")
+
+    if failures:
+        print(f"FAIL: {', '.join(failures)}")
+        sys.exit(1)
+    print("OK: all CLI import paths within budget")
+
+
+if __name__ == "__main__":
+    main()
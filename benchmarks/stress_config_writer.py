@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Stress test: concurrent config writers and crashes mid-write.
+
+* concurrency -- ``--threads`` threads each call ``ConfigService.set()``
+  ``--updates`` times on the user layer; reported are the caller-side cost per
+  call against the old synchronous ``json.dump(indent=4)`` rewrite, how many
+  disk writes the debounce coalesced them into, and whether the file on disk
+  ends up equal to the in-memory layer,
+* crash -- a child process rewrites a config in a loop and is SIGKILLed at a
+  random moment, ``--crashes`` times, once with ``atomic_write_json`` and once
+  with the old ``open(path, "w")`` rewrite; after every kill the file must
+  still parse and hold one complete generation.
+
+    python benchmarks/stress_config_writer.py --threads 8 --updates 2000 --crashes 50
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import random
+import shutil
+import signal
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from shadowcore_nexus.core.config_service import ConfigService  # noqa: E402
+from shadowcore_nexus.core.config_writer import atomic_write_json, remove_stale_temps  # noqa: E402
+
+PAYLOAD_KEYS = 2000
+
+
+def old_save(path: Path, data):
+    with open(path, "w") as f:
+        json.dump(data, f, indent=4)
+
+
+def rewrite_forever(path: str, atomic: bool):
+    logging.disable(logging.CRITICAL)
+    generation = 0
+    while True:
+        generation += 1
+        data = {f"key_{i}": generation for i in range(PAYLOAD_KEYS)}
+        if atomic:
+            atomic_write_json(path, data)
+        else:
+            old_save(Path(path), data)
+
+
+def check_file(path: Path) -> bool:
+    """True if ``path`` holds one complete generation."""
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return False
+    return len(data) == PAYLOAD_KEYS and len(set(data.values())) == 1
+
+
+def crash_run(ctx, workdir: Path, atomic: bool, crashes: int, rng: random.Random):
+    path = workdir / ("atomic.json" if atomic else "plain.json")
+    old_save(path, {f"key_{i}": 0 for i in range(PAYLOAD_KEYS)})
+    corrupt = 0
+    for _ in range(crashes):
+        proc = ctx.Process(target=rewrite_forever, args=(str(path), atomic), daemon=True)
+        proc.start()
+        time.sleep(rng.uniform(0.005, 0.05))
+        os.kill(proc.pid, signal.SIGKILL)
+        proc.join(5)
+        if not check_file(path):
+            corrupt += 1
+            old_save(path, {f"key_{i}": 0 for i in range(PAYLOAD_KEYS)})
+    return corrupt, remove_stale_temps(path, max_age=0)
+
+
+def concurrency_run(workdir: Path, threads: int, updates: int):
+    user = workdir / "user_config.json"
+    service = ConfigService(defaults={}, packaged_path=workdir / "packaged.json", user_path=user,
+                            environ={}, write_debounce=0.05)
+    barrier = threading.Barrier(threads)
+
+    def worker(n: int):
+        barrier.wait()
+        for i in range(updates):
+            service.set(f"worker_{n}", i)
+            service.set("last_writer", n)
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - start
+    service.stop()
+    writer = service._writers["user"]
+    on_disk = json.loads(user.read_text())
+    consistent = (on_disk == service.layer("user")
+                  and all(on_disk[f"worker_{n}"] == updates - 1 for n in range(threads)))
+
+    sync_path = workdir / "sync.json"
+    data = {}
+    calls = min(threads * updates * 2, 2000)
+    sync_start = time.perf_counter()
+    for i in range(calls):
+        data[f"worker_{i % threads}"] = i
+        old_save(sync_path, data)
+    sync_per_call = (time.perf_counter() - sync_start) / calls
+    return writer.submitted, writer.written, elapsed / writer.submitted, sync_per_call, consistent
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--updates", type=int, default=2000)
+    parser.add_argument("--crashes", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    ctx = multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods()
+                                      else "spawn")
+    rng = random.Random(args.seed)
+    workdir = Path(tempfile.mkdtemp(prefix="scn_stress_config_"))
+    try:
+        submitted, written, per_call, sync_per_call, consistent = concurrency_run(
+            workdir, args.threads, args.updates)
+        print(f"concurrency: {args.threads} threads x {args.updates} x 2 set() calls")
+        print(f"  set() {per_call * 1e6:8.1f} us/call vs old synchronous save {sync_per_call * 1e6:8.1f} us/call")
+        print(f"  {submitted} updates -> {written} atomic writes; file matches memory: {consistent}")
+
+        atomic_bad, atomic_left = crash_run(ctx, workdir, True, args.crashes, rng)
+        plain_bad, _ = crash_run(ctx, workdir, False, args.crashes, rng)
+        print(f"crash: child SIGKILLed mid-rewrite {args.crashes} times ({PAYLOAD_KEYS}-key config)")
+        print(f"  atomic_write_json  corrupt {atomic_bad}/{args.crashes}  ({atomic_left} stray temp files cleaned up)")
+        print(f"  open(path, 'w')    corrupt {plain_bad}/{args.crashes}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    if not consistent or atomic_bad or written >= submitted:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
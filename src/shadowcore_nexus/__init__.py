@@ -1,111 +1,30 @@
-#!/usr/bin/env python3
-# shadowveil/__init__.py
+"""
+ShadowCore Nexus (SCN--13X-666) — modular Python dashboard hub.
 
-import os
-import sys
-import logging
-import importlib.util
-from pathlib import Path
+Importing the package is side-effect free and cheap: no directories are
+created, no config is read and urwid is not imported. Public names below are
+resolved on first attribute access (PEP 562).
+"""
 
-# Package metadata for hub discovery
-__package_name__ = "ShadowVeil"
-__version__ = "2.0.0"
-__module_type__ = "security/anti-forensics"
-__compatibility__ = ["TUI", "GUI", "CLI"]
-__author__ = "BlackOps Division"
-__description__ = "Advanced anti-forensics and operational security module"
-__exported_methods__ = [
-    "execute_stealth",
-    "tunnel_file",
-    "camouflage_traffic",
-    "port_stealth",
-    "covert_channel",
-    "clean_system"
-]
+__version__ = "0.1.0"
 
-# Hub integration protocol
-HUB_REGISTRY = {}
+_LAZY_EXPORTS = {
+    "ModuleLoader": ".core.module_loader",
+    "ShadowCoreTUI": ".interfaces.tui",
+}
 
-def register_with_hub(hub_instance):
-    """Auto-register with dashboard hub system"""
-    HUB_REGISTRY[hub_instance.hub_id] = {
-        'instance': hub_instance,
-        'status': 'active'
-    }
-    hub_instance.register_module(
-        module_name=__package_name__,
-        module_version=__version__,
-        module_type=__module_type__,
-        activation_callback=activate_in_hub
-    )
+__all__ = ["__version__"] + list(_LAZY_EXPORTS)
 
-def activate_in_hub(hub_instance, config=None):
-    """Activation hook for hub integration"""
-    from .core import ShadowVeilCore
-    
-    # Get hub-specific configuration
-    hub_config = config or hub_instance.get_module_config(__package_name__)
-    
-    # Initialize with hub parameters
-    stealth_mode = hub_config.get('stealth_mode', 'aggressive')
-    deep_cover = hub_config.get('deep_cover', True)
-    
-    sv = ShadowVeilCore(
-        cloak_mode=stealth_mode,
-        deep_cover=deep_cover
-    )
-    
-    if sv.setup():
-        hub_instance.log(f"{__package_name__} activated in {stealth_mode} mode")
-        return sv
-    hub_instance.error(f"{__package_name__} initialization failed")
-    return None
 
-def get_integration_points():
-    """Return integration points for dashboard system"""
-    return {
-        "menu_items": [
-            {
-                "path": "Security/ShadowVeil",
-                "name": "Stealth Operations",
-                "action": "launch_stealth_console"
-            }
-        ],
-        "context_actions": {
-            "Process/Execute": ["Execute with ShadowVeil"],
-            "Network/Port": ["Hide with ShadowVeil"]
-        },
-        "api_endpoints": [
-            ("POST", "/shadowveil/execute", "execute_stealth_command"),
-            ("GET", "/shadowveil/status", "get_stealth_status")
-        ]
-    }
+def __getattr__(name):
+    target = _LAZY_EXPORTS.get(name)
+    if target is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(target, __name__), name)
+    globals()[name] = value
+    return value
 
-def detect_hub_environment():
-    """Auto-detect if running within dashboard hub"""
-    return 'CYBER_DASHBOARD_HUB' in os.environ
 
-# Core functionality (lazy-loaded)
-class ShadowVeilCore:
-    # ... (Full implementation from previous LIMIT BREAKER edition) ...
-    # This remains identical to the last implementation
-
-# Auto-configure when imported in hub mode
-if detect_hub_environment():
-    try:
-        from .hub_adapter import ShadowVeilHubAdapter
-        # Auto-register with hub if in hub environment
-        hub_id = os.environ['CYBER_DASHBOARD_HUB']
-        register_with_hub(ShadowVeilHubAdapter(hub_id))
-    except ImportError:
-        pass
-
-# Standalone CLI entry point
-def main():
-    """Command-line interface for standalone operation"""
-    from .cli import launch_cli
-    launch_cli()
-
-# Package initialization hook
-if __name__ == "__main__":
-    main()
\ No newline at end of file
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_EXPORTS))
@@ -4,31 +4,87 @@ Entry point for ShadowCore Nexus (SCN--13X-666)
 Unified TUI-first launcher.
 """
 
+import time
+
+_T0 = time.perf_counter()
+
 import argparse
 import sys
 from pathlib import Path
 
-try:
-    from .core.module_loader import ModuleLoader
-except ImportError:
-    from .module_loader import ModuleLoader
+# The TUI (and urwid) is imported only after argument parsing, so `--help`
+# and bad arguments never pay for it.
 
-try:
-    from .interfaces.tui import ShadowCoreTUI
-except ImportError:
-    print("[ERROR] TUI interface not found.")
-    sys.exit(1)
+_T_IMPORTED = time.perf_counter()
 
 def main():
-    parser = argparse.ArgumentParser(prog="shadowcore_nexus", description="ShadowCore Nexus Dashboard")
+    t_main = time.perf_counter()
+    if sys.argv[1:2] == ["logs"]:
+        from .utils.log_index import main as logs_main
+        return logs_main(sys.argv[2:])
+    parser = argparse.ArgumentParser(prog="shadowcore_nexus", description="ShadowCore Nexus Dashboard",
+                                     epilog="'shadowcore_nexus logs --help' queries daemon.log.")
     parser.add_argument("--modules-dir", "-m", help="Modules directory (default: ./modules)")
     parser.add_argument("--no-watch", action="store_true", help="Disable module hot reload")
     parser.add_argument("--debug", action="store_true", help="Enable debug output")
+    parser.add_argument("--eager", action="store_true", help="Import every module at startup instead of on first run")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore the on-disk module discovery cache")
+    parser.add_argument("--load-workers", type=int, default=1, metavar="N",
+                        help="Import modules on N worker threads (eager discovery and reloads)")
+    parser.add_argument("--run-workers", type=int, default=2, metavar="N",
+                        help="Worker processes running modules concurrently")
+    parser.add_argument("--run-timeout", type=float, default=None, metavar="SECONDS",
+                        help="Cancel module runs that exceed this time")
+    parser.add_argument("--inline-runs", action="store_true",
+                        help="Run modules inside the TUI process (blocks the UI)")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Profile startup phases and module imports; writes a report and "
+                             "Chrome trace to artifacts/outputs")
+    parser.add_argument("--log-fps", type=float, default=10.0, metavar="N",
+                        help="Redraw the log feed at most N times per second")
+    parser.add_argument("--log-scrollback", type=int, default=2000, metavar="LINES",
+                        help="Lines of log feed history kept in memory")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE",
+                        help="Override a config key for this run (VALUE parsed as JSON if it parses)")
     args = parser.parse_args()
 
+    overrides = {}
+    for item in args.set:
+        key, sep, value = item.partition("=")
+        if not sep or not key:
+            parser.error(f"--set expects KEY=VALUE, got {item!r}")
+        overrides[key] = value
+    if overrides or args.debug:
+        from .core.config_service import _parse_env_value, get_service
+        cli = {key: _parse_env_value(value) for key, value in overrides.items()}
+        if args.debug:
+            cli.setdefault("debug_mode", True)
+        get_service().set_cli(cli)
+
+    if args.profile_startup:
+        from .core.startup_profiler import start_profiling
+        profiler = start_profiling(origin=_T0)
+        profiler.add_span("package imports", _T0, _T_IMPORTED)
+        profiler.add_span("parse args", t_main, time.perf_counter())
+    else:
+        profiler = None
+
+    t_ui = time.perf_counter()
+    try:
+        from .interfaces.tui import ShadowCoreTUI
+    except ImportError as e:
+        print(f"[ERROR] TUI interface not available: {e}")
+        sys.exit(1)
+    if profiler is not None:
+        profiler.add_span("import TUI (urwid)", t_ui, time.perf_counter())
+
     modules_dir = Path(args.modules_dir or Path(__file__).resolve().parent / "modules")
 
-    tui = ShadowCoreTUI(modules_dir, watch=not args.no_watch, debug=args.debug)
+    tui = ShadowCoreTUI(modules_dir, watch=not args.no_watch, debug=args.debug, lazy=not args.eager,
+                        use_cache=not args.no_cache, load_workers=args.load_workers,
+                        run_workers=args.run_workers, run_timeout=args.run_timeout,
+                        inline_runs=args.inline_runs, log_fps=args.log_fps,
+                        log_scrollback=args.log_scrollback)
     tui.main()
 
 if __name__ == "__main__":
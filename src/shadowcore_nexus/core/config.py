@@ -1,20 +1,7 @@
-import sys
-from pathlib import Path
+# Packaged daemon config. The merged view of every config layer (defaults,
+# this file, the user config, env vars, CLI flags) lives in core.config_service.
 
-# === Absolute Path Override ===
-ROOT_DIR = Path(__file__).resolve().parent.parent
-sys.path = [str(ROOT_DIR)] + sys.path  # Force ShadowCore to be sys.path[0]
-
-import json
-
-import json
-from core.paths import CONFIGS_DIR
-
-
-# Ensure ShadowCore is in sys.path
-ROOT_DIR = Path(__file__).resolve().parent.parent
-if str(ROOT_DIR) not in sys.path:
-    sys.path.insert(0, str(ROOT_DIR))
+from .paths import CONFIGS_DIR
 
 
 CONFIG_FILE = CONFIGS_DIR / 'daemon_config.json'
@@ -28,20 +15,31 @@ DEFAULT_CONFIG = {
 }
 
 def load_config():
-    if CONFIG_FILE.exists():
-        with open(CONFIG_FILE, 'r') as f:
-            return json.load(f)
-    else:
+    """The packaged config layer, created from DEFAULT_CONFIG if missing."""
+    from .config_service import get_service
+    service = get_service()
+    service.refresh()
+    if not CONFIG_FILE.exists() and not service.layer("packaged"):
         save_config(DEFAULT_CONFIG)
-        return DEFAULT_CONFIG
+    return service.layer("packaged")
 
 def save_config(config_data):
-    with open(CONFIG_FILE, 'w') as f:
-        json.dump(config_data, f, indent=4)
-
-# Auto-load on import
-config = load_config()
+    """Debounced, atomic write (see core.config_writer); use get_service().flush() to force it."""
+    from .config_service import get_service
+    get_service().save_layer("packaged", config_data)
+
+def get_config():
+    """Merged config of all layers, as a dict (see core.config_service)."""
+    from .config_service import get_service
+    return get_service().as_dict()
+
+def __getattr__(name):
+    # `from core.config import config` keeps working, but the JSON is only read
+    # when someone actually asks for it (PEP 562), not at import time.
+    if name == "config":
+        return get_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Optional Debug Print
 if __name__ == "__main__":
-    print(f"Loaded Config: {config}")
+    print(f"Loaded Config: {get_config()}")
@@ -0,0 +1,288 @@
+"""
+Layered configuration service.
+
+One merged view built from, lowest priority first:
+
+* ``defaults``  -- ``config.DEFAULT_CONFIG``
+* ``packaged``  -- ``artifacts/configs/daemon_config.json``
+* ``user``      -- ``~/.shadowcore_nexus_config.json``
+* ``env``       -- ``SCN_CONFIG_<KEY>`` variables (values parsed as JSON when
+  they parse, e.g. ``SCN_CONFIG_NETWORK_TIMEOUT=10``, else kept as strings)
+* ``cli``       -- overrides set by the launcher (``--set KEY=VALUE``)
+
+The merged dict is rebuilt only when a layer changes, so ``get()`` is a dict
+lookup. ``refresh()`` re-stats the two files (and re-reads the environment)
+and reloads only what changed; ``watch()`` calls it from a ``HubWatcher``
+thread (inotify on Linux). Subscribers receive ``{key: (old, new)}`` for the
+keys whose merged value actually changed.
+
+Writes (``set``/``save_layer``) update the merged view at once and reach the
+disk through a per-file ``ConfigWriter`` (debounced, atomic); ``flush()``
+forces them out. While a write is pending, ``refresh()`` keeps the in-memory
+layer rather than re-reading the stale file.
+"""
+
+import copy
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from ..utils.logging import get_logger
+from .config import CONFIG_FILE, DEFAULT_CONFIG
+from .config_writer import ConfigWriter, atomic_write_json
+from .configuration import CONFIG_FILE as USER_CONFIG_FILE
+
+logger = get_logger(__name__)
+
+LAYERS = ("defaults", "packaged", "user", "env", "cli")
+FILE_LAYERS = ("packaged", "user")
+ENV_PREFIX = "SCN_CONFIG_"
+
+Changes = Dict[str, Tuple[Any, Any]]
+
+
+def _parse_env_value(raw: str):
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return raw
+
+
+def _file_signature(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _read_json(path: Path) -> Dict[str, Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.error(f"Ignoring unreadable config {path}: {e}")
+        return {}
+    if not isinstance(data, dict):
+        logger.error(f"Ignoring config {path}: top level is not an object")
+        return {}
+    return data
+
+
+class ConfigService:
+    """Memoized merge of the config layers, with change notification."""
+
+    def __init__(self, defaults: Optional[Mapping[str, Any]] = None, packaged_path=None,
+                 user_path=None, environ: Optional[Mapping[str, str]] = None,
+                 write_debounce: float = 0.2):
+        self.paths: Dict[str, Path] = {
+            "packaged": Path(packaged_path) if packaged_path else CONFIG_FILE,
+            "user": Path(user_path) if user_path else Path(USER_CONFIG_FILE),
+        }
+        self.environ = os.environ if environ is None else environ
+        self.layers: Dict[str, Dict[str, Any]] = {name: {} for name in LAYERS}
+        self.layers["defaults"] = copy.deepcopy(dict(DEFAULT_CONFIG if defaults is None else defaults))
+        self._signatures: Dict[str, Optional[Tuple[int, int]]] = {}
+        self._merged: Dict[str, Any] = {}
+        self._subscribers: List[Tuple[Callable[[Changes], None], Optional[frozenset]]] = []
+        self._lock = threading.RLock()
+        self._watchers: list = []
+        self._writers: Dict[str, ConfigWriter] = {
+            layer: ConfigWriter(self.paths[layer], debounce=write_debounce,
+                                on_written=lambda path, layer=layer: self._written(layer))
+            for layer in FILE_LAYERS}
+        for layer in FILE_LAYERS:
+            self._load_file(layer)
+        self.layers["env"] = self._read_env()
+        self._merged = self._merge()
+
+    # Reads -------------------------------------------------------------
+
+    def get(self, key: str, default=None):
+        return self._merged.get(key, default)
+
+    def __getitem__(self, key: str):
+        return self._merged[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._merged
+
+    def view(self) -> Mapping[str, Any]:
+        """Read-only view of the merged config (no copy)."""
+        return MappingProxyType(self._merged)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return copy.deepcopy(self._merged)
+
+    def layer(self, name: str) -> Dict[str, Any]:
+        return copy.deepcopy(self.layers[name])
+
+    def source(self, key: str) -> Optional[str]:
+        """Highest-priority layer that defines ``key``."""
+        for name in reversed(LAYERS):
+            if key in self.layers[name]:
+                return name
+        return None
+
+    # Layers ------------------------------------------------------------
+
+    def _merge(self) -> Dict[str, Any]:
+        merged: Dict[str, Any] = {}
+        for name in LAYERS:
+            merged.update(self.layers[name])
+        return merged
+
+    def _read_env(self) -> Dict[str, Any]:
+        return {name[len(ENV_PREFIX):].lower(): _parse_env_value(value)
+                for name, value in self.environ.items() if name.startswith(ENV_PREFIX)}
+
+    def _load_file(self, layer: str) -> bool:
+        """Re-read ``layer``'s file if its signature changed; True if it did."""
+        if self._writers[layer].busy:
+            return False  # memory is ahead of the file until the write lands
+        path = self.paths[layer]
+        signature = _file_signature(path)
+        if layer in self._signatures and signature == self._signatures[layer]:
+            return False
+        self._signatures[layer] = signature
+        self.layers[layer] = _read_json(path) if signature is not None else {}
+        return True
+
+    def _commit(self) -> Changes:
+        """Rebuild the merged view and notify subscribers of changed keys."""
+        old = self._merged
+        new = self._merge()
+        changes = {key: (old.get(key), new.get(key))
+                   for key in old.keys() | new.keys() if old.get(key) != new.get(key)}
+        self._merged = new
+        if changes:
+            self._notify(changes)
+        return changes
+
+    def _notify(self, changes: Changes):
+        for callback, keys in list(self._subscribers):
+            if keys is None:
+                relevant = changes
+            else:
+                relevant = {k: v for k, v in changes.items() if k in keys}
+            if not relevant:
+                continue
+            try:
+                callback(relevant)
+            except Exception as e:
+                logger.error(f"Config subscriber {callback!r} failed: {e!r}")
+
+    def refresh(self) -> Changes:
+        """Pick up file and environment changes; returns the changed keys."""
+        with self._lock:
+            dirty = False
+            for layer in FILE_LAYERS:
+                dirty |= self._load_file(layer)
+            env = self._read_env()
+            if env != self.layers["env"]:
+                self.layers["env"] = env
+                dirty = True
+            return self._commit() if dirty else {}
+
+    def set_cli(self, overrides: Mapping[str, Any]) -> Changes:
+        """Replace the CLI layer (``None`` values are left out)."""
+        with self._lock:
+            self.layers["cli"] = {k: v for k, v in overrides.items() if v is not None}
+            return self._commit()
+
+    def set(self, key: str, value, layer: str = "user") -> Changes:
+        """Set ``key`` in a file layer and write that file."""
+        if layer not in FILE_LAYERS:
+            raise ValueError(f"Can only write file layers {FILE_LAYERS}, not {layer!r}")
+        with self._lock:
+            data = dict(self.layers[layer])
+            data[key] = value
+            return self.save_layer(layer, data)
+
+    def save_layer(self, layer: str, data: Mapping[str, Any]) -> Changes:
+        """Replace a file layer with ``data``; the file is written in the background."""
+        if layer not in FILE_LAYERS:
+            raise ValueError(f"Can only write file layers {FILE_LAYERS}, not {layer!r}")
+        with self._lock:
+            self.layers[layer] = copy.deepcopy(dict(data))
+            self._writers[layer].submit(self.layers[layer])
+            return self._commit()
+
+    def _written(self, layer: str):
+        with self._lock:
+            self._signatures[layer] = _file_signature(self.paths[layer])
+
+    def flush(self):
+        """Write pending layer changes to disk now."""
+        for writer in self._writers.values():
+            writer.flush()
+
+    def export(self, path=None, layer: Optional[str] = None) -> Path:
+        """Write the merged view (or one layer) as indented JSON; returns the path."""
+        if path is None:
+            from .paths import OUTPUTS_DIR
+            stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            path = OUTPUTS_DIR / f"config_{layer or 'merged'}_{stamp}.json"
+        data = self.layer(layer) if layer else self.as_dict()
+        return atomic_write_json(path, data, pretty=True)
+
+    # Subscribers and watching ------------------------------------------
+
+    def subscribe(self, callback: Callable[[Changes], None], keys: Optional[Iterable[str]] = None):
+        """Call ``callback({key: (old, new)})`` when merged values change (only ``keys``, if given)."""
+        with self._lock:
+            self._subscribers.append((callback, frozenset(keys) if keys is not None else None))
+
+    def unsubscribe(self, callback: Callable[[Changes], None]) -> bool:
+        with self._lock:
+            for i, (existing, _) in enumerate(self._subscribers):
+                if existing == callback:
+                    del self._subscribers[i]
+                    return True
+            return False
+
+    def watch(self, debounce: float = 0.1, poll_interval: float = 1.0):
+        """Refresh automatically when a config file changes (one watcher per directory)."""
+        from ..utils.file_monitor import HubWatcher
+
+        if self._watchers:
+            return self
+        watched = {os.path.abspath(p) for p in self.paths.values()}
+
+        def on_change(paths):
+            if any(os.path.abspath(p) in watched for p in paths):
+                self.refresh()
+
+        for directory in sorted({Path(os.path.abspath(p)).parent for p in self.paths.values()}):
+            directory.mkdir(parents=True, exist_ok=True)
+            watcher = HubWatcher(directory, on_change, debounce=debounce, recursive=False,
+                                 poll_interval=poll_interval)
+            self._watchers.append(watcher.start())
+        return self
+
+    def stop(self):
+        for watcher in self._watchers:
+            watcher.stop()
+        self._watchers = []
+        for writer in self._writers.values():
+            writer.stop()
+
+
+_service: Optional[ConfigService] = None
+_service_lock = threading.Lock()
+
+
+def get_service() -> ConfigService:
+    """The process-wide service, created on first use."""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = ConfigService()
+    return _service
@@ -0,0 +1,213 @@
+"""
+Crash-safe, debounced writes of JSON config files.
+
+``atomic_write_json`` writes to a temp file in the target directory, fsyncs
+it, ``os.replace``s it over the target and fsyncs the directory, so a reader
+(or the next start after a crash) sees either the old file or the new one,
+never a truncated mix. Files are written compact; ``pretty=True`` is for
+human-facing exports.
+
+``ConfigWriter`` sits in front of one file: ``submit(data)`` returns at once
+and a background thread writes only the latest submitted state once updates
+have been quiet for ``debounce`` seconds (``max_delay`` bounds how long a
+steady stream can postpone the write). ``flush()`` writes synchronously and
+runs at interpreter exit.
+"""
+
+import atexit
+import copy
+import json
+import os
+import tempfile
+import threading
+import time
+import weakref
+from pathlib import Path
+from typing import Any, Callable, Mapping, Optional
+
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+NEW_FILE_MODE = 0o644
+# Temp files older than this were left by a writer that died mid-write.
+STALE_TEMP_AGE = 60.0
+
+
+def _fsync_dir(directory: Path):
+    if not hasattr(os, "O_DIRECTORY"):
+        return  # Windows cannot open directories; os.replace is still atomic there
+    try:
+        fd = os.open(str(directory), os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write_json(path, data: Any, pretty: bool = False, fsync: bool = True) -> Path:
+    """Replace ``path`` with ``data`` as JSON, atomically; keeps the file's mode."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        mode = os.stat(path).st_mode & 0o7777
+    except OSError:
+        mode = NEW_FILE_MODE
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            if pretty:
+                json.dump(data, f, indent=4, sort_keys=True)
+                f.write("\n")
+            else:
+                json.dump(data, f, separators=(",", ":"))
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    if fsync:
+        _fsync_dir(path.parent)
+    return path
+
+
+def remove_stale_temps(path, max_age: float = STALE_TEMP_AGE) -> int:
+    """Delete temp files of ``path`` left behind by a crash; returns how many."""
+    path = Path(path)
+    prefix = f".{path.name}-"
+    cutoff = time.time() - max_age
+    removed = 0
+    try:
+        entries = list(os.scandir(path.parent))
+    except OSError:
+        return 0
+    for entry in entries:
+        if not (entry.name.startswith(prefix) and entry.name.endswith(".tmp")):
+            continue
+        try:
+            if entry.stat(follow_symlinks=False).st_mtime <= cutoff:
+                os.unlink(entry.path)
+                removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+class ConfigWriter:
+    """Coalesce bursts of updates to one JSON file into one atomic write."""
+
+    def __init__(self, path, debounce: float = 0.2, max_delay: float = 2.0,
+                 on_written: Optional[Callable[[Path], None]] = None):
+        self.path = Path(path)
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.on_written = on_written
+        self.submitted = 0
+        self.written = 0
+        self._pending: Optional[Any] = None
+        self._has_pending = False
+        self._writing = False
+        self._first = self._last = 0.0
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._stop = False
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def busy(self) -> bool:
+        """True while a write is pending or in progress."""
+        return self._has_pending or self._writing
+
+    def submit(self, data: Mapping[str, Any]):
+        """Schedule ``data`` (copied now) to be written; supersedes earlier submits."""
+        snapshot = copy.deepcopy(dict(data))
+        with self._cond:
+            now = time.monotonic()
+            if not self._has_pending:
+                self._first = now
+            self._pending, self._has_pending, self._last = snapshot, True, now
+            self.submitted += 1
+            if self._thread is None:
+                self._start()
+            self._cond.notify()
+
+    def flush(self):
+        """Write any pending state now, in the calling thread."""
+        with self._write_lock:
+            with self._cond:
+                if not self._has_pending:
+                    return
+                data, self._pending, self._has_pending = self._pending, None, False
+                self._writing = True
+            try:
+                self._write(data)
+            finally:
+                with self._cond:
+                    self._writing = False
+                    self._cond.notify_all()
+
+    def _write(self, data):
+        try:
+            atomic_write_json(self.path, data)
+        except OSError as e:
+            logger.error(f"Could not write config {self.path}: {e}")
+            return
+        self.written += 1
+        if self.on_written is not None:
+            self.on_written(self.path)
+
+    def _start(self):
+        remove_stale_temps(self.path)
+        self._thread = threading.Thread(target=self.run, name="scn-config-writer", daemon=True)
+        self._thread.start()
+        _live_writers.add(self)
+
+    def stop(self):
+        """Flush pending state and stop the writer thread."""
+        with self._cond:
+            self._stop = True
+            self._cond.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        self.flush()
+        self._thread = None
+        self._stop = False
+
+    def run(self):
+        """Writer loop; returns after ``stop()``."""
+        while True:
+            with self._cond:
+                while not self._stop:
+                    if self._has_pending:
+                        due = min(self._last + self.debounce, self._first + self.max_delay)
+                        wait = due - time.monotonic()
+                        if wait <= 0:
+                            break
+                        self._cond.wait(wait)
+                    else:
+                        self._cond.wait()
+                if self._stop:
+                    return
+            self.flush()
+
+
+_live_writers: "weakref.WeakSet[ConfigWriter]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_all():
+    for writer in list(_live_writers):
+        try:
+            writer.flush()
+        except Exception as e:
+            logger.error(f"Could not flush config {writer.path} at exit: {e}")
@@ -2,17 +2,18 @@
 Configuration management for Shadowcore Nexus.
 """
 
-import json
 import os
 
 CONFIG_FILE = os.path.expanduser("~/.shadowcore_nexus_config.json")
 
 def load_config():
-    if os.path.exists(CONFIG_FILE):
-        with open(CONFIG_FILE, "r") as f:
-            return json.load(f)
-    return {}
+    """The user config layer; cached by the config service, re-read only when the file changes."""
+    from .config_service import get_service
+    service = get_service()
+    service.refresh()
+    return service.layer("user")
 
 def save_config(config):
-    with open(CONFIG_FILE, "w") as f:
-        json.dump(config, f, indent=4)
\ No newline at end of file
+    """Replace the user config; written atomically after a short debounce."""
+    from .config_service import get_service
+    get_service().save_layer("user", config)
\ No newline at end of file
@@ -1,5 +1,4 @@
 import argparse
-import importlib
 import os
 import sys
 import runpy
@@ -8,9 +7,6 @@ from pathlib import Path
 # Dynamically resolve ROOT_DIR (GHOULNET_SANCTUARY)
 ROOT_DIR = Path(__file__).resolve().parent.parent
 
-# Ensure ROOT_DIR is in sys.path for module imports
-sys.path.append(str(ROOT_DIR))
-
 # Rituals Directory Path (correctly alined
 RITUALS_DIR = ROOT_DIR / 'rituals'
 
@@ -27,12 +23,22 @@ def execute_ritual(ritual_name, args):
         print(f"[-] Ritual '{ritual_file}' not fount.")
         return
 
+    # Rituals import `core.*` absolutely; only needed once one actually runs
+    if str(ROOT_DIR) not in sys.path:
+        sys.path.append(str(ROOT_DIR))
+
 # inject params as global variable temporarily
     for key, value in args.items():
         globals()[key] = value
 
-# Execute the ritual script in an isolated namespace
-    runpy.run_path(str(ritual_file), run_name="__main__")
+# Execute the ritual script in an isolated namespace, with its own argv
+# (not this CLI's --run/--params)
+    saved_argv = sys.argv
+    sys.argv = [str(ritual_file)]
+    try:
+        runpy.run_path(str(ritual_file), run_name="__main__")
+    finally:
+        sys.argv = saved_argv
 
 
 def parse_args():
@@ -43,7 +49,7 @@ def parse_args():
 
     return parser.parse_args()
 
-if __name__ == '__main__':
+def main():
     args = parse_args()
 
     if args.list:
@@ -60,3 +66,6 @@ if __name__ == '__main__':
         execute_ritual(args.run, param_dict)
     else:
         print("[-] No action specified. Use --list or --run.")
+
+if __name__ == '__main__':
+    main()
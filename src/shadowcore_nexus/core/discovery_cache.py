@@ -0,0 +1,140 @@
+"""
+Persistent module discovery cache.
+
+One JSON file per modules directory, stored under ``PathResolver.resolve("cache")``.
+Each record is keyed by the module path and guarded by ``st_mtime_ns``,
+``st_size`` and the sha256 of the file contents; a stat mismatch falls back to
+re-hashing, so a plain ``touch`` does not invalidate the record.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+CACHE_VERSION = 3
+
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class DiscoveryCache:
+    def __init__(self, cache_dir: Path, modules_dir: Path):
+        modules_dir = Path(modules_dir).resolve()
+        tag = hashlib.sha1(str(modules_dir).encode("utf-8")).hexdigest()[:12]
+        self.cache_dir = Path(cache_dir)
+        self.path = self.cache_dir / f"module_discovery_{tag}.json"
+        self.modules_dir = modules_dir
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self.state = "cold"
+        self.dirty = False
+
+    def load(self) -> bool:
+        """Read the cache file. Returns False (full scan) if missing or corrupt."""
+        self.records = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            self.state = "cold"
+            return False
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discovery cache corrupt, rescanning: {e}")
+            self.state = "corrupt"
+            return False
+
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION \
+                or data.get("modules_dir") != str(self.modules_dir) \
+                or not isinstance(data.get("records"), dict):
+            logger.warning("Discovery cache has unexpected layout, rescanning")
+            self.state = "corrupt"
+            return False
+
+        self.records = data["records"]
+        self.state = "warm"
+        return True
+
+    def lookup(self, path: Path, st: os.stat_result) -> Optional[Dict[str, Any]]:
+        """Return the cached record for ``path`` if the file is unchanged."""
+        record = self.records.get(str(path))
+        if not isinstance(record, dict):
+            return None
+        try:
+            if record["mtime_ns"] == st.st_mtime_ns and record["size"] == st.st_size:
+                return record
+            if record["size"] != st.st_size or record["sha256"] != file_sha256(path):
+                return None
+        except (KeyError, TypeError, OSError):
+            return None
+        # Same content, new timestamp (touch / checkout): refresh the stat key.
+        record["mtime_ns"] = st.st_mtime_ns
+        self.dirty = True
+        return record
+
+    def store(self, path: Path, st: os.stat_result, sha256: str, manifest: Dict[str, Any],
+              valid: bool, timings: Dict[str, float]):
+        record = {
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "sha256": sha256,
+            "manifest": manifest,
+            "valid": valid,
+            "timings": timings,
+        }
+        try:
+            json.dumps(record)
+        except (TypeError, ValueError):
+            # MODULE_META holds values JSON can't represent; always rescan it.
+            self.records.pop(str(path), None)
+            return
+        self.records[str(path)] = record
+        self.dirty = True
+
+    def update_timings(self, path: Path, **timings: float):
+        record = self.records.get(str(path))
+        if isinstance(record, dict):
+            record.setdefault("timings", {}).update(timings)
+            self.dirty = True
+
+    def prune(self, live_paths):
+        live = {str(p) for p in live_paths}
+        for key in [k for k in self.records if k not in live]:
+            del self.records[key]
+            self.dirty = True
+
+    def save(self):
+        """Atomically write the cache if anything changed."""
+        if not self.dirty:
+            return
+        payload = {
+            "version": CACHE_VERSION,
+            "modules_dir": str(self.modules_dir),
+            "records": self.records,
+        }
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=str(self.cache_dir), prefix=".discovery-", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(payload, f, separators=(",", ":"))
+                os.replace(tmp, self.path)
+            except BaseException:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+                raise
+            self.dirty = False
+        except OSError as e:
+            logger.warning(f"Could not write discovery cache: {e}")
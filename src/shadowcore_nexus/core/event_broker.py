@@ -0,0 +1,488 @@
+"""
+Cross-process event bus over a Unix domain socket.
+
+``EventBroker`` listens on a Unix socket under the artifacts directory
+(``paths.EVENT_SOCKET``, or ``$SCN_EVENT_SOCKET``) and routes published
+events to the clients whose subscriptions match the topic, with the same
+``*``/``#`` wildcards as ``EventBus``. Subscriptions live in the broker, so
+events no one in a process asked for never cross that process's socket.
+
+Frames are length-prefixed::
+
+    >I  length of the rest of the frame
+    B   kind: PUB, SUB or UNSUB
+    >H  topic length, then the UTF-8 topic (the pattern for SUB/UNSUB)
+    B   codec, PUB only: ``m`` msgpack, ``j`` compact JSON
+    ... payload, PUB only
+
+The broker reads only the header and forwards PUB frames byte for byte;
+payloads are decoded by the receiving client. Publishers encode with
+msgpack when it is installed and fall back to stdlib JSON otherwise.
+
+``EventClient`` is thread based, so modules can use it without an event
+loop. When the broker goes away it reconnects with backoff, re-sends its
+subscriptions and then the events published meanwhile (a bounded queue;
+the oldest are dropped first).
+
+    python -m shadowcore_nexus.core.event_broker [--socket PATH]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import struct
+import tempfile
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from ..utils.logging import get_logger
+from .paths import EVENT_SOCKET
+from .topics import TopicTrie
+
+try:
+    import msgpack
+except ImportError:  # optional: compact JSON is used instead
+    msgpack = None
+
+logger = get_logger(__name__)
+
+PUB, SUB, UNSUB = 1, 2, 3
+MAX_FRAME = 16 * 1024 * 1024
+# Longest path accepted for AF_UNIX sockets on common platforms (sun_path)
+MAX_SOCKET_PATH = 104
+
+_LEN = struct.Struct(">I")
+_HEADER = struct.Struct(">IBH")
+_TOPIC_LEN = struct.Struct(">H")
+
+
+def default_socket_path() -> Path:
+    """``$SCN_EVENT_SOCKET``, else ``paths.EVENT_SOCKET`` unless it is too long for AF_UNIX."""
+    env = os.environ.get("SCN_EVENT_SOCKET")
+    if env:
+        return Path(env)
+    if len(os.fsencode(str(EVENT_SOCKET))) < MAX_SOCKET_PATH:
+        return EVENT_SOCKET
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return Path(tempfile.gettempdir()) / f"scn-events-{uid}.sock"
+
+
+def encode_payload(data):
+    if msgpack is not None:
+        return b"m", msgpack.packb(data, use_bin_type=True, default=str)
+    return b"j", json.dumps(data, separators=(",", ":"), default=str).encode()
+
+
+def decode_payload(codec: int, payload: bytes):
+    if codec == ord("m"):
+        if msgpack is None:
+            raise ValueError("Received a msgpack payload but msgpack is not installed")
+        return msgpack.unpackb(payload, raw=False)
+    return json.loads(payload)
+
+
+def encode_frame(kind: int, topic: str, codec: bytes = b"", payload: bytes = b"") -> bytes:
+    t = topic.encode()
+    return _HEADER.pack(3 + len(t) + len(codec) + len(payload), kind, len(t)) + t + codec + payload
+
+
+def split_frames(buf: bytearray) -> List[bytes]:
+    """Remove and return the complete frames at the start of ``buf``."""
+    frames = []
+    pos, size = 0, len(buf)
+    while size - pos >= 4:
+        (length,) = _LEN.unpack_from(buf, pos)
+        if length < 3 or length > MAX_FRAME:
+            raise ValueError(f"Invalid frame length {length}")
+        end = pos + 4 + length
+        if end > size:
+            break
+        frames.append(bytes(buf[pos:end]))
+        pos = end
+    if pos:
+        del buf[:pos]
+    return frames
+
+
+def frame_header(frame: bytes):
+    """``(kind, topic, offset of the codec byte)`` of a complete frame."""
+    (topic_len,) = _TOPIC_LEN.unpack_from(frame, 5)
+    return frame[4], frame[7:7 + topic_len].decode(), 7 + topic_len
+
+
+class _Peer:
+    __slots__ = ("writer", "patterns", "out")
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.patterns: List[str] = []
+        self.out: List[bytes] = []
+
+
+class EventBroker:
+    """Routes PUB frames to the clients whose subscriptions match their topic.
+
+    A client whose socket buffer exceeds ``max_buffer`` bytes is skipped
+    (counted in ``dropped``) rather than allowed to stall the broker.
+    """
+
+    def __init__(self, path=None, max_buffer: int = 4 * 1024 * 1024):
+        self.path = Path(path) if path else default_socket_path()
+        self.max_buffer = max_buffer
+        self.routes = TopicTrie()
+        self.peers: List[_Peer] = []
+        self.received = 0
+        self.forwarded = 0
+        self.filtered = 0
+        self.dropped = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _prepare_path(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if not self.path.exists():
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(self.path))
+        except OSError:
+            self.path.unlink()  # stale socket left by a broker that died
+        else:
+            raise OSError(f"An event broker is already listening on {self.path}")
+        finally:
+            probe.close()
+
+    async def serve(self, ready: Optional[threading.Event] = None):
+        """Serve until ``stop()``."""
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        self._prepare_path()
+        server = await asyncio.start_unix_server(self._handle, path=str(self.path))
+        os.chmod(self.path, 0o600)
+        logger.info(f"Event broker listening on {self.path}")
+        if ready is not None:
+            ready.set()
+        try:
+            await self._stopping.wait()
+        finally:
+            server.close()
+            for peer in list(self.peers):
+                peer.writer.close()
+            await server.wait_closed()
+            try:
+                self.path.unlink()
+            except OSError:
+                pass
+
+    def serve_forever(self):
+        asyncio.run(self.serve())
+
+    def start(self, timeout: float = 5.0):
+        """Serve from a background thread; returns once the socket is listening."""
+        ready = threading.Event()
+        errors: List[BaseException] = []
+
+        def run():
+            try:
+                asyncio.run(self.serve(ready))
+            except BaseException as e:
+                errors.append(e)
+                ready.set()
+
+        self._thread = threading.Thread(target=run, name="scn-event-broker", daemon=True)
+        self._thread.start()
+        ready.wait(timeout)
+        if errors:
+            raise errors[0]
+        return self
+
+    def stop(self):
+        if self._loop is not None and self._stopping is not None:
+            self._loop.call_soon_threadsafe(self._stopping.set)
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        self._thread = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        peer = _Peer(writer)
+        self.peers.append(peer)
+        buf = bytearray()
+        try:
+            while True:
+                chunk = await reader.read(65536)
+                if not chunk:
+                    break
+                buf += chunk
+                # Frames routed from one read go out with one write per client.
+                targets: Dict[int, _Peer] = {}
+                for frame in split_frames(buf):
+                    kind, topic, _ = frame_header(frame)
+                    if kind == PUB:
+                        self._route(topic, frame, targets)
+                    elif kind == SUB:
+                        self.routes.add(topic, peer)
+                        peer.patterns.append(topic)
+                    elif kind == UNSUB and topic in peer.patterns:
+                        self.routes.remove(topic, peer)
+                        peer.patterns.remove(topic)
+                for target in targets.values():
+                    target.writer.write(b"".join(target.out))
+                    target.out.clear()
+        except (ConnectionError, ValueError) as e:
+            logger.warning(f"Dropping event client: {e!r}")
+        finally:
+            for pattern in peer.patterns:
+                self.routes.remove(pattern, peer)
+            self.peers.remove(peer)
+            writer.close()
+
+    def _route(self, topic: str, frame: bytes, targets: Dict[int, _Peer]):
+        self.received += 1
+        peers = self.routes.match(topic)
+        if not peers:
+            self.filtered += 1
+            return
+        if len(peers) > 1:
+            peers = dict.fromkeys(peers)  # overlapping patterns of one client
+        for peer in peers:
+            transport = peer.writer.transport
+            if transport.is_closing() or transport.get_write_buffer_size() > self.max_buffer:
+                self.dropped += 1
+                continue
+            peer.out.append(frame)
+            targets[id(peer)] = peer
+            self.forwarded += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {"clients": len(self.peers), "subscriptions": len(self.routes),
+                "received": self.received, "forwarded": self.forwarded,
+                "filtered": self.filtered, "dropped": self.dropped}
+
+
+class EventClient:
+    """Publish to and subscribe on an ``EventBroker`` from any thread.
+
+    ``publish()`` only queues the frame; a writer thread sends everything
+    queued in one ``sendall``, so a burst costs a handful of syscalls. While
+    connected, publishers wait when ``queue_size`` frames are queued; while
+    disconnected the oldest queued frames are dropped (``dropped``).
+    ``callback(data)`` runs on the client's reader thread.
+    """
+
+    def __init__(self, path=None, reconnect: bool = True, min_backoff: float = 0.05,
+                 max_backoff: float = 2.0, queue_size: int = 10000):
+        self.path = Path(path) if path else default_socket_path()
+        self.reconnect = reconnect
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.queue_size = max(1, queue_size)
+        self.listeners = TopicTrie()
+        self.patterns: Dict[str, int] = {}
+        self.sent = 0
+        self.received = 0
+        self.dropped = 0
+        self.reconnects = 0
+        self._outbox = deque()
+        self._sock: Optional[socket.socket] = None
+        self._cond = threading.Condition(threading.RLock())
+        self._connected = threading.Event()
+        self._closed = threading.Event()
+        self._reader: Optional[threading.Thread] = None
+        self._writer: Optional[threading.Thread] = None
+
+    @property
+    def connected(self) -> bool:
+        return self._connected.is_set()
+
+    def connect(self, timeout: float = 5.0):
+        """Start the client; waits up to ``timeout`` for the first connection."""
+        if self._reader is None:
+            self._closed.clear()
+            self._reader = threading.Thread(target=self._run, name="scn-event-client", daemon=True)
+            self._writer = threading.Thread(target=self._write_loop, name="scn-event-writer",
+                                            daemon=True)
+            self._reader.start()
+            self._writer.start()
+        if not self._connected.wait(timeout) and not self.reconnect:
+            raise ConnectionError(f"No event broker on {self.path}")
+        return self
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything queued has been handed to the socket."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._outbox or self._closed.is_set(), timeout)
+
+    def close(self):
+        self.flush(timeout=1.0 if self.connected else 0)
+        self._closed.set()
+        with self._cond:
+            self._cond.notify_all()
+            sock = self._sock
+        if sock is not None:
+            self._drop(sock)
+        for thread in (self._writer, self._reader):
+            if thread is not None and thread is not threading.current_thread():
+                thread.join(timeout=5)
+        self._reader = self._writer = None
+
+    def publish(self, topic: str, data=None) -> bool:
+        """Queue an event; False if the broker is currently unreachable."""
+        frame = encode_frame(PUB, topic, *encode_payload(data))
+        with self._cond:
+            if self._sock is None and not self.reconnect:
+                raise ConnectionError(f"Not connected to the event broker on {self.path}")
+            while (self._sock is not None and len(self._outbox) >= self.queue_size
+                   and not self._closed.is_set()):
+                self._cond.wait()
+            if len(self._outbox) >= self.queue_size:
+                self._outbox.popleft()
+                self.dropped += 1
+            self._outbox.append(frame)
+            if len(self._outbox) == 1:
+                self._cond.notify_all()
+            return self._sock is not None
+
+    def subscribe(self, pattern: str, callback: Callable):
+        with self._cond:
+            self.listeners.add(pattern, callback)
+            self.patterns[pattern] = self.patterns.get(pattern, 0) + 1
+            if self.patterns[pattern] == 1:
+                self._control(encode_frame(SUB, pattern))
+
+    def unsubscribe(self, pattern: str, callback: Callable) -> bool:
+        with self._cond:
+            if not self.listeners.remove(pattern, callback):
+                return False
+            self.patterns[pattern] -= 1
+            if not self.patterns[pattern]:
+                del self.patterns[pattern]
+                self._control(encode_frame(UNSUB, pattern))
+            return True
+
+    def _control(self, frame: bytes):
+        # Queued behind earlier events; when disconnected, _open() re-sends
+        # the current subscriptions instead.
+        if self._sock is not None:
+            self._outbox.append(frame)
+            self._cond.notify_all()
+
+    def _write_loop(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._closed.is_set()
+                                    or (self._outbox and self._sock is not None))
+                sock = self._sock
+                if not self._outbox or sock is None:
+                    return  # closed
+                frames = list(self._outbox)
+                self._outbox.clear()
+                self._cond.notify_all()
+            try:
+                sock.sendall(b"".join(frames))
+                self.sent += len(frames)
+            except OSError:
+                with self._cond:
+                    self._outbox.extendleft(reversed(frames))
+                    while len(self._outbox) > self.queue_size:
+                        self._outbox.popleft()
+                        self.dropped += 1
+                self._drop(sock)
+
+    def _drop(self, sock: socket.socket):
+        with self._cond:
+            if self._sock is sock:
+                self._sock = None
+                self._connected.clear()
+                self._cond.notify_all()
+        try:
+            sock.shutdown(socket.SHUT_RDWR)  # wakes the reader thread
+        except OSError:
+            pass
+        sock.close()
+
+    def _open(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(str(self.path))
+            with self._cond:
+                # Subscriptions go out before anything queued while disconnected,
+                # so events this client queued for itself come back to it too.
+                subs = b"".join(encode_frame(SUB, pattern) for pattern in self.patterns)
+                if subs:
+                    sock.sendall(subs)
+                self._sock = sock
+                self._connected.set()
+                self._cond.notify_all()
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def _run(self):
+        delay = self.min_backoff
+        first = True
+        while not self._closed.is_set():
+            try:
+                sock = self._open()
+            except OSError:
+                if not self.reconnect:
+                    return
+                self._closed.wait(delay)
+                delay = min(delay * 2, self.max_backoff)
+                continue
+            if not first:
+                self.reconnects += 1
+                logger.info(f"Reconnected to event broker on {self.path}")
+            first = False
+            delay = self.min_backoff
+            try:
+                self._read(sock)
+            except (OSError, ValueError) as e:
+                if not self._closed.is_set():
+                    logger.warning(f"Event broker connection lost: {e!r}")
+            self._drop(sock)
+            if not self.reconnect:
+                return
+
+    def _read(self, sock: socket.socket):
+        buf = bytearray()
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                return
+            buf += chunk
+            for frame in split_frames(buf):
+                kind, topic, offset = frame_header(frame)
+                if kind != PUB:
+                    continue
+                self.received += 1
+                try:
+                    data = decode_payload(frame[offset], frame[offset + 1:])
+                except ValueError as e:
+                    logger.error(f"Undecodable event on {topic}: {e}")
+                    continue
+                for callback in self.listeners.match(topic):
+                    try:
+                        callback(data)
+                    except Exception as e:
+                        logger.error(f"Event subscriber {callback!r} failed on {topic}: {e!r}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ShadowCore Nexus cross-process event broker")
+    parser.add_argument("--socket", help=f"Socket path (default: {default_socket_path()})")
+    args = parser.parse_args()
+    broker = EventBroker(args.socket)
+    try:
+        broker.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
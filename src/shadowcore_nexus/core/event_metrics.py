@@ -0,0 +1,258 @@
+"""
+Optional instrumentation for the event buses.
+
+``EventMetrics`` records publishes per topic, per-handler call latency in
+log-bucketed (HDR-style) histograms, handler exceptions, and queue depths
+sampled when a snapshot is taken. Snapshots are written as JSON and as
+Prometheus text exposition format to ``artifacts/outputs``.
+
+Instrumentation is off unless a bus is given ``metrics=`` or
+``SCN_EVENT_METRICS=1`` is set, in which case buses share
+``shared_metrics()``. A disabled ``EventBus`` runs its plain ``publish``;
+the instrumented one is swapped in per instance, so being off costs nothing
+per event.
+
+Recording takes no lock (a lock costs more than the recording itself): two
+threads updating the same counter at the same instant can, rarely, lose one
+increment, which is acceptable for these numbers.
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Sub-buckets per power of two: 2**SUB_BITS, i.e. ~6% relative precision.
+SUB_BITS = 4
+_SUB = 1 << SUB_BITS
+_LINEAR = _SUB * 2
+
+# Prometheus ``le`` bounds: every power of two from ~1 us to ~17 s, in ns.
+PROMETHEUS_BOUNDS_NS = tuple(1 << e for e in range(10, 35))
+
+
+def _bucket_bounds(index: int) -> Tuple[int, int]:
+    """``[low, high)`` of a bucket, in the histogram's unit."""
+    if index < _LINEAR:
+        return index, index + 1
+    shift = index // _SUB - 1
+    mantissa = index % _SUB + _SUB
+    return mantissa << shift, (mantissa + 1) << shift
+
+
+class LogHistogram:
+    """Sparse log-bucketed histogram of non-negative integers (nanoseconds)."""
+
+    __slots__ = ("counts", "total", "max")
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.total = 0
+        self.max = 0
+
+    def record(self, value: int):
+        # Values below _LINEAR get a bucket each; above, the top SUB_BITS bits
+        # after the leading one pick the sub-bucket within its power of two.
+        if value < _LINEAR:
+            index = value if value > 0 else 0
+        else:
+            shift = value.bit_length() - SUB_BITS - 1
+            index = ((shift + 1) << SUB_BITS) + (value >> shift) - _SUB
+        counts = self.counts
+        counts[index] = counts.get(index, 0) + 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts.values())
+
+    @property
+    def min(self) -> int:
+        return _bucket_bounds(min(self.counts))[0] if self.counts else 0
+
+    def percentile(self, q: float) -> float:
+        """Approximate value at quantile ``q`` (0..1): the midpoint of its bucket."""
+        count = self.count
+        if not count:
+            return 0.0
+        rank = max(1, round(q * count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                low, high = _bucket_bounds(index)
+                return min(max((low + high - 1) / 2, self.min), self.max)
+        return float(self.max)
+
+    def cumulative(self, bounds: Iterable[int]) -> List[Tuple[int, int]]:
+        """``(bound, count of values < bound)`` for ascending ``bounds``."""
+        items = sorted(self.counts.items())
+        out, seen, i = [], 0, 0
+        for bound in bounds:
+            while i < len(items) and _bucket_bounds(items[i][0])[1] <= bound:
+                seen += items[i][1]
+                i += 1
+            out.append((bound, seen))
+        return out
+
+    def summary(self) -> Dict[str, float]:
+        us = 1000.0
+        count = self.count
+        return {"count": count, "mean_us": (self.total / count / us) if count else 0.0,
+                "min_us": self.min / us, "p50_us": self.percentile(0.5) / us,
+                "p90_us": self.percentile(0.9) / us, "p99_us": self.percentile(0.99) / us,
+                "max_us": self.max / us}
+
+
+class HandlerStats:
+    """Calls (``latency.count``), errors and latency of one handler on one pattern."""
+
+    __slots__ = ("pattern", "handler", "errors", "latency")
+
+    def __init__(self, pattern: str, handler: str):
+        self.pattern = pattern
+        self.handler = handler
+        self.errors = 0
+        self.latency = LogHistogram()
+
+    @property
+    def calls(self) -> int:
+        return self.latency.count
+
+
+def handler_name(callback) -> str:
+    func = getattr(callback, "__func__", callback)
+    module = getattr(func, "__module__", None) or "?"
+    name = getattr(func, "__qualname__", None) or type(callback).__qualname__
+    return f"{module}.{name}"
+
+
+class EventMetrics:
+    """Counters, latency histograms and queue gauges shared by one or more buses."""
+
+    def __init__(self):
+        self.published: Dict[str, int] = {}
+        self.handlers: Dict[Tuple[str, str], HandlerStats] = {}
+        self.gauges: Dict[str, Callable[[], int]] = {}
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+    def count_publish(self, topic: str, n: int = 1):
+        published = self.published
+        published[topic] = published.get(topic, 0) + n
+
+    def handler(self, pattern: str, callback) -> HandlerStats:
+        key = (pattern, handler_name(callback))
+        stats = self.handlers.get(key)
+        if stats is None:
+            with self._lock:
+                stats = self.handlers.setdefault(key, HandlerStats(*key))
+        return stats
+
+    def observe(self, stats: HandlerStats, elapsed_ns: int, failed: bool = False):
+        if failed:
+            stats.errors += 1
+        stats.latency.record(elapsed_ns)
+
+    def track_queue(self, name: str, depth: Callable[[], int]):
+        """Sample ``depth()`` as gauge ``name`` whenever a snapshot is taken."""
+        self.gauges[name] = depth
+
+    def untrack_queue(self, name: str):
+        self.gauges.pop(name, None)
+
+    def _queue_depths(self) -> Dict[str, int]:
+        depths = {}
+        for name, depth in list(self.gauges.items()):
+            try:
+                depths[name] = int(depth())
+            except Exception:
+                continue
+        return depths
+
+    def snapshot(self) -> Dict:
+        published = dict(self.published)
+        handlers = [{"pattern": s.pattern, "handler": s.handler, "calls": s.calls,
+                     "errors": s.errors, "latency": s.latency.summary()}
+                    for s in list(self.handlers.values())]
+        handlers.sort(key=lambda h: h["latency"]["count"] * h["latency"]["mean_us"], reverse=True)
+        elapsed = max(time.time() - self.started, 1e-9)
+        return {"timestamp": datetime.now().isoformat(timespec="seconds"),
+                "elapsed_s": round(elapsed, 3),
+                "published": published,
+                "publish_rate": {t: round(n / elapsed, 3) for t, n in published.items()},
+                "handlers": handlers,
+                "queues": self._queue_depths()}
+
+    def prometheus(self) -> str:
+        lines = ["# HELP scn_events_published_total Events published per topic.",
+                 "# TYPE scn_events_published_total counter"]
+        published = sorted(dict(self.published).items())
+        handlers = sorted(list(self.handlers.values()), key=lambda s: (s.pattern, s.handler))
+        buckets = [(s, s.latency.cumulative(PROMETHEUS_BOUNDS_NS), s.latency.count,
+                    s.latency.total, s.errors) for s in handlers]
+        for topic, n in published:
+            lines.append(f'scn_events_published_total{{topic="{_label(topic)}"}} {n}')
+        lines += ["# HELP scn_event_handler_seconds Event handler call latency.",
+                  "# TYPE scn_event_handler_seconds histogram"]
+        for s, cumulative, count, total, _ in buckets:
+            labels = f'pattern="{_label(s.pattern)}",handler="{_label(s.handler)}"'
+            for bound, seen in cumulative:
+                lines.append(f'scn_event_handler_seconds_bucket{{{labels},le="{bound / 1e9:.9g}"}} {seen}')
+            lines.append(f'scn_event_handler_seconds_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f"scn_event_handler_seconds_sum{{{labels}}} {total / 1e9:.9g}")
+            lines.append(f"scn_event_handler_seconds_count{{{labels}}} {count}")
+        lines += ["# HELP scn_event_handler_errors_total Exceptions raised by event handlers.",
+                  "# TYPE scn_event_handler_errors_total counter"]
+        for s, _, _, _, errors in buckets:
+            lines.append(f'scn_event_handler_errors_total{{pattern="{_label(s.pattern)}",'
+                         f'handler="{_label(s.handler)}"}} {errors}')
+        lines += ["# HELP scn_event_queue_depth Events waiting in a bus queue.",
+                  "# TYPE scn_event_queue_depth gauge"]
+        for name, depth in sorted(self._queue_depths().items()):
+            lines.append(f'scn_event_queue_depth{{queue="{_label(name)}"}} {depth}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, output_dir: Optional[Path] = None) -> Dict[str, Path]:
+        """Write a JSON snapshot and a Prometheus text file; returns their paths."""
+        if output_dir is None:
+            from .paths import OUTPUTS_DIR
+            output_dir = OUTPUTS_DIR
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        json_path = output_dir / f"event_metrics_{stamp}.json"
+        prom_path = output_dir / f"event_metrics_{stamp}.prom"
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        prom_path.write_text(self.prometheus(), encoding="utf-8")
+        return {"json": json_path, "prometheus": prom_path}
+
+
+def _label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+_shared: Optional[EventMetrics] = None
+_shared_lock = threading.Lock()
+
+
+def shared_metrics() -> EventMetrics:
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = EventMetrics()
+    return _shared
+
+
+def metrics_from_env() -> Optional[EventMetrics]:
+    """``shared_metrics()`` when ``SCN_EVENT_METRICS`` is set to a true value."""
+    if os.environ.get("SCN_EVENT_METRICS", "").lower() in ("1", "true", "yes", "on"):
+        return shared_metrics()
+    return None
@@ -1,16 +1,616 @@
 """
 Simple pub/sub event system for inter-module communication.
+
+Topics are dotted (``scan.host.up``) and subscriptions may use wildcards:
+``*`` matches one segment, ``#`` any number (see ``core.topics``).
+
+``EventBus`` calls subscribers synchronously on the publisher's thread.
+``AsyncEventBus`` gives every subscriber its own bounded queue drained by an
+asyncio task, so a slow subscriber only delays itself; what happens when its
+queue is full is set per subscription:
+
+* ``block``       — ``await publish()`` waits for room (backpressure)
+* ``drop-oldest`` — the oldest queued event is discarded
+* ``drop-newest`` — the new event is discarded
+* ``coalesce``    — a queued event with the same key is replaced in place
+  (``coalesce_key(event_type, data)``, default: the event type); when no key
+  matches, the oldest event is discarded
+
+``BatchingEventBus`` is for high-rate producers (sweeps, harvest runs):
+``publish()`` only appends to a ring buffer, and a flusher thread hands each
+subscriber a list of ``(event_type, data)`` per ``interval`` or per
+``max_batch`` events, optionally coalesced to the latest event per key.
+
+Every bus takes ``metrics=`` (``core.event_metrics``) for publish counts,
+handler latency histograms, handler errors and queue depths; it is off by
+default and costs nothing per event then.
 """
 
-from collections import defaultdict
+import asyncio
+import inspect
+import threading
+import time
+import traceback
+import weakref
+from collections import OrderedDict, deque
+from typing import Any, Callable, Dict, List, Optional
+
+from ..utils.logging import get_logger
+from .event_metrics import EventMetrics, handler_name, metrics_from_env, shared_metrics
+from .topics import TopicTrie
+
+logger = get_logger(__name__)
+
+OVERFLOW_POLICIES = ("block", "drop-oldest", "drop-newest", "coalesce")
+
+# Events a consumer handles back to back before yielding to the loop
+CONSUME_BATCH = 64
+
+
+def _running_loop():
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+class _Listener:
+    __slots__ = ("pattern", "callback", "ref", "coalesce_key", "stats", "__weakref__")
+
+    def __init__(self, pattern: str, callback: Callable, ref=None):
+        self.pattern = pattern
+        self.callback = callback
+        self.ref = ref
+        self.coalesce_key: Optional[Callable] = None
+        self.stats = None  # (EventMetrics, HandlerStats) once instrumented
+
+    def resolve(self) -> Optional[Callable]:
+        return self.callback if self.ref is None else self.ref()
+
+    def stats_for(self, metrics: EventMetrics, callback: Callable):
+        cached = self.stats
+        if cached is None or cached[0] is not metrics:
+            cached = self.stats = (metrics, metrics.handler(self.pattern, callback))
+        return cached[1]
+
 
 class EventBus:
-    def __init__(self):
-        self.listeners = defaultdict(list)
+    def __init__(self, metrics: Optional[EventMetrics] = None, name: str = "events"):
+        self.listeners = TopicTrie()
+        self.name = name
+        # Weak listeners whose callback was collected, purged on the next change
+        self._dead: List[_Listener] = []
+        self.metrics: Optional[EventMetrics] = None
+        metrics = metrics or metrics_from_env()
+        if metrics is not None:
+            self.enable_metrics(metrics)
+
+    def enable_metrics(self, metrics: Optional[EventMetrics] = None) -> EventMetrics:
+        """Instrument this bus (``shared_metrics()`` unless given one)."""
+        self.metrics = metrics or shared_metrics()
+        # Instance attribute shadows the plain publish; dropped again on disable.
+        self.publish = self._publish_instrumented
+        return self.metrics
+
+    def disable_metrics(self):
+        self.metrics = None
+        self.__dict__.pop("publish", None)
+
+    def subscribe(self, event_type, callback, weak: bool = False):
+        """Call ``callback(data)`` for events matching ``event_type``.
+
+        With ``weak=True`` the bus holds only a weak reference (``WeakMethod``
+        for bound methods), so a module dropped on reload takes its
+        subscriptions with it instead of being kept alive by the bus.
+        """
+        self.listeners.add(event_type, self._make_listener(event_type, callback, weak))
+
+    def _make_listener(self, event_type, callback, weak: bool) -> _Listener:
+        self._purge()
+        if weak:
+            listener = _Listener(event_type, None)
+            on_dead = self._dead.append
+            listener_ref = weakref.ref(listener)
+
+            def collected(_ref):
+                dead = listener_ref()
+                if dead is not None:
+                    on_dead(dead)
+
+            if inspect.ismethod(callback):
+                listener.ref = weakref.WeakMethod(callback, collected)
+            else:
+                listener.ref = weakref.ref(callback, collected)
+        else:
+            listener = _Listener(event_type, callback)
+        return listener
+
+    def unsubscribe(self, event_type, callback) -> bool:
+        """Remove a subscription made with the same ``event_type`` and callback."""
+        self._purge()
+        for listener in list(self.listeners.items(event_type)):
+            if listener.resolve() == callback:
+                return self.listeners.remove(event_type, listener)
+        return False
+
+    def _purge(self):
+        while self._dead:
+            listener = self._dead.pop()
+            self.listeners.remove(listener.pattern, listener)
+
+    def publish(self, event_type, data=None):
+        for listener in self.listeners.match(event_type):
+            callback = listener.callback
+            if callback is None:
+                callback = listener.ref()
+                if callback is None:
+                    continue
+            callback(data)
+
+    def _publish_instrumented(self, event_type, data=None):
+        metrics = self.metrics
+        metrics.count_publish(event_type)
+        clock = time.perf_counter_ns
+        for listener in self.listeners.match(event_type):
+            callback = listener.resolve()
+            if callback is None:
+                continue
+            stats = listener.stats_for(metrics, callback)
+            start = clock()
+            try:
+                callback(data)
+            except Exception:
+                metrics.observe(stats, clock() - start, failed=True)
+                raise
+            stats.latency.record(clock() - start)
+
+
+class BatchingEventBus(EventBus):
+    """``EventBus`` whose subscribers receive batches instead of single events.
+
+    Producers only pay for a ``deque.append`` into a ring of ``capacity``
+    events (atomic under the GIL, no lock); when the ring is full the oldest
+    event is overwritten and counted in ``overwritten``. Call ``start()`` for
+    the flusher thread, or ``flush()`` to deliver from the calling thread.
+    """
+
+    def __init__(self, capacity: int = 65536, interval: float = 0.05, max_batch: int = 1024,
+                 metrics: Optional[EventMetrics] = None, name: str = "batched-events"):
+        self.ring = deque(maxlen=capacity)
+        super().__init__(metrics, name)
+        self.capacity = capacity
+        self.interval = interval
+        self.max_batch = max(1, max_batch)
+        self.published = 0
+        self.delivered = 0
+        self.coalesced = 0
+        self.overwritten = 0
+        self.batches = 0
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, event_type, callback, weak: bool = False,
+                  coalesce_key: Optional[Callable] = None):
+        """Call ``callback(events)`` with lists of ``(event_type, data)``.
+
+        With ``coalesce_key(event_type, data)`` only the latest event per key
+        within a flush is delivered (e.g. latest state per host), in the order
+        the keys were first seen.
+        """
+        listener = self._make_listener(event_type, callback, weak)
+        listener.coalesce_key = coalesce_key
+        self.listeners.add(event_type, listener)
+
+    def enable_metrics(self, metrics: Optional[EventMetrics] = None) -> EventMetrics:
+        # publish() stays the ring append: topics are counted and handlers
+        # timed per batch in flush().
+        self.metrics = metrics or shared_metrics()
+        self.metrics.track_queue(f"{self.name}/ring", lambda: len(self.ring))
+        return self.metrics
 
-    def subscribe(self, event_type, callback):
-        self.listeners[event_type].append(callback)
+    def disable_metrics(self):
+        if self.metrics is not None:
+            self.metrics.untrack_queue(f"{self.name}/ring")
+        self.metrics = None
 
     def publish(self, event_type, data=None):
-        for callback in self.listeners[event_type]:
-            callback(data)
\ No newline at end of file
+        ring = self.ring
+        if len(ring) >= self.capacity:
+            self.overwritten += 1
+        ring.append((event_type, data))
+        self.published += 1
+        if len(ring) >= self.max_batch:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """Deliver everything published so far; returns the number of events taken."""
+        with self._flush_lock:
+            ring = self.ring
+            popleft = ring.popleft
+            events = [popleft() for _ in range(len(ring))]
+            if not events:
+                return 0
+            metrics = self.metrics
+            if metrics is not None:
+                topics: Dict[str, int] = {}
+                for event in events:
+                    topics[event[0]] = topics.get(event[0], 0) + 1
+                for topic, n in topics.items():
+                    metrics.count_publish(topic, n)
+            # Per flush, each topic resolves once to the batches it feeds.
+            batches: List[tuple] = []
+            targets: Dict[str, tuple] = {}
+            by_listener: Dict[int, tuple] = {}
+            for event in events:
+                topic_targets = targets.get(event[0])
+                if topic_targets is None:
+                    plain, keyed = [], []
+                    for listener in self.listeners.match(event[0]):
+                        slot = by_listener.get(id(listener))
+                        if slot is None:
+                            slot = by_listener[id(listener)] = (
+                                listener, {} if listener.coalesce_key else [])
+                            batches.append(slot)
+                        if listener.coalesce_key is None:
+                            plain.append(slot[1].append)
+                        else:
+                            keyed.append((listener.coalesce_key, slot[1]))
+                    topic_targets = targets[event[0]] = (plain, keyed)
+                plain, keyed = topic_targets
+                for append in plain:
+                    append(event)
+                for key_fn, latest in keyed:
+                    key = key_fn(*event)
+                    if key in latest:
+                        self.coalesced += 1
+                    latest[key] = event
+            for listener, batch in batches:
+                callback = listener.resolve()
+                if callback is None:
+                    continue
+                if isinstance(batch, dict):
+                    batch = list(batch.values())
+                for i in range(0, len(batch), self.max_batch):
+                    chunk = batch[i:i + self.max_batch]
+                    self.batches += 1
+                    start = time.perf_counter_ns() if metrics is not None else 0
+                    failed = False
+                    try:
+                        callback(chunk)
+                    except Exception as e:
+                        failed = True
+                        logger.error(f"Batch subscriber {callback!r} failed on {listener.pattern}: {e!r}")
+                    if metrics is not None:
+                        metrics.observe(listener.stats_for(metrics, callback),
+                                        time.perf_counter_ns() - start, failed)
+                    self.delivered += len(chunk)
+            return len(events)
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name="scn-event-batcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the flusher thread after a final flush."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        self._thread = None
+        self.flush()
+
+    def run(self):
+        """Flush loop; returns after ``stop()``."""
+        while not self._stop.is_set():
+            deadline = time.monotonic() + self.interval
+            while not self._stop.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or len(self.ring) >= self.max_batch:
+                    break
+                self._wake.wait(remaining)
+                self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                traceback.print_exc()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"published": self.published, "delivered": self.delivered, "batches": self.batches,
+                "coalesced": self.coalesced, "overwritten": self.overwritten,
+                "pending": len(self.ring)}
+
+
+class Subscription:
+    """One subscriber of an ``AsyncEventBus``: its queue, policy and counters."""
+
+    def __init__(self, bus: "AsyncEventBus", event_type: str, callback: Callable,
+                 maxsize: int, policy: str, coalesce_key: Optional[Callable] = None):
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy {policy!r}; expected one of {OVERFLOW_POLICIES}")
+        self.bus = bus
+        self.event_type = event_type
+        self.callback = callback
+        self.maxsize = max(1, int(maxsize))
+        self.policy = policy
+        self.coalesce_key = coalesce_key or (lambda event_type, data: event_type)
+        self.is_coroutine = inspect.iscoroutinefunction(callback)
+        self.queue = OrderedDict() if policy == "coalesce" else deque()
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.task: Optional[asyncio.Task] = None
+        self._handler_stats = None  # (EventMetrics, HandlerStats) once instrumented
+        # Created in start(): asyncio primitives must belong to the bus loop (3.8/3.9).
+        self._ready: Optional[asyncio.Event] = None
+        self._space: Optional[asyncio.Event] = None
+        self._idle: Optional[asyncio.Event] = None
+        self._put_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def depth(self) -> int:
+        return len(self.queue)
+
+    def start(self):
+        if self.task is None:
+            self._ready, self._space, self._idle = asyncio.Event(), asyncio.Event(), asyncio.Event()
+            self._put_lock = asyncio.Lock()
+            self._space.set()
+            self._idle.set()
+            self.task = asyncio.get_running_loop().create_task(self._consume())
+
+    def offer(self, event_type: str, data) -> bool:
+        """Queue without waiting; applies the overflow policy. False if not queued."""
+        if self._put_lock is not None and self._put_lock.locked():
+            return False  # publishers are already waiting (block): keep FIFO order
+        return self._offer(event_type, data)
+
+    def _offer(self, event_type: str, data) -> bool:
+        queue = self.queue
+        if self.policy == "coalesce":
+            key = self.coalesce_key(event_type, data)
+            if key in queue:
+                queue[key] = (event_type, data)
+                self.coalesced += 1
+                return True
+            if len(queue) >= self.maxsize:
+                queue.popitem(last=False)
+                self.dropped += 1
+            queue[key] = (event_type, data)
+        elif len(queue) >= self.maxsize:
+            if self.policy == "drop-newest":
+                self.dropped += 1
+                return False
+            if self.policy == "drop-oldest":
+                queue.popleft()
+                self.dropped += 1
+            else:
+                return False  # block: caller has to wait for room
+            queue.append((event_type, data))
+        else:
+            queue.append((event_type, data))
+        if self._ready is not None:
+            self._idle.clear()
+            self._ready.set()
+            if len(queue) >= self.maxsize:
+                self._space.clear()
+        return True
+
+    async def put(self, event_type: str, data):
+        """Queue, waiting for room under the ``block`` policy (fair, FIFO)."""
+        if self.policy != "block":
+            self._offer(event_type, data)
+            return
+        if self._put_lock is None:
+            self.start()
+        async with self._put_lock:
+            while not self._offer(event_type, data):
+                self._space.clear()
+                await self._space.wait()
+
+    def _pop(self):
+        if self.policy == "coalesce":
+            return self.queue.popitem(last=False)[1]
+        return self.queue.popleft()
+
+    async def _consume(self):
+        while True:
+            if not self.queue:
+                self._idle.set()
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+            for _ in range(CONSUME_BATCH):
+                if not self.queue:
+                    break
+                event_type, data = self._pop()
+                self._space.set()
+                metrics = self.bus.metrics
+                start = time.perf_counter_ns() if metrics is not None else 0
+                failed = False
+                try:
+                    result = self.callback(data)
+                    if self.is_coroutine or inspect.isawaitable(result):
+                        await result
+                    self.delivered += 1
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    failed = True
+                    self.errors += 1
+                    logger.error(f"Subscriber {self.callback!r} failed on {event_type}: {e!r}")
+                if metrics is not None:
+                    cached = self._handler_stats
+                    if cached is None or cached[0] is not metrics:
+                        cached = self._handler_stats = (metrics, metrics.handler(self.event_type,
+                                                                                 self.callback))
+                    metrics.observe(cached[1], time.perf_counter_ns() - start, failed)
+            # Let publishers and other subscribers run between batches.
+            await asyncio.sleep(0)
+
+    async def wait_idle(self):
+        if self._idle is not None:
+            await self._idle.wait()
+
+    @property
+    def gauge_name(self) -> str:
+        return f"{self.bus.name}/{self.event_type}/{handler_name(self.callback)}"
+
+    def stats(self) -> Dict[str, Any]:
+        return {"event_type": self.event_type, "policy": self.policy, "depth": self.depth,
+                "maxsize": self.maxsize, "delivered": self.delivered, "dropped": self.dropped,
+                "coalesced": self.coalesced, "errors": self.errors}
+
+
+class AsyncEventBus:
+    """Asyncio event bus with a bounded queue and consumer task per subscriber.
+
+    ``await publish()`` from coroutines on the bus loop; other threads (scan
+    workers, the urwid thread) use ``publish_threadsafe()``. The bus binds to
+    the running loop on first use.
+    """
+
+    def __init__(self, maxsize: int = 1024, policy: str = "block",
+                 metrics: Optional[EventMetrics] = None, name: str = "async-events"):
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy {policy!r}; expected one of {OVERFLOW_POLICIES}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.name = name
+        self.metrics: Optional[EventMetrics] = None
+        self.listeners = TopicTrie()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.published = 0
+        # Events handed over by other threads, flushed by one task on the loop
+        self._inbox = deque()
+        self._inbox_cond = threading.Condition()
+        self._flush_scheduled = False
+        self._flush_task: Optional[asyncio.Task] = None
+        metrics = metrics or metrics_from_env()
+        if metrics is not None:
+            self.enable_metrics(metrics)
+
+    def enable_metrics(self, metrics: Optional[EventMetrics] = None) -> EventMetrics:
+        """Instrument this bus; subscription queue depths become gauges."""
+        self.metrics = metrics or shared_metrics()
+        for sub in self.listeners.items():
+            self.metrics.track_queue(sub.gauge_name, lambda sub=sub: sub.depth)
+        return self.metrics
+
+    def disable_metrics(self):
+        if self.metrics is not None:
+            for sub in self.listeners.items():
+                self.metrics.untrack_queue(sub.gauge_name)
+        self.metrics = None
+
+    def subscribe(self, event_type: str, callback: Callable, maxsize: Optional[int] = None,
+                  policy: Optional[str] = None, coalesce_key: Optional[Callable] = None) -> Subscription:
+        sub = Subscription(self, event_type, callback, maxsize or self.maxsize,
+                           policy or self.policy, coalesce_key)
+        self.listeners.add(event_type, sub)
+        if self.metrics is not None:
+            self.metrics.track_queue(sub.gauge_name, lambda: sub.depth)
+        if self.loop is not None:
+            if _running_loop() is self.loop:
+                sub.start()
+            else:
+                self.loop.call_soon_threadsafe(sub.start)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        self.listeners.remove(sub.event_type, sub)
+        if self.metrics is not None:
+            self.metrics.untrack_queue(sub.gauge_name)
+        if sub.task is not None:
+            sub.task.cancel()
+
+    def _bind(self):
+        if self.loop is None:
+            self.loop = asyncio.get_running_loop()
+            for sub in self.listeners.items():
+                sub.start()
+
+    async def publish(self, event_type: str, data=None):
+        """Queue ``data`` for every subscriber; waits only on ``block`` queues that are full."""
+        self._bind()
+        self.published += 1
+        if self.metrics is not None:
+            self.metrics.count_publish(event_type)
+        for sub in self.listeners.match(event_type):
+            if not sub.offer(event_type, data) and sub.policy == "block":
+                await sub.put(event_type, data)
+
+    def publish_nowait(self, event_type: str, data=None):
+        """Queue from the bus loop without waiting; full ``block`` queues drop the event."""
+        self._bind()
+        self.published += 1
+        if self.metrics is not None:
+            self.metrics.count_publish(event_type)
+        for sub in self.listeners.match(event_type):
+            if not sub.offer(event_type, data) and sub.policy == "block":
+                sub.dropped += 1
+
+    def publish_threadsafe(self, event_type: str, data=None):
+        """Publish from another thread.
+
+        Events go through a bounded inbox drained by a single task on the bus
+        loop, so a burst costs one loop wake-up rather than one per event. When
+        the inbox is full the calling thread waits: that is the thread-side
+        backpressure of the ``block`` policy.
+        """
+        if self.loop is None:
+            raise RuntimeError("AsyncEventBus is not bound to a loop yet; publish or drain from it first")
+        if _running_loop() is self.loop:
+            self.publish_nowait(event_type, data)
+            return
+        with self._inbox_cond:
+            while len(self._inbox) >= self.maxsize:
+                self._inbox_cond.wait()
+            self._inbox.append((event_type, data))
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        self.loop.call_soon_threadsafe(self._start_flush)
+
+    def _start_flush(self):
+        self._flush_task = self.loop.create_task(self._flush())
+
+    async def _flush(self):
+        while True:
+            with self._inbox_cond:
+                if not self._inbox:
+                    self._flush_scheduled = False
+                    return
+                batch = list(self._inbox)
+                self._inbox.clear()
+                self._inbox_cond.notify_all()
+            for event_type, data in batch:
+                await self.publish(event_type, data)
+
+    async def drain(self):
+        """Wait until every subscriber has handled everything queued so far."""
+        self._bind()
+        while self._flush_scheduled:
+            if self._flush_task is not None and not self._flush_task.done():
+                await self._flush_task
+            else:
+                await asyncio.sleep(0)
+        for sub in list(self.listeners.items()):
+            await sub.wait_idle()
+
+    async def close(self):
+        subs = list(self.listeners.items())
+        tasks = [sub.task for sub in subs if sub.task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for sub in subs:
+            sub.task = sub._ready = sub._space = sub._idle = sub._put_lock = None
+        self.loop = None
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [sub.stats() for sub in self.listeners.items()]
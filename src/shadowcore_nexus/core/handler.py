@@ -1,18 +1,6 @@
-import sys
-from pathlib import Path
-
-# === Absolute Path Override ===
-ROOT_DIR = Path(__file__).resolve().parent.parent
-sys.path = [str(ROOT_DIR)] + sys.path  # Force ShadowCore to be sys.path[0
-
-from core.config import config
-from core.paths import RITUALS_DIR
 import importlib
 
-# Ensure ShadowCore is in sys.path
-ROOT_DIR = Path(__file__).resolve().parent.parent
-if str(ROOT_DIR) not in sys.path:
-    sys.path.insert(0, str(ROOT_DIR))
+from .paths import ensure_root_on_path
 
 
 class DaemonHandler:
@@ -20,6 +8,7 @@ class DaemonHandler:
         self.modules = {}
 
     def load_module(self, module_name):
+        ensure_root_on_path()
         try:
             module_path = f'rituals.{module_name}'
             module = importlib.import_module(module_path)
@@ -29,7 +18,8 @@ class DaemonHandler:
             print(f"[-] Failed to load module: {module_name}")
 
     def initialize_modules(self):
-        for module_name in config.get("modules_enabled", []):
+        from .config import get_config
+        for module_name in get_config().get("modules_enabled", []):
             self.load_module(module_name)
 
     def execute_module(self, module_name, *args, **kwargs):
@@ -0,0 +1,447 @@
+"""
+Append-only, segmented ritual history.
+
+Every ``log_history()`` call appends one JSON line
+``{"ts": <epoch seconds>, "ritual": <name>, "details": ...}`` to the newest
+segment ``history-NNNNNN.jsonl`` under ``artifacts/history``; a segment that
+would grow past ``segment_bytes`` is closed and the next one started.
+
+Each segment has a sidecar ``history-NNNNNN.idx.json`` mapping
+
+* ritual name -> byte ranges ``[start, end, records]`` holding its records
+  (runs less than ``MERGE_GAP`` bytes apart share a range), and
+* time bucket (``bucket_seconds`` wide) -> byte span of its records,
+
+so ``query(ritual="netmap_ritual", since=...)`` skips whole segments by
+time, then seeks straight to the matching ranges. The index is a cache: it
+records how many bytes it covers and anything appended past that (by this or
+another process, or before a crash) is indexed on the next access. It is
+written when a segment is rotated, on ``flush()`` and at exit.
+
+Appends take an ``flock`` on ``.lock`` where available, so several processes
+can share one store.
+
+    python -m shadowcore_nexus.core.history_store query --ritual netmap_ritual --since 7d
+    python -m shadowcore_nexus.core.history_store migrate   # old per-event .log files
+"""
+
+import argparse
+import atexit
+import contextlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are serialized per process only
+    fcntl = None
+
+from ..utils.log_index import parse_when
+from .config_writer import atomic_write_json
+from .paths import HISTORY_DIR
+
+SEGMENT_BYTES = 8 << 20
+BUCKET_SECONDS = 3600
+INDEX_VERSION = 1
+# Ranges closer than this are read in one go (and filtered) instead of seeking.
+MERGE_GAP = 4096
+
+_SEGMENT_RE = re.compile(r"^history-(\d{6})\.jsonl$")
+_LEGACY_TIMESTAMP = "%Y-%m-%d_%H-%M-%S"
+
+
+def _segment_name(number: int) -> str:
+    return f"history-{number:06d}.jsonl"
+
+
+def _to_epoch(value) -> Optional[float]:
+    if value is None or isinstance(value, (int, float)):
+        return value
+    return value.timestamp()
+
+
+class SegmentIndex:
+    """Ritual ranges and time-bucket spans of one segment."""
+
+    def __init__(self, number: int, bucket_seconds: int):
+        self.number = number
+        self.bucket_seconds = bucket_seconds
+        self.rituals: Dict[str, List[List[int]]] = {}
+        self.buckets: Dict[int, List[int]] = {}
+        self.indexed = 0
+        self.records = 0
+        self.min_ts: Optional[float] = None
+        self.max_ts: Optional[float] = None
+        self.dirty = False
+
+    def add(self, ritual: str, ts: float, start: int, end: int):
+        ranges = self.rituals.setdefault(ritual, [])
+        if ranges and start - ranges[-1][1] <= MERGE_GAP:
+            ranges[-1][1] = end
+            ranges[-1][2] += 1
+        else:
+            ranges.append([start, end, 1])
+        bucket = int(ts // self.bucket_seconds)
+        span = self.buckets.get(bucket)
+        if span is None:
+            self.buckets[bucket] = [start, end]
+        else:
+            span[0] = min(span[0], start)
+            span[1] = max(span[1], end)
+        self.min_ts = ts if self.min_ts is None else min(self.min_ts, ts)
+        self.max_ts = ts if self.max_ts is None else max(self.max_ts, ts)
+        self.records += 1
+        self.indexed = end
+        self.dirty = True
+
+    def ranges(self, ritual: Optional[str], since: Optional[float],
+               until: Optional[float]) -> List[Tuple[int, int]]:
+        """Byte ranges that may hold matching records (callers still filter)."""
+        if since is not None and self.max_ts is not None and self.max_ts < since:
+            return []
+        if until is not None and self.min_ts is not None and self.min_ts > until:
+            return []
+        if ritual is not None:
+            candidates = [(s, e) for s, e, _ in self.rituals.get(ritual, ())]
+        else:
+            candidates = [(0, self.indexed)] if self.indexed else []
+        if since is not None or until is not None:
+            lo_ts = float("-inf") if since is None else since
+            hi_ts = float("inf") if until is None else until
+            width = self.bucket_seconds
+            spans = [span for bucket, span in self.buckets.items()
+                     if bucket * width <= hi_ts and (bucket + 1) * width > lo_ts]
+            if not spans:
+                return []
+            lo = min(s for s, _ in spans)
+            hi = max(e for _, e in spans)
+            candidates = [(max(s, lo), min(e, hi)) for s, e in candidates if s < hi and e > lo]
+        merged: List[Tuple[int, int]] = []
+        for start, end in candidates:
+            if merged and start - merged[-1][1] <= MERGE_GAP:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
+
+    def to_json(self) -> Dict[str, Any]:
+        return {"version": INDEX_VERSION, "bucket_seconds": self.bucket_seconds,
+                "indexed": self.indexed, "records": self.records,
+                "min_ts": self.min_ts, "max_ts": self.max_ts, "rituals": self.rituals,
+                "buckets": {str(b): span for b, span in self.buckets.items()}}
+
+    @classmethod
+    def from_json(cls, number: int, data: Dict[str, Any], bucket_seconds: int) -> "SegmentIndex":
+        index = cls(number, bucket_seconds)
+        if data.get("version") != INDEX_VERSION or data.get("bucket_seconds") != bucket_seconds:
+            return index
+        index.indexed = data["indexed"]
+        index.records = data["records"]
+        index.min_ts = data["min_ts"]
+        index.max_ts = data["max_ts"]
+        index.rituals = data["rituals"]
+        index.buckets = {int(b): span for b, span in data["buckets"].items()}
+        return index
+
+
+class HistoryStore:
+    """Segmented JSONL history with per-segment ritual and time indexes."""
+
+    def __init__(self, directory=None, segment_bytes: int = SEGMENT_BYTES,
+                 bucket_seconds: int = BUCKET_SECONDS):
+        self.directory = Path(directory) if directory is not None else HISTORY_DIR
+        self.segment_bytes = segment_bytes
+        self.bucket_seconds = bucket_seconds
+        self._indexes: Dict[int, SegmentIndex] = {}
+        self._lock = threading.RLock()
+        self._fd: Optional[int] = None
+        self._active: Optional[int] = None
+        self._lock_fd: Optional[int] = None
+
+    # Files -------------------------------------------------------------
+
+    def segments(self) -> List[int]:
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(int(m.group(1)) for m in map(_SEGMENT_RE.match, names) if m)
+
+    def segment_path(self, number: int) -> Path:
+        return self.directory / _segment_name(number)
+
+    def index_path(self, number: int) -> Path:
+        return self.directory / f"history-{number:06d}.idx.json"
+
+    @contextlib.contextmanager
+    def _file_lock(self):
+        if fcntl is None:
+            yield
+            return
+        if self._lock_fd is None:
+            self._lock_fd = os.open(str(self.directory / ".lock"), os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def _open_segment(self, number: int):
+        if self._fd is not None:
+            os.close(self._fd)
+        self._fd = os.open(str(self.segment_path(number)),
+                           os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._active = number
+
+    def _writable_segment(self, incoming: int) -> Tuple[int, int]:
+        """``(number, size)`` of the segment the next ``incoming`` bytes go to."""
+        if self._fd is None:
+            self._open_segment(max(self.segments(), default=1))
+        while True:
+            size = os.fstat(self._fd).st_size
+            if size == 0 or size + incoming <= self.segment_bytes:
+                return self._active, size
+            newest = max(self.segments(), default=self._active)
+            if newest > self._active:  # another process rotated already
+                self._open_segment(newest)
+                continue
+            self._write_index(self._index(self._active))
+            self._open_segment(self._active + 1)
+
+    # Index -------------------------------------------------------------
+
+    def _index(self, number: int, size: Optional[int] = None) -> SegmentIndex:
+        """The segment's index, caught up with anything appended since it was saved."""
+        index = self._indexes.get(number)
+        if index is None:
+            try:
+                with open(self.index_path(number), "r", encoding="utf-8") as f:
+                    index = SegmentIndex.from_json(number, json.load(f), self.bucket_seconds)
+            except (OSError, ValueError, KeyError, TypeError):
+                index = SegmentIndex(number, self.bucket_seconds)
+            self._indexes[number] = index
+        if size is None:
+            try:
+                size = os.path.getsize(self.segment_path(number))
+            except OSError:
+                return index
+        if size < index.indexed:  # segment replaced underneath us; rebuild
+            index = self._indexes[number] = SegmentIndex(number, self.bucket_seconds)
+        if size > index.indexed:
+            self._catch_up(index, size)
+        return index
+
+    def _catch_up(self, index: SegmentIndex, size: int):
+        with open(self.segment_path(index.number), "rb") as f:
+            f.seek(index.indexed)
+            data = f.read(size - index.indexed)
+        offset = index.indexed
+        for line in data.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break  # a writer is mid-append; pick it up next time
+            end = offset + len(line)
+            try:
+                record = json.loads(line)
+                index.add(str(record["ritual"]), float(record["ts"]), offset, end)
+            except (ValueError, KeyError, TypeError):
+                index.indexed = end  # unreadable line; skip it for good
+            offset = end
+
+    def _write_index(self, index: SegmentIndex):
+        if not index.dirty:
+            return
+        try:
+            atomic_write_json(self.index_path(index.number), index.to_json(), fsync=False)
+            index.dirty = False
+        except OSError:
+            pass  # the index is rebuilt from the segment next time
+
+    # Records -----------------------------------------------------------
+
+    def append(self, ritual: str, details: Any, ts: Optional[float] = None):
+        """Append one record; ``ts`` defaults to now."""
+        ts = time.time() if ts is None else float(ts)
+        line = json.dumps({"ts": ts, "ritual": ritual, "details": details},
+                          separators=(",", ":"), ensure_ascii=False, default=str)
+        data = line.encode("utf-8") + b"\n"
+        with self._lock:
+            if self._fd is None:
+                self.directory.mkdir(parents=True, exist_ok=True)
+            with self._file_lock():
+                number, size = self._writable_segment(len(data))
+                index = self._index(number, size)
+                # A torn last line from a crashed writer gets terminated first.
+                prefix = b"\n" if index.indexed < size else b""
+                os.write(self._fd, prefix + data)
+                start = size + len(prefix)
+                index.add(ritual, ts, start, start + len(data))
+
+    def query(self, ritual: Optional[str] = None, since=None, until=None) -> Iterator[Dict[str, Any]]:
+        """Records of ``ritual`` (all if None) with ``since <= ts <= until``, in append order.
+
+        ``since``/``until`` are epoch seconds or datetimes.
+        """
+        since, until = _to_epoch(since), _to_epoch(until)
+        # Cheap byte test before json.loads; append() always writes this form.
+        needle = None if ritual is None else \
+            b'"ritual":' + json.dumps(ritual, ensure_ascii=False).encode("utf-8") + b","
+        for number in self.segments():
+            with self._lock:
+                ranges = self._index(number).ranges(ritual, since, until)
+            if not ranges:
+                continue
+            with open(self.segment_path(number), "rb") as f:
+                for start, end in ranges:
+                    f.seek(start)
+                    for line in f.read(end - start).splitlines():
+                        if needle is not None and needle not in line:
+                            continue
+                        try:
+                            record = json.loads(line)
+                        except ValueError:
+                            continue
+                        if ritual is not None and record.get("ritual") != ritual:
+                            continue
+                        ts = record.get("ts", 0)
+                        if (since is not None and ts < since) or (until is not None and ts > until):
+                            continue
+                        yield record
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            indexes = [self._index(n) for n in self.segments()]
+            rituals: Dict[str, int] = {}
+            for index in indexes:
+                for name, ranges in index.rituals.items():
+                    rituals[name] = rituals.get(name, 0) + sum(r[2] for r in ranges)
+            return {"segments": len(indexes), "records": sum(i.records for i in indexes),
+                    "bytes": sum(i.indexed for i in indexes), "rituals": rituals}
+
+    def flush(self):
+        """Write the indexes of segments appended to since they were last saved."""
+        with self._lock:
+            for index in list(self._indexes.values()):
+                self._write_index(index)
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            for fd in (self._fd, self._lock_fd):
+                if fd is not None:
+                    os.close(fd)
+            self._fd = self._lock_fd = self._active = None
+
+
+# Migration of the old one-file-per-event history ----------------------
+
+def parse_legacy(path: Path) -> Optional[Tuple[str, float, str]]:
+    """``(ritual, ts, details)`` from an old ``<ritual>_<timestamp>.log`` file."""
+    try:
+        text = path.read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return None
+    head, sep, details = text.partition("\nDetails: ")
+    lines = head.split("\n")
+    if not sep or len(lines) != 2 or not lines[0].startswith("Ritual: ") \
+            or not lines[1].startswith("Timestamp: "):
+        return None
+    try:
+        stamp = datetime.strptime(lines[1][len("Timestamp: "):].strip(), _LEGACY_TIMESTAMP)
+    except ValueError:
+        return None
+    details = details[:-1] if details.endswith("\n") else details
+    return lines[0][len("Ritual: "):].strip(), stamp.timestamp(), details
+
+
+def migrate_legacy(store: HistoryStore, source=None, delete: bool = False) -> Dict[str, int]:
+    """Append old per-event ``*.log`` files to ``store`` in timestamp order.
+
+    Migrated files are deleted, or moved to ``<source>/legacy`` unless
+    ``delete``; unparseable ones are left where they are.
+    """
+    source = Path(source) if source is not None else store.directory
+    parsed, skipped = [], 0
+    for path in sorted(source.glob("*.log")):
+        record = parse_legacy(path)
+        if record is None:
+            skipped += 1
+            continue
+        parsed.append((record[1], path.stat().st_mtime, path, record))
+    parsed.sort(key=lambda item: item[:2])
+    legacy_dir = source / "legacy"
+    for _, _, path, (ritual, ts, details) in parsed:
+        store.append(ritual, details, ts=ts)
+    store.flush()
+    for _, _, path, _ in parsed:
+        if delete:
+            path.unlink()
+        else:
+            legacy_dir.mkdir(exist_ok=True)
+            os.replace(path, legacy_dir / path.name)
+    return {"migrated": len(parsed), "skipped": skipped}
+
+
+# Shared store and CLI -------------------------------------------------
+
+_store: Optional[HistoryStore] = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> HistoryStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = HistoryStore()
+                atexit.register(_store.close)
+    return _store
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ShadowCore Nexus ritual history")
+    parser.add_argument("--dir", help=f"History directory (default: {HISTORY_DIR})")
+    sub = parser.add_subparsers(dest="command", required=True)
+    query = sub.add_parser("query", help="Print matching history records")
+    query.add_argument("--ritual")
+    query.add_argument("--since", type=parse_when, help="e.g. 7d, 12h, 2024-05-01")
+    query.add_argument("--until", type=parse_when)
+    query.add_argument("--limit", type=int)
+    query.add_argument("--json", action="store_true", help="One JSON record per line")
+    migrate = sub.add_parser("migrate", help="Import old per-event .log history files")
+    migrate.add_argument("--source", help="Directory of old .log files (default: --dir)")
+    migrate.add_argument("--delete", action="store_true",
+                         help="Delete migrated files instead of moving them to legacy/")
+    sub.add_parser("stats", help="Segment, record and per-ritual counts")
+    args = parser.parse_args(argv)
+
+    store = HistoryStore(args.dir)
+    try:
+        if args.command == "query":
+            for n, record in enumerate(store.query(args.ritual, args.since, args.until)):
+                if args.limit is not None and n >= args.limit:
+                    break
+                if args.json:
+                    print(json.dumps(record, ensure_ascii=False))
+                else:
+                    stamp = datetime.fromtimestamp(record["ts"]).isoformat(sep=" ", timespec="seconds")
+                    print(f"{stamp}  {record['ritual']}: {record['details']}")
+        elif args.command == "migrate":
+            result = migrate_legacy(store, args.source, delete=args.delete)
+            print(f"[+] Migrated {result['migrated']} history files ({result['skipped']} skipped)")
+        else:
+            print(json.dumps(store.stats(), indent=2))
+    except BrokenPipeError:
+        sys.stderr.close()
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
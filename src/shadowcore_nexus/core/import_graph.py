@@ -0,0 +1,97 @@
+"""
+Import graph between hub modules, as observed while they load.
+
+``track_imports(importer, observer)`` wraps the import of one hub module: for
+its duration, every absolute ``import``/``from ... import`` statement executed
+by that module's own code (``globals()['__name__']`` is the module or one of
+its submodules) is reported to ``observer(importer, name)``. Imports made by
+third-party libraries it pulls in are ignored.
+
+The hook is a thin wrapper around ``builtins.__import__`` installed on first
+use. It is gated by a thread-local stack, so outside a tracked load (and on
+other threads) it costs one attribute lookup per import statement.
+"""
+
+import builtins
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Set
+
+_state = threading.local()
+_install_lock = threading.Lock()
+_original_import = None
+
+
+def _tracking_import(name, globals=None, locals=None, fromlist=(), level=0):
+    stack = getattr(_state, "stack", None)
+    if stack and level == 0 and globals is not None:
+        importer, observer = stack[-1]
+        caller = globals.get("__name__") or ""
+        if caller == importer or caller.startswith(importer + "."):
+            observer(importer, name)
+    return _original_import(name, globals, locals, fromlist, level)
+
+
+def _install():
+    global _original_import
+    with _install_lock:
+        if _original_import is None:
+            _original_import = builtins.__import__
+            builtins.__import__ = _tracking_import
+
+
+@contextmanager
+def track_imports(importer: str, observer: Callable[[str, str], None]):
+    """Report absolute imports executed by module ``importer`` while in the block."""
+    _install()
+    stack = getattr(_state, "stack", None)
+    if stack is None:
+        stack = _state.stack = []
+    stack.append((importer, observer))
+    try:
+        yield
+    finally:
+        stack.pop()
+
+
+class ImportGraph:
+    """``imports[a]`` holds the hub modules ``a`` imported during its last load."""
+
+    def __init__(self):
+        self.imports: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def reset(self, key: str):
+        """Forget ``key``'s edges before it is loaded again."""
+        with self._lock:
+            self.imports[key] = set()
+
+    def add(self, importer: str, imported: str):
+        if importer == imported:
+            return
+        with self._lock:
+            self.imports.setdefault(importer, set()).add(imported)
+
+    def discard(self, key: str):
+        with self._lock:
+            self.imports.pop(key, None)
+
+    def dependencies(self, key: str) -> Set[str]:
+        return set(self.imports.get(key, ()))
+
+    def dependents(self, keys: Iterable[str]) -> Set[str]:
+        """Every module that (transitively) imported one of ``keys``; excludes ``keys``."""
+        reverse: Dict[str, Set[str]] = {}
+        with self._lock:
+            for importer, imported in self.imports.items():
+                for key in imported:
+                    reverse.setdefault(key, set()).add(importer)
+        start = set(keys)
+        seen: Set[str] = set()
+        pending: List[str] = list(start)
+        while pending:
+            for importer in reverse.get(pending.pop(), ()):
+                if importer not in seen:
+                    seen.add(importer)
+                    pending.append(importer)
+        return seen - start
@@ -0,0 +1,394 @@
+"""
+Flattened, schema-driven CSV for nested intel records.
+
+A ``CsvSchema`` is inferred once per run from the first ``sample`` records
+(or passed in) and saved next to the data as ``<name>.schema.json``:
+
+* nested dicts become dotted columns (``financial_trail.revenue``),
+* lists become child tables, ``<name>.<field>.csv``, one row per item keyed
+  by ``_parent`` (the record's ``_id``) and ``_idx``; the record's own row
+  holds the item count. Dict items are flattened the same way (lists inside
+  them are stored as JSON); other items go in a single ``value`` column,
+* every column has a type (``str``, ``int``, ``float``, ``bool``, ``json``,
+  or ``list`` for a child-table count), so the reader restores values, not
+  strings.
+
+Cells: empty means the key was absent, ``\\N`` is ``None`` and ``\\E`` an
+empty string (strings starting with a backslash get one more). Anything the
+schema cannot hold -- a new key, a value of another type, an empty or
+non-dict value where a dict was seen -- goes into the row's ``_extra``
+column as a JSON list of ``[path, value]`` pairs, so nothing is lost.
+
+``FlatCsvWriter`` streams rows to every table as records arrive (only the
+schema sample is held in memory); ``read_records`` streams them back,
+walking the child tables in step with the main one.
+"""
+
+import copy
+import csv
+import json
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+SCHEMA_VERSION = 1
+SCHEMA_SAMPLE = 100
+WRITE_BUFFER = 1 << 20
+RESERVED = frozenset({"_id", "_extra", "_parent", "_idx"})
+SCALAR_TYPES = {bool: "bool", int: "int", float: "float", str: "str"}
+
+NULL = "\\N"
+EMPTY = "\\E"
+
+_encode_json = json.JSONEncoder(separators=(",", ":"), default=str).encode
+
+
+def _columnable(key) -> bool:
+    return (isinstance(key, str) and key != "" and key not in RESERVED
+            and not any(c in key for c in "./\\"))
+
+
+def table_path(path: str, table: str) -> str:
+    """File of child table ``table`` for the main CSV at ``path``."""
+    stem = path[:-4] if path.endswith(".csv") else path
+    return f"{stem}.{table}.csv"
+
+
+def schema_path(path: str) -> str:
+    stem = path[:-4] if path.endswith(".csv") else path
+    return f"{stem}.schema.json"
+
+
+class _Stats:
+    """Types seen at one path of the sample."""
+
+    def __init__(self):
+        self.types = set()
+        self.fields: Dict[str, "_Stats"] = {}   # dict values
+        self.items: Optional["_Stats"] = None   # list items
+
+    def observe(self, value):
+        if value is None:
+            return
+        kind = type(value)
+        self.types.add(kind)
+        if kind is dict:
+            for key, sub in value.items():
+                if _columnable(key):
+                    self.fields.setdefault(key, _Stats()).observe(sub)
+        elif kind is list:
+            if self.items is None:
+                self.items = _Stats()
+            for item in value:
+                self.items.observe(item)
+
+
+class CsvSchema:
+    """Columns of the main table and of each child table, with their types.
+
+    ``tables`` maps a list field to ``(items, columns)``, ``items`` being
+    ``"dict"`` or ``"scalar"``.
+    """
+
+    def __init__(self, columns: List[Tuple[str, str]], tables: Dict[str, Tuple[str, List[Tuple[str, str]]]]):
+        self.columns = [tuple(c) for c in columns]
+        self.tables = {name: (items, [tuple(c) for c in cols]) for name, (items, cols) in tables.items()}
+
+    @classmethod
+    def infer(cls, records: Iterable[dict]) -> "CsvSchema":
+        root = _Stats()
+        for record in records:
+            root.observe(record)
+        columns, tables = [], {}
+        cls._flatten(root, (), columns, tables, in_item=False)
+        return cls(columns, tables)
+
+    @classmethod
+    def _flatten(cls, stats: _Stats, prefix: Tuple[str, ...], columns, tables, in_item: bool):
+        for key, sub in stats.fields.items():
+            path = prefix + (key,)
+            name = ".".join(path)
+            if sub.types == {dict}:
+                cls._flatten(sub, path, columns, tables, in_item)
+            elif sub.types == {list} and not in_item:
+                columns.append((name, "list"))
+                tables[name] = cls._item_columns(sub.items)
+            elif len(sub.types) == 1 and next(iter(sub.types)) in SCALAR_TYPES:
+                columns.append((name, SCALAR_TYPES[next(iter(sub.types))]))
+            else:  # mixed, None-only, or a list inside a list item
+                columns.append((name, "json"))
+
+    @classmethod
+    def _item_columns(cls, items: Optional[_Stats]):
+        if items is not None and items.types == {dict}:
+            columns = []
+            cls._flatten(items, (), columns, None, in_item=True)
+            return "dict", columns
+        if items is not None and len(items.types) == 1 and next(iter(items.types)) in SCALAR_TYPES:
+            return "scalar", [("value", SCALAR_TYPES[next(iter(items.types))])]
+        return "scalar", [("value", "json")]
+
+    def to_dict(self) -> dict:
+        return {"version": SCHEMA_VERSION,
+                "columns": [list(c) for c in self.columns],
+                "tables": {name: {"items": items, "columns": [list(c) for c in cols]}
+                           for name, (items, cols) in self.tables.items()}}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CsvSchema":
+        if data.get("version") != SCHEMA_VERSION:
+            raise ValueError(f"Unsupported CSV schema version: {data.get('version')!r}")
+        return cls(data["columns"], {name: (table["items"], table["columns"])
+                                     for name, table in data["tables"].items()})
+
+    def save(self, path: str):
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=4)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "CsvSchema":
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+def _tree(columns: List[Tuple[str, str]]) -> dict:
+    """Nested {key: subtree | (index, type)} for the flattening walk."""
+    tree: Dict[str, Any] = {}
+    for index, (name, kind) in enumerate(columns):
+        node = tree
+        *parents, leaf = name.split(".")
+        for key in parents:
+            node = node.setdefault(key, {})
+        node[leaf] = (index, kind)
+    return tree
+
+
+def _encode(value, kind: str):
+    """Cell text for ``value`` in a ``kind`` column, or None if it does not fit."""
+    if value is None:
+        return NULL
+    if kind == "str":
+        if type(value) is not str:
+            return None
+        if not value:
+            return EMPTY
+        return "\\" + value if value[0] == "\\" else value
+    if kind == "json":
+        return _encode_json(value)
+    if kind == "int":
+        return str(value) if type(value) is int else None
+    if kind == "float":
+        return repr(value) if type(value) is float else None
+    if kind == "bool":
+        return ("true" if value else "false") if type(value) is bool else None
+    return None
+
+
+def _decode(cell: str, kind: str):
+    if cell == NULL:
+        return None
+    if kind == "str":
+        if cell == EMPTY:
+            return ""
+        return cell[1:] if cell[0] == "\\" else cell
+    if kind == "int":
+        return int(cell)
+    if kind == "float":
+        return float(cell)
+    if kind == "bool":
+        return cell == "true"
+    return json.loads(cell)
+
+
+def _set(record: dict, path, value):
+    for key in path[:-1]:
+        record = record.setdefault(key, {})
+    record[path[-1]] = value
+
+
+class FlatCsvWriter:
+    """Stream nested records into a main CSV plus one CSV per list field."""
+
+    def __init__(self, path, schema: Optional[CsvSchema] = None, sample: int = SCHEMA_SAMPLE):
+        self.path = str(path)
+        self.schema = schema
+        self.sample = sample
+        self.rows: Dict[str, int] = {}
+        self.records = 0
+        self._pending: List[dict] = []
+        self._files = []
+        self._main = None
+        self._children: Dict[str, Any] = {}
+        self._closed = False
+        if schema is not None:
+            self._start()
+
+    def _open(self, path):
+        f = open(path, "w", newline="", encoding="utf-8", buffering=WRITE_BUFFER)
+        self._files.append(f)
+        return csv.writer(f)
+
+    def _start(self):
+        schema = self.schema
+        schema.save(schema_path(self.path))
+        self._main_tree = _tree(schema.columns)
+        self._main_width = len(schema.columns)
+        self._main = self._open(self.path)
+        self._main.writerow(["_id"] + [name for name, _ in schema.columns] + ["_extra"])
+        self.rows["main"] = 0
+        self._child_trees = {}
+        for table, (items, columns) in schema.tables.items():
+            writer = self._open(table_path(self.path, table))
+            writer.writerow(["_parent", "_idx"] + [name for name, _ in columns] + ["_extra"])
+            self._children[table] = writer
+            self._child_trees[table] = (_tree(columns), len(columns), items == "scalar")
+            self.rows[table] = 0
+
+    def write(self, record: dict):
+        if self._closed:
+            raise ValueError("I/O operation on a closed FlatCsvWriter")
+        if self._main is None:
+            self._pending.append(copy.deepcopy(record))
+            if len(self._pending) >= self.sample:
+                self._infer()
+            return
+        self._write_row(record)
+
+    def _infer(self):
+        self.schema = CsvSchema.infer(self._pending)
+        self._start()
+        pending, self._pending = self._pending, []
+        for record in pending:
+            self._write_row(record)
+
+    def _write_row(self, record: dict):
+        row_id = self.records
+        self.records += 1
+        row = [""] * self._main_width
+        extra = []
+        lists = []
+        self._flatten(record, self._main_tree, (), row, extra, lists)
+        self._main.writerow([row_id] + row + [_encode_json(extra) if extra else ""])
+        self.rows["main"] += 1
+        for table, items in lists:
+            writer = self._children[table]
+            tree, width, scalar = self._child_trees[table]
+            for idx, item in enumerate(items):
+                cells = [""] * width
+                item_extra = []
+                if scalar:
+                    cell = _encode(item, tree["value"][1])
+                    if cell is None:
+                        item_extra.append([[], item])
+                    else:
+                        cells[0] = cell
+                elif type(item) is dict:
+                    self._flatten(item, tree, (), cells, item_extra, None)
+                else:
+                    item_extra.append([[], item])
+                writer.writerow([row_id, idx] + cells + [_encode_json(item_extra) if item_extra else ""])
+            self.rows[table] += len(items)
+
+    def _flatten(self, obj: dict, tree: dict, prefix, row, extra, lists):
+        for key, value in obj.items():
+            node = tree.get(key)
+            if node is None:
+                extra.append([list(prefix) + [key], value])
+            elif type(node) is dict:
+                if type(value) is dict and value:
+                    self._flatten(value, node, prefix + (key,), row, extra, lists)
+                else:
+                    extra.append([list(prefix) + [key], value])
+            else:
+                index, kind = node
+                if kind == "list":
+                    if type(value) is list and lists is not None:
+                        row[index] = str(len(value))
+                        lists.append((".".join(prefix + (key,)), value))
+                    elif value is None:
+                        row[index] = NULL
+                    else:
+                        extra.append([list(prefix) + [key], value])
+                    continue
+                cell = _encode(value, kind)
+                if cell is None:
+                    extra.append([list(prefix) + [key], value])
+                else:
+                    row[index] = cell
+
+    def flush(self):
+        for f in self._files:
+            f.flush()
+
+    def close(self):
+        """Write any still-sampled records and close every table."""
+        if self._closed:
+            return
+        if self._main is None:
+            self._infer()
+        self._closed = True
+        for f in self._files:
+            f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _rows(path: str, header: List[str]) -> Iterator[List[str]]:
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        found = next(reader, None)
+        if found != header:
+            raise ValueError(f"{path}: header does not match the schema")
+        yield from reader
+
+
+def _unflatten(cells, columns, record: dict):
+    for cell, (name, kind) in zip(cells, columns):
+        if cell != "":
+            _set(record, name.split("."), _decode(cell, kind))
+
+
+def read_records(path, schema: Optional[CsvSchema] = None) -> Iterator[dict]:
+    """Rebuild the records written by ``FlatCsvWriter`` to ``path``, in order."""
+    path = str(path)
+    schema = schema or CsvSchema.load(schema_path(path))
+    children = {}
+    for table, (items, columns) in schema.tables.items():
+        header = ["_parent", "_idx"] + [name for name, _ in columns] + ["_extra"]
+        children[table] = (_rows(table_path(path, table), header), items == "scalar", columns)
+    header = ["_id"] + [name for name, _ in schema.columns] + ["_extra"]
+    for row in _rows(path, header):
+        record: Dict[str, Any] = {}
+        for cell, (name, kind) in zip(row[1:-1], schema.columns):
+            if cell == "":
+                continue
+            if kind != "list" or cell == NULL:
+                _set(record, name.split("."), _decode(cell, kind if kind != "list" else "json"))
+                continue
+            rows, scalar, columns = children[name]
+            items = []
+            for _ in range(int(cell)):
+                child = next(rows)
+                if child[0] != row[0]:
+                    raise ValueError(f"{table_path(path, name)}: row for record {child[0]}, expected {row[0]}")
+                extra = json.loads(child[-1]) if child[-1] else ()
+                if extra and not extra[0][0]:
+                    item = extra[0][1]  # an item the columns could not hold
+                elif scalar:
+                    item = _decode(child[2], columns[0][1])
+                else:
+                    item = {}
+                    _unflatten(child[2:-1], columns, item)
+                    for sub, value in extra:
+                        _set(item, sub, value)
+                items.append(item)
+            _set(record, name.split("."), items)
+        if row[-1]:
+            for sub, value in json.loads(row[-1]):
+                _set(record, sub, value)
+        yield record
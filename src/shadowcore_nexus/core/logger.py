@@ -0,0 +1,10 @@
+"""
+Ritual logging: ``log_event`` and ``log_history`` from ``utils.logging``.
+
+Rituals import this as ``core.logger`` (the package root on ``sys.path``),
+so the import is package-qualified: ``core.logger`` and
+``shadowcore_nexus.core.logger`` then write through the same daemon.log
+sink and history store.
+"""
+
+from shadowcore_nexus.utils.logging import log_event, log_history  # noqa: F401
@@ -0,0 +1,352 @@
+"""
+In-memory index of the hub's modules directory.
+
+A single ``os.scandir`` walk finds two kinds of modules:
+
+* ``file`` — a ``*.py`` file; its key is the file stem.
+* ``package`` — a directory holding ``__init__.py`` (or, for script-style
+  bundles like ``net_mapper/``, a ``main.py``). The whole directory is one
+  module; every ``*.py`` file below it counts towards its change signature.
+
+Plain directories without those markers are categories: they are walked and
+their modules get a dotted key (``category.module``). Names starting with
+``_`` or ``.`` and the watcher's ignored directories are skipped.
+
+After ``build()`` the index is kept up to date incrementally: ``update(paths)``
+re-walks only the units (file, package or category directory) that the
+changed paths belong to, and ``refresh()`` finds those units by stat'ing the
+known directories and files instead of relisting the whole tree. Both return
+an ``IndexDelta`` of added/changed/removed keys.
+"""
+
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from ..utils.file_monitor import IGNORED_DIRS
+
+PACKAGE_MARKERS = ("__init__.py", "main.py")
+
+
+class IndexRecord:
+    __slots__ = ("key", "kind", "root", "entry", "files", "dirs")
+
+    def __init__(self, key: str, kind: str, root: str, entry: str):
+        self.key = key
+        self.kind = kind
+        self.root = root      # the .py file, or the package directory
+        self.entry = entry    # file the manifest is read from and the loader executes
+        self.files: Dict[str, Tuple[int, int]] = {}  # .py path -> (mtime_ns, size)
+        self.dirs: Dict[str, int] = {}               # package sub-directory -> mtime_ns
+
+    @property
+    def mtime_ns(self) -> int:
+        return max((st[0] for st in self.files.values()), default=0)
+
+    @property
+    def signature(self):
+        """Changes whenever the module's code on disk changes."""
+        return (self.kind, self.entry, tuple(sorted(self.files.items())))
+
+    @property
+    def package_dir(self) -> Optional[str]:
+        return self.root if self.kind == "package" else None
+
+
+class IndexDelta:
+    def __init__(self, added=(), changed=(), removed=()):
+        self.added: Set[str] = set(added)
+        self.changed: Set[str] = set(changed)
+        self.removed: Set[str] = set(removed)
+
+    def __bool__(self):
+        return bool(self.added or self.changed or self.removed)
+
+    def __repr__(self):
+        return (f"IndexDelta(added={sorted(self.added)}, changed={sorted(self.changed)}, "
+                f"removed={sorted(self.removed)})")
+
+
+def _skip(name: str) -> bool:
+    return name.startswith((".", "_")) or name in IGNORED_DIRS
+
+
+class ModuleIndex:
+    def __init__(self, root: Path):
+        self.root = os.path.realpath(root)
+        self.records: Dict[str, IndexRecord] = {}
+        self.by_root: Dict[str, str] = {}            # record root -> key
+        self.categories: Dict[str, Tuple[str, int]] = {}  # dir -> (key prefix, mtime_ns)
+        self.children: Dict[str, Set[str]] = {}      # category dir -> names indexed in it
+        self.built = False
+        self._touched: Optional[Set[str]] = None
+
+    def __len__(self):
+        return len(self.records)
+
+    def get(self, key: str) -> Optional[IndexRecord]:
+        return self.records.get(key)
+
+    def sorted_records(self) -> List[IndexRecord]:
+        return [self.records[k] for k in sorted(self.records)]
+
+    # --- full walk ---------------------------------------------------------
+    def build(self) -> IndexDelta:
+        """Walk the whole tree once with ``os.scandir``."""
+        before = self._signatures() if self.records else None
+        self.records.clear()
+        self.by_root.clear()
+        self.categories.clear()
+        self.children.clear()
+        self._walk(self.root, "")
+        self.built = True
+        if before is None:
+            return IndexDelta(added=self.records)
+        return self._delta(before)
+
+    def _walk(self, directory: str, key: str, mtime_ns: Optional[int] = None):
+        """Index ``directory`` and everything below it.
+
+        Whether a directory is a package is decided from its own listing, so
+        each directory costs one ``scandir`` and one stat.
+        """
+        stack = [(directory, key, mtime_ns)]
+        while stack:
+            directory, key, mtime_ns = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    items = list(it)
+                if mtime_ns is None:
+                    mtime_ns = os.stat(directory).st_mtime_ns
+            except OSError:
+                continue
+            if directory != self.root and any(item.name in PACKAGE_MARKERS for item in items):
+                self._insert(self._scan_package(directory, key, items, mtime_ns))
+                continue
+            prefix = key + "." if key else ""
+            self.categories[directory] = (prefix, mtime_ns)
+            names = self.children.setdefault(directory, set())
+            for item in items:
+                if _skip(item.name):
+                    continue
+                try:
+                    if item.is_dir(follow_symlinks=False):
+                        stack.append((item.path, prefix + item.name,
+                                      item.stat(follow_symlinks=False).st_mtime_ns))
+                        names.add(item.name)
+                    elif item.name.endswith(".py") and item.is_file():
+                        self._add_file(item.path, prefix + item.name[:-3], item.stat())
+                        names.add(item.name)
+                except OSError:
+                    continue
+
+    @staticmethod
+    def _is_package(directory: str) -> bool:
+        return any(os.path.isfile(os.path.join(directory, m)) for m in PACKAGE_MARKERS)
+
+    def _add_file(self, path: str, key: str, st: os.stat_result):
+        record = IndexRecord(key, "file", path, path)
+        record.files[path] = (st.st_mtime_ns, st.st_size)
+        self._insert(record)
+
+    @staticmethod
+    def _scan_package(directory: str, key: str, items=None, mtime_ns: Optional[int] = None) -> IndexRecord:
+        record = IndexRecord(key, "package", directory, "")
+        stack = [(directory, items, mtime_ns)]
+        while stack:
+            current, items, mtime_ns = stack.pop()
+            try:
+                if items is None:
+                    with os.scandir(current) as it:
+                        items = list(it)
+                record.dirs[current] = mtime_ns if mtime_ns is not None else os.stat(current).st_mtime_ns
+                for item in items:
+                    if item.name in IGNORED_DIRS or item.name.startswith("."):
+                        continue
+                    if item.is_dir(follow_symlinks=False):
+                        stack.append((item.path, None, None))
+                    elif item.name.endswith(".py") and item.is_file():
+                        st = item.stat()
+                        record.files[item.path] = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                continue
+        init = os.path.join(directory, "__init__.py")
+        record.entry = init if init in record.files else os.path.join(directory, "main.py")
+        return record
+
+    def _insert(self, record: IndexRecord):
+        old = self.records.get(record.key)
+        if old is not None and old.root != record.root:
+            # Same key from two places (e.g. foo.py next to foo/): first one wins.
+            return
+        self.records[record.key] = record
+        self.by_root[record.root] = record.key
+        if self._touched is not None:
+            self._touched.add(record.key)
+
+    # --- incremental -------------------------------------------------------
+    def update(self, paths: Iterable[str]) -> IndexDelta:
+        """Re-index only what ``paths`` (changed files or dirs) belong to."""
+        if not self.built:
+            return self.build()
+        units = set()
+        for raw in paths:
+            path = os.path.realpath(raw)
+            if path == self.root:
+                return self.build()  # watcher lost events: start over
+            unit = self._unit_for(path)
+            if unit is not None:
+                units.add(unit)
+        return self._apply(units)
+
+    def refresh(self) -> IndexDelta:
+        """Find changes by stat'ing known dirs and files (no full relisting)."""
+        if not self.built:
+            return self.build()
+        units = set()
+        for directory, (_prefix, mtime_ns) in list(self.categories.items()):
+            try:
+                changed = os.stat(directory).st_mtime_ns != mtime_ns
+            except OSError:
+                changed = True
+            if changed:
+                units.update(self._changed_children(directory))
+        for record in list(self.records.values()):
+            if self._stale(record):
+                units.add(record.root)
+        return self._apply(units)
+
+    def _stale(self, record: IndexRecord) -> bool:
+        try:
+            for path, (mtime_ns, size) in record.files.items():
+                st = os.stat(path)
+                if st.st_mtime_ns != mtime_ns or st.st_size != size:
+                    return True
+            dirs_changed = any(os.stat(path).st_mtime_ns != mtime_ns
+                               for path, mtime_ns in record.dirs.items())
+        except OSError:
+            return True
+        if dirs_changed:
+            # Files added/removed -- or just a __pycache__ written on import.
+            fresh = self._scan_package(record.root, record.key)
+            if fresh.signature != record.signature:
+                return True
+            record.dirs = fresh.dirs
+        return False
+
+    def _changed_children(self, directory: str) -> Set[str]:
+        """Units for entries added to or removed from a category directory."""
+        if directory != self.root and self._is_package(directory):
+            return {directory}
+        known = self.children.get(directory, set())
+        try:
+            with os.scandir(directory) as it:
+                present = {item.name for item in it if not _skip(item.name)
+                           and (item.name.endswith(".py") or item.is_dir(follow_symlinks=False))}
+        except OSError:
+            return {directory}
+        units = {os.path.join(directory, name) for name in present ^ known}
+        # Contents changed in place; keep the recorded mtime current.
+        prefix = self.categories[directory][0]
+        try:
+            self.categories[directory] = (prefix, os.stat(directory).st_mtime_ns)
+        except OSError:
+            pass
+        return units
+
+    def _unit_for(self, path: str) -> Optional[str]:
+        """The file, package dir or category dir that ``path`` belongs to."""
+        if path != self.root and not path.startswith(self.root + os.sep):
+            return None
+        # Inside a known package: the package is the unit.
+        current = path
+        while current != self.root:
+            if current in self.by_root and self.records[self.by_root[current]].kind == "package":
+                return current
+            current = os.path.dirname(current)
+        parent = os.path.dirname(path)
+        if os.path.basename(path) in PACKAGE_MARKERS and parent != self.root:
+            return parent  # a category dir became (or stopped being) a package
+        # Otherwise: the child of the nearest indexed category directory.
+        child = path
+        while parent not in self.categories:
+            if parent == self.root:
+                return None
+            child, parent = parent, os.path.dirname(parent)
+        return child
+
+    def _apply(self, units: Set[str]) -> IndexDelta:
+        if not units:
+            return IndexDelta()
+        # Drop nested units whose ancestor is re-walked anyway.
+        units = sorted(units)
+        outer = [u for i, u in enumerate(units)
+                 if not any(u.startswith(o + os.sep) for o in units[:i])]
+        # Only the records under these units are diffed, not the whole index.
+        before = {}
+        self._touched = set()
+        try:
+            for unit in outer:
+                before.update(self._drop_under(unit))
+                self._index_unit(unit)
+            after = {k: self.records[k].signature for k in self._touched if k in self.records}
+        finally:
+            self._touched = None
+        return IndexDelta(
+            added=after.keys() - before.keys(),
+            removed=before.keys() - after.keys(),
+            changed=[k for k in after.keys() & before.keys() if after[k] != before[k]],
+        )
+
+    def _drop_under(self, path: str) -> Dict[str, tuple]:
+        """Forget everything indexed at or below ``path``; returns their signatures."""
+        dropped = {}
+        if path in self.categories or path in self.by_root:
+            prefix = path + os.sep
+            if path in self.categories or self.records[self.by_root[path]].kind == "package":
+                roots = [r for r in self.by_root if r == path or r.startswith(prefix)]
+                for directory in [d for d in self.categories if d == path or d.startswith(prefix)]:
+                    del self.categories[directory]
+                    self.children.pop(directory, None)
+            else:
+                roots = [path]
+            for root in roots:
+                key = self.by_root.pop(root)
+                record = self.records.get(key)
+                if record is not None and record.root == root:
+                    dropped[key] = record.signature
+                    del self.records[key]
+        parent = os.path.dirname(path)
+        if parent in self.children:
+            self.children[parent].discard(os.path.basename(path))
+        return dropped
+
+    def _index_unit(self, path: str):
+        parent = os.path.dirname(path)
+        name = os.path.basename(path)
+        if parent not in self.categories or _skip(name):
+            return
+        prefix = self.categories[parent][0]
+        try:
+            st = os.stat(path)
+        except OSError:
+            return  # removed
+        if os.path.isdir(path):
+            self._walk(path, prefix + name, st.st_mtime_ns)
+        elif name.endswith(".py"):
+            self._add_file(path, prefix + name[:-3], st)
+        else:
+            return
+        self.children[parent].add(name)
+
+    # --- deltas ------------------------------------------------------------
+    def _signatures(self):
+        return {key: record.signature for key, record in self.records.items()}
+
+    def _delta(self, before) -> IndexDelta:
+        after = self._signatures()
+        return IndexDelta(
+            added=after.keys() - before.keys(),
+            removed=before.keys() - after.keys(),
+            changed=[k for k in after.keys() & before.keys() if after[k] != before[k]],
+        )
@@ -1,32 +1,111 @@
 from pathlib import Path
+import hashlib
+import importlib
 import importlib.util
 import sys
+import threading
+import time
 import traceback
-from typing import Dict, Optional
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional
 from ..utils.validation import validate_module_contract
 from ..utils.logging import get_logger
+from .discovery_cache import DiscoveryCache
+from .import_graph import ImportGraph, track_imports
+from .module_index import IndexDelta, IndexRecord, ModuleIndex
+from .module_manifest import ModuleManifest, parse_manifest, scan_manifest
+from .paths import ensure_root_on_path
+from .startup_profiler import get_profiler
 
 logger = get_logger(__name__)
 
 class ModuleEntry:
-    def __init__(self, path: Path):
+    def __init__(self, path: Path, key: Optional[str] = None, kind: str = "file",
+                 package_dir: Optional[Path] = None):
         self.path = path
-        self.key = path.stem
+        self.key = key or path.stem
+        self.kind = kind
+        self.package_dir = package_dir  # set for package modules; path is then its __init__/main
         self.module = None
+        self.manifest: Optional[ModuleManifest] = None
         self.metadata = {}
         self.mtime = 0
+        self.load_time = None
+
+    @property
+    def loaded(self):
+        return self.module is not None
+
+    def scan(self, manifest: Optional[ModuleManifest] = None):
+        """Read the module's manifest statically, without importing it."""
+        self.manifest = manifest or scan_manifest(self.path)
+        self.metadata = self.manifest.display_metadata(self.key)
+        try:
+            self.mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            return False
+        if self.manifest.error:
+            logger.warning(f"Manifest scan failed for {self.key}: {self.manifest.error}")
+            return False
+        return True
+
+    def ensure_loaded(self):
+        """Import the module on first use (manifest mode)."""
+        if self.module is None:
+            return self.load()
+        return True
+
+    def unload(self):
+        """Tear down the loaded module so a reload doesn't leave the old one alive.
+
+        Calls the module's optional ``teardown()`` hook (to undo callbacks or
+        threads it registered), then drops it and its submodules from
+        ``sys.modules`` and releases the loader's own references.
+        """
+        mod = self.module
+        if mod is None:
+            return
+        teardown = getattr(mod, "teardown", None)
+        if callable(teardown):
+            try:
+                teardown()
+            except Exception as e:
+                logger.error(f"teardown() failed for {self.key}: {e!r}")
+        prefix = self.key + "."
+        for name in [n for n in sys.modules if n == self.key or n.startswith(prefix)]:
+            if name == self.key and sys.modules[name] is not mod:
+                continue
+            del sys.modules[name]
+        self.module = None
+        self.metadata = self.manifest.display_metadata(self.key) if self.manifest else {}
 
     def load(self):
         """Load a single module, validate it, and capture metadata."""
+        with get_profiler().span(f"load {self.key}", "module"):
+            return self._load()
+
+    def _load(self):
+        self.unload()
+        ensure_root_on_path()
+        start = time.perf_counter()
         try:
             spec_name = self.key
-            spec = importlib.util.spec_from_file_location(spec_name, str(self.path))
+            search = [str(self.package_dir)] if self.package_dir is not None else None
+            spec = importlib.util.spec_from_file_location(spec_name, str(self.path),
+                                                          submodule_search_locations=search)
             if not spec or not spec.loader:
                 raise ImportError(f"Invalid module: {spec_name}")
 
             mod = importlib.util.module_from_spec(spec)
             sys.modules[spec_name] = mod
-            spec.loader.exec_module(mod)  # type: ignore
+            try:
+                spec.loader.exec_module(mod)  # type: ignore
+            except BaseException:
+                # Don't leave a half-initialised module importable.
+                if sys.modules.get(spec_name) is mod:
+                    del sys.modules[spec_name]
+                raise
 
             # Validate module structure
             mod = validate_module_contract(mod, spec_name)
@@ -37,65 +116,323 @@ class ModuleEntry:
             elif hasattr(mod, "register") and callable(mod.register):
                 self.metadata = mod.register() or {}
             elif hasattr(mod, "main") and callable(mod.main):
-                self.metadata = {"name": self.key, "run": getattr(mod, "main")}
+                base = self.manifest.display_metadata(self.key) if self.manifest else {"name": self.key}
+                self.metadata = dict(base, run=getattr(mod, "main"))
 
             self.module = mod
             self.mtime = self.path.stat().st_mtime
+            self.load_time = time.perf_counter() - start
             logger.info(f"Loaded module: {self.key}")
             return True
-        except Exception as e:
-            logger.error(f"Failed to load {self.key}: {e}")
+        except (Exception, SystemExit) as e:
+            logger.error(f"Failed to load {self.key}: {e!r}")
             traceback.print_exc()
             return False
 
 class ModuleLoader:
-    def __init__(self, modules_dir: Path = Path("modules")):
+    def __init__(self, modules_dir: Path = Path("modules"), lazy: bool = True,
+                 use_cache: bool = True, cache_dir: Optional[Path] = None, workers: int = 1):
         self.modules_dir = Path(modules_dir)
         self.modules_dir.mkdir(parents=True, exist_ok=True)
+        self.lazy = lazy
+        self.workers = max(1, int(workers))
         self.entries: Dict[str, ModuleEntry] = {}
+        self.cache: Optional[DiscoveryCache] = None
+        self.last_discovery: Dict[str, object] = {}
+        self.index = ModuleIndex(self.modules_dir)
+        self.graph = ImportGraph()
+        self._loading = set()
+        self._loading_lock = threading.Lock()
+        self._loaded_at: Dict[str, float] = {}
+        self.last_invalidated = set()  # keys the last reload made stale (for run-pool workers)
+        if use_cache:
+            if cache_dir is None:
+                from .path_resolver import PathResolver
+                cache_dir = PathResolver().resolve("cache")
+            self.cache = DiscoveryCache(cache_dir, self.modules_dir)
+            self.cache.load()
+
+    def _scan(self, entry: ModuleEntry):
+        """Scan an entry's manifest, served from the discovery cache when unchanged."""
+        if self.cache is None:
+            return entry.scan(), False
+        try:
+            st = entry.path.stat()
+        except FileNotFoundError:
+            return False, False
+        record = self.cache.lookup(entry.path, st)
+        if record is not None:
+            entry.scan(ModuleManifest.from_dict(entry.path, record.get("manifest") or {}))
+            return bool(record.get("valid")), True
+
+        start = time.perf_counter()
+        try:
+            data = entry.path.read_bytes()
+        except OSError:
+            return entry.scan(), False
+        ok = entry.scan(parse_manifest(data.decode("utf-8", errors="replace"), entry.path))
+        timings = {"scan_ms": (time.perf_counter() - start) * 1000}
+        self.cache.store(entry.path, st, hashlib.sha256(data).hexdigest(),
+                         entry.manifest.to_dict(), ok, timings)
+        return ok, False
+
+    def _record_load(self, entry: ModuleEntry, ok: bool):
+        if self.cache is None or entry.load_time is None:
+            return
+        self.cache.update_timings(entry.path, load_ms=entry.load_time * 1000)
+        record = self.cache.records.get(str(entry.path))
+        if record is not None:
+            record["valid"] = ok
+
+    def ensure_loaded(self, entry: ModuleEntry):
+        """Import a manifest-only entry on first run and remember its load time."""
+        if entry.loaded:
+            return True
+        return self._load_entry(entry)
+
+    def _load_entry(self, entry: ModuleEntry) -> bool:
+        """Import one entry, recording which hub modules its code imports."""
+        self.graph.reset(entry.key)
+        with self._loading_lock:
+            self._loading.add(entry.key)
+        try:
+            with track_imports(entry.key, self._observe_import):
+                ok = entry.load()
+        finally:
+            with self._loading_lock:
+                self._loading.discard(entry.key)
+                self._loaded_at[entry.key] = time.monotonic()
+        self._record_load(entry, ok)
+        return ok
+
+    def _resolve_key(self, name: str) -> Optional[str]:
+        """Hub entry an import name refers to (``pkg.sub`` -> ``pkg``), if any."""
+        while name:
+            if name in self.entries:
+                return name
+            name = name.rpartition(".")[0]
+        return None
+
+    def _observe_import(self, importer: str, name: str):
+        key = self._resolve_key(name)
+        if key is None or key == importer or importer.startswith(key + "."):
+            return
+        self.graph.add(importer, key)
+        entry = self.entries.get(key)
+        if entry is None or entry.loaded:
+            return
+        with self._loading_lock:
+            if key in self._loading:
+                return  # import cycle or loading on another thread
+        # Lazy mode: load the sibling now so `from logger import Logger` finds it.
+        self._load_entry(entry)
+
+    def save_cache(self):
+        if self.cache is not None:
+            self.cache.save()
 
     def discover_all(self):
-        """Load all modules in the directory."""
-        for p in sorted(self.modules_dir.glob("*.py")):
-            if p.name.startswith("_"):
-                continue
-            key = p.stem
-            if key not in self.entries:
-                self.entries[key] = ModuleEntry(p)
-            self.entries[key].load()
+        """Discover all modules in the directory.
+
+        Single-file and package modules come from one ``os.scandir`` walk
+        (``ModuleIndex``). In manifest mode (``lazy=True``) modules are only
+        scanned statically; they are imported by ``ensure_loaded()`` on first
+        run. Unchanged modules are served from the discovery cache.
+        """
+        start = time.perf_counter()
+        profiler = get_profiler()
+        with profiler.span("index modules dir", "scan"):
+            self.index.build()
+        hits = misses = 0
+        to_load = []
+        for record in self.index.sorted_records():
+            entry = self._entry_for(record)
+            hit = False
+            if not entry.loaded:
+                with profiler.span(f"scan {entry.key}", "scan"):
+                    _, hit = self._scan(entry)
+            if not self.lazy or entry.loaded:
+                to_load.append(entry)
+            hits += hit
+            misses += not hit
+        self.load_entries(to_load)
 
         # Prune removed
-        to_remove = [k for k, e in self.entries.items() if not e.path.exists()]
-        for k in to_remove:
-            self.entries.pop(k, None)
+        for k in [k for k in self.entries if self.index.get(k) is None]:
+            self.entries.pop(k).unload()
+
+        if self.cache is not None:
+            self.cache.prune(e.path for e in self.entries.values())
+            self.save_cache()
+        self.last_discovery = {
+            "cache": self.cache.state if self.cache is not None else "disabled",
+            "hits": hits,
+            "misses": misses,
+            "elapsed_ms": (time.perf_counter() - start) * 1000,
+            "loaded": len(to_load),
+            "workers": self.workers,
+            "packages": sum(1 for e in self.entries.values() if e.kind == "package"),
+        }
+        logger.debug(f"Discovery: {self.last_discovery}")
+
+    def _entry_for(self, record: IndexRecord) -> ModuleEntry:
+        """The entry for an index record; replaced if the module changed shape."""
+        entry = self.entries.get(record.key)
+        path = Path(record.entry)
+        if entry is not None and entry.path == path and entry.kind == record.kind:
+            return entry
+        if entry is not None:
+            entry.unload()
+        package_dir = Path(record.package_dir) if record.package_dir else None
+        entry = self.entries[record.key] = ModuleEntry(path, record.key, record.kind, package_dir)
+        return entry
+
+    def load_entries(self, entries: List[ModuleEntry]) -> Dict[str, bool]:
+        """Import entries, on a bounded thread pool when ``workers > 1``.
+
+        Entries are loaded in dependency waves: a module importing a sibling
+        hub module waits for the wave holding that sibling, so it never sees
+        a half-executed module in ``sys.modules``. Third-party imports shared
+        by several modules are warmed once up front instead of having every
+        worker block on the same module import lock. A failure only affects
+        its own entry.
+        """
+        entries = list(entries)
+        results: Dict[str, bool] = {}
+        batch_start = time.monotonic()
+
+        def load(entry):
+            # Already imported on demand by a sibling earlier in this batch.
+            if entry.loaded and self._loaded_at.get(entry.key, 0) > batch_start:
+                return True
+            return self._load_entry(entry)
+
+        if self.workers <= 1 or len(entries) < 2:
+            for wave in self._load_waves(entries):
+                for entry in wave:
+                    results[entry.key] = load(entry)
+        else:
+            self._prewarm_shared_imports(entries)
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="scn-load") as pool:
+                for wave in self._load_waves(entries):
+                    futures = {pool.submit(load, entry): entry for entry in wave}
+                    for future in as_completed(futures):
+                        entry = futures[future]
+                        try:
+                            results[entry.key] = future.result()
+                        except BaseException as e:
+                            logger.error(f"Failed to load {entry.key}: {e!r}")
+                            results[entry.key] = False
+        return results
+
+    def _load_waves(self, entries: List[ModuleEntry]) -> List[List[ModuleEntry]]:
+        """Group entries into waves; each wave only depends on earlier ones.
+
+        Dependencies are the static imports from the manifest plus the hub
+        imports observed the last time each module loaded.
+        """
+        by_key = {e.key: e for e in entries}
+        deps = {}
+        for e in entries:
+            imports = e.manifest.imports if e.manifest else ()
+            found = {self._resolve_key(name) for name in imports} | self.graph.dependencies(e.key)
+            deps[e.key] = found & by_key.keys() - {e.key}
+
+        waves = []
+        done = set()
+        pending = sorted(by_key)
+        while pending:
+            ready = [k for k in pending if deps[k] <= done]
+            if not ready:
+                # Import cycle: fall back to one-at-a-time for what's left.
+                waves.extend([by_key[k]] for k in pending)
+                break
+            waves.append([by_key[k] for k in ready])
+            done.update(ready)
+            pending = [k for k in pending if k not in done]
+        return waves
+
+    def _prewarm_shared_imports(self, entries: List[ModuleEntry]):
+        counts = Counter()
+        for e in entries:
+            if e.manifest:
+                counts.update(e.manifest.imports)
+        for name, count in sorted(counts.items()):
+            if count < 2 or name in sys.modules or name.split(".")[0] in self.entries:
+                continue
+            try:
+                importlib.import_module(name)
+            except (Exception, SystemExit) as e:
+                # The owning module will report this when it loads.
+                logger.debug(f"Prewarm of shared import {name} failed: {e!r}")
 
     def get_list(self):
-        """Return list of (key, display_name, entry) tuples."""
-        return [(k, e.metadata.get("name", k), e) for k, e in self.entries.items()]
+        """Return list of (key, display_name, entry) tuples, sorted by key."""
+        return [(k, e.metadata.get("name", k), e) for k, e in sorted(self.entries.items())]
 
     def reload_if_changed(self):
-        """Reload modules if file timestamps changed, detect new ones."""
-        changed = False
-        for k, e in list(self.entries.items()):
-            try:
-                mtime = e.path.stat().st_mtime
-                if mtime != e.mtime:
-                    logger.info(f"Reloading module: {k}")
-                    e.load()
-                    changed = True
-            except FileNotFoundError:
+        """Reload changed modules and pick up new/removed ones.
+
+        Updates the module index incrementally: only directories whose mtime
+        moved are relisted, and only modules whose files changed are reloaded.
+        """
+        return self._apply_delta(self.index.refresh())
+
+    def reload_paths(self, paths: Iterable) -> bool:
+        """Reload only the modules that ``paths`` belong to.
+
+        Used by the event-driven watcher: a changed file inside a package
+        reloads that package, new files and packages become entries, deleted
+        ones are dropped, and untouched modules are never stat'ed or reloaded.
+        """
+        return self._apply_delta(self.index.update(paths))
+
+    def _apply_delta(self, delta: IndexDelta) -> bool:
+        """Apply index changes: changed files plus their loaded dependents.
+
+        Modules that imported a changed or removed module (transitively, per
+        the import graph recorded at load time) are reloaded after it, so none
+        keeps a reference to the stale version. Nothing else is touched.
+        """
+        stale = self.graph.dependents(delta.changed | delta.removed)
+        self.last_invalidated = set(delta.changed | delta.removed | stale)
+        for k in sorted(delta.removed):
+            entry = self.entries.pop(k, None)
+            self.graph.discard(k)
+            if entry is not None:
                 logger.warning(f"Module removed: {k}")
-                self.entries.pop(k, None)
-                changed = True
+                entry.unload()
+        to_load = []
+        for k in sorted(delta.added | delta.changed):
+            record = self.index.get(k)
+            if record is None:
+                continue
+            logger.info(f"Reloading module: {k}")
+            to_load.append(self._entry_for(record))
+        dependents = []
+        for k in sorted(stale - delta.added - delta.changed):
+            entry = self.entries.get(k)
+            if entry is not None and entry.loaded:
+                logger.info(f"Reloading module: {k} (imports a changed module)")
+                dependents.append(entry)
+        self._apply_reloads(to_load, dependents)
+        if delta:
+            self.save_cache()
+        return bool(delta)
 
-        # Detect new files
-        for p in self.modules_dir.glob("*.py"):
-            if p.stem not in self.entries and not p.name.startswith("_"):
-                self.entries[p.stem] = ModuleEntry(p)
-                self.entries[p.stem].load()
-                changed = True
+    def _apply_reloads(self, to_load: List[ModuleEntry], dependents: List[ModuleEntry] = ()):
+        """Rescan and re-import changed entries; ``dependents`` are only re-imported."""
+        imports = []
+        for e in to_load:
+            self._scan(e)
+            if not self.lazy or e.loaded:
+                imports.append(e)
+        self.load_entries(imports + list(dependents))
 
-        return changed
+    def unload_all(self):
+        """Tear down every loaded module (hub shutdown)."""
+        for entry in self.entries.values():
+            entry.unload()
 
     def get_entry(self, key) -> Optional[ModuleEntry]:
         """Retrieve ModuleEntry by key."""
@@ -0,0 +1,167 @@
+"""
+Static manifest extraction for hub modules.
+
+Reads a module's source with ``ast`` and records what the loader needs to list
+it (``MODULE_META``, ``register``, ``main``/``run``) without executing it, so
+heavy imports are only paid for when a module is actually run. The absolute
+imports executed at module level are recorded too, for load scheduling.
+Package modules are described by their ``__init__.py``; its literal package
+dunders (``__package_name__``, ``__version__``, ``__exported_methods__`` ...)
+feed the display metadata when there is no ``MODULE_META``.
+"""
+
+import ast
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+ENTRYPOINTS = ("main", "run", "register")
+
+# package dunder -> display metadata key
+PACKAGE_FIELDS = {
+    "__package_name__": "name",
+    "__version__": "version",
+    "__description__": "description",
+    "__module_type__": "type",
+    "__author__": "author",
+    "__compatibility__": "compatibility",
+    "__exported_methods__": "exported_methods",
+}
+
+
+class ModuleManifest:
+    def __init__(self, path: Path, meta: Optional[Dict[str, Any]] = None,
+                 meta_dynamic: bool = False, functions=(), imports=(),
+                 error: Optional[str] = None, package_info: Optional[Dict[str, Any]] = None):
+        self.path = path
+        self.meta = meta or {}
+        self.package_info = package_info or {}
+        self.meta_dynamic = meta_dynamic
+        self.functions = frozenset(functions)
+        self.imports = frozenset(imports)
+        self.error = error
+
+    @property
+    def has_meta(self):
+        return bool(self.meta) or self.meta_dynamic
+
+    @property
+    def has_register(self):
+        return "register" in self.functions
+
+    @property
+    def has_main(self):
+        return "main" in self.functions
+
+    @property
+    def is_runnable(self):
+        """True when the module exposes something the hub can call."""
+        return self.has_meta or bool(self.functions)
+
+    def display_metadata(self, key: str) -> Dict[str, Any]:
+        """Metadata usable for listing the module before it is imported."""
+        metadata = {PACKAGE_FIELDS[k]: v for k, v in self.package_info.items()}
+        metadata.update(self.meta)
+        metadata.setdefault("name", key)
+        return metadata
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "meta": self.meta,
+            "meta_dynamic": self.meta_dynamic,
+            "functions": sorted(self.functions),
+            "imports": sorted(self.imports),
+            "error": self.error,
+            "package_info": self.package_info,
+        }
+
+    @classmethod
+    def from_dict(cls, path: Path, data: Dict[str, Any]) -> "ModuleManifest":
+        return cls(
+            path,
+            meta=data.get("meta") or {},
+            meta_dynamic=bool(data.get("meta_dynamic")),
+            functions=data.get("functions") or (),
+            imports=data.get("imports") or (),
+            error=data.get("error"),
+            package_info=data.get("package_info") or {},
+        )
+
+
+def _literal_meta(node: ast.AST):
+    """Return (meta, dynamic) for the value assigned to MODULE_META."""
+    try:
+        value = ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        return {}, True
+    if isinstance(value, dict):
+        return value, False
+    return {}, True
+
+
+def _module_level(body):
+    """Yield statements executed at import time (descends into if/try/with)."""
+    for node in body:
+        yield node
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            continue
+        for field in ("body", "orelse", "finalbody"):
+            yield from _module_level(getattr(node, field, ()) or ())
+        for handler in getattr(node, "handlers", ()) or ():
+            yield from _module_level(handler.body)
+
+
+def _absolute_imports(body):
+    imports = set()
+    for node in _module_level(body):
+        if isinstance(node, ast.Import):
+            imports.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and not node.level and node.module:
+            imports.add(node.module)
+    return imports
+
+
+def parse_manifest(source: str, path: Path) -> ModuleManifest:
+    """Extract a manifest from module source text."""
+    try:
+        tree = ast.parse(source, filename=str(path))
+    except SyntaxError as e:
+        return ModuleManifest(path, error=f"SyntaxError: {e.msg} (line {e.lineno})")
+
+    meta, meta_dynamic = {}, False
+    package_info = {}
+    functions = set()
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            if node.name in ENTRYPOINTS:
+                functions.add(node.name)
+        elif isinstance(node, ast.Assign):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    if target.id == "MODULE_META":
+                        meta, meta_dynamic = _literal_meta(node.value)
+                    elif target.id in ENTRYPOINTS:
+                        functions.add(target.id)
+                    elif target.id in PACKAGE_FIELDS:
+                        try:
+                            package_info[target.id] = ast.literal_eval(node.value)
+                        except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+                            pass
+        elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+            if node.target.id == "MODULE_META" and node.value is not None:
+                meta, meta_dynamic = _literal_meta(node.value)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                if (alias.asname or alias.name) in ENTRYPOINTS:
+                    functions.add(alias.asname or alias.name)
+
+    return ModuleManifest(path, meta=meta, meta_dynamic=meta_dynamic, functions=functions,
+                          imports=_absolute_imports(tree.body), package_info=package_info)
+
+
+def scan_manifest(path: Path) -> ModuleManifest:
+    """Read and statically scan a module file. Never imports it."""
+    try:
+        source = Path(path).read_text(encoding="utf-8", errors="replace")
+    except OSError as e:
+        return ModuleManifest(Path(path), error=str(e))
+    return parse_manifest(source, Path(path))
@@ -0,0 +1,493 @@
+"""
+Out-of-process module execution pool.
+
+Module runs are dispatched to a fixed number of pre-forked worker processes
+that import the hub's common dependencies once at startup and then stay warm.
+Each worker's stdout/stderr (file descriptors 1 and 2, so subprocess output is
+captured too) and results are streamed back over a ``multiprocessing``
+connection whose file descriptor the UI watches (``MainLoop.watch_file``).
+
+Runs beyond the concurrency limit are queued. A run can be cancelled or time
+out; both terminate the worker executing it and start a fresh one.
+
+Workers keep each module they ran imported, re-importing it when its file
+changes. ``invalidate(keys)`` evicts modules whose dependencies changed (the
+loader's import-graph dependents) so their next run re-imports them too.
+"""
+
+import importlib
+import importlib.util
+import itertools
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from ..utils.logging import get_logger
+from .paths import ensure_root_on_path
+
+logger = get_logger(__name__)
+
+COMMON_IMPORTS = (
+    "argparse", "csv", "datetime", "json", "logging", "pathlib", "random",
+    "socket", "subprocess", "threading", "time",
+)
+
+_END_MARKER = b"\x00SCN-RUN-END\x00"
+
+
+def _mp_context():
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context("spawn")
+
+
+class RunHandle:
+    """State of one module run, as seen by the parent process."""
+
+    def __init__(self, run_id: int, key: str, path: Path, args: tuple, kwargs: dict,
+                 timeout: Optional[float], on_output: Optional[Callable], on_done: Optional[Callable],
+                 package_dir: Optional[Path] = None):
+        self.run_id = run_id
+        self.key = key
+        self.path = path
+        self.package_dir = package_dir
+        self.args = args
+        self.kwargs = kwargs
+        self.timeout = timeout
+        self.on_output = on_output
+        self.on_done = on_done
+        self.state = "queued"
+        self.result = None
+        self.error = None
+        self.submitted = time.monotonic()
+        self.started = None
+        self.finished = None
+        self._pool = None
+
+    @property
+    def done(self):
+        return self.state in ("done", "failed", "cancelled", "timeout")
+
+    def cancel(self):
+        if self._pool is not None:
+            self._pool.cancel(self.run_id)
+
+
+class _StreamPump(threading.Thread):
+    """Worker side: forward everything written to an fd back to the parent."""
+
+    def __init__(self, fd: int, stream: str, send: Callable, current_run: Callable):
+        super().__init__(daemon=True, name=f"scn-pump-{stream}")
+        self.fd = fd
+        self.stream = stream
+        self.send = send
+        self.current_run = current_run
+        self.synced = threading.Event()
+
+    def run(self):
+        pending = b""
+        while True:
+            try:
+                chunk = os.read(self.fd, 65536)
+            except InterruptedError:
+                continue
+            if not chunk:
+                break
+            pending += chunk
+            while True:
+                idx = pending.find(_END_MARKER)
+                if idx < 0:
+                    break
+                self._forward(pending[:idx])
+                pending = pending[idx + len(_END_MARKER):]
+                self.synced.set()
+            # Hold back only a possible partial marker at the end of the buffer.
+            cut = pending.rfind(b"\x00", max(0, len(pending) - len(_END_MARKER) + 1))
+            if cut < 0:
+                cut = len(pending)
+            self._forward(pending[:cut])
+            pending = pending[cut:]
+
+    def _forward(self, data: bytes):
+        if data:
+            self.send(("out", self.current_run(), self.stream, data.decode("utf-8", errors="replace")))
+
+
+def _resolve_entrypoint(mod):
+    meta = getattr(mod, "MODULE_META", None)
+    if isinstance(meta, dict) and callable(meta.get("run")):
+        return meta["run"]
+    register = getattr(mod, "register", None)
+    if callable(register):
+        info = register() or {}
+        if callable(info.get("run")):
+            return info["run"]
+    for name in ("main", "run"):
+        func = getattr(mod, name, None)
+        if callable(func):
+            return func
+    return None
+
+
+def _source_version(path, package_dir):
+    """mtime of the module file, or of the newest .py file in a package."""
+    if package_dir is None:
+        return os.stat(path).st_mtime_ns
+    newest = 0
+    for dirpath, dirnames, filenames in os.walk(package_dir):
+        dirnames[:] = [d for d in dirnames if d != "__pycache__"]
+        for name in filenames:
+            if name.endswith(".py"):
+                newest = max(newest, os.stat(os.path.join(dirpath, name)).st_mtime_ns)
+    return newest
+
+
+def _teardown(key, mod):
+    teardown = getattr(mod, "teardown", None)
+    if callable(teardown):
+        try:
+            teardown()
+        except Exception:
+            traceback.print_exc()
+    prefix = key + "."
+    for name in [n for n in sys.modules if n.startswith(prefix) or sys.modules[n] is mod]:
+        del sys.modules[name]
+
+
+def _evict(modules, key):
+    """Drop hub module ``key`` from a worker: its cache entry, or the copy a
+    sibling's run imported, so the next run imports it from disk."""
+    for path in [p for p, (_, mod) in modules.items() if mod.__name__ == key]:
+        _teardown(key, modules.pop(path)[1])
+    mod = sys.modules.get(key)
+    if mod is not None:
+        _teardown(key, mod)
+
+
+def _add_modules_dir(path, package_dir):
+    # Sibling imports (`from logger import Logger`) resolve from the modules dir.
+    modules_dir = os.path.dirname(package_dir if package_dir is not None else path)
+    if modules_dir not in sys.path:
+        sys.path.append(modules_dir)
+
+
+def _worker_main(task_conn, result_conn, preload):
+    """Entry point of a pool worker process."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    send_lock = threading.Lock()
+    current = {"run_id": None}
+
+    def send(message):
+        with send_lock:
+            result_conn.send(message)
+
+    # Capture fds 1/2 so output from C extensions and subprocesses is streamed too.
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+    pumps = []
+    for fd, stream in ((1, "stdout"), (2, "stderr")):
+        r, w = os.pipe()
+        os.dup2(w, fd)
+        os.close(w)
+        pump = _StreamPump(r, stream, send, lambda: current["run_id"])
+        pump.start()
+        pumps.append(pump)
+    sys.stdout = open(1, "w", buffering=1, closefd=False)
+    sys.stderr = open(2, "w", buffering=1, closefd=False)
+
+    ensure_root_on_path()
+    for name in preload:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            pass
+
+    modules = {}
+    while True:
+        try:
+            task = task_conn.recv()
+        except (EOFError, OSError):
+            break
+        if task is None:
+            break
+        if task[0] == "invalidate":
+            for key in task[1]:
+                _evict(modules, key)
+            continue
+        run_id, key, path, package_dir, args, kwargs = task
+        current["run_id"] = run_id
+        status, payload = "done", None
+        try:
+            mtime = _source_version(path, package_dir)
+            cached = modules.get(path)
+            if cached is None or cached[0] != mtime:
+                if cached is not None:
+                    _teardown(key, cached[1])
+                    modules.pop(path, None)
+                _add_modules_dir(path, package_dir)
+                search = [package_dir] if package_dir is not None else None
+                spec = importlib.util.spec_from_file_location(key, path,
+                                                              submodule_search_locations=search)
+                if not spec or not spec.loader:
+                    raise ImportError(f"Invalid module: {key}")
+                mod = importlib.util.module_from_spec(spec)
+                sys.modules[key] = mod
+                spec.loader.exec_module(mod)
+                modules[path] = (mtime, mod)
+            else:
+                mod = cached[1]
+            func = _resolve_entrypoint(mod)
+            if func is None:
+                raise AttributeError(f"No callable entrypoint found for module {key}")
+            payload = repr(func(*args, **kwargs))[:4096]
+        except SystemExit as e:
+            status, payload = ("done", repr(e.code)) if not e.code else ("failed", f"SystemExit({e.code!r})")
+        except BaseException:
+            status, payload = "failed", traceback.format_exc()
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        for fd, pump in zip((1, 2), pumps):
+            pump.synced.clear()
+            os.write(fd, _END_MARKER)
+            pump.synced.wait(timeout=2)
+        send((status, run_id, payload))
+        current["run_id"] = None
+
+
+class _Worker:
+    def __init__(self, ctx, preload):
+        task_r, self.task_conn = ctx.Pipe(duplex=False)
+        self.result_conn, result_w = ctx.Pipe(duplex=False)
+        self.process = ctx.Process(target=_worker_main, args=(task_r, result_w, tuple(preload)),
+                                   name="scn-run-worker", daemon=True)
+        self.process.start()
+        task_r.close()
+        result_w.close()
+        self.run: Optional[RunHandle] = None
+        self.watch_handle = None
+
+    def fileno(self):
+        return self.result_conn.fileno()
+
+    def kill(self, grace: float = 0.5):
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(grace)
+            if self.process.is_alive():
+                self.process.kill()
+                self.process.join(grace)
+        for conn in (self.task_conn, self.result_conn):
+            try:
+                conn.close()
+            except OSError:
+                pass
+
+
+class ModuleRunPool:
+    """Fixed-size pool of warm worker processes executing hub modules.
+
+    ``watch_fd(fd, callback)`` / ``unwatch_fd(handle)`` plug the pool into the
+    UI's event loop; without them, call ``handle_ready(fd)`` for readable fds
+    from your own ``select`` loop. ``check_timeouts()`` must be called
+    periodically (the TUI uses a loop alarm).
+    """
+
+    def __init__(self, size: int = 2, preload=COMMON_IMPORTS, default_timeout: Optional[float] = None,
+                 watch_fd: Optional[Callable] = None, unwatch_fd: Optional[Callable] = None):
+        self.size = max(1, int(size))
+        self.preload = tuple(preload)
+        self.default_timeout = default_timeout
+        self.watch_fd = watch_fd
+        self.unwatch_fd = unwatch_fd
+        self._ctx = _mp_context()
+        self._ids = itertools.count(1)
+        self.workers: List[_Worker] = []
+        self.queue = deque()
+        self.runs: Dict[int, RunHandle] = {}
+        self.started = False
+
+    # --- lifecycle -------------------------------------------------------
+    def start(self):
+        if not self.started:
+            for _ in range(self.size):
+                self._spawn()
+            self.started = True
+        return self
+
+    def shutdown(self):
+        for handle in list(self.queue):
+            self._finish(handle, "cancelled")
+        self.queue.clear()
+        for worker in list(self.workers):
+            if worker.run is not None:
+                self._finish(worker.run, "cancelled")
+            try:
+                worker.task_conn.send(None)
+            except (OSError, ValueError):
+                pass
+            self._retire(worker)
+        self.started = False
+
+    def _spawn(self):
+        worker = _Worker(self._ctx, self.preload)
+        self.workers.append(worker)
+        if self.watch_fd is not None:
+            fd = worker.fileno()
+            worker.watch_handle = self.watch_fd(fd, lambda fd=fd: self.handle_ready(fd))
+        return worker
+
+    def _retire(self, worker: _Worker):
+        if worker in self.workers:
+            self.workers.remove(worker)
+        if self.unwatch_fd is not None and worker.watch_handle is not None:
+            self.unwatch_fd(worker.watch_handle)
+        worker.kill()
+
+    def _replace(self, worker: _Worker):
+        self._retire(worker)
+        if self.started:
+            self._spawn()
+            self._dispatch()
+
+    # --- runs ------------------------------------------------------------
+    def submit(self, key: str, path, args=(), kwargs=None, timeout: Optional[float] = None,
+               on_output: Optional[Callable] = None, on_done: Optional[Callable] = None,
+               package_dir=None) -> RunHandle:
+        """Queue a module run. ``on_output(handle, stream, text)`` / ``on_done(handle)``.
+
+        ``package_dir`` is set for package modules (``path`` is then the
+        package's ``__init__.py``/``main.py``).
+        """
+        self.start()
+        handle = RunHandle(next(self._ids), key, Path(path), tuple(args), dict(kwargs or {}),
+                           timeout if timeout is not None else self.default_timeout,
+                           on_output, on_done,
+                           Path(package_dir) if package_dir is not None else None)
+        handle._pool = self
+        self.runs[handle.run_id] = handle
+        self.queue.append(handle)
+        self._dispatch()
+        return handle
+
+    def _dispatch(self):
+        for worker in self.workers:
+            if not self.queue:
+                return
+            if worker.run is not None:
+                continue
+            handle = self.queue.popleft()
+            try:
+                package_dir = str(handle.package_dir) if handle.package_dir is not None else None
+                worker.task_conn.send((handle.run_id, handle.key, str(handle.path), package_dir,
+                                       handle.args, handle.kwargs))
+            except (OSError, ValueError) as e:
+                handle.error = f"dispatch failed: {e}"
+                self._finish(handle, "failed")
+                continue
+            worker.run = handle
+            handle.state = "running"
+            handle.started = time.monotonic()
+
+    def invalidate(self, keys):
+        """Make every worker re-import ``keys`` (and drop their cached copies)
+        on the next run, e.g. the modules a reload found stale."""
+        keys = sorted(keys)
+        if not keys:
+            return
+        for worker in self.workers:
+            try:
+                worker.task_conn.send(("invalidate", keys))
+            except (OSError, ValueError):
+                pass  # dead worker; its replacement forks with fresh state
+
+    def cancel(self, run_id: int) -> bool:
+        handle = self.runs.get(run_id)
+        if handle is None or handle.done:
+            return False
+        if handle.state == "queued":
+            self.queue.remove(handle)
+            self._finish(handle, "cancelled")
+            return True
+        worker = self._worker_for(handle)
+        self._finish(handle, "cancelled")
+        if worker is not None:
+            worker.run = None
+            self._replace(worker)
+        return True
+
+    def check_timeouts(self):
+        now = time.monotonic()
+        for worker in list(self.workers):
+            handle = worker.run
+            if handle is None or handle.timeout is None or handle.started is None:
+                continue
+            if now - handle.started > handle.timeout:
+                handle.error = f"timed out after {handle.timeout:g}s"
+                self._finish(handle, "timeout")
+                worker.run = None
+                self._replace(worker)
+
+    @property
+    def active(self) -> List[RunHandle]:
+        return [w.run for w in self.workers if w.run is not None]
+
+    def _worker_for(self, handle: RunHandle) -> Optional[_Worker]:
+        for worker in self.workers:
+            if worker.run is handle:
+                return worker
+        return None
+
+    def _finish(self, handle: RunHandle, state: str):
+        if handle.done:
+            return
+        handle.state = state
+        handle.finished = time.monotonic()
+        self.runs.pop(handle.run_id, None)
+        if handle.on_done is not None:
+            try:
+                handle.on_done(handle)
+            except Exception:
+                logger.error(f"on_done callback failed for run {handle.run_id}:\n{traceback.format_exc()}")
+
+    # --- parent-side I/O -------------------------------------------------
+    def handle_ready(self, fd: int):
+        """Drain messages from the worker owning ``fd``."""
+        worker = next((w for w in self.workers if w.fileno() == fd), None)
+        if worker is None:
+            return
+        try:
+            while worker.result_conn.poll():
+                self._handle_message(worker, worker.result_conn.recv())
+        except (EOFError, OSError):
+            handle = worker.run
+            worker.run = None
+            if handle is not None and not handle.done:
+                handle.error = f"worker exited (code {worker.process.exitcode})"
+                self._finish(handle, "failed")
+            self._replace(worker)
+
+    def _handle_message(self, worker: _Worker, message):
+        kind, run_id = message[0], message[1]
+        handle = worker.run if worker.run is not None and worker.run.run_id == run_id else None
+        if kind == "out":
+            if handle is not None and handle.on_output is not None:
+                handle.on_output(handle, message[2], message[3])
+            return
+        if handle is None:
+            return
+        if kind == "done":
+            handle.result = message[2]
+        else:
+            handle.error = message[2]
+        worker.run = None
+        self._finish(handle, "done" if kind == "done" else "failed")
+        self._dispatch()
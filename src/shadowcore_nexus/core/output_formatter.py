@@ -1,25 +1,180 @@
-import json
+"""
+Intel output for recon runs.
+
+By default one ``OutputFormatter`` is one run: ``save_json`` appends the
+record as a line of ``intel_<run>.ndjson`` and ``save_csv`` a row of
+``intel_<run>.csv``, both through large write buffers that are flushed every
+``flush_interval`` seconds (and on ``close()``). ``close()`` also writes
+``intel_<run>.manifest.json`` with the files, record counts and entities.
+Use the formatter as a context manager, or rely on it being closed at exit.
+
+``split_per_entity=True`` keeps the old layout: one
+``<entity>_intel_<timestamp>.json`` and ``.csv`` per call.
+
+The CSV is written by ``intel_csv.FlatCsvWriter``: nested fields are
+flattened into columns and lists exploded into child tables
+(``intel_<run>.<field>.csv``) under a schema inferred from the first records
+(or given as ``csv_schema``) and saved as ``intel_<run>.schema.json``;
+``intel_csv.read_records`` reads the run back.
+"""
+
+import atexit
 import csv
+import json
 import os
+import threading
+import time
+import weakref
 from datetime import datetime
 
+from .intel_csv import FlatCsvWriter, schema_path, table_path
+
+WRITE_BUFFER = 1 << 20
+FLUSH_INTERVAL = 1.0
+
+
 class OutputFormatter:
-    def __init__(self, output_dir="artifacts/intel_dumps/"):
+    def __init__(self, output_dir="artifacts/intel_dumps/", split_per_entity=False,
+                 flush_interval=FLUSH_INTERVAL, csv_schema=None):
         self.output_dir = output_dir
+        self.split_per_entity = split_per_entity
+        self.flush_interval = flush_interval
+        self.csv_schema = csv_schema
         os.makedirs(self.output_dir, exist_ok=True)
+        self.started = datetime.now()
+        self.run_id = f"{self.started.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
+        self.counts = {"json": 0, "csv": 0}
+        self.entities = set()
+        self.paths = {}
+        self._files = {}
+        self._csv = None
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._closed = False
+        _open_formatters.add(self)
+
+    def _path(self, kind):
+        return os.path.join(self.output_dir, f"intel_{self.run_id}.{kind}")
+
+    def _file(self, kind):
+        f = self._files.get(kind)
+        if f is None:
+            if self._closed:
+                raise ValueError("I/O operation on a closed OutputFormatter")
+            path = self.paths[kind] = self._path(kind)
+            f = self._files[kind] = open(path, 'a', newline='' if kind == 'csv' else None,
+                                         encoding='utf-8', buffering=WRITE_BUFFER)
+            print(f"[+] Streaming intel to {path}")
+        return f
+
+    def _maybe_flush(self):
+        now = time.monotonic()
+        if now - self._last_flush >= self.flush_interval:
+            self._flush_files()
+            self._last_flush = now
+
+    def _flush_files(self):
+        for f in self._files.values():
+            f.flush()
+        if self._csv is not None:
+            self._csv.flush()
 
     def save_json(self, data, entity_name):
+        if self.split_per_entity:
+            return self._save_json_file(data, entity_name)
+        if data.get('entity') != entity_name:
+            data = dict(data, _entity=entity_name)
+        line = json.dumps(data, default=str, separators=(',', ':')) + '\n'
+        with self._lock:
+            self._file('ndjson').write(line)
+            self.counts['json'] += 1
+            self.entities.add(entity_name)
+            self._maybe_flush()
+
+    def save_csv(self, data, entity_name):
+        if self.split_per_entity:
+            return self._save_csv_file(data, entity_name)
+        with self._lock:
+            if self._csv is None:
+                if self._closed:
+                    raise ValueError("I/O operation on a closed OutputFormatter")
+                path = self.paths['csv'] = self._path('csv')
+                self._csv = FlatCsvWriter(path, schema=self.csv_schema)
+                print(f"[+] Streaming intel to {path}")
+            self._csv.write(data)
+            self.counts['csv'] += 1
+            self.entities.add(entity_name)
+            self._maybe_flush()
+
+    def _save_json_file(self, data, entity_name):
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"{self.output_dir}{entity_name}_intel_{timestamp}.json"
         with open(filename, 'w', encoding='utf-8') as outfile:
             json.dump(data, outfile, indent=4)
         print(f"[+] JSON Intel Saved: {filename}")
 
-    def save_csv(self, data, entity_name):
+    def _save_csv_file(self, data, entity_name):
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"{self.output_dir}{entity_name}_intel_{timestamp}.csv"
         with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
             writer = csv.writer(csvfile)
             writer.writerow(data.keys())
             writer.writerow(data.values())
-        print(f"[+] CSV Intel Saved: {filename}")
\ No newline at end of file
+        print(f"[+] CSV Intel Saved: {filename}")
+
+    def flush(self):
+        with self._lock:
+            self._flush_files()
+            self._last_flush = time.monotonic()
+
+    def close(self):
+        """Flush and close the run files and write the manifest (streaming mode)."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            for f in self._files.values():
+                f.close()
+            self._files.clear()
+            if self._csv is not None:
+                self._csv.close()
+        _open_formatters.discard(self)
+        if self.split_per_entity or not self.paths:
+            return
+        manifest = {
+            "run_id": self.run_id,
+            "started": self.started.isoformat(),
+            "finished": datetime.now().isoformat(),
+            "files": {kind: {"path": os.path.basename(path), "bytes": os.path.getsize(path),
+                             "records": self.counts["json" if kind == "ndjson" else "csv"]}
+                      for kind, path in self.paths.items()},
+            "entities": len(self.entities),
+        }
+        if self._csv is not None:
+            csv_path = self.paths['csv']
+            manifest["csv_schema"] = os.path.basename(schema_path(csv_path))
+            manifest["csv_tables"] = {
+                table: {"path": os.path.basename(table_path(csv_path, table)), "rows": rows}
+                for table, rows in self._csv.rows.items() if table != "main"}
+        path = self._path('manifest.json')
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=4)
+        os.replace(tmp, path)
+        print(f"[+] Intel run {self.run_id}: {self.counts['json']} JSON / {self.counts['csv']} CSV "
+              f"records, manifest {path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_open_formatters: "weakref.WeakSet[OutputFormatter]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_all():
+    for formatter in list(_open_formatters):
+        formatter.close()
@@ -3,7 +3,7 @@ import sys
 import platform
 from ..utils.compat import get_data_dir
 
-class PathResolver
+class PathResolver:
     def __init__(self):
         self.system = platform.system()
         self._init_paths()
@@ -1,10 +1,12 @@
 # What This Does:
 # Resolves absolute paths dynamically — never hardcodes.
-# Ensures all critical folders exist — builds them on-the-fly if missing.
+# Importing is side-effect free: call ensure_directories() (or mkdir the one
+# folder you need) right before writing, not at import time.
 # Any script can now import:
 # from core.paths import LOGS_DIR, OUTPUTS_DIR
 # This eliminates all your broken path issues across scripts.
 
+import sys
 from pathlib import Path
 
 # Root Directory (ShadowCore)
@@ -22,6 +24,11 @@ LOGS_DIR = ARTIFACTS_DIR / 'logs'
 OUTPUTS_DIR = ARTIFACTS_DIR / 'outputs'
 CONFIGS_DIR = ARTIFACTS_DIR / 'configs'
 KEYS_DIR = ARTIFACTS_DIR / 'keys'
+RUN_DIR = ARTIFACTS_DIR / 'run'
+HISTORY_DIR = ARTIFACTS_DIR / 'history'
+
+# Unix socket of the cross-process event broker (core.event_broker)
+EVENT_SOCKET = RUN_DIR / 'events.sock'
 
 # Rituals Subdirectories
 RITUALS_MODULES_DIR = RITUALS_DIR / 'modules'
@@ -42,7 +49,7 @@ ARTIFACTS_SUB_DIR = PHANTOM_SCRY_DIR / 'Phantom_scry/artifacts'
 # UI Subdirectories
 UI_COMPONENTS_DIR = UI_DIR / 'components'
 
-# Ensure all critical directories exist
+# Create all critical directories (idempotent; no longer run on import)
 def ensure_directories():
     dirs = [
         ARTIFACTS_DIR, LOGS_DIR, OUTPUTS_DIR, CONFIGS_DIR, KEYS_DIR,
@@ -51,8 +58,11 @@ def ensure_directories():
     for directory in dirs:
         directory.mkdir(parents=True, exist_ok=True)
 
-# Execute on import
-ensure_directories()
+# Hub modules and rituals import `core.*` / `utils.*` absolutely: put the
+# package root on sys.path right before loading one (never on import).
+def ensure_root_on_path():
+    if str(ROOT_DIR) not in sys.path:
+        sys.path.insert(0, str(ROOT_DIR))
 
 # Optional: Debug Print (Remove in production)
 if __name__ == "__main__":
@@ -0,0 +1,187 @@
+"""
+Startup profiling for ``--profile-startup``.
+
+Records wall time, CPU time and tracemalloc peak for named spans (startup
+phases and each ``ModuleEntry.load()``), renders a sorted text report and a
+Chrome trace-event JSON file (open it in chrome://tracing or Perfetto).
+
+Code paths call ``get_profiler().span(...)``; when no profiler is active that
+returns a shared no-op context manager, so the hooks cost next to nothing.
+tracemalloc peaks are process-wide, so with ``--load-workers`` > 1 the peaks of
+concurrently loading modules overlap.
+"""
+
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class Span:
+    __slots__ = ("name", "category", "start", "wall", "cpu", "peak", "tid", "depth", "saved_peak", "base_mem")
+
+    def __init__(self, name: str, category: str, start: float, tid: int, depth: int):
+        self.name = name
+        self.category = category
+        self.start = start
+        self.tid = tid
+        self.depth = depth
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.peak = 0
+        self.saved_peak = 0
+        self.base_mem = 0
+
+
+class _NullContext:
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL = _NullContext()
+
+
+class NullProfiler:
+    enabled = False
+
+    def span(self, name, category="phase"):
+        return _NULL
+
+
+class StartupProfiler:
+    enabled = True
+
+    def __init__(self, trace_memory: bool = True):
+        self.origin = time.perf_counter()
+        self.spans: List[Span] = []
+        self.trace_memory = trace_memory and hasattr(tracemalloc, "reset_peak")
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def span(self, name: str, category: str = "phase"):
+        """Time the enclosed block. Nested spans keep the parent's peak intact."""
+        stack = self._stack()
+        span = Span(name, category, time.perf_counter(), threading.get_ident(), len(stack))
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1].saved_peak = max(stack[-1].saved_peak, peak)
+            span.base_mem = current
+            tracemalloc.reset_peak()
+        stack.append(span)
+        cpu0 = time.thread_time()
+        try:
+            yield span
+        finally:
+            span.cpu = time.thread_time() - cpu0
+            span.wall = time.perf_counter() - span.start
+            stack.pop()
+            if self.trace_memory:
+                _, peak = tracemalloc.get_traced_memory()
+                peak = max(span.saved_peak, peak)
+                span.peak = max(0, peak - span.base_mem)
+                if stack:
+                    stack[-1].saved_peak = max(stack[-1].saved_peak, peak)
+                tracemalloc.reset_peak()
+            with self._lock:
+                self.spans.append(span)
+
+    def add_span(self, name: str, start: float, end: float, category: str = "phase"):
+        """Record a span measured elsewhere (e.g. interpreter and package imports)."""
+        span = Span(name, category, start, threading.get_ident(), 0)
+        span.wall = end - start
+        with self._lock:
+            self.spans.append(span)
+
+    def stop(self):
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    # --- reporting -------------------------------------------------------
+    def slowest(self, category: str = "module", n: int = 3) -> List[Span]:
+        spans = [s for s in self.spans if s.category == category]
+        return sorted(spans, key=lambda s: s.wall, reverse=True)[:n]
+
+    def report(self) -> str:
+        lines = [f"{'wall ms':>10} {'cpu ms':>10} {'peak KiB':>10}  span"]
+        for category in ("phase", "module", "scan"):
+            spans = sorted((s for s in self.spans if s.category == category),
+                           key=lambda s: s.wall, reverse=True)
+            if not spans:
+                continue
+            lines.append(f"-- {category} ({len(spans)})")
+            for s in spans:
+                lines.append(f"{s.wall * 1000:10.2f} {s.cpu * 1000:10.2f} {s.peak / 1024:10.1f}  "
+                             f"{'  ' * s.depth}{s.name}")
+        return "\n".join(lines)
+
+    def chrome_trace(self) -> Dict:
+        pid = os.getpid()
+        events = []
+        for s in sorted(self.spans, key=lambda s: s.start):
+            events.append({
+                "name": s.name,
+                "cat": s.category,
+                "ph": "X",
+                "ts": round((s.start - self.origin) * 1e6, 3),
+                "dur": round(s.wall * 1e6, 3),
+                "pid": pid,
+                "tid": s.tid,
+                "args": {"cpu_ms": round(s.cpu * 1000, 3), "peak_kib": round(s.peak / 1024, 1)},
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, output_dir: Optional[Path] = None) -> Dict[str, Path]:
+        """Write the text report and Chrome trace; returns their paths."""
+        if output_dir is None:
+            from .paths import OUTPUTS_DIR
+            output_dir = OUTPUTS_DIR
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        report_path = output_dir / f"startup_profile_{stamp}.txt"
+        trace_path = output_dir / f"startup_trace_{stamp}.json"
+        report_path.write_text(self.report() + "\n", encoding="utf-8")
+        with open(trace_path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
+        return {"report": report_path, "trace": trace_path}
+
+
+_active = NullProfiler()
+
+
+def get_profiler():
+    return _active
+
+
+def start_profiling(origin: Optional[float] = None) -> StartupProfiler:
+    global _active
+    _active = StartupProfiler()
+    if origin is not None:
+        _active.origin = origin
+    return _active
+
+
+def stop_profiling():
+    global _active
+    profiler, _active = _active, NullProfiler()
+    if isinstance(profiler, StartupProfiler):
+        profiler.stop()
+    return profiler
@@ -0,0 +1,143 @@
+"""
+Dotted hierarchical topics with wildcards.
+
+Patterns are matched segment by segment against concrete topics such as
+``scan.host.up``:
+
+* ``*`` matches exactly one segment   (``scan.*`` matches ``scan.host``)
+* ``#`` matches zero or more segments (``scan.#`` matches ``scan``,
+  ``scan.host`` and ``scan.host.up``)
+
+``TopicTrie.match()`` caches the resolved item tuple per concrete topic, so
+publishing to a topic seen before is one dict lookup; the cache is dropped
+whenever a pattern is added or removed.
+"""
+
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Concrete topics whose dispatch tuple is kept; the cache is reset past this.
+DISPATCH_CACHE_SIZE = 4096
+
+
+def validate_pattern(pattern: str) -> List[str]:
+    parts = pattern.split(".")
+    for part in parts:
+        if not part:
+            raise ValueError(f"Empty segment in topic pattern {pattern!r}")
+        if part not in ("*", "#") and ("*" in part or "#" in part):
+            raise ValueError(f"Wildcards must be whole segments in topic pattern {pattern!r}")
+    return parts
+
+
+class _Node:
+    __slots__ = ("children", "items")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.items: List[Tuple[int, Any]] = []
+
+
+class TopicTrie:
+    """Items registered under topic patterns, looked up by concrete topic.
+
+    ``match()`` returns items in registration order, each at most once.
+    """
+
+    def __init__(self):
+        self._root = _Node()
+        self._seq = 0
+        self._count = 0
+        self._cache: Dict[str, Tuple[Any, ...]] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, pattern: str, item: Any):
+        parts = validate_pattern(pattern)
+        with self._lock:
+            node = self._root
+            for part in parts:
+                child = node.children.get(part)
+                if child is None:
+                    child = node.children[part] = _Node()
+                node = child
+            self._seq += 1
+            node.items.append((self._seq, item))
+            self._count += 1
+            self._cache = {}
+
+    def remove(self, pattern: str, item: Any) -> bool:
+        """Remove one registration of ``item`` under ``pattern``; False if absent."""
+        parts = validate_pattern(pattern)
+        with self._lock:
+            path = [self._root]
+            for part in parts:
+                node = path[-1].children.get(part)
+                if node is None:
+                    return False
+                path.append(node)
+            items = path[-1].items
+            for i, (_, existing) in enumerate(items):
+                if existing is item:
+                    del items[i]
+                    break
+            else:
+                return False
+            # Prune branches left empty
+            for depth in range(len(parts), 0, -1):
+                node = path[depth]
+                if node.items or node.children:
+                    break
+                del path[depth - 1].children[parts[depth - 1]]
+            self._count -= 1
+            self._cache = {}
+            return True
+
+    def match(self, topic: str) -> Tuple[Any, ...]:
+        """Items whose pattern matches ``topic``."""
+        cached = self._cache.get(topic)
+        if cached is not None:
+            return cached
+        with self._lock:
+            found: Dict[int, Any] = {}
+            self._collect(self._root, topic.split("."), 0, found)
+            resolved = tuple(found[seq] for seq in sorted(found))
+            if len(self._cache) >= DISPATCH_CACHE_SIZE:
+                self._cache = {}
+            self._cache[topic] = resolved
+            return resolved
+
+    def _collect(self, node: _Node, parts: List[str], i: int, found: Dict[int, Any]):
+        if i == len(parts):
+            found.update(node.items)
+        else:
+            child = node.children.get(parts[i])
+            if child is not None:
+                self._collect(child, parts, i + 1, found)
+            child = node.children.get("*")
+            if child is not None:
+                self._collect(child, parts, i + 1, found)
+        hash_node = node.children.get("#")
+        if hash_node is not None:
+            for j in range(i, len(parts) + 1):
+                self._collect(hash_node, parts, j, found)
+
+    def items(self, pattern: Optional[str] = None) -> Iterator[Any]:
+        """Every registered item (or those registered under exactly ``pattern``)."""
+        with self._lock:
+            if pattern is not None:
+                node = self._root
+                for part in validate_pattern(pattern):
+                    node = node.children.get(part)
+                    if node is None:
+                        return iter(())
+                return iter([item for _, item in node.items])
+            out: List[Tuple[int, Any]] = []
+            pending = [self._root]
+            while pending:
+                node = pending.pop()
+                out.extend(node.items)
+                pending.extend(node.children.values())
+            return iter([item for _, item in sorted(out, key=lambda pair: pair[0])])
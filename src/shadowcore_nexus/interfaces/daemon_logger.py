@@ -1,23 +1,20 @@
 from pathlib import Path
+import sys
 import threading
-import time
+
+from ..utils.log_rotation import follow_batches
 
 LOG_FILE = Path(__file__).resolve().parent.parent/'artifacts'/'logs'/'daemon.log'
 
 
 def tail_log():
     print("[*] LILITH Watcher Feed Activated.")
-    with LOG_FILE.open('r') as f:
-        f.seek(0, 2) 
-        while True:
-            where = f.tell()
-            line = f.readline()
-            if not line:
-                time.sleep(0.5)
-                f.seek(where)
-            else:
-                print(f"\r[LOG] {line.strip():<80}",end='', flush=True)
-                
+    # follow_batches() wakes on inotify and hands over everything new at once;
+    # it re-opens daemon.log when it is rotated, after draining the old file.
+    for batch in follow_batches(LOG_FILE):
+        sys.stdout.write("".join(f"[LOG] {line.rstrip()}\n" for line in batch))
+        sys.stdout.flush()
+
 
 def start_watcher():
     t = threading.Thread(target=tail_log, daemon=True)
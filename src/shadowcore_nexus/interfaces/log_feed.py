@@ -0,0 +1,165 @@
+"""
+LILITH watcher feed as an urwid widget: a live tail of ``daemon.log``.
+
+A ``scn-log-feed`` thread runs ``follow_batches`` (inotify-driven, survives
+rotation and truncation) and queues whole batches; the UI thread is woken
+through ``watch_pipe`` no sooner than one frame (``1 / fps``) after the
+previous redraw and appends everything queued in one go, so a burst of
+thousands of lines costs one redraw. Scrollback is a ring buffer of
+``scrollback`` lines; ``Text`` widgets are only built for the rows urwid asks
+for. The view sticks to the newest line unless the user has scrolled up.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import urwid
+
+from ..utils.log_index import parse_record
+from ..utils.log_rotation import follow_batches
+
+LOG_FILE = Path(__file__).resolve().parent.parent / 'artifacts' / 'logs' / 'daemon.log'
+DEFAULT_SCROLLBACK = 2000
+DEFAULT_FPS = 10.0
+
+
+def format_line(line: str):
+    """urwid markup for one log line; errors use the ``stderr`` attribute."""
+    record = parse_record(line)
+    if record is None:
+        return line
+    text = f"{record['time'][11:19]} {record['ritual']}: {record['message']}"
+    return ("stderr", text) if record["level"] in ("ERROR", "CRITICAL") else text
+
+
+class RingWalker(urwid.ListWalker):
+    """List walker over the last ``maxlen`` lines appended.
+
+    Positions are absolute line numbers, so they stay valid while old lines
+    fall off the front.
+    """
+
+    def __init__(self, maxlen: int = DEFAULT_SCROLLBACK,
+                 formatter: Callable[[str], object] = format_line):
+        self.lines: deque = deque(maxlen=maxlen)
+        self.formatter = formatter
+        self.end = 0          # position after the newest line
+        self.focus = 0
+        self.tail = True      # focus follows new lines
+        self._widgets: Dict[int, urwid.Widget] = {}
+
+    @property
+    def first(self) -> int:
+        return self.end - len(self.lines)
+
+    def extend(self, lines):
+        if not lines:
+            return
+        self.lines.extend(lines)
+        self.end += len(lines)
+        first = self.first
+        if len(self._widgets) > 2 * len(self.lines) or (self._widgets and min(self._widgets) < first):
+            self._widgets = {pos: w for pos, w in self._widgets.items() if pos >= first}
+        if self.tail or self.focus < first:
+            self.focus = self.end - 1
+        self._modified()
+
+    def _get(self, pos):
+        if not self.first <= pos < self.end:
+            return None, None
+        widget = self._widgets.get(pos)
+        if widget is None:
+            widget = self._widgets[pos] = urwid.Text(self.formatter(self.lines[pos - self.first]))
+        return widget, pos
+
+    def get_focus(self):
+        return self._get(self.focus)
+
+    def set_focus(self, position):
+        self.focus = position
+        self.tail = position >= self.end - 1
+        self._modified()
+
+    def get_next(self, position):
+        return self._get(position + 1)
+
+    def get_prev(self, position):
+        return self._get(position - 1)
+
+
+class LogFeed(urwid.WidgetWrap):
+    """Live, rotation-safe tail of a log file with a bounded scrollback.
+
+    ``attach(loop)`` starts following; ``stop()`` ends it.
+    """
+
+    def __init__(self, path=LOG_FILE, scrollback: int = DEFAULT_SCROLLBACK,
+                 fps: float = DEFAULT_FPS, from_end: bool = True,
+                 formatter: Callable[[str], object] = format_line):
+        self.path = Path(path)
+        self.fps = fps
+        self.from_end = from_end
+        self.walker = RingWalker(scrollback, formatter)
+        self.received = 0
+        self.redraws = 0
+        self._pending: deque = deque(maxlen=scrollback)  # older lines would scroll off anyway
+        self._lock = threading.Lock()
+        self._scheduled = False
+        self._last_draw = 0.0
+        self._loop = None
+        self._wake_fd: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        super().__init__(urwid.ListBox(self.walker))
+
+    def attach(self, loop):
+        """Start following ``path`` and deliver batches to ``loop``."""
+        self._loop = loop
+        self._wake_fd = loop.watch_pipe(self._on_wake)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name="scn-log-feed", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2)
+        self._thread = None
+        if self._wake_fd is not None:
+            self._loop.remove_watch_pipe(self._wake_fd)
+            self._wake_fd = None
+
+    def run(self):
+        """Follower loop (``scn-log-feed`` thread); returns after ``stop()``."""
+        for batch in follow_batches(self.path, self.from_end, stop=self._stop):
+            with self._lock:
+                self._pending.extend(batch)
+                self.received += len(batch)
+                if self._scheduled:
+                    continue
+                self._scheduled = True
+            if self.fps > 0:
+                # Hold the wake-up until the next frame is due; what arrives
+                # meanwhile joins the same render.
+                delay = self._last_draw + 1.0 / self.fps - time.monotonic()
+                if delay > 0 and self._stop.wait(delay):
+                    return
+            try:
+                os.write(self._wake_fd, b"!")
+            except (OSError, TypeError):
+                return  # pipe closed by stop()
+
+    def _on_wake(self, _data):
+        with self._lock:
+            lines = list(self._pending)
+            self._pending.clear()
+            self._scheduled = False
+        self.walker.extend(lines)
+        self._last_draw = time.monotonic()
+        self.redraws += 1
+        return True
@@ -1,24 +1,54 @@
+import os
+import threading
+import time
 import urwid
 from pathlib import Path
-from .core.module_loader import ModuleLoader
-from .utils.logging import get_logger
+from ..core.module_loader import ModuleLoader
+from ..core.module_runner import ModuleRunPool
+from ..core.startup_profiler import get_profiler, stop_profiling
+from ..utils.file_monitor import HubWatcher
+from ..utils.logging import get_logger
+from .log_feed import DEFAULT_FPS, DEFAULT_SCROLLBACK, LogFeed
 
 logger = get_logger(__name__)
 
+MAX_OUTPUT_LINES = 500
+
 class ShadowCoreTUI:
-    def __init__(self, modules_dir: Path, watch: bool = True, debug: bool = False):
+    def __init__(self, modules_dir: Path, watch: bool = True, debug: bool = False, lazy: bool = True,
+                 use_cache: bool = True, load_workers: int = 1, run_workers: int = 2,
+                 run_timeout: float = None, inline_runs: bool = False,
+                 log_fps: float = DEFAULT_FPS, log_scrollback: int = DEFAULT_SCROLLBACK):
         self.watch = watch
         self.debug = debug
-        self.module_loader = ModuleLoader(modules_dir)
-        self.module_loader.discover_all()
+        self.profiler = get_profiler()
+        self.profile_paths = None
+        self.loop = None
+        self.watcher = None
+        self.inline_runs = inline_runs
+        self.run_pool = ModuleRunPool(size=run_workers, default_timeout=run_timeout)
+        self.output_walker = urwid.SimpleFocusListWalker([])
+        self.log_feed = LogFeed(scrollback=log_scrollback, fps=log_fps)
+        self._changed_paths = set()
+        self._changed_lock = threading.Lock()
+        with self.profiler.span("ModuleLoader init"):
+            self.module_loader = ModuleLoader(modules_dir, lazy=lazy, use_cache=use_cache,
+                                              workers=load_workers)
+        with self.profiler.span("discover_all"):
+            self.module_loader.discover_all()
+        if self.debug:
+            logger.info(f"Module discovery: {self._discovery_summary()}")
 
         self.palette = [
             ("header", "white", "dark blue"),
             ("footer", "white", "dark red"),
-            ("button", "black", "light grey"),
-            ("selected", "white", "dark green")
+            ("button", "black", "light gray"),
+            ("selected", "white", "dark green"),
+            ("stderr", "light red", "default"),
+            ("status", "yellow", "default")
         ]
-        self._build_ui()
+        with self.profiler.span("build UI"):
+            self._build_ui()
 
     def _build_ui(self):
         """Build the TUI layout."""
@@ -34,21 +64,66 @@ class ShadowCoreTUI:
                 self.module_items.append(urwid.AttrMap(btn, "button", "selected"))
 
         module_list = urwid.ListBox(urwid.SimpleFocusListWalker(self.module_items))
+        output = urwid.LineBox(urwid.ListBox(self.output_walker), title="Output")
+        feed = urwid.LineBox(self.log_feed, title="LILITH Watcher Feed")
+        body = urwid.Pile([("weight", 2, module_list), ("weight", 1, output), ("weight", 1, feed)])
         header = urwid.AttrMap(urwid.Text("SCN Σ13X666 — ShadowCore Nexus", align="center"), "header")
-        footer = urwid.AttrMap(urwid.Text("PID:SCN-Σ13X-666 | [F5] Reload | [F10] Exit"), "footer")
+        self.footer_text = urwid.Text(self._footer_markup())
+        footer = urwid.AttrMap(self.footer_text, "footer")
 
         self.frame = urwid.Frame(
             header=header,
-            body=module_list,
+            body=body,
             footer=footer
         )
 
+    def _footer_markup(self):
+        footer_text = "PID:SCN-Σ13X-666 | [F5] Reload | [F8] Cancel runs | [F10] Exit"
+        if self.debug:
+            footer_text += f" | {self._discovery_summary()}"
+        if self.profile_paths is not None:
+            footer_text += f" | {self._slowest_summary()}"
+        return footer_text
+
+    def _slowest_summary(self):
+        slowest = self.profiler.slowest("module") or self.profiler.slowest("scan")
+        if not slowest:
+            return "slowest: n/a"
+        return "slowest: " + ", ".join(f"{s.name} {s.wall * 1000:.0f}ms" for s in slowest)
+
+    def _finish_startup_profile(self, t_run):
+        """First frame is on screen: close the profile and surface the slowest modules."""
+        self.profiler.add_span("screen start + first frame", t_run, time.perf_counter())
+        stop_profiling()
+        self.profile_paths = self.profiler.write()
+        self.footer_text.set_text(self._footer_markup())
+        logger.info(f"Startup profile: {self.profile_paths['report']} / {self.profile_paths['trace']}")
+
+    def _discovery_summary(self):
+        stats = self.module_loader.last_discovery
+        if not stats:
+            return "discovery: n/a"
+        return (f"discovery {stats['elapsed_ms']:.1f} ms ({stats['cache']} cache, "
+                f"{stats['hits']} hit / {stats['misses']} miss)")
+
     def run_module(self, button, module_key):
-        """Run selected module."""
+        """Run selected module in the worker pool (or inline with ``inline_runs``)."""
         entry = self.module_loader.get_entry(module_key)
         if not entry:
             logger.error(f"Module {module_key} not found in loader.")
             return
+        if self.inline_runs:
+            self._run_inline(entry)
+            return
+        handle = self.run_pool.submit(entry.key, entry.path, package_dir=entry.package_dir,
+                                      on_output=self._on_run_output, on_done=self._on_run_done)
+        self._append_output(f"[{handle.run_id}] {module_key}: {handle.state}", "status")
+
+    def _run_inline(self, entry):
+        module_key = entry.key
+        if not self.module_loader.ensure_loaded(entry):
+            logger.error(f"Module {module_key} could not be imported.")
+            return
         try:
             run_func = entry.metadata.get("run")
             if callable(run_func):
@@ -60,15 +135,94 @@ class ShadowCoreTUI:
         except Exception as e:
             logger.error(f"Module {module_key} failed: {str(e)}")
 
+    def _append_output(self, text, attr=None):
+        for line in text.rstrip("\n").split("\n"):
+            self.output_walker.append(urwid.Text((attr, line) if attr else line))
+        overflow = len(self.output_walker) - MAX_OUTPUT_LINES
+        if overflow > 0:
+            del self.output_walker[:overflow]
+        if self.output_walker:
+            self.output_walker.set_focus(len(self.output_walker) - 1)
+
+    def _on_run_output(self, handle, stream, text):
+        self._append_output(text, "stderr" if stream == "stderr" else None)
+
+    def _on_run_done(self, handle):
+        elapsed = ""
+        if handle.started is not None:
+            elapsed = f" in {handle.finished - handle.started:.2f}s"
+        detail = handle.result if handle.state == "done" else handle.error
+        self._append_output(f"[{handle.run_id}] {handle.key}: {handle.state}{elapsed}", "status")
+        if detail and handle.state != "done":
+            self._append_output(detail, "stderr")
+
+    def _attach_run_pool(self):
+        self.run_pool.watch_fd = lambda fd, callback: self.loop.watch_file(fd, callback)
+        self.run_pool.unwatch_fd = self.loop.remove_watch_file
+        if not self.inline_runs:
+            self.run_pool.start()  # fork before the screen and watcher thread start
+
+        def check(loop, _data):
+            self.run_pool.check_timeouts()
+            loop.set_alarm_in(0.5, check)
+
+        self.loop.set_alarm_in(0.5, check)
+
     def reload_modules(self):
         """Reload module list."""
         self.module_loader.reload_if_changed()
+        self.run_pool.invalidate(self.module_loader.last_invalidated)
+        self._rebuild_ui()
+
+    def _rebuild_ui(self):
         self._build_ui()
+        if self.loop is not None:
+            self.loop.widget = self.frame
+
+    def _start_watcher(self):
+        """Watch the modules dir; batches are handed to the UI thread via watch_pipe."""
+        wake_fd = self.loop.watch_pipe(self._on_modules_changed)
+
+        def on_change(paths):
+            with self._changed_lock:
+                self._changed_paths.update(paths)
+            os.write(wake_fd, b"!")
+
+        self.watcher = HubWatcher(self.module_loader.modules_dir, on_change).start()
+        logger.info(f"Hot reload watching {self.module_loader.modules_dir} ({self.watcher.backend})")
+
+    def _on_modules_changed(self, _data):
+        with self._changed_lock:
+            paths, self._changed_paths = self._changed_paths, set()
+        if paths and self.module_loader.reload_paths(paths):
+            self.run_pool.invalidate(self.module_loader.last_invalidated)
+            self._rebuild_ui()
+        return True
 
     def main(self):
         """Start the TUI main loop."""
-        loop = urwid.MainLoop(self.frame, self.palette, unhandled_input=self.handle_keys)
-        loop.run()
+        with self.profiler.span("urwid MainLoop init"):
+            self.loop = urwid.MainLoop(self.frame, self.palette, unhandled_input=self.handle_keys)
+        with self.profiler.span("run pool + watcher start"):
+            self._attach_run_pool()
+            self.log_feed.attach(self.loop)
+            if self.watch:
+                self._start_watcher()
+        if self.profiler.enabled:
+            t_run = time.perf_counter()
+            self.loop.set_alarm_in(0, lambda loop, _data: self._finish_startup_profile(t_run))
+        try:
+            self.loop.run()
+        finally:
+            self.run_pool.shutdown()
+            self.log_feed.stop()
+            if self.watcher is not None:
+                self.watcher.stop()
+            self.module_loader.save_cache()
+            self.module_loader.unload_all()
+            if self.profile_paths is not None:
+                print(self.profiler.report())
+                print(f"[+] Startup trace: {self.profile_paths['trace']}")
 
     def handle_keys(self, key):
         """Handle keyboard shortcuts."""
@@ -76,3 +230,6 @@ class ShadowCoreTUI:
             raise urwid.ExitMainLoop()
         elif key.lower() == "f5":
             self.reload_modules()
+        elif key.lower() == "f8":
+            for handle in self.run_pool.active + list(self.run_pool.queue):
+                handle.cancel()
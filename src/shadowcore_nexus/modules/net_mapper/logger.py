@@ -1,21 +1,7 @@
-import logging
-import json
-from datetime import datetime
+"""
+Structured result logging for scan modules; ``Logger`` lives in
+``shadowcore_nexus.utils.result_sink`` so every copy of this module shares
+one set of sinks.
+"""
 
-class Logger:
-    def __init__(self, log_file='netmap.log', json_mode=False):
-        self.json_mode = json_mode
-        logging.basicConfig(filename=log_file, level=logging.INFO, format='%(message)s')
-        self.log_file = log_file
-
-    def log(self, data: dict):
-        timestamp = datetime.now().isoformat()
-        data['timestamp'] = timestamp
-
-        if self.json_mode:
-            log_entry = json.dumps(data)
-        else:
-            log_entry = f"[{timestamp}] " + ' | '.join(f"{k}: {v}" for k, v in data.items() if k != 'timestamp')
-
-        logging.info(log_entry)
-        print(log_entry)  # Console output
+from shadowcore_nexus.utils.result_sink import Logger  # noqa: F401
@@ -1,19 +1,28 @@
+import argparse
+import sys
+
 from core.target_manager import TargetManager
 from core.intel_harvester import IntelHarvester
 from core.output_formatter import OutputFormatter
 
-def main():
+def main(argv=()):
+    # Hub runs call main() with no arguments; only a direct run reads sys.argv.
+    parser = argparse.ArgumentParser(description="Scry: recon intel harvest")
+    parser.add_argument("--split-per-entity", action="store_true",
+                        help="Write one JSON and one CSV file per entity (old layout) "
+                             "instead of one NDJSON and one CSV file per run")
+    args = parser.parse_args(list(argv))
+
     target_loader = TargetManager("targets.csv")
     target_loader.load_targets()
     target_loader.prioritize_targets()
     targets = target_loader.get_targets()
 
     harvester = IntelHarvester(targets)
-    formatter = OutputFormatter()
-
-    for intel in harvester.run_recon():
-        formatter.save_json(intel, intel['entity'])
-        formatter.save_csv(intel, intel['entity'])
+    with OutputFormatter(split_per_entity=args.split_per_entity) as formatter:
+        for intel in harvester.run_recon():
+            formatter.save_json(intel, intel['entity'])
+            formatter.save_csv(intel, intel['entity'])
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(sys.argv[1:])
\ No newline at end of file
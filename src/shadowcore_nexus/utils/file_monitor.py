@@ -1,17 +1,339 @@
 """
 Filesystem watcher for detecting new modules in the HUB directory.
+
+``HubWatcher`` is event-driven: on Linux it uses inotify through ctypes (no
+third-party dependencies), elsewhere it falls back to comparing ``os.scandir``
+snapshots. Bursts of events (an editor's write/rename/chmod dance on save) are
+coalesced and delivered to the callback as one set of changed paths once the
+directory has been quiet for ``debounce`` seconds.
 """
 
+import ctypes
+import ctypes.util
+import errno
 import os
+import select
+import struct
+import sys
+import threading
 import time
+import traceback
+from typing import Callable, Dict, Iterable, Optional, Set
+
+IGNORED_DIRS = frozenset({"__pycache__", ".git", ".mypy_cache", ".pytest_cache"})
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _load_libc():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    return libc
+
+
+_libc = _load_libc()
+
+
+def inotify_available():
+    return _libc is not None
+
+
+def _walk_dirs(root: str, recursive: bool):
+    """Yield ``root`` and (if recursive) every sub-directory not in IGNORED_DIRS."""
+    yield root
+    if not recursive:
+        return
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.name in IGNORED_DIRS or not entry.is_dir(follow_symlinks=False):
+                        continue
+                    yield entry.path
+                    stack.append(entry.path)
+        except OSError:
+            continue
+
+
+class InotifyWatcher:
+    """Thin ctypes wrapper around an inotify instance watching a directory tree."""
+
+    def __init__(self, root, recursive: bool = True):
+        if _libc is None:
+            raise OSError(errno.ENOSYS, "inotify is not available on this platform")
+        self.root = os.path.abspath(str(root))
+        self.recursive = recursive
+        self.fd = _libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self.watches: Dict[int, str] = {}
+        for directory in _walk_dirs(self.root, recursive):
+            self._add_watch(directory)
+
+    def fileno(self):
+        return self.fd
+
+    def _add_watch(self, directory: str):
+        wd = _libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK | IN_ONLYDIR)
+        if wd < 0:
+            return None
+        self.watches[wd] = directory
+        return wd
+
+    def read_events(self) -> Set[str]:
+        """Drain pending events and return the set of affected paths.
+
+        If the kernel queue overflowed, the watch root itself is reported so
+        the consumer knows to rescan.
+        """
+        changed: Set[str] = set()
+        while True:
+            try:
+                buf = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            except InterruptedError:
+                continue
+            if not buf:
+                break
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(buf):
+                wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(buf, offset)
+                offset += _EVENT_HEADER.size
+                name = buf[offset:offset + length].rstrip(b"\0")
+                offset += length
+                self._handle(wd, mask, os.fsdecode(name), changed)
+        return changed
+
+    def _handle(self, wd: int, mask: int, name: str, changed: Set[str]):
+        if mask & IN_Q_OVERFLOW:
+            changed.add(self.root)
+            return
+        if mask & IN_IGNORED:
+            self.watches.pop(wd, None)
+            return
+        directory = self.watches.get(wd)
+        if directory is None:
+            return
+        path = os.path.join(directory, name) if name else directory
+        if mask & IN_ISDIR:
+            if name in IGNORED_DIRS:
+                return
+            if self.recursive and mask & (IN_CREATE | IN_MOVED_TO):
+                # Files may land in the new directory before its watch exists.
+                for sub in _walk_dirs(path, True):
+                    self._add_watch(sub)
+                    changed.update(_snapshot(sub, False).keys())
+        changed.add(path)
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+            self.watches.clear()
+
+
+def _snapshot(root: str, recursive: bool) -> Dict[str, tuple]:
+    """Map every file under ``root`` to (st_mtime_ns, st_size) in one scandir pass."""
+    snap = {}
+    for directory in _walk_dirs(root, recursive):
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    try:
+                        if entry.is_file(follow_symlinks=False):
+                            st = entry.stat(follow_symlinks=False)
+                            snap[entry.path] = (st.st_mtime_ns, st.st_size)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return snap
+
+
+class PollingWatcher:
+    """Portable fallback: diff consecutive scandir snapshots."""
+
+    def __init__(self, root, recursive: bool = True):
+        self.root = os.path.abspath(str(root))
+        self.recursive = recursive
+        self.snapshot = _snapshot(self.root, recursive)
+
+    def poll(self) -> Set[str]:
+        current = _snapshot(self.root, self.recursive)
+        previous = self.snapshot
+        self.snapshot = current
+        changed = {p for p, sig in current.items() if previous.get(p) != sig}
+        changed.update(p for p in previous if p not in current)
+        return changed
+
+
+class ChangeCoalescer:
+    """Collect paths until the stream has been quiet for ``debounce`` seconds.
+
+    ``max_delay`` bounds how long a continuous stream of events can postpone
+    delivery.
+    """
+
+    def __init__(self, debounce: float = 0.25, max_delay: float = 2.0):
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.pending: Set[str] = set()
+        self.first = None
+        self.last = None
+
+    def add(self, paths: Iterable[str], now: float):
+        paths = set(paths)
+        if not paths:
+            return
+        if not self.pending:
+            self.first = now
+        self.pending |= paths
+        self.last = now
+
+    def timeout(self, now: float) -> Optional[float]:
+        """Seconds until the pending batch is due, or None if nothing is pending."""
+        if not self.pending:
+            return None
+        due = min(self.last + self.debounce, self.first + self.max_delay)
+        return max(0.0, due - now)
+
+    def drain(self) -> Set[str]:
+        paths, self.pending = self.pending, set()
+        self.first = self.last = None
+        return paths
+
+
+class HubWatcher:
+    """Watch a hub directory and report coalesced batches of changed paths.
+
+    ``callback(paths)`` runs on the watcher thread; consumers with their own
+    event loop should hand the batch over (e.g. via ``MainLoop.watch_pipe``).
+    """
+
+    def __init__(self, path, callback: Callable[[Set[str]], None], debounce: float = 0.25,
+                 max_delay: float = 2.0, recursive: bool = True, backend: str = "auto",
+                 poll_interval: float = 1.0):
+        self.path = os.path.abspath(str(path))
+        self.callback = callback
+        self.recursive = recursive
+        self.poll_interval = poll_interval
+        self.coalescer = ChangeCoalescer(debounce, max_delay)
+        self._stop = threading.Event()
+        self._wake_r, self._wake_w = os.pipe()
+        self._thread: Optional[threading.Thread] = None
+        self._inotify: Optional[InotifyWatcher] = None
+        self._poller: Optional[PollingWatcher] = None
+
+        if backend in ("auto", "inotify") and inotify_available():
+            try:
+                self._inotify = InotifyWatcher(self.path, recursive)
+            except OSError:
+                if backend == "inotify":
+                    raise
+        elif backend == "inotify":
+            raise OSError(errno.ENOSYS, "inotify is not available on this platform")
+        if self._inotify is None:
+            self._poller = PollingWatcher(self.path, recursive)
+
+    @property
+    def backend(self):
+        return "inotify" if self._inotify is not None else "polling"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.run, name="scn-hub-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        try:
+            os.write(self._wake_w, b"x")
+        except OSError:
+            pass
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        if self._inotify is not None:
+            self._inotify.close()
+        for fd in (self._wake_r, self._wake_w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def run(self):
+        """Blocking watch loop; returns after ``stop()``."""
+        next_poll = time.monotonic() + self.poll_interval
+        while not self._stop.is_set():
+            now = time.monotonic()
+            timeout = self.coalescer.timeout(now)
+            if self._poller is not None:
+                until_poll = max(0.0, next_poll - now)
+                timeout = until_poll if timeout is None else min(timeout, until_poll)
+
+            fds = [self._wake_r]
+            if self._inotify is not None:
+                fds.append(self._inotify.fileno())
+            try:
+                readable, _, _ = select.select(fds, [], [], timeout)
+            except InterruptedError:
+                continue
+            if self._stop.is_set():
+                break
+
+            now = time.monotonic()
+            if self._inotify is not None and self._inotify.fileno() in readable:
+                self.coalescer.add(self._inotify.read_events(), now)
+            if self._poller is not None and now >= next_poll:
+                self.coalescer.add(self._poller.poll(), now)
+                next_poll = now + self.poll_interval
+
+            if self.coalescer.pending and self.coalescer.timeout(now) == 0.0:
+                batch = self.coalescer.drain()
+                try:
+                    self.callback(batch)
+                except Exception:
+                    traceback.print_exc()
+
 
 def watch_hub_directory(callback, path, interval=2):
+    """Call ``callback(filename)`` for each file added to ``path``. Blocks forever."""
     seen = set(os.listdir(path))
-    while True:
-        time.sleep(interval)
+
+    def on_change(paths):
         current = set(os.listdir(path))
-        new_files = current - seen
-        if new_files:
-            for f in new_files:
-                callback(f)
-        seen = current
\ No newline at end of file
+        for f in sorted(current - seen):
+            callback(f)
+        seen.clear()
+        seen.update(current)
+
+    HubWatcher(path, on_change, recursive=False, poll_interval=interval).run()
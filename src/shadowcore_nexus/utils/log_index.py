@@ -0,0 +1,379 @@
+"""
+Structured ``daemon.log`` records and a sparse time -> offset index over them.
+
+``log_event`` writes one record per line::
+
+    2026-10-18T13:51:01.115267+00:00<TAB>INFO<TAB>netmap_ritual<TAB>NetMap Ritual Completed.
+
+(backslashes, newlines and carriage returns in the message are escaped, so a
+record is always one line). ``SparseIndex`` is fed by the ``LogSink`` writer:
+at most every ``every`` bytes (64 KB by default) it appends a fixed-size
+``(timestamp, offset)`` entry to ``daemon.log.idx``. The index header holds
+the log's inode, so an index left over from a rotated file is ignored and
+restarted.
+
+``query()`` bisects the index for ``since``/``until`` (with ``SLACK_SECONDS``
+of margin, since batches from different threads can land slightly out of
+order), samples the part of the log written after the last entry, mmaps the
+file and searches only that byte range, exact-filtering each candidate line.
+``--ritual``/``--grep`` are regex searches over the mapping, so non-matching
+lines are never split or decoded. Lines without a timestamp (written before
+this format) only match queries without a time filter.
+
+    python -m shadowcore_nexus logs query --since 2h --ritual netmap_ritual --grep "Port 22"
+"""
+
+import argparse
+import bisect
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+INDEX_EVERY = 64 << 10
+SLACK_SECONDS = 5.0
+INDEX_VERSION = 1
+
+_HEADER = struct.Struct("<4sIQ")   # magic, version, inode of the indexed log
+_ENTRY = struct.Struct("<dQ")      # epoch seconds, byte offset of a line start
+_MAGIC = b"SCNI"
+
+_ts_cache: Tuple[int, str, str] = (-1, "", "")
+_parse_cache: Dict[str, float] = {}
+
+
+def format_timestamp(t: float) -> str:
+    """Local ISO-8601 with microseconds and UTC offset (fixed width)."""
+    global _ts_cache
+    sec = int(t)
+    cached_sec, prefix, offset = _ts_cache
+    if sec != cached_sec:
+        local = time.localtime(sec)
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", local)
+        z = time.strftime("%z", local) or "+0000"
+        offset = f"{z[:3]}:{z[3:]}"
+        _ts_cache = (sec, prefix, offset)
+    return f"{prefix}.{int((t - sec) * 1e6):06d}{offset}"
+
+
+def parse_timestamp(field: str) -> Optional[float]:
+    # Whole seconds are cached; only the microseconds differ between lines.
+    if len(field) == 32 and field[19] == ".":
+        key = field[:19] + field[26:]
+        base = _parse_cache.get(key)
+        if base is None:
+            try:
+                base = datetime.fromisoformat(key).timestamp()
+            except ValueError:
+                return None
+            if len(_parse_cache) > 4096:
+                _parse_cache.clear()
+            _parse_cache[key] = base
+        try:
+            return base + int(field[20:26]) / 1e6
+        except ValueError:
+            return None
+    try:
+        return datetime.fromisoformat(field).timestamp()
+    except ValueError:
+        return None
+
+
+def _escape(message: str) -> str:
+    return message.replace("\\", "\\\\").replace("\n", "\\n").replace("\r", "\\r")
+
+
+_UNESCAPE = re.compile(r"\\(.)")
+_UNESCAPED = {"n": "\n", "r": "\r", "\\": "\\"}
+
+
+def _unescape(message: str) -> str:
+    if "\\" not in message:
+        return message
+    return _UNESCAPE.sub(lambda m: _UNESCAPED.get(m.group(1), m.group(0)), message)
+
+
+def format_record(message, ritual: str = "-", level: str = "INFO", ts: Optional[float] = None) -> str:
+    """One log line (with trailing newline)."""
+    stamp = format_timestamp(time.time() if ts is None else ts)
+    return f"{stamp}\t{level}\t{ritual}\t{_escape(str(message))}\n"
+
+
+def parse_record(line) -> Optional[Dict[str, Any]]:
+    """Fields of a record line (bytes or str), or None for an unstructured line."""
+    if isinstance(line, bytes):
+        line = line.decode("utf-8", "replace")
+    parts = line.rstrip("\n").split("\t", 3)
+    if len(parts) != 4:
+        return None
+    ts = parse_timestamp(parts[0])
+    if ts is None:
+        return None
+    return {"ts": ts, "time": parts[0], "level": parts[1], "ritual": parts[2],
+            "message": _unescape(parts[3])}
+
+
+def _line_ts(buf, start: int) -> Optional[float]:
+    tab = buf.find(b"\t", start, start + 64)
+    if tab < 0:
+        return None
+    return parse_timestamp(buf[start:tab].decode("ascii", "replace"))
+
+
+# Index ----------------------------------------------------------------
+
+def index_path(log_path) -> Path:
+    log_path = Path(log_path)
+    return log_path.with_name(log_path.name + ".idx")
+
+
+def read_index(log_path, inode: int) -> Optional[List[Tuple[float, int]]]:
+    """Entries of ``log_path``'s index, or None if missing or for another file."""
+    try:
+        data = index_path(log_path).read_bytes()
+    except OSError:
+        return None
+    if len(data) < _HEADER.size:
+        return None
+    magic, version, ino = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != INDEX_VERSION or ino != inode:
+        return None
+    usable = (len(data) - _HEADER.size) // _ENTRY.size * _ENTRY.size
+    return list(_ENTRY.iter_unpack(data[_HEADER.size:_HEADER.size + usable]))
+
+
+def sample_index(buf, start: int, end: int, every: int = INDEX_EVERY) -> List[Tuple[float, int]]:
+    """Index entries for ``buf[start:end]`` by reading one line every ``every`` bytes."""
+    entries = []
+    line = start
+    while line < end:
+        ts = _line_ts(buf, line)
+        if ts is not None:
+            entries.append((ts, line))
+        nl = buf.find(b"\n", line + every, end)
+        if nl < 0:
+            break
+        line = nl + 1
+    return entries
+
+
+class SparseIndex:
+    """Writer side of ``daemon.log.idx``: one entry per ``every`` bytes of log."""
+
+    def __init__(self, log_path, every: int = INDEX_EVERY):
+        self.log_path = Path(log_path)
+        self.path = index_path(log_path)
+        self.every = every
+        self._fd: Optional[int] = None
+        self._inode: Optional[int] = None
+        self._last = -1
+
+    def observe(self, f, first_line: str):
+        """Called with the open log before a batch starting with ``first_line`` is written."""
+        inode = os.fstat(f.fileno()).st_ino
+        if inode != self._inode:
+            self._attach(inode)
+        offset = f.tell()
+        if self._last >= 0 and offset - self._last < self.every:
+            return
+        tab = first_line.find("\t", 0, 64)
+        ts = parse_timestamp(first_line[:tab]) if tab > 0 else None
+        if ts is None:
+            return
+        os.write(self._fd, _ENTRY.pack(ts, offset))
+        self._last = offset
+
+    def _attach(self, inode: int):
+        """Continue this file's index, or start a new one (new or rotated log)."""
+        self.close()
+        entries = read_index(self.log_path, inode)
+        if entries is None:
+            self._fd = os.open(str(self.path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            os.write(self._fd, _HEADER.pack(_MAGIC, INDEX_VERSION, inode))
+            self._last = -1
+        else:
+            self._fd = os.open(str(self.path), os.O_WRONLY | os.O_APPEND)
+            self._last = entries[-1][1] if entries else -1
+        self._inode = inode
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        self._inode = None
+
+
+def rebuild_index(log_path, every: int = INDEX_EVERY) -> int:
+    """Write a fresh index for ``log_path`` by sampling it; returns the entry count."""
+    log_path = Path(log_path)
+    with open(log_path, "rb") as f:
+        inode = os.fstat(f.fileno()).st_ino
+        size = os.fstat(f.fileno()).st_size
+        entries = []
+        if size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                entries = sample_index(mm, 0, size, every)
+    tmp = index_path(log_path).with_suffix(".idx.tmp")
+    with open(tmp, "wb") as out:
+        out.write(_HEADER.pack(_MAGIC, INDEX_VERSION, inode))
+        for entry in entries:
+            out.write(_ENTRY.pack(*entry))
+    os.replace(tmp, index_path(log_path))
+    return len(entries)
+
+
+# Query ----------------------------------------------------------------
+
+def byte_range(entries: List[Tuple[float, int]], since: Optional[float], until: Optional[float],
+               size: int) -> Tuple[int, int]:
+    """Offsets bounding every record with ``since <= ts <= until`` (plus slack)."""
+    times = [ts for ts, _ in entries]
+    start, end = 0, size
+    if since is not None:
+        i = bisect.bisect_left(times, since - SLACK_SECONDS)
+        start = entries[i - 1][1] if i > 0 else 0
+    if until is not None:
+        j = bisect.bisect_right(times, until + SLACK_SECONDS)
+        end = entries[j][1] if j < len(entries) else size
+    return start, max(start, end)
+
+
+def _matches(record: Optional[Dict[str, Any]], since, until, ritual) -> bool:
+    if record is None:
+        return since is None and until is None and ritual is None
+    if ritual is not None and record["ritual"] != ritual:
+        return False
+    ts = record["ts"]
+    return (since is None or ts >= since) and (until is None or ts <= until)
+
+
+def _search(buf, start: int, end: int, since, until, ritual, grep) -> Iterator[Dict[str, Any]]:
+    if grep is not None:
+        pattern = re.compile(grep.encode("utf-8"))
+    elif ritual is not None:
+        pattern = re.compile(re.escape(f"\t{ritual}\t".encode("utf-8")))
+    else:
+        pattern = None
+    pos = start
+    while pos < end:
+        if pattern is not None:
+            match = pattern.search(buf, pos, end)
+            if match is None:
+                return
+            line_start = max(buf.rfind(b"\n", pos, match.start()) + 1, pos)
+            line_end = buf.find(b"\n", match.start(), end)
+        else:
+            line_start = pos
+            line_end = buf.find(b"\n", pos, end)
+        if line_end < 0:
+            return  # last line still being written
+        raw = buf[line_start:line_end]
+        record = parse_record(raw)
+        if _matches(record, since, until, ritual):
+            yield record if record is not None else {"ts": None, "time": "", "level": "",
+                                                     "ritual": "", "message": raw.decode("utf-8", "replace")}
+        pos = line_end + 1
+
+
+def query(log_path, since=None, until=None, ritual: Optional[str] = None, grep: Optional[str] = None,
+          rotated: bool = False, use_index: bool = True) -> Iterator[Dict[str, Any]]:
+    """Records of ``log_path`` matching every given filter, oldest first.
+
+    ``since``/``until`` are epoch seconds; ``grep`` is a regex over the raw
+    line. ``rotated`` also streams the closed (compressed) segments that may
+    overlap the time window.
+    """
+    log_path = Path(log_path)
+    if rotated:
+        # log_rotation pulls in logging.handlers; most queries never need it.
+        from .log_rotation import open_segment, rotated_segments
+        for segment in rotated_segments(log_path):
+            if since is not None and segment.stat().st_mtime < since:
+                continue  # last written before the window opened
+            pattern = re.compile(grep) if grep is not None else None
+            with open_segment(segment) as f:
+                for line in f:
+                    if pattern is not None and not pattern.search(line):
+                        continue
+                    record = parse_record(line)
+                    if _matches(record, since, until, ritual) and record is not None:
+                        yield record
+    try:
+        f = open(log_path, "rb")
+    except FileNotFoundError:
+        return
+    with f:
+        st = os.fstat(f.fileno())
+        if not st.st_size:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = len(mm)
+            if use_index and (since is not None or until is not None):
+                entries = read_index(log_path, st.st_ino) or []
+                tail = entries[-1][1] if entries else 0
+                entries += [e for e in sample_index(mm, tail, size) if e[1] > tail]
+                start, end = byte_range(entries, since, until, size)
+            else:
+                start, end = 0, size
+            yield from _search(mm, start, end, since, until, ritual, grep)
+
+
+# CLI ------------------------------------------------------------------
+
+_RELATIVE = re.compile(r"^(\d+(?:\.\d+)?)([smhdw])$")
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def parse_when(value: str) -> float:
+    """``7d``/``12h``/``30m`` ago, or an ISO date/time, as epoch seconds."""
+    match = _RELATIVE.match(value.strip())
+    if match:
+        return time.time() - float(match.group(1)) * _UNITS[match.group(2)]
+    return datetime.fromisoformat(value).timestamp()
+
+
+def main(argv=None):
+    from ..core.paths import LOGS_DIR
+    default_log = LOGS_DIR / "daemon.log"
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--file", default=str(default_log), help=f"Log file (default: {default_log})")
+    parser = argparse.ArgumentParser(prog="shadowcore_nexus logs", description="Query daemon.log")
+    sub = parser.add_subparsers(dest="command", required=True)
+    q = sub.add_parser("query", parents=[common], help="Print matching records")
+    q.add_argument("--since", type=parse_when, help="e.g. 30m, 2h, 7d, 2026-10-01T12:00")
+    q.add_argument("--until", type=parse_when)
+    q.add_argument("--ritual")
+    q.add_argument("--grep", help="Regular expression matched against the raw line")
+    q.add_argument("--rotated", action="store_true", help="Also search rotated (compressed) segments")
+    q.add_argument("--limit", type=int)
+    q.add_argument("--json", action="store_true", help="One JSON record per line")
+    sub.add_parser("index", parents=[common], help="Rebuild daemon.log.idx from the log")
+    args = parser.parse_args(argv)
+
+    if args.command == "index":
+        print(f"[+] Indexed {args.file}: {rebuild_index(args.file)} entries")
+        return
+    try:
+        results = query(args.file, args.since, args.until, args.ritual, args.grep, args.rotated)
+        for n, record in enumerate(results):
+            if args.limit is not None and n >= args.limit:
+                break
+            if args.json:
+                print(json.dumps(record, ensure_ascii=False))
+            elif record["ts"] is None:
+                print(record["message"])
+            else:
+                print(f"{record['time'][:23]} {record['level']:<5} {record['ritual']}: {record['message']}")
+    except BrokenPipeError:
+        sys.stderr.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,447 @@
+"""
+Size/time-based rotation, background compression and retention for log files.
+
+A ``RotationPolicy`` says when a live log is rotated (``max_bytes``, or
+``max_age`` seconds after it was opened) and what happens to the closed
+segment: it is renamed to ``<name>.<YYYYmmdd-HHMMSS>``, compressed with gzip
+or lzma on the ``scn-log-compress`` thread (streamed, never loaded whole),
+and the oldest segments beyond ``keep`` / ``max_total_bytes`` are deleted.
+
+Writers that rotate: ``LogSink`` (``daemon.log``) and ``RotatingLogHandler``
+for the stdlib ``logging`` module (``modules/logger.Logger``). Both close the
+file before renaming it, so everything written before a rotation is in the
+renamed segment; ``follow_batches()`` relies on that to tail a log across
+rotations without losing or repeating lines.
+"""
+
+import gzip
+import logging.handlers
+import os
+import queue
+import re
+import select
+import shutil
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+try:
+    import lzma
+except ImportError:  # Python built without liblzma
+    lzma = None
+
+COMPRESSION_SUFFIX = {"gzip": ".gz", "lzma": ".xz"}
+CHUNK_SIZE = 1 << 20
+# A segment is compressed only once it has been untouched this long, so a
+# writer in another process that has not yet noticed the rotation can finish.
+SETTLE_SECONDS = 1.0
+
+
+class RotationPolicy:
+    """When to rotate a log, how to compress closed segments, how many to keep."""
+
+    def __init__(self, max_bytes: Optional[int] = 10 << 20, max_age: Optional[float] = 86400,
+                 compression: Optional[str] = "gzip", level: Optional[int] = None,
+                 keep: int = 10, max_total_bytes: Optional[int] = None):
+        if compression not in (None, "gzip", "lzma"):
+            raise ValueError(f"compression must be 'gzip', 'lzma' or None, not {compression!r}")
+        if compression == "lzma" and lzma is None:
+            compression = "gzip"
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.compression = compression
+        self.level = level
+        self.keep = keep
+        self.max_total_bytes = max_total_bytes
+
+    def due(self, size: int, opened_at: float, now: Optional[float] = None) -> bool:
+        """True if a file of ``size`` bytes, opened at ``opened_at``, should rotate."""
+        if size <= 0:
+            return False
+        if self.max_bytes is not None and size >= self.max_bytes:
+            return True
+        if self.max_age is not None:
+            return (time.time() if now is None else now) - opened_at >= self.max_age
+        return False
+
+
+def opened_at(path) -> float:
+    """Start of a log's age: now, or its last write if that is earlier (a stale file)."""
+    now = time.time()
+    try:
+        return min(now, os.stat(path).st_mtime)
+    except OSError:
+        return now
+
+
+def _segment_pattern(path: Path):
+    return re.compile(re.escape(path.name) + r"\.(\d{8}-\d{6})(?:-(\d+))?(\.gz|\.xz)?$")
+
+
+def _segments(path: Path) -> List[Tuple[Tuple[str, int], Path]]:
+    pattern = _segment_pattern(path)
+    found = []
+    try:
+        names = os.listdir(path.parent)
+    except OSError:
+        return []
+    for name in names:
+        match = pattern.match(name)
+        if match:
+            found.append(((match.group(1), int(match.group(2) or 0)), path.parent / name))
+    found.sort()
+    return found
+
+
+def rotated_segments(path) -> List[Path]:
+    """Closed segments of ``path`` (compressed or not), oldest first."""
+    return [segment for _, segment in _segments(Path(path))]
+
+
+def rotate_file(path, policy: RotationPolicy) -> Optional[Path]:
+    """Rename ``path`` to a timestamped segment and queue it for compression.
+
+    The caller must have closed its handle on ``path``. Returns the segment,
+    or None if there was nothing to rotate.
+    """
+    path = Path(path)
+    # Names must sort after every existing segment, even once retention has
+    # freed an older name in the same second (follow() relies on the order).
+    key = (datetime.now().strftime("%Y%m%d-%H%M%S"), 0)
+    existing = _segments(path)
+    if existing and existing[-1][0] >= key:
+        key = (existing[-1][0][0], existing[-1][0][1] + 1)
+    stamp, n = key
+    target = path.with_name(f"{path.name}.{stamp}" if n == 0 else f"{path.name}.{stamp}-{n}")
+    while any(target.with_name(target.name + s).exists() for s in ("", ".gz", ".xz")):
+        n += 1
+        target = path.with_name(f"{path.name}.{stamp}-{n}")
+    try:
+        os.replace(path, target)
+    except FileNotFoundError:
+        return None
+    _compressor.submit(path, policy)
+    return target
+
+
+def compress_file(source: Path, compression: str, level: Optional[int] = None) -> Path:
+    """Stream ``source`` into ``source + .gz/.xz`` and delete it; returns the new path."""
+    target = source.with_name(source.name + COMPRESSION_SUFFIX[compression])
+    tmp = target.with_name(target.name + ".tmp")
+    if compression == "gzip":
+        out = gzip.open(tmp, "wb", compresslevel=6 if level is None else level)
+    else:
+        out = lzma.open(tmp, "wb", preset=level)
+    try:
+        with open(source, "rb") as src, out:
+            shutil.copyfileobj(src, out, CHUNK_SIZE)
+        shutil.copystat(source, tmp)
+        os.replace(tmp, target)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    os.unlink(source)
+    return target
+
+
+def apply_retention(path, policy: RotationPolicy) -> List[Path]:
+    """Delete the oldest segments beyond ``keep`` / ``max_total_bytes``; returns them."""
+    segments = rotated_segments(path)
+    removed = []
+    while segments and len(segments) > policy.keep:
+        removed.append(segments.pop(0))
+    if policy.max_total_bytes is not None:
+        sizes = []
+        for segment in segments:
+            try:
+                sizes.append(segment.stat().st_size)
+            except OSError:
+                sizes.append(0)
+        total = sum(sizes)
+        while segments and total > policy.max_total_bytes:
+            removed.append(segments.pop(0))
+            total -= sizes.pop(0)
+    for segment in removed:
+        try:
+            segment.unlink()
+        except OSError:
+            pass
+    return removed
+
+
+class _Compressor:
+    """One background thread compressing closed segments, then applying retention."""
+
+    def __init__(self):
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, path: Path, policy: RotationPolicy):
+        self._queue.put((path, policy))
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self.run, name="scn-log-compress", daemon=True)
+                self._thread.start()
+
+    def run(self):
+        while True:
+            path, policy = self._queue.get()
+            try:
+                self._process(path, policy)
+            except Exception:
+                pass  # retried with the next rotation of this log
+            finally:
+                self._queue.task_done()
+
+    def _process(self, path: Path, policy: RotationPolicy):
+        if policy.compression is not None:
+            # Also picks up segments a previous process left uncompressed.
+            for stale in path.parent.glob(f"{path.name}.*.tmp"):
+                if time.time() - stale.stat().st_mtime > 60:
+                    stale.unlink()
+            for segment in rotated_segments(path):
+                if segment.suffix in (".gz", ".xz"):
+                    continue
+                while True:
+                    idle = time.time() - segment.stat().st_mtime
+                    if idle >= SETTLE_SECONDS:
+                        break
+                    time.sleep(SETTLE_SECONDS - idle)
+                compress_file(segment, policy.compression, policy.level)
+        apply_retention(path, policy)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until every queued segment is processed."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+
+_compressor = _Compressor()
+
+
+def wait_for_compression(timeout: Optional[float] = None) -> bool:
+    return _compressor.wait(timeout)
+
+
+def rotated_away(path, f) -> bool:
+    """True if ``path`` no longer names the file open as ``f`` (rotated elsewhere)."""
+    try:
+        current = os.stat(path)
+    except FileNotFoundError:
+        return True
+    own = os.fstat(f.fileno())
+    return (current.st_ino, current.st_dev) != (own.st_ino, own.st_dev)
+
+
+class RotatingLogHandler(logging.handlers.BaseRotatingHandler):
+    """``logging`` file handler that rotates by ``RotationPolicy``."""
+
+    def __init__(self, filename, policy: Optional[RotationPolicy] = None,
+                 encoding: Optional[str] = "utf-8", delay: bool = False):
+        self.policy = policy or RotationPolicy()
+        self.opened_at = time.time()
+        super().__init__(filename, "a", encoding=encoding, delay=delay)
+
+    def _open(self):
+        self.opened_at = opened_at(self.baseFilename)
+        return super()._open()
+
+    def shouldRollover(self, record) -> bool:
+        if self.stream is not None and rotated_away(self.baseFilename, self.stream):
+            self.stream.close()  # another process rotated it
+            self.stream = None
+        if self.stream is None:
+            self.stream = self._open()
+        size = self.stream.tell()
+        return size > 0 and self.policy.due(size + len(self.format(record)) + 1, self.opened_at)
+
+    def doRollover(self):
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+        rotate_file(self.baseFilename, self.policy)
+        if not self.delay:
+            self.stream = self._open()
+
+
+def open_segment(segment: Path):
+    """Open a live file or a closed segment (gzip/lzma by suffix) as text."""
+    if segment.suffix == ".gz":
+        return gzip.open(segment, "rt", encoding="utf-8", errors="replace")
+    if segment.suffix == ".xz":
+        return lzma.open(segment, "rt", encoding="utf-8", errors="replace")
+    return open(segment, "r", encoding="utf-8", errors="replace")
+
+
+def _segment_key(path: Path, own: os.stat_result):
+    """Sort key of the segment of ``path`` that was the file ``own`` was taken of.
+
+    An uncompressed segment is still that inode; a compressed one is a new
+    file, recognised by the modification time ``compress_file`` copies over.
+    """
+    for key, segment in _segments(path):
+        try:
+            st = segment.stat()
+        except OSError:
+            continue
+        if segment.suffix in (".gz", ".xz"):
+            if st.st_mtime_ns == own.st_mtime_ns:
+                return key
+        elif st.st_ino == own.st_ino:
+            return key
+    return None
+
+
+def _read_rotated_after(path: Path, key) -> Iterator[List[str]]:
+    """The lines of every segment rotated after the one with sort key ``key``,
+    one list per segment.
+
+    Returns (as the generator's value) the key of the last segment read.
+    """
+    while True:
+        later = [(k, segment) for k, segment in _segments(path) if k > key]
+        if not later:
+            return key
+        k, segment = later[0]
+        try:
+            with open_segment(segment) as f:
+                lines = f.read().split("\n")
+        except FileNotFoundError:
+            continue  # compressed (renamed) meanwhile; list again
+        if lines[-1] == "":
+            lines.pop()
+        if lines:
+            yield lines
+        key = k
+
+
+class _ChangeWaiter:
+    """Sleep until something in ``directory`` changes (inotify), or ``timeout``."""
+
+    def __init__(self, directory: Path):
+        self._inotify = None
+        try:
+            from .file_monitor import InotifyWatcher, inotify_available
+            if inotify_available():
+                self._inotify = InotifyWatcher(directory, recursive=False)
+        except OSError:
+            self._inotify = None
+
+    @property
+    def backend(self) -> str:
+        return "inotify" if self._inotify is not None else "polling"
+
+    def wait(self, timeout: float):
+        if self._inotify is None:
+            time.sleep(timeout)
+            return
+        try:
+            readable, _, _ = select.select([self._inotify.fileno()], [], [], timeout)
+        except InterruptedError:
+            return
+        if readable:
+            self._inotify.read_events()
+
+    def close(self):
+        if self._inotify is not None:
+            self._inotify.close()
+
+
+def follow_batches(path, from_end: bool = True, poll_interval: float = 0.5,
+                   stop: Optional[threading.Event] = None,
+                   max_bytes: int = CHUNK_SIZE) -> Iterator[List[str]]:
+    """Yield lists of lines appended to ``path``, across rotations and truncation.
+
+    Between bursts the follower sleeps on inotify events for the log's
+    directory (so a write, rotation or truncation wakes it at once), falling
+    back to ``poll_interval`` polling without inotify; ``poll_interval`` also
+    bounds how long ``stop`` takes to be noticed. Each wake-up reads
+    everything new (up to ``max_bytes`` per batch) and splits it in one go.
+
+    At EOF the file is re-stat'ed. If ``path`` now names a different file
+    (rotated), the rest of the old file is read, then any segments rotated
+    after it (a slow reader may miss several rotations; compressed ones are
+    read through gzip/lzma), then the new file from its start. If the file
+    shrank (truncated in place), reading restarts at 0. A log that does not
+    exist yet is read from its start once it appears. Partial lines are held
+    until their newline arrives.
+    """
+    path = Path(path)
+    waiter = _ChangeWaiter(path.parent)
+    f = None
+    pending = b""
+    key = None  # sort key of the segment just drained after a rotation
+    try:
+        while stop is None or not stop.is_set():
+            if f is None:
+                try:
+                    f = open(path, "rb")
+                except FileNotFoundError:
+                    from_end = False  # everything in it once it appears is new
+                    waiter.wait(poll_interval)
+                    continue
+                if key is not None and any(k > key for k, _ in _segments(path)):
+                    # Rotated again before we opened it: read those segments first.
+                    f.close()
+                    f = None
+                    key = yield from _read_rotated_after(path, key)
+                    continue
+                key = None
+                if from_end:
+                    f.seek(0, os.SEEK_END)
+                    from_end = False  # later (re)opens start at the beginning
+            chunk = f.read(max_bytes)
+            if chunk:
+                pending += chunk
+                cut = pending.rfind(b"\n")
+                if cut >= 0:
+                    complete, pending = pending[:cut], pending[cut + 1:]
+                    yield complete.decode("utf-8", "replace").split("\n")
+                continue
+            try:
+                current = os.stat(path)
+            except FileNotFoundError:
+                current = None
+            own = os.fstat(f.fileno())
+            if current is not None and (current.st_ino, current.st_dev) != (own.st_ino, own.st_dev):
+                # Rotated. The writer closed the old file before renaming it, so
+                # one more read to EOF gets whatever landed since the last one.
+                pending += f.read()
+                f.close()
+                f = None
+                if pending:
+                    lines = pending.decode("utf-8", "replace").split("\n")
+                    if lines[-1] == "":
+                        lines.pop()
+                    yield lines
+                    pending = b""
+                key = _segment_key(path, own)
+                if key is not None:
+                    key = yield from _read_rotated_after(path, key)
+                continue
+            if current is not None and current.st_size < f.tell():
+                f.seek(0)  # truncated in place
+                pending = b""
+                continue
+            waiter.wait(poll_interval)
+    finally:
+        waiter.close()
+        if f is not None:
+            f.close()
+
+
+def follow(path, from_end: bool = True, poll_interval: float = 0.5,
+           stop: Optional[threading.Event] = None) -> Iterator[str]:
+    """Yield lines appended to ``path`` one at a time; see ``follow_batches``."""
+    for batch in follow_batches(path, from_end, poll_interval, stop):
+        yield from batch
@@ -0,0 +1,232 @@
+"""
+Buffered, process-wide sink for ``log_event`` lines.
+
+Callers append to a bounded in-memory queue and return; a background thread
+(``scn-log-sink``) writes whatever has accumulated in one ``write`` call once
+``batch_lines`` lines are waiting or ``flush_interval`` seconds have passed
+since the oldest one. When the queue is full, callers block until the writer
+catches up, so lines are never dropped.
+
+``durability`` decides what happens after each batch:
+
+* ``none``  -- leave it in the file object's buffer (written when that fills
+  and on close),
+* ``flush`` -- hand it to the OS (survives a crash of this process),
+* ``fsync`` -- also ``fsync`` it (survives a power loss).
+
+The default is ``flush``; ``SCN_LOG_DURABILITY`` overrides it for the shared
+sink. With a ``rotation`` policy (the shared sink has the default one) the
+file is rotated between batches, see ``utils.log_rotation``; with an ``index``
+(the shared sink keeps ``daemon.log.idx``) each batch is offered to it before
+being written, see ``utils.log_index``. Pending lines are written at
+interpreter exit; a forked child starts a fresh sink instead of inheriting the
+parent's queue.
+"""
+
+import atexit
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Optional
+
+from .log_index import SparseIndex
+from .log_rotation import RotationPolicy, opened_at, rotate_file, rotated_away
+
+DURABILITY = ("none", "flush", "fsync")
+DEFAULT_DURABILITY = "flush"
+
+
+class LogSink:
+    """Append lines to one file from a background thread, in batches."""
+
+    def __init__(self, path, max_queue: int = 10000, batch_lines: int = 512,
+                 flush_interval: float = 0.2, durability: str = DEFAULT_DURABILITY,
+                 rotation: Optional[RotationPolicy] = None, index: Optional[SparseIndex] = None):
+        if durability not in DURABILITY:
+            raise ValueError(f"durability must be one of {DURABILITY}, not {durability!r}")
+        self.path = Path(path)
+        self.max_queue = max_queue
+        self.batch_lines = batch_lines
+        self.flush_interval = flush_interval
+        self.durability = durability
+        self.rotation = rotation
+        self.index = index
+        self.rotations = 0
+        self.enqueued = 0
+        self.written = 0
+        self.lost = 0
+        self.batches = 0
+        self._queue: deque = deque()
+        self._first = 0.0
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._file = None
+        self._opened_at = 0.0
+        self._stop = False
+        self._thread: Optional[threading.Thread] = None
+
+    def write(self, line: str):
+        """Queue ``line`` (which should end in a newline)."""
+        with self._cond:
+            queue = self._queue
+            while len(queue) >= self.max_queue:
+                self._cond.notify_all()
+                self._cond.wait()
+            if not queue:
+                self._first = time.monotonic()
+            queue.append(line)
+            self.enqueued += 1
+            if self._thread is None:
+                self._start()
+            elif len(queue) >= self.batch_lines:
+                self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything queued so far is written (and made durable)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            target = self.enqueued
+        # Written from this thread: the writer would hold a short batch back
+        # until flush_interval has passed.
+        self._write_batch()
+        with self._cond:
+            while self.written < target:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        with self._write_lock:
+            if self._file is not None and self.durability == "none":
+                self._file.flush()
+        return True
+
+    def _open(self):
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._opened_at = opened_at(self.path)
+            self._file = open(self.path, "a", encoding="utf-8")
+        return self._file
+
+    def _rotate_if_due(self, incoming: int):
+        f = self._file
+        if f is None:
+            return
+        if rotated_away(self.path, f):  # rotated by another process
+            f.close()
+            self._file = None
+        elif f.tell() > 0 and self.rotation.due(f.tell() + incoming, self._opened_at):
+            f.close()
+            self._file = None
+            if rotate_file(self.path, self.rotation) is not None:
+                self.rotations += 1
+
+    def _write_batch(self) -> int:
+        with self._write_lock:
+            with self._cond:
+                if not self._queue:
+                    return 0
+                lines = list(self._queue)
+                self._queue.clear()
+                self._cond.notify_all()  # room for blocked writers
+            lost = 0
+            chunk = "".join(lines)
+            try:
+                if self.rotation is not None:
+                    self._rotate_if_due(len(chunk))
+                f = self._open()
+                if self.index is not None:
+                    self.index.observe(f, lines[0])
+                f.write(chunk)
+                if self.durability != "none":
+                    f.flush()
+                    if self.durability == "fsync":
+                        os.fsync(f.fileno())
+            except OSError:
+                lost = len(lines)  # e.g. disk full; nowhere left to report it
+            with self._cond:
+                self.written += len(lines)
+                self.lost += lost
+                self.batches += 1
+                self._cond.notify_all()  # wake flush() callers
+            return len(lines)
+
+    def _start(self):
+        self._thread = threading.Thread(target=self.run, name="scn-log-sink", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        """Write what is queued, stop the thread and close the file."""
+        with self._cond:
+            self._stop = True
+            self._cond.notify_all()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+        self._write_batch()
+        with self._write_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            if self.index is not None:
+                self.index.close()
+        with self._cond:
+            self._thread = None
+            self._stop = False
+
+    def run(self):
+        """Writer loop; returns after ``close()``."""
+        while True:
+            with self._cond:
+                while not self._stop:
+                    pending = len(self._queue)
+                    if pending >= self.batch_lines or pending >= self.max_queue:
+                        break  # a full queue has writers blocked on it
+                    if pending:
+                        wait = self._first + self.flush_interval - time.monotonic()
+                        if wait <= 0:
+                            break
+                        self._cond.wait(wait)
+                    else:
+                        self._cond.wait()
+                if self._stop:
+                    return
+            self._write_batch()
+
+
+_sink: Optional[LogSink] = None
+_sink_lock = threading.Lock()
+
+
+def get_sink(path) -> LogSink:
+    """The shared sink, created on first use with ``path``."""
+    global _sink
+    if _sink is None:
+        with _sink_lock:
+            if _sink is None:
+                durability = os.environ.get("SCN_LOG_DURABILITY", DEFAULT_DURABILITY).lower()
+                if durability not in DURABILITY:
+                    durability = DEFAULT_DURABILITY
+                _sink = LogSink(path, durability=durability, rotation=RotationPolicy(),
+                                index=SparseIndex(path))
+    return _sink
+
+
+@atexit.register
+def close_sink():
+    """Write pending lines and close the shared sink."""
+    global _sink
+    sink, _sink = _sink, None
+    if sink is not None:
+        sink.close()
+
+
+def _reset_after_fork():
+    global _sink, _sink_lock
+    _sink = None
+    _sink_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -1,21 +1,28 @@
+import logging
+import sys
 from pathlib import Path
 
-LOG_FILE = Path(__file__).resolve().parent.parent / 'artifacts' / 'logs' / 'daemon.log'
+from .log_index import format_record
+from .log_sink import get_sink
 
-def log_event(message):
-    with LOG_FILE.open('a') as f:
-        f.write(f"{message}\n")
+LOG_FILE = Path(__file__).resolve().parent.parent / 'artifacts' / 'logs' / 'daemon.log'
 
-from datetime import datetime
+def get_logger(name):
+    # Standard library logger for hub internals (diagnostics, not ritual
+    # events); handlers and level are left to the application.
+    return logging.getLogger(name)
 
-HISTORY_DIR = Path(__file__).resolve().parent.parent / 'artifacts' / 'history'
+def log_event(message, ritual=None, level="INFO"):
+    # One structured record (see utils.log_index), queued for the background
+    # writer in utils.log_sink (flushed at exit). The ritual defaults to the
+    # calling module's file name, e.g. "netmap_ritual".
+    if ritual is None:
+        caller = sys._getframe(1).f_globals.get("__file__")
+        ritual = Path(caller).stem if caller else "-"
+    get_sink(LOG_FILE).write(format_record(message, ritual, level))
 
 def log_history(ritual_name, details):
-    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    filename = f"{ritual_name}_{timestamp}.log"
-    filepath = HISTORY_DIR / filename
-
-    with filepath.open('w') as f:
-        f.write(f"Ritual: {ritual_name}\n")
-        f.write(f"Timestamp: {timestamp}\n")
-        f.write(f"Details: {details}\n")
\ No newline at end of file
+    # One record appended to the segmented store in core.history_store (which
+    # also migrates the old per-event <ritual>_<timestamp>.log files).
+    from ..core.history_store import get_store
+    get_store().append(ritual_name, details)
\ No newline at end of file
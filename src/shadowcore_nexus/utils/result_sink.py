@@ -0,0 +1,290 @@
+"""
+Structured result logging for scan modules (``modules/logger.py`` and
+``modules/net_mapper/logger.py`` re-export ``Logger`` from here).
+
+``Logger.log(dict)`` hands the record to a ``QueueHandler`` on a private,
+non-propagating ``logging`` logger (one per result file; the root logger and
+global logging config are left alone) and returns. A ``QueueListener``
+thread per file serializes records to JSONL and appends them in batches: a
+batch is written when ``BATCH_RECORDS`` are buffered or the queue runs dry.
+Any number of ``Logger`` objects, in any threads, can share a file.
+
+Console echo is optional (``echo=False`` turns it off) and rate-limited to
+``echo_rate`` lines per second per file; the rest are counted and reported
+in one summary line. The file is rotated by ``utils.log_rotation``.
+
+Listener threads do not survive ``fork()``: a child process starts its own
+sinks, and a ``Logger`` created before the fork moves to the child's sink on
+its next call.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+from .log_rotation import RotationPolicy, opened_at, rotate_file, rotated_away
+
+BATCH_RECORDS = 512
+ECHO_RATE = 20.0
+
+_encode = json.JSONEncoder(default=str).encode  # json.dumps(default=...) builds one per call
+
+
+def format_entry(data: dict, json_mode: bool) -> str:
+    """Console form of a record (``data`` includes its ``timestamp``)."""
+    if json_mode:
+        return _encode(data)
+    return f"[{data['timestamp']}] " + ' | '.join(f"{k}: {v}" for k, v in data.items() if k != 'timestamp')
+
+
+class ConsoleEcho:
+    """Print records to stdout, at most ``rate`` per second (token bucket)."""
+
+    def __init__(self, rate: float = ECHO_RATE, source: str = ""):
+        self.rate = rate
+        self.source = source
+        self.suppressed = 0
+        self._tokens = rate
+        self._last = time.monotonic()
+
+    def offer(self, data: dict, json_mode: bool):
+        now = time.monotonic()
+        self._tokens = min(self.rate, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+        if self._tokens < 1:
+            self.suppressed += 1
+            return
+        self._tokens -= 1
+        self.report()
+        print(format_entry(data, json_mode))
+
+    def report(self):
+        if self.suppressed:
+            print(f"[...] {self.suppressed} more results not echoed (see {self.source})")
+            self.suppressed = 0
+
+
+class JsonlBatchHandler(logging.Handler):
+    """Append dict records to ``path`` as JSONL, one write per batch."""
+
+    def __init__(self, path, batch_records: int = BATCH_RECORDS, echo_rate: float = ECHO_RATE):
+        super().__init__()
+        self.path = os.path.abspath(path)
+        self.batch_records = batch_records
+        self.policy = RotationPolicy()
+        self.echo = ConsoleEcho(echo_rate, self.path)
+        self.written = 0
+        self._buffer = []
+        self._file = None
+        self._opened_at = 0.0
+
+    def emit(self, record):
+        data = record.msg
+        data['timestamp'] = datetime.fromtimestamp(record.created).isoformat()
+        self._buffer.append(_encode(data) + "\n")
+        if record.scn_echo:
+            self.echo.offer(data, record.scn_json)
+        if len(self._buffer) >= self.batch_records:
+            self.flush()
+
+    def _rotate_if_due(self, incoming: int):
+        f = self._file
+        if rotated_away(self.path, f):  # rotated by another process
+            f.close()
+            self._file = None
+        elif f.tell() > 0 and self.policy.due(f.tell() + incoming, self._opened_at):
+            f.close()
+            self._file = None
+            rotate_file(self.path, self.policy)
+
+    def flush(self):
+        self.acquire()
+        try:
+            if not self._buffer:
+                return
+            chunk = "".join(self._buffer)
+            count = len(self._buffer)
+            self._buffer = []
+            if self._file is not None:
+                self._rotate_if_due(len(chunk))
+            if self._file is None:
+                self._opened_at = opened_at(self.path)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(chunk)
+            self._file.flush()
+            self.written += count
+        finally:
+            self.release()
+
+    def close(self):
+        self.flush()
+        self.echo.report()
+        self.acquire()
+        try:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        finally:
+            self.release()
+        super().close()
+
+
+class ResultRecord(logging.LogRecord):
+    """A ``LogRecord`` carrying one result dict, without the caller, thread and
+    process lookups a ``LogRecord`` normally makes (they cost more than the
+    rest of ``log()`` together)."""
+
+    args = None
+    exc_info = exc_text = stack_info = None
+    pathname = filename = module = ""
+    lineno = 0
+    funcName = thread = threadName = process = processName = None
+    levelno = logging.INFO
+    levelname = "INFO"
+    msecs = relativeCreated = 0
+
+    def __init__(self, name: str, data: dict, echo: bool, json_mode: bool):
+        self.name = name
+        self.msg = data
+        self.created = time.time()
+        self.scn_echo = echo
+        self.scn_json = json_mode
+
+
+class _DictQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        return record  # consumed in-process: keep the dict, skip formatting
+
+
+class _BatchingListener(logging.handlers.QueueListener):
+    def dequeue(self, block):
+        if block:
+            try:
+                return self.queue.get_nowait()
+            except queue.Empty:
+                self._flush()  # caught up: write the partial batch
+        return self.queue.get(block)
+
+    def handle(self, record):
+        if isinstance(record, threading.Event):  # flush() marker
+            self._flush()
+            record.set()
+            return
+        super().handle(record)
+
+    def _flush(self):
+        for handler in self.handlers:
+            handler.flush()
+
+
+class ResultSink:
+    """Queue + listener thread + JSONL writer for one result file."""
+
+    def __init__(self, path, echo_rate: float = ECHO_RATE):
+        self.path = os.path.abspath(path)
+        self.queue = queue.SimpleQueue()
+        self.handler = JsonlBatchHandler(self.path, echo_rate=echo_rate)
+        self.logger = logging.getLogger(f"scn.results.{self.path}")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+        self.logger.addHandler(_DictQueueHandler(self.queue))
+        self.listener = _BatchingListener(self.queue, self.handler)
+        self.listener.start()
+        self.users = 0
+        self.forked = False  # set in a child process: the listener is the parent's
+
+    def flush(self):
+        """Block until every record queued so far is on disk."""
+        done = threading.Event()
+        self.queue.put(done)
+        done.wait()
+
+    def close(self):
+        for handler in list(self.logger.handlers):
+            self.logger.removeHandler(handler)
+        self.listener.stop()
+        self.handler.close()
+
+
+_sinks = {}
+_sinks_lock = threading.Lock()
+
+
+def _acquire_sink(path, echo_rate: float) -> ResultSink:
+    key = os.path.abspath(path)
+    with _sinks_lock:
+        sink = _sinks.get(key)
+        if sink is None:
+            sink = _sinks[key] = ResultSink(key, echo_rate)
+        sink.users += 1
+        return sink
+
+
+def _release_sink(sink: ResultSink):
+    with _sinks_lock:
+        sink.users -= 1
+        if sink.users > 0 or _sinks.get(sink.path) is not sink:
+            return
+        del _sinks[sink.path]
+    sink.close()
+
+
+@atexit.register
+def close_all():
+    """Write everything queued and stop every listener."""
+    with _sinks_lock:
+        sinks = list(_sinks.values())
+        _sinks.clear()
+    for sink in sinks:
+        sink.close()
+
+
+def _reset_after_fork():
+    global _sinks, _sinks_lock
+    for sink in _sinks.values():
+        sink.forked = True
+        for handler in list(sink.logger.handlers):
+            sink.logger.removeHandler(handler)
+    _sinks = {}
+    _sinks_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+class Logger:
+    def __init__(self, log_file='netmap.log', json_mode=False, echo=True, echo_rate=ECHO_RATE):
+        self.json_mode = json_mode
+        self.log_file = log_file
+        self.echo_rate = echo_rate
+        self._sink = _acquire_sink(log_file, echo_rate)
+        self._logger = self._sink.logger
+        self.echo = echo
+
+    def _move_to_child_sink(self):
+        # Created before a fork; the parent's records stay with the parent.
+        self._sink = _acquire_sink(self.log_file, self.echo_rate)
+        self._logger = self._sink.logger
+
+    def log(self, data: dict):
+        if self._sink is not None and self._sink.forked:
+            self._move_to_child_sink()
+        # Timestamped and serialized on the listener thread.
+        self._logger.handle(ResultRecord(self._logger.name, dict(data), self.echo, self.json_mode))
+
+    def flush(self):
+        if self._sink.forked:
+            self._move_to_child_sink()
+        self._sink.flush()
+
+    def close(self):
+        if self._sink is not None:
+            _release_sink(self._sink)
+            self._sink = None
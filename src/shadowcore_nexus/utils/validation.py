@@ -18,4 +18,20 @@ def get_data_dir(app_name):
     elif system == "Darwin":  # macOS
         return Path.home() / "Library" / "Application Support" / app_name
     else:  # Linux/BSD
-        return Path.home() / f".{app_name.lower()}"
\ No newline at end of file
+        return Path.home() / f".{app_name.lower()}"
+
+
+def validate_module_contract(mod, name):
+    """Check a freshly imported hub module's entry points; return the module.
+
+    Every entry point is optional, but those present must be usable:
+    ``MODULE_META`` a dict, ``register``/``main``/``run`` callables.
+    """
+    meta = getattr(mod, "MODULE_META", None)
+    if meta is not None and not isinstance(meta, dict):
+        raise ImportError(f"{name}: MODULE_META must be a dict, not {type(meta).__name__}")
+    for attr in ("register", "main", "run"):
+        value = getattr(mod, attr, None)
+        if value is not None and not callable(value):
+            raise ImportError(f"{name}: {attr} must be callable")
+    return mod
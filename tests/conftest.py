@@ -0,0 +1,40 @@
+import logging
+import sys
+import textwrap
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolate_imports():
+    """Hub modules loaded by a test (and sys.path entries the loader adds) must
+    not leak into the next test."""
+    modules = set(sys.modules)
+    path = list(sys.path)
+    yield
+    for name in set(sys.modules) - modules:
+        del sys.modules[name]
+    sys.path[:] = path
+
+
+@pytest.fixture(autouse=True)
+def _quiet_logs():
+    logging.disable(logging.CRITICAL)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+@pytest.fixture
+def write_module(tmp_path):
+    """Write ``source`` (dedented) to ``modules/<relpath>``; returns the path."""
+    root = tmp_path / "modules"
+    root.mkdir()
+
+    def write(relpath, source=""):
+        path = root / relpath
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(textwrap.dedent(source))
+        return path
+
+    write.root = root
+    return write
@@ -0,0 +1,174 @@
+import asyncio
+import threading
+
+import pytest
+
+from shadowcore_nexus.core.event_system import AsyncEventBus
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_events_are_delivered_in_order_to_sync_and_async_subscribers():
+    async def scenario():
+        bus = AsyncEventBus()
+        plain, awaited = [], []
+
+        async def slow(data):
+            await asyncio.sleep(0)
+            awaited.append(data)
+
+        bus.subscribe("scan.done", plain.append)
+        bus.subscribe("scan.done", slow)
+        for i in range(200):
+            await bus.publish("scan.done", i)
+        await bus.drain()
+        await bus.close()
+        return plain, awaited
+
+    plain, awaited = run(scenario())
+    assert plain == list(range(200))
+    assert awaited == list(range(200))
+
+
+def test_block_policy_applies_backpressure_without_losing_events():
+    async def scenario():
+        bus = AsyncEventBus(maxsize=4, policy="block")
+        gate = asyncio.Event()
+        seen = []
+
+        async def consumer(data):
+            await gate.wait()
+            seen.append(data)
+
+        sub = bus.subscribe("t", consumer)
+        publisher = asyncio.ensure_future(asyncio.gather(*[bus.publish("t", i) for i in range(20)]))
+        for _ in range(10):
+            await asyncio.sleep(0)
+        assert not publisher.done()
+        assert sub.depth <= sub.maxsize
+        gate.set()
+        await publisher
+        await bus.drain()
+        await bus.close()
+        return sub, seen
+
+    sub, seen = run(scenario())
+    assert seen == list(range(20))
+    assert sub.dropped == 0
+
+
+@pytest.mark.parametrize("policy, kept", [("drop-oldest", [7, 8, 9]), ("drop-newest", [0, 1, 2])])
+def test_drop_policies_keep_the_expected_end_of_a_burst(policy, kept):
+    async def scenario():
+        bus = AsyncEventBus(maxsize=3, policy=policy)
+        seen = []
+        sub = bus.subscribe("t", seen.append)
+        for i in range(10):
+            bus.publish_nowait("t", i)  # no yield: the consumer cannot run in between
+        await bus.drain()
+        await bus.close()
+        return sub, seen
+
+    sub, seen = run(scenario())
+    assert seen == kept
+    assert sub.dropped == 7
+
+
+def test_coalesce_policy_keeps_the_latest_event_per_key():
+    async def scenario():
+        bus = AsyncEventBus(maxsize=8)
+        seen = []
+        sub = bus.subscribe("host.state", seen.append, policy="coalesce",
+                            coalesce_key=lambda _topic, data: data["host"])
+        for i in range(30):
+            bus.publish_nowait("host.state", {"host": f"10.0.0.{i % 3}", "seq": i})
+        await bus.drain()
+        await bus.close()
+        return sub, seen
+
+    sub, seen = run(scenario())
+    assert [(e["host"], e["seq"]) for e in seen] == [("10.0.0.0", 27), ("10.0.0.1", 28), ("10.0.0.2", 29)]
+    assert sub.coalesced == 27
+
+
+def test_slow_subscriber_does_not_delay_a_fast_one():
+    async def scenario():
+        bus = AsyncEventBus(maxsize=64)
+        gate = asyncio.Event()
+        fast = []
+
+        async def stuck(_data):
+            await gate.wait()
+
+        bus.subscribe("t", stuck)
+        bus.subscribe("t", fast.append)
+        for i in range(50):
+            await bus.publish("t", i)
+        for _ in range(5):
+            await asyncio.sleep(0)
+        delivered = list(fast)
+        gate.set()
+        await bus.drain()
+        await bus.close()
+        return delivered
+
+    assert run(scenario()) == list(range(50))
+
+
+def test_failing_subscriber_is_counted_and_others_still_run():
+    async def scenario():
+        bus = AsyncEventBus()
+        seen = []
+
+        def broken(_data):
+            raise RuntimeError("boom")
+
+        bad = bus.subscribe("t", broken)
+        bus.subscribe("t", seen.append)
+        for i in range(3):
+            await bus.publish("t", i)
+        await bus.drain()
+        await bus.close()
+        return bad, seen
+
+    bad, seen = run(scenario())
+    assert bad.errors == 3 and bad.delivered == 0
+    assert seen == [0, 1, 2]
+
+
+def test_publish_threadsafe_delivers_everything_from_other_threads():
+    async def scenario():
+        bus = AsyncEventBus(maxsize=16)
+        seen = []
+        bus.subscribe("scan.#", seen.append)
+        await bus.drain()  # bind to this loop
+
+        def producer(base):
+            for i in range(500):
+                bus.publish_threadsafe("scan.port", base + i)
+
+        threads = [threading.Thread(target=producer, args=(n * 1000,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        while any(t.is_alive() for t in threads):
+            await asyncio.sleep(0.001)
+        await bus.drain()
+        await bus.close()
+        return seen
+
+    seen = run(scenario())
+    assert len(seen) == 2000
+    for n in range(4):
+        mine = [v for v in seen if n * 1000 <= v < (n + 1) * 1000]
+        assert mine == sorted(mine)
+
+
+def test_publish_threadsafe_before_binding_and_unknown_policy_raise():
+    with pytest.raises(RuntimeError):
+        AsyncEventBus().publish_threadsafe("t", 1)
+    with pytest.raises(ValueError):
+        AsyncEventBus(policy="spill")
+    with pytest.raises(ValueError):
+        AsyncEventBus().subscribe("t", print, policy="spill")
@@ -0,0 +1,136 @@
+import json
+import os
+import sys
+import time
+
+import pytest
+
+from shadowcore_nexus import __main__ as launcher
+from shadowcore_nexus.core import config, config_service, configuration
+from shadowcore_nexus.core.config_service import ConfigService
+
+DEFAULTS = {"debug_mode": False, "network_timeout": 5, "log_level": "INFO"}
+
+
+@pytest.fixture
+def make_service(tmp_path):
+    services = []
+
+    def make(environ=None, write_debounce=0.01):
+        service = ConfigService(DEFAULTS, packaged_path=tmp_path / "daemon_config.json",
+                                user_path=tmp_path / "user.json", environ=environ or {},
+                                write_debounce=write_debounce)
+        services.append(service)
+        return service
+
+    yield make
+    for service in services:
+        service.stop()
+
+
+def write_json(path, data):
+    # A different size or a later mtime, so the signature always changes
+    path.write_text(json.dumps(data))
+    os.utime(path, ns=(time.time_ns() + 10**9,) * 2)
+
+
+def test_layers_merge_in_priority_order(tmp_path, make_service):
+    write_json(tmp_path / "daemon_config.json", {"network_timeout": 10, "log_level": "DEBUG"})
+    write_json(tmp_path / "user.json", {"log_level": "WARNING"})
+    service = make_service(environ={"SCN_CONFIG_NETWORK_TIMEOUT": "30", "SCN_CONFIG_TAG": "red team",
+                                    "UNRELATED": "1"})
+    service.set_cli({"network_timeout": 60, "unset": None})
+    assert service.as_dict() == {"debug_mode": False, "network_timeout": 60, "log_level": "WARNING",
+                                 "tag": "red team"}
+    assert [service.source(k) for k in ("debug_mode", "log_level", "tag", "network_timeout")] == \
+        ["defaults", "user", "env", "cli"]
+    assert service.source("missing") is None
+    with pytest.raises(TypeError):
+        service.view()["log_level"] = "x"
+
+
+def test_refresh_reloads_only_changed_files_and_notifies_changed_keys(tmp_path, make_service):
+    service = make_service()
+    changes, timeouts = [], []
+    service.subscribe(changes.append)
+    service.subscribe(timeouts.append, keys=["network_timeout"])
+    assert service.refresh() == {}
+    write_json(tmp_path / "user.json", {"log_level": "ERROR"})
+    assert service.refresh() == {"log_level": ("INFO", "ERROR")}
+    assert changes == [{"log_level": ("INFO", "ERROR")}] and timeouts == []
+    write_json(tmp_path / "user.json", {"log_level": "ERROR", "extra": 1})
+    write_json(tmp_path / "daemon_config.json", {"network_timeout": 5})  # same merged value
+    assert service.refresh() == {"extra": (None, 1)}
+    assert service.unsubscribe(changes.append) and not service.unsubscribe(changes.append)
+
+
+def test_unreadable_config_file_is_ignored(tmp_path, make_service):
+    (tmp_path / "user.json").write_text("{not json")
+    (tmp_path / "daemon_config.json").write_text("[1, 2]")
+    assert make_service().as_dict() == DEFAULTS
+
+
+def test_set_updates_memory_at_once_and_disk_after_flush(tmp_path, make_service):
+    service = make_service(write_debounce=60)
+    service.set("network_timeout", 15)
+    assert service.get("network_timeout") == 15
+    assert not (tmp_path / "user.json").exists()
+    assert service.refresh() == {}  # a pending write keeps the in-memory layer
+    service.flush()
+    assert json.loads((tmp_path / "user.json").read_text()) == {"network_timeout": 15}
+    assert service.refresh() == {}  # our own write is not seen as an outside change
+    with pytest.raises(ValueError):
+        service.set("x", 1, layer="env")
+
+
+def test_watch_picks_up_edits_to_the_user_file(tmp_path, make_service):
+    service = make_service().watch(debounce=0.01, poll_interval=0.05)
+    seen = []
+    service.subscribe(seen.append)
+    write_json(tmp_path / "user.json", {"log_level": "CRITICAL"})
+    deadline = time.monotonic() + 5
+    while not seen and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert seen == [{"log_level": ("INFO", "CRITICAL")}]
+
+
+def test_export_writes_merged_view_or_one_layer(tmp_path, make_service):
+    service = make_service()
+    service.set_cli({"log_level": "DEBUG"})
+    merged = service.export(tmp_path / "merged.json")
+    cli = service.export(tmp_path / "cli.json", layer="cli")
+    assert json.loads(merged.read_text())["log_level"] == "DEBUG"
+    assert json.loads(cli.read_text()) == {"log_level": "DEBUG"}
+
+
+@pytest.fixture
+def shared_service(monkeypatch, make_service):
+    service = make_service()
+    monkeypatch.setattr(config_service, "_service", service)
+    monkeypatch.setattr(config, "CONFIG_FILE", service.paths["packaged"])
+    return service
+
+
+def test_legacy_config_helpers_go_through_the_service(shared_service):
+    assert config.load_config() == dict(config.DEFAULT_CONFIG)  # created from the defaults
+    config.save_config({"network_timeout": 7})
+    assert config.get_config()["network_timeout"] == 7
+    assert config.config["network_timeout"] == 7
+    configuration.save_config({"log_level": "ERROR"})
+    assert configuration.load_config() == {"log_level": "ERROR"}
+    shared_service.flush()
+    assert json.loads(shared_service.paths["packaged"].read_text()) == {"network_timeout": 7}
+
+
+def test_launcher_set_flags_become_the_cli_layer(monkeypatch, shared_service):
+    monkeypatch.setitem(sys.modules, "shadowcore_nexus.interfaces.tui", None)  # stop before the TUI
+    monkeypatch.setattr(sys, "argv", ["shadowcore_nexus", "--set", "network_timeout=12",
+                                      "--set", "tag=blue", "--debug"])
+    with pytest.raises(SystemExit):
+        launcher.main()
+    assert shared_service.layer("cli") == {"network_timeout": 12, "tag": "blue", "debug_mode": True}
+
+    monkeypatch.setattr(sys, "argv", ["shadowcore_nexus", "--set", "no-equals"])
+    with pytest.raises(SystemExit) as exc:
+        launcher.main()
+    assert exc.value.code == 2
@@ -0,0 +1,135 @@
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from shadowcore_nexus.core import config_writer
+from shadowcore_nexus.core.config_service import ConfigService
+from shadowcore_nexus.core.config_writer import ConfigWriter, atomic_write_json, remove_stale_temps
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+REWRITE_FOREVER = """
+import sys
+from shadowcore_nexus.core.config_writer import atomic_write_json
+generation = 0
+while True:
+    generation += 1
+    atomic_write_json(sys.argv[1], {f"key_{i}": generation for i in range(2000)})
+"""
+
+
+def temps(path):
+    return [p for p in path.parent.iterdir() if p.name.startswith(f".{path.name}-")]
+
+
+def test_atomic_write_keeps_mode_and_leaves_no_temp(tmp_path):
+    path = tmp_path / "sub" / "config.json"
+    atomic_write_json(path, {"a": 1})
+    assert oct(path.stat().st_mode & 0o777) == oct(config_writer.NEW_FILE_MODE)
+    os.chmod(path, 0o600)
+    atomic_write_json(path, {"a": 2}, pretty=True)
+    assert path.stat().st_mode & 0o777 == 0o600
+    assert json.loads(path.read_text()) == {"a": 2} and path.read_text().endswith("}\n")
+    assert temps(path) == []
+
+
+def test_failed_write_keeps_the_old_file(tmp_path):
+    path = tmp_path / "config.json"
+    atomic_write_json(path, {"a": 1})
+    with pytest.raises(TypeError):
+        atomic_write_json(path, {"a": object()})
+    assert json.loads(path.read_text()) == {"a": 1}
+    assert temps(path) == []
+
+
+def test_remove_stale_temps_only_removes_old_temps_of_that_file(tmp_path):
+    path = tmp_path / "config.json"
+    old = tmp_path / ".config.json-dead.tmp"
+    fresh = tmp_path / ".config.json-live.tmp"
+    other = tmp_path / ".other.json-dead.tmp"
+    for p in (old, fresh, other):
+        p.write_text("{")
+    past = time.time() - 3600
+    os.utime(old, (past, past))
+    os.utime(other, (past, past))
+    assert remove_stale_temps(path) == 1
+    assert not old.exists() and fresh.exists() and other.exists()
+
+
+def test_burst_of_submits_becomes_one_write_of_the_latest_state(tmp_path):
+    path = tmp_path / "config.json"
+    written = []
+    writer = ConfigWriter(path, debounce=0.05, on_written=written.append)
+    state = {"n": 0}
+    for n in range(1000):
+        state["n"] = n
+        writer.submit(state)  # copied now: later mutation does not leak in
+    state["n"] = "mutated"
+    deadline = time.monotonic() + 5
+    while writer.busy and time.monotonic() < deadline:
+        time.sleep(0.01)
+    writer.stop()
+    assert writer.submitted == 1000 and writer.written == 1 and written == [path]
+    assert json.loads(path.read_text()) == {"n": 999}
+
+
+def test_max_delay_bounds_a_steady_stream(tmp_path):
+    path = tmp_path / "config.json"
+    writer = ConfigWriter(path, debounce=0.05, max_delay=0.1)
+    start = time.monotonic()
+    while not path.exists() and time.monotonic() - start < 2:
+        writer.submit({"t": time.monotonic()})
+        time.sleep(0.01)
+    writer.stop()
+    assert path.exists() and writer.written >= 1
+
+
+def test_concurrent_service_writers_end_with_disk_equal_to_memory(tmp_path):
+    service = ConfigService({}, packaged_path=tmp_path / "packaged.json",
+                            user_path=tmp_path / "user.json", environ={}, write_debounce=0.02)
+    threads_n, updates = 8, 500
+
+    def hammer(t):
+        for i in range(updates):
+            service.set(f"thread_{t}", i)
+
+    threads = [threading.Thread(target=hammer, args=(t,)) for t in range(threads_n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    service.stop()
+    on_disk = json.loads((tmp_path / "user.json").read_text())
+    assert on_disk == service.layer("user") == {f"thread_{t}": updates - 1 for t in range(threads_n)}
+    writer = service._writers["user"]
+    assert writer.submitted == threads_n * updates
+    assert writer.written < writer.submitted / 10
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGKILL"), reason="needs SIGKILL")
+def test_file_survives_being_killed_mid_write(tmp_path):
+    path = tmp_path / "config.json"
+    env = dict(os.environ, PYTHONPATH=str(SRC))
+    rng = random.Random(13)
+    for _ in range(12):
+        child = subprocess.Popen([sys.executable, "-c", REWRITE_FOREVER, str(path)], env=env)
+        time.sleep(rng.uniform(0.15, 0.3))
+        child.send_signal(signal.SIGKILL)
+        child.wait()
+        if not path.exists():
+            continue  # killed before the first write landed
+        data = json.loads(path.read_text())
+        assert len(data) == 2000 and len(set(data.values())) == 1
+    assert path.exists()
+    for p in temps(path):
+        os.utime(p, (0, 0))
+    remove_stale_temps(path)
+    assert temps(path) == []
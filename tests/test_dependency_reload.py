@@ -0,0 +1,75 @@
+import select
+import time
+
+from shadowcore_nexus.core.module_loader import ModuleLoader
+from shadowcore_nexus.core.module_runner import ModuleRunPool
+
+HELPER = "VERSION = {version}\n"
+USER = "from dep_helper import VERSION\ndef main():\n    return VERSION\n"
+CHAIN = "import dep_user\ndef main():\n    return dep_user.main()\n"
+
+
+def make_hub(write_module):
+    helper = write_module("dep_helper.py", HELPER.format(version=1))
+    write_module("dep_user.py", USER)
+    write_module("dep_chain.py", CHAIN)
+    write_module("dep_plain.py", "def main():\n    return 0\n")
+    return helper
+
+
+def edit(path, text):
+    time.sleep(0.01)
+    path.write_text(text)
+
+
+def test_dependents_are_reloaded_with_the_changed_module(write_module):
+    helper = make_hub(write_module)
+    loader = ModuleLoader(write_module.root, lazy=False, use_cache=False)
+    loader.discover_all()
+    assert loader.graph.dependents({"dep_helper"}) == {"dep_user", "dep_chain"}
+    before = {k: e.module for k, e in loader.entries.items()}
+
+    edit(helper, HELPER.format(version=2))
+    loader.reload_paths([str(helper)])
+
+    reloaded = {k for k, e in loader.entries.items() if e.module is not before[k]}
+    assert reloaded == {"dep_helper", "dep_user", "dep_chain"}
+    assert loader.last_invalidated == reloaded
+    assert loader.get_entry("dep_chain").module.main() == 2
+
+
+def test_lazy_mode_loads_an_imported_sibling_on_demand(write_module):
+    make_hub(write_module)
+    loader = ModuleLoader(write_module.root, lazy=True, use_cache=False)
+    loader.discover_all()
+    chain = loader.get_entry("dep_chain")
+    assert loader.ensure_loaded(chain) and chain.module.main() == 1
+    assert loader.get_entry("dep_helper").loaded
+
+
+def run(pool, entry):
+    handle = pool.submit(entry.key, entry.path)
+    deadline = time.monotonic() + 10
+    while not handle.done and time.monotonic() < deadline:
+        ready, _, _ = select.select([w.fileno() for w in pool.workers], [], [], 0.05)
+        for fd in ready:
+            pool.handle_ready(fd)
+    assert handle.state == "done", handle.error
+    return handle.result
+
+
+def test_run_pool_workers_drop_stale_dependents(write_module):
+    helper = make_hub(write_module)
+    loader = ModuleLoader(write_module.root, lazy=False, use_cache=False)
+    loader.discover_all()
+    pool = ModuleRunPool(size=1, preload=()).start()
+    try:
+        chain = loader.get_entry("dep_chain")
+        assert run(pool, chain) == "1"
+        edit(helper, HELPER.format(version=2))
+        loader.reload_paths([str(helper)])
+        assert run(pool, chain) == "1"  # the worker still holds the old helper
+        pool.invalidate(loader.last_invalidated)
+        assert run(pool, chain) == "2"
+    finally:
+        pool.shutdown()
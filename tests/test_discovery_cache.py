@@ -0,0 +1,89 @@
+import os
+
+import pytest
+
+from shadowcore_nexus.core.discovery_cache import DiscoveryCache
+from shadowcore_nexus.core.module_loader import ModuleLoader
+from shadowcore_nexus.utils.validation import validate_module_contract
+
+
+def discover(modules_dir, cache_dir):
+    loader = ModuleLoader(modules_dir, lazy=True, cache_dir=cache_dir)
+    loader.discover_all()
+    return loader
+
+
+def test_second_start_is_served_from_the_cache(write_module, tmp_path):
+    write_module("alpha.py", "MODULE_META = {'name': 'Alpha'}\n")
+    write_module("beta.py", "def main():\n    pass\n")
+    cache_dir = tmp_path / "cache"
+
+    cold = discover(write_module.root, cache_dir)
+    assert cold.last_discovery["cache"] == "cold"
+    assert (cold.last_discovery["hits"], cold.last_discovery["misses"]) == (0, 2)
+
+    warm = discover(write_module.root, cache_dir)
+    assert warm.last_discovery["cache"] == "warm"
+    assert (warm.last_discovery["hits"], warm.last_discovery["misses"]) == (2, 0)
+    assert warm.get_entry("alpha").metadata["name"] == "Alpha"
+
+
+def test_touch_keeps_the_record_but_an_edit_invalidates_it(write_module, tmp_path):
+    path = write_module("alpha.py", "MODULE_META = {'name': 'Alpha'}\n")
+    cache_dir = tmp_path / "cache"
+    discover(write_module.root, cache_dir)
+
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert discover(write_module.root, cache_dir).last_discovery["hits"] == 1
+
+    path.write_text("MODULE_META = {'name': 'Renamed'}\n")
+    loader = discover(write_module.root, cache_dir)
+    assert loader.last_discovery["misses"] == 1
+    assert loader.get_entry("alpha").metadata["name"] == "Renamed"
+
+
+def test_corrupt_cache_falls_back_to_a_full_scan(write_module, tmp_path):
+    write_module("alpha.py", "def main():\n    pass\n")
+    cache_dir = tmp_path / "cache"
+    cache = DiscoveryCache(cache_dir, write_module.root)
+    cache_dir.mkdir()
+    cache.path.write_text("{not json")
+
+    loader = discover(write_module.root, cache_dir)
+    assert loader.last_discovery["cache"] == "corrupt"
+    assert loader.last_discovery["misses"] == 1
+    assert DiscoveryCache(cache_dir, write_module.root).load()
+
+
+def test_removed_modules_are_pruned(write_module, tmp_path):
+    write_module("alpha.py")
+    gone = write_module("beta.py")
+    cache_dir = tmp_path / "cache"
+    discover(write_module.root, cache_dir)
+    gone.unlink()
+    loader = discover(write_module.root, cache_dir)
+    assert list(loader.cache.records) == [str(write_module.root / "alpha.py")]
+
+
+class _Module:
+    pass
+
+
+def test_module_contract_rejects_unusable_entry_points():
+    mod = _Module()
+    assert validate_module_contract(mod, "plain") is mod
+    mod.MODULE_META = ["not", "a", "dict"]
+    with pytest.raises(ImportError):
+        validate_module_contract(mod, "bad_meta")
+    mod.MODULE_META = {}
+    mod.main = "not callable"
+    with pytest.raises(ImportError):
+        validate_module_contract(mod, "bad_main")
+
+
+def test_module_with_broken_contract_fails_to_load(write_module):
+    write_module("bad.py", "MODULE_META = 42\n")
+    loader = ModuleLoader(write_module.root, lazy=True, use_cache=False)
+    loader.discover_all()
+    assert not loader.ensure_loaded(loader.get_entry("bad"))
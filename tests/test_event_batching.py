@@ -0,0 +1,92 @@
+import threading
+import time
+
+from shadowcore_nexus.core.event_system import BatchingEventBus
+
+
+def test_flush_delivers_batches_in_publish_order():
+    bus = BatchingEventBus(max_batch=4)
+    batches = []
+    bus.subscribe("scan.#", batches.append)
+    for i in range(10):
+        bus.publish("scan.port", i)
+    assert batches == []  # publish only appends to the ring
+    assert bus.flush() == 10
+    assert [len(b) for b in batches] == [4, 4, 2]
+    assert [data for batch in batches for _, data in batch] == list(range(10))
+    assert bus.stats() == {"published": 10, "delivered": 10, "batches": 3, "coalesced": 0,
+                           "overwritten": 0, "pending": 0}
+
+
+def test_coalesce_key_keeps_latest_event_per_key_in_first_seen_order():
+    bus = BatchingEventBus()
+    batches = []
+    bus.subscribe("host.state", batches.append, coalesce_key=lambda _topic, data: data[0])
+    for i in range(9):
+        bus.publish("host.state", ("abc"[i % 3], i))
+    bus.flush()
+    assert batches == [[("host.state", ("a", 6)), ("host.state", ("b", 7)), ("host.state", ("c", 8))]]
+    assert bus.coalesced == 6
+
+
+def test_each_subscriber_only_gets_matching_topics():
+    bus = BatchingEventBus()
+    hosts, ports = [], []
+    bus.subscribe("scan.host", hosts.extend)
+    bus.subscribe("scan.port", ports.extend)
+    bus.publish("scan.host", 1)
+    bus.publish("scan.port", 2)
+    bus.publish("scan.host", 3)
+    bus.flush()
+    assert hosts == [("scan.host", 1), ("scan.host", 3)]
+    assert ports == [("scan.port", 2)]
+
+
+def test_full_ring_overwrites_the_oldest_events():
+    bus = BatchingEventBus(capacity=5)
+    seen = []
+    bus.subscribe("t", seen.extend)
+    for i in range(8):
+        bus.publish("t", i)
+    bus.flush()
+    assert [data for _, data in seen] == [3, 4, 5, 6, 7]
+    assert bus.overwritten == 3
+
+
+def test_failing_subscriber_does_not_stop_delivery():
+    bus = BatchingEventBus()
+    seen = []
+
+    def broken(_batch):
+        raise RuntimeError("boom")
+
+    bus.subscribe("t", broken)
+    bus.subscribe("t", seen.extend)
+    bus.publish("t", 1)
+    bus.flush()
+    assert seen == [("t", 1)]
+
+
+def test_flusher_thread_delivers_concurrent_producers_and_final_flush_on_stop():
+    bus = BatchingEventBus(interval=0.01, max_batch=256)
+    seen = []
+    bus.subscribe("t", seen.extend)
+    bus.start()
+
+    def producer(base):
+        for i in range(2000):
+            bus.publish("t", base + i)
+
+    threads = [threading.Thread(target=producer, args=(n * 10000,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    time.sleep(0.05)
+    bus.publish("t", -1)
+    bus.stop()
+    values = [data for _, data in seen]
+    assert len(values) == 8001 and values[-1] == -1
+    for n in range(4):
+        mine = [v for v in values if n * 10000 <= v < (n + 1) * 10000]
+        assert mine == sorted(mine) and len(mine) == 2000
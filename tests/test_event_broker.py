@@ -0,0 +1,143 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from shadowcore_nexus.core.event_broker import (PUB, SUB, EventBroker, EventClient, decode_payload,
+                                                 encode_frame, encode_payload, frame_header,
+                                                 split_frames)
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+
+@pytest.fixture
+def socket_path():
+    # pytest's tmp_path can be longer than AF_UNIX allows
+    short = tempfile.mkdtemp(prefix="scn-")
+    yield Path(short) / "events.sock"
+    shutil.rmtree(short, ignore_errors=True)
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        time.sleep(0.005)
+
+
+class Collector:
+    def __init__(self):
+        self.items = []
+        self.lock = threading.Lock()
+
+    def __call__(self, data):
+        with self.lock:
+            self.items.append(data)
+
+
+def test_frames_survive_partial_reads():
+    payload = {"host": "10.0.0.1", "ports": [22, 443], "note": "ünïcode"}
+    stream = encode_frame(SUB, "scan.#") + encode_frame(PUB, "scan.host.up", *encode_payload(payload))
+    buf = bytearray()
+    frames = []
+    for i in range(0, len(stream), 3):
+        buf += stream[i:i + 3]
+        frames.extend(split_frames(buf))
+    assert not buf and len(frames) == 2
+    assert frame_header(frames[0])[:2] == (SUB, "scan.#")
+    kind, topic, offset = frame_header(frames[1])
+    assert (kind, topic) == (PUB, "scan.host.up")
+    assert decode_payload(frames[1][offset], frames[1][offset + 1:]) == payload
+
+
+def test_invalid_frame_length_is_rejected():
+    with pytest.raises(ValueError):
+        split_frames(bytearray(b"\x00\x00\x00\x01xyz"))
+
+
+def test_broker_routes_only_matching_topics(socket_path):
+    broker = EventBroker(socket_path).start()
+    hosts, everything = Collector(), Collector()
+    a = EventClient(socket_path).connect()
+    b = EventClient(socket_path).connect()
+    try:
+        a.subscribe("scan.host.*", hosts)
+        b.subscribe("#", everything)
+        wait_for(lambda: broker.stats()["subscriptions"] == 2)
+        publisher = EventClient(socket_path).connect()
+        for i in range(100):
+            publisher.publish("scan.host.up", i)
+        publisher.publish("scan.port.open", "x")
+        publisher.flush()
+        wait_for(lambda: len(everything.items) == 101)
+        wait_for(lambda: len(hosts.items) == 100)
+        assert hosts.items == list(range(100))
+        assert broker.stats()["received"] == 101
+        a.unsubscribe("scan.host.*", hosts)
+        b.unsubscribe("#", everything)
+        wait_for(lambda: broker.stats()["subscriptions"] == 0)
+        publisher.publish("scan.host.up", "unheard")
+        publisher.flush()
+        wait_for(lambda: broker.stats()["filtered"] == 1)
+        publisher.close()
+    finally:
+        a.close()
+        b.close()
+        broker.stop()
+    assert not socket_path.exists()
+
+
+def test_second_broker_on_a_live_socket_refuses_to_start(socket_path):
+    broker = EventBroker(socket_path).start()
+    try:
+        with pytest.raises(OSError):
+            EventBroker(socket_path).start()
+    finally:
+        broker.stop()
+
+
+def test_client_reconnects_and_resubscribes_after_broker_restart(socket_path):
+    broker = EventBroker(socket_path).start()
+    seen = Collector()
+    client = EventClient(socket_path, min_backoff=0.01, max_backoff=0.05).connect()
+    try:
+        client.subscribe("t", seen)
+        client.publish("t", "before")
+        wait_for(lambda: seen.items == ["before"])
+        broker.stop()
+        wait_for(lambda: not client.connected)
+        assert client.publish("t", "queued") is False
+        broker = EventBroker(socket_path).start()
+        wait_for(lambda: client.connected)
+        wait_for(lambda: seen.items == ["before", "queued"])
+        assert client.reconnects == 1
+    finally:
+        client.close()
+        broker.stop()
+
+
+def test_events_cross_process_boundaries(socket_path):
+    broker = EventBroker(socket_path).start()
+    seen = Collector()
+    client = EventClient(socket_path).connect()
+    try:
+        client.subscribe("worker.result", seen)
+        wait_for(lambda: broker.stats()["subscriptions"] == 1)
+        code = ("import sys; from shadowcore_nexus.core.event_broker import EventClient\n"
+                "c = EventClient(sys.argv[1], reconnect=False).connect()\n"
+                "[c.publish('worker.result', {'n': i}) for i in range(50)]\n"
+                "c.close()\n")
+        env = dict(os.environ, PYTHONPATH=str(SRC))
+        subprocess.run([sys.executable, "-c", code, str(socket_path)], env=env, check=True, timeout=30)
+        wait_for(lambda: len(seen.items) == 50)
+        assert seen.items == [{"n": i} for i in range(50)]
+    finally:
+        client.close()
+        broker.stop()
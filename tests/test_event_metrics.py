@@ -0,0 +1,100 @@
+import asyncio
+import json
+import random
+
+import pytest
+
+from shadowcore_nexus.core.event_metrics import EventMetrics, LogHistogram, metrics_from_env
+from shadowcore_nexus.core.event_system import AsyncEventBus, BatchingEventBus, EventBus
+
+
+def test_histogram_percentiles_stay_within_bucket_precision():
+    rng = random.Random(7)
+    values = sorted(rng.randint(1, 50_000_000) for _ in range(5000))
+    hist = LogHistogram()
+    for v in values:
+        hist.record(v)
+    assert hist.count == 5000 and hist.max == values[-1] and hist.total == sum(values)
+    for q in (0.5, 0.9, 0.99):
+        exact = values[round(q * len(values)) - 1]
+        assert abs(hist.percentile(q) - exact) / exact < 0.07
+
+
+def test_small_values_are_exact():
+    hist = LogHistogram()
+    for v in (0, 1, 5, 31):
+        hist.record(v)
+    assert hist.min == 0 and hist.percentile(1.0) == 31
+    assert hist.cumulative([1, 6, 32]) == [(1, 1), (6, 3), (32, 4)]
+
+
+def test_event_bus_records_publishes_latency_and_errors():
+    metrics = EventMetrics()
+    bus = EventBus(metrics=metrics)
+
+    def broken(_data):
+        raise RuntimeError("boom")
+
+    bus.subscribe("scan.#", lambda data: None)
+    bus.subscribe("scan.fail", broken)
+    for _ in range(10):
+        bus.publish("scan.host", 1)
+    with pytest.raises(RuntimeError):
+        bus.publish("scan.fail")
+    snapshot = metrics.snapshot()
+    assert snapshot["published"] == {"scan.host": 10, "scan.fail": 1}
+    by_pattern = {h["pattern"]: h for h in snapshot["handlers"]}
+    assert by_pattern["scan.#"]["calls"] == 11
+    assert by_pattern["scan.fail"]["errors"] == 1
+
+
+def test_disabled_bus_uses_the_plain_publish(monkeypatch):
+    monkeypatch.delenv("SCN_EVENT_METRICS", raising=False)
+    assert metrics_from_env() is None
+    bus = EventBus()
+    assert "publish" not in bus.__dict__
+    metrics = bus.enable_metrics(EventMetrics())
+    bus.publish("t")
+    bus.disable_metrics()
+    bus.publish("t")
+    assert metrics.published == {"t": 1}
+    monkeypatch.setenv("SCN_EVENT_METRICS", "1")
+    assert EventBus().metrics is metrics_from_env()
+
+
+def test_batching_and_async_buses_count_topics_and_queue_depths():
+    metrics = EventMetrics()
+    batching = BatchingEventBus(metrics=metrics)
+    batching.subscribe("t", lambda batch: None)
+    for _ in range(5):
+        batching.publish("t")
+    assert metrics.snapshot()["queues"]["batched-events/ring"] == 5
+    batching.flush()
+    assert metrics.published == {"t": 5}
+
+    async def scenario():
+        bus = AsyncEventBus(metrics=metrics)
+        bus.subscribe("a", lambda data: None)
+        for _ in range(3):
+            bus.publish_nowait("a")
+        depth = metrics.snapshot()["queues"]
+        await bus.drain()
+        await bus.close()
+        return depth
+
+    depths = asyncio.run(scenario())
+    assert [d for name, d in depths.items() if name.startswith("async-events/a/")] == [3]
+    assert metrics.published == {"t": 5, "a": 3}
+
+
+def test_prometheus_and_json_export(tmp_path):
+    metrics = EventMetrics()
+    bus = EventBus(metrics=metrics)
+    bus.subscribe('odd."topic"', lambda data: None)
+    bus.publish('odd."topic"')
+    text = metrics.prometheus()
+    assert 'scn_events_published_total{topic="odd.\\"topic\\""} 1' in text
+    assert "scn_event_handler_seconds_count{" in text and 'le="+Inf"} 1' in text
+    paths = metrics.write(tmp_path)
+    assert json.loads(paths["json"].read_text())["published"] == {'odd."topic"': 1}
+    assert paths["prometheus"].read_text() == metrics.prometheus()
@@ -0,0 +1,88 @@
+import json
+import os
+
+from shadowcore_nexus.core import history_store
+from shadowcore_nexus.core.history_store import HistoryStore, main, migrate_legacy, parse_legacy
+from shadowcore_nexus.utils import logging as scn_logging
+
+BASE = 1_700_000_000.0
+
+
+def fill(store, n=300):
+    for i in range(n):
+        store.append(("netmap_ritual", "scry", "harvest")[i % 3], {"i": i}, ts=BASE + i * 60)
+
+
+def test_query_by_ritual_and_time_matches_a_full_scan(tmp_path):
+    store = HistoryStore(tmp_path, segment_bytes=4096, bucket_seconds=600)
+    fill(store)
+    assert len(store.segments()) > 1
+    everything = list(store.query())
+    assert [r["details"]["i"] for r in everything] == list(range(300))
+    since, until = BASE + 3000, BASE + 9000
+    expected = [r for r in everything if r["ritual"] == "scry" and since <= r["ts"] <= until]
+    assert list(store.query("scry", since, until)) == expected and expected
+    assert list(store.query("unknown")) == []
+    assert list(store.query(since=BASE + 10**6)) == []
+    assert store.stats()["rituals"] == {"netmap_ritual": 100, "scry": 100, "harvest": 100}
+    store.close()
+
+
+def test_saved_index_is_reused_and_caught_up_with_later_appends(tmp_path):
+    store = HistoryStore(tmp_path)
+    fill(store, 30)
+    store.close()
+    assert json.loads(store.index_path(1).read_text())["records"] == 30
+    other = HistoryStore(tmp_path)  # e.g. a second process
+    other.append("scry", "late", ts=BASE + 10**5)
+    other.close()
+    reader = HistoryStore(tmp_path)
+    assert [r["details"] for r in reader.query("scry", since=BASE + 10**4)] == ["late"]
+    assert reader.stats()["records"] == 31
+    reader.close()
+
+
+def test_torn_last_line_is_terminated_before_the_next_append(tmp_path):
+    store = HistoryStore(tmp_path)
+    store.append("scry", "ok", ts=BASE)
+    store.close()
+    with open(store.segment_path(1), "ab") as f:
+        f.write(b'{"ts": 1, "ritual": "scr')  # writer crashed mid-append
+    store = HistoryStore(tmp_path)
+    store.append("scry", "after", ts=BASE + 1)
+    assert [r["details"] for r in store.query("scry")] == ["ok", "after"]
+    store.close()
+
+
+def test_migrate_legacy_files_in_timestamp_order(tmp_path):
+    source = tmp_path / "old"
+    source.mkdir()
+    (source / "scry_b.log").write_text("Ritual: scry\nTimestamp: 2024-05-02_10-00-00\nDetails: second\n")
+    (source / "scry_a.log").write_text("Ritual: scry\nTimestamp: 2024-05-01_10-00-00\nDetails: first\nline\n")
+    (source / "junk.log").write_text("not a history file")
+    assert parse_legacy(source / "junk.log") is None
+    store = HistoryStore(tmp_path / "store")
+    assert migrate_legacy(store, source) == {"migrated": 2, "skipped": 1}
+    assert [r["details"] for r in store.query("scry")] == ["first\nline", "second"]
+    assert sorted(os.listdir(source / "legacy")) == ["scry_a.log", "scry_b.log"]
+    assert (source / "junk.log").exists()
+    store.close()
+
+
+def test_cli_query_and_stats(tmp_path, capsys):
+    store = HistoryStore(tmp_path)
+    fill(store, 9)
+    store.close()
+    main(["--dir", str(tmp_path), "query", "--ritual", "harvest", "--json", "--limit", "2"])
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [r["details"]["i"] for r in records] == [2, 5]
+    main(["--dir", str(tmp_path), "stats"])
+    assert json.loads(capsys.readouterr().out)["records"] == 9
+
+
+def test_log_history_appends_to_the_shared_store(tmp_path, monkeypatch):
+    store = HistoryStore(tmp_path)
+    monkeypatch.setattr(history_store, "_store", store)
+    scn_logging.log_history("netmap_ritual", {"hosts": 3})
+    assert [r["details"] for r in store.query("netmap_ritual")] == [{"hosts": 3}]
+    store.close()
@@ -0,0 +1,62 @@
+import queue
+import time
+
+import pytest
+
+from shadowcore_nexus.core.module_loader import ModuleLoader
+from shadowcore_nexus.utils.file_monitor import ChangeCoalescer, HubWatcher, inotify_available
+
+BACKENDS = ["polling"] + (["inotify"] if inotify_available() else [])
+
+
+def test_coalescer_waits_for_quiet_but_caps_the_delay():
+    c = ChangeCoalescer(debounce=0.25, max_delay=1.0)
+    assert c.timeout(0.0) is None
+    c.add({"a.py"}, 0.0)
+    c.add({"a.py", "b.py"}, 0.2)
+    assert c.timeout(0.2) == pytest.approx(0.25)
+    for t in (0.4, 0.6, 0.8):
+        c.add({"c.py"}, t)
+    assert c.timeout(0.8) == pytest.approx(0.2)  # first + max_delay
+    assert c.drain() == {"a.py", "b.py", "c.py"}
+    assert c.timeout(1.0) is None
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_watcher_reports_a_burst_of_changes(write_module, backend):
+    batches = queue.Queue()
+    watcher = HubWatcher(write_module.root, batches.put, debounce=0.2, backend=backend,
+                         poll_interval=0.05).start()
+    expected = {str(write_module.root / f"mod_{i}.py") for i in range(5)}
+    expected.add(str(write_module.root / "pkg" / "sub.py"))
+    try:
+        time.sleep(0.1)
+        for i in range(5):
+            write_module(f"mod_{i}.py", f"X = {i}\n")
+        write_module("pkg/sub.py", "Y = 1\n")
+        paths = batches.get(timeout=5)
+        while expected - paths:
+            paths |= batches.get(timeout=5)  # a polling scan can split a burst
+    finally:
+        watcher.stop()
+    assert watcher.backend == backend
+    if backend == "inotify":
+        assert batches.empty()  # debounced into one callback
+
+
+def test_reload_paths_only_touches_the_changed_module(write_module):
+    changed = write_module("alpha.py", "VALUE = 1\n")
+    write_module("beta.py", "VALUE = 1\n")
+    loader = ModuleLoader(write_module.root, lazy=False, use_cache=False)
+    loader.discover_all()
+    beta = loader.get_entry("beta").module
+
+    time.sleep(0.01)
+    changed.write_text("VALUE = 2\n")
+    added = write_module("gamma.py", "VALUE = 3\n")
+    assert loader.reload_paths([str(changed), str(added)])
+
+    assert loader.get_entry("alpha").module.VALUE == 2
+    assert loader.get_entry("beta").module is beta
+    assert "gamma" in loader.entries
+    assert not loader.reload_paths([])
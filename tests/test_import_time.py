@@ -0,0 +1,64 @@
+"""Import-time and import side-effect regressions for the CLI paths.
+
+Reuses the cases of ``benchmarks/check_import_time.py`` with doubled budgets,
+so a noisy machine does not fail the suite but an eager urwid or config
+import still does.
+"""
+
+import importlib.util
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+
+
+def _load_check():
+    spec = importlib.util.spec_from_file_location("check_import_time", ROOT / "benchmarks" / "check_import_time.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+check = _load_check()
+
+
+@pytest.fixture(scope="module")
+def env():
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC), env.get("PYTHONPATH")]))
+    return env
+
+
+@pytest.fixture(scope="module")
+def baseline(env):
+    return check.run_case(["-c", "pass"], env)[1]
+
+
+@pytest.mark.parametrize("label, argv, budget", check.CASES, ids=[c[0] for c in check.CASES])
+def test_cli_path_imports_within_budget(env, baseline, label, argv, budget):
+    best = None
+    for _ in range(3):
+        code, modules, total = check.run_case(argv, env, baseline)
+        assert code == 0
+        best = total if best is None else min(best, total)
+    assert not [name for name in check.FORBIDDEN if name in modules]
+    assert best / 1000 <= 2 * budget, f"{label}: {best / 1000:.1f} ms"
+
+
+def test_importing_has_no_side_effects(env):
+    probe = subprocess.run([sys.executable, "-c", check.SIDE_EFFECT_PROBE], env=env,
+                           stderr=subprocess.PIPE, text=True)
+    assert probe.returncode == 0, probe.stderr
+
+
+def test_package_exports_resolve_lazily(env):
+    code = ("import sys, shadowcore_nexus as scn\n"
+            "assert 'shadowcore_nexus.core.module_loader' not in sys.modules\n"
+            "assert scn.ModuleLoader.__name__ == 'ModuleLoader'\n")
+    proc = subprocess.run([sys.executable, "-c", code], env=env, stderr=subprocess.PIPE, text=True)
+    assert proc.returncode == 0, proc.stderr
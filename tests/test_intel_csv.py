@@ -0,0 +1,124 @@
+import csv
+import random
+
+import pytest
+
+from shadowcore_nexus.core.intel_csv import (CsvSchema, FlatCsvWriter, read_records, schema_path,
+                                             table_path)
+
+
+def harvest(i):
+    return {"entity": f"corp-{i}", "score": i, "ratio": i / 7, "active": i % 2 == 0,
+            "emails": [f"a{i}@x.example", f"b{i}@x.example"][: i % 3],
+            "supply_chain": [{"vendor": f"v{i}", "tier": 1, "regions": ["eu", "us"]}],
+            "financial_trail": {"revenue": 1000 + i, "parent": None if i % 2 else f"h{i}"}}
+
+
+TRICKY = [
+    {"entity": "\\N", "notes": "", "emails": [], "financial_trail": {"revenue": 1, "parent": "\\E"}},
+    {"entity": "a,b \"quoted\"\nnext line\r\n", "notes": "\\backslash", "score": 10**30},
+    {"entity": "ünïcødé ✓", "score": None, "financial_trail": None, "emails": None},
+    {"entity": "types", "score": "12", "ratio": 1, "active": 1, "financial_trail": {}},
+    {"entity": "new keys", "first_seen": "2024", "financial_trail": {"revenue": 1, "extra": [1, {"a": 2}]}},
+    {"entity": "odd items", "emails": [None, "x", 3, ""], "supply_chain": ["loose", {"vendor": "v", "tier": "1"}, []]},
+    {"entity": "odd keys", "a.b": 1, "_id": "mine", 5: "int key", "": "empty key"},
+    {"entity": "nested", "financial_trail": {"revenue": {"q1": 1}}},
+    {"entity": "float", "ratio": 0.1 + 0.2, "score": -0},
+]
+
+
+def round_trip(path, records, **kwargs):
+    with FlatCsvWriter(path, **kwargs) as writer:
+        for record in records:
+            writer.write(record)
+    return writer, list(read_records(path))
+
+
+def test_regular_records_flatten_into_stable_columns(tmp_path):
+    path = str(tmp_path / "intel.csv")
+    records = [harvest(i) for i in range(300)]
+    writer, back = round_trip(path, records, sample=50)
+    assert back == records
+    columns = [name for name, _ in writer.schema.columns]
+    assert "financial_trail.revenue" in columns and "emails" in columns
+    assert set(writer.schema.tables) == {"emails", "supply_chain"}
+    assert writer.rows == {"main": 300, "emails": 300, "supply_chain": 300}
+    with open(path, newline="") as f:
+        rows = list(csv.reader(f))
+    assert len(rows) == 301 and "_extra" in rows[0] and not any(r[-1] for r in rows[1:])
+
+
+def test_tricky_records_come_back_unchanged(tmp_path):
+    path = str(tmp_path / "intel.csv")
+    records = [harvest(i) for i in range(20)] + TRICKY
+    writer, back = round_trip(path, records, sample=20)  # schema from the regular ones only
+    assert back == records
+    assert [type(r["score"]) for r in back if r["entity"] == "types"] == [str]
+
+
+def test_random_records_round_trip(tmp_path):
+    rng = random.Random(1)
+    scalars = [None, "", "\\N", "\\E", "\\\\", "x,y", "\n", 0, 1, -5, 2.5, True, False]
+
+    def value(depth=0):
+        roll = rng.random()
+        if depth < 2 and roll < 0.2:
+            return {rng.choice("abc"): value(depth + 1) for _ in range(rng.randint(0, 3))}
+        if depth < 2 and roll < 0.35:
+            return [value(depth + 1) for _ in range(rng.randint(0, 3))]
+        return rng.choice(scalars)
+
+    records = [{k: value() for k in rng.sample("pqrstu", rng.randint(1, 6))} for _ in range(500)]
+    _, back = round_trip(str(tmp_path / "fuzz.csv"), records, sample=30)
+    assert back == records
+
+
+def test_records_are_streamed_after_the_sample(tmp_path):
+    writer = FlatCsvWriter(str(tmp_path / "intel.csv"), sample=10)
+    for i in range(25):
+        writer.write(harvest(i))
+        assert len(writer._pending) == (i + 1 if i < 9 else 0)
+    writer.close()
+    with pytest.raises(ValueError):
+        writer.write(harvest(0))
+
+
+def test_fewer_records_than_the_sample_are_written_on_close(tmp_path):
+    path = str(tmp_path / "intel.csv")
+    _, back = round_trip(path, [harvest(1)])
+    assert back == [harvest(1)]
+    _, back = round_trip(str(tmp_path / "empty.csv"), [])
+    assert back == []
+
+
+def test_explicit_schema_is_used_and_saved(tmp_path):
+    schema = CsvSchema([("entity", "str"), ("score", "int"), ("emails", "list")],
+                       {"emails": ("scalar", [("value", "str")])})
+    path = str(tmp_path / "intel.csv")
+    writer = FlatCsvWriter(path, schema=schema)
+    assert CsvSchema.load(schema_path(path)).to_dict() == schema.to_dict()  # before any record
+    records = [harvest(i) for i in range(5)]
+    for record in records:
+        writer.write(record)
+    writer.close()
+    with open(path, newline="") as f:
+        assert next(csv.reader(f)) == ["_id", "entity", "score", "emails", "_extra"]
+    assert list(read_records(path)) == records
+    assert list(read_records(path, schema=schema)) == records
+
+
+def test_header_mismatch_and_unknown_schema_version_raise(tmp_path):
+    path = str(tmp_path / "intel.csv")
+    round_trip(path, [harvest(i) for i in range(3)])
+    other = CsvSchema([("entity", "str")], {})
+    with pytest.raises(ValueError):
+        list(read_records(path, schema=other))
+    child = table_path(path, "emails")
+    with open(child) as f:
+        text = f.read()
+    with open(child, "w") as f:
+        f.write(text.replace("_parent", "parent", 1))
+    with pytest.raises(ValueError):
+        list(read_records(path))
+    with pytest.raises(ValueError):
+        CsvSchema.from_dict({"version": 99, "columns": [], "tables": {}})
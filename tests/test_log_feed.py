@@ -0,0 +1,150 @@
+import os
+import select
+import threading
+import time
+
+import pytest
+
+from shadowcore_nexus.utils.log_index import format_record
+from shadowcore_nexus.utils.log_rotation import follow_batches
+
+
+class Follower:
+    """Collect ``follow_batches`` output on a thread."""
+
+    def __init__(self, path, **kwargs):
+        self.batches = []
+        self.stop = threading.Event()
+        kwargs.setdefault("poll_interval", 0.02)
+        self._thread = threading.Thread(target=self._run, args=(path, kwargs), daemon=True)
+        self._thread.start()
+
+    def _run(self, path, kwargs):
+        for batch in follow_batches(path, stop=self.stop, **kwargs):
+            self.batches.append(batch)
+
+    @property
+    def lines(self):
+        return [line for batch in list(self.batches) for line in batch]
+
+    def wait_for(self, n, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while len(self.lines) < n and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return self.lines
+
+    def close(self):
+        self.stop.set()
+        self._thread.join(timeout=5)
+
+
+def append(path, text):
+    with open(path, "a") as f:
+        f.write(text)
+
+
+def test_a_burst_arrives_as_one_batch_and_partial_lines_wait(tmp_path):
+    path = tmp_path / "daemon.log"
+    path.write_text("before\n")
+    follower = Follower(path)
+    time.sleep(0.1)
+    append(path, "".join(f"{i}\n" for i in range(1000)) + "part")
+    assert follower.wait_for(1000) == [str(i) for i in range(1000)]
+    assert len(follower.batches) == 1
+    append(path, "ial\n")
+    assert follower.wait_for(1001)[-1] == "partial"
+    follower.close()
+
+
+def test_from_start_and_truncation(tmp_path):
+    path = tmp_path / "daemon.log"
+    path.write_text("a\nb\n")
+    follower = Follower(path, from_end=False)
+    assert follower.wait_for(2) == ["a", "b"]
+    path.write_text("")  # truncated in place
+    time.sleep(0.1)
+    append(path, "c\n")
+    assert follower.wait_for(3) == ["a", "b", "c"]
+    follower.close()
+
+
+def test_stop_ends_an_idle_follower(tmp_path):
+    path = tmp_path / "daemon.log"
+    path.write_text("")
+    follower = Follower(path, poll_interval=0.05)
+    time.sleep(0.1)
+    follower.close()
+    assert not follower._thread.is_alive()
+
+
+# urwid widget -------------------------------------------------------------
+
+class FakeLoop:
+    """The part of ``urwid.MainLoop`` the feed uses: ``watch_pipe``."""
+
+    def __init__(self):
+        self.read_fd = None
+        self.callback = None
+
+    def watch_pipe(self, callback):
+        self.read_fd, write_fd = os.pipe()
+        self.callback = callback
+        return write_fd
+
+    def remove_watch_pipe(self, write_fd):
+        os.close(write_fd)
+        os.close(self.read_fd)
+
+    def run_once(self, timeout=1.0):
+        if select.select([self.read_fd], [], [], timeout)[0]:
+            self.callback(os.read(self.read_fd, 4096))
+            return True
+        return False
+
+
+def test_ring_walker_keeps_scrollback_and_follows_the_tail():
+    pytest.importorskip("urwid")
+    from shadowcore_nexus.interfaces.log_feed import RingWalker
+
+    walker = RingWalker(maxlen=100, formatter=str)
+    walker.extend([str(i) for i in range(250)])
+    assert (walker.first, walker.end) == (150, 250)
+    widget, pos = walker.get_focus()
+    assert pos == 249 and widget.text == "249"
+    assert walker.get_prev(150) == (None, None) and walker.get_next(249) == (None, None)
+    walker.set_focus(200)  # scrolled up: new lines do not move the view
+    walker.extend(["250"])
+    assert walker.focus == 200 and not walker.tail
+    walker.extend([str(i) for i in range(251, 400)])  # the focused line fell off
+    assert walker.focus == 399
+
+
+def test_format_line_marks_errors():
+    pytest.importorskip("urwid")
+    from shadowcore_nexus.interfaces.log_feed import format_line
+
+    ts = 1_750_000_000.0
+    assert format_line(format_record("boom", "scry", "ERROR", ts=ts).rstrip("\n"))[0] == "stderr"
+    assert format_line(format_record("ok", "scry", ts=ts).rstrip("\n")).endswith(" scry: ok")
+    assert format_line("legacy line") == "legacy line"
+
+
+def test_log_feed_coalesces_a_burst_into_few_redraws(tmp_path):
+    pytest.importorskip("urwid")
+    from shadowcore_nexus.interfaces.log_feed import LogFeed
+
+    path = tmp_path / "daemon.log"
+    path.write_text("old\n")
+    feed = LogFeed(path, scrollback=500, fps=5)
+    loop = FakeLoop()
+    feed.attach(loop)
+    time.sleep(0.1)
+    for i in range(5000):
+        append(path, f"{i}\n")
+    deadline = time.monotonic() + 10
+    while list(feed.walker.lines)[-1:] != ["4999"] and time.monotonic() < deadline:
+        loop.run_once(0.5)
+    feed.stop()
+    assert feed.received == 5000
+    assert list(feed.walker.lines) == [str(i) for i in range(4500, 5000)]
+    assert feed.redraws < 20
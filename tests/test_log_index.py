@@ -0,0 +1,113 @@
+import json
+import sys
+import time
+
+import pytest
+
+from shadowcore_nexus import __main__ as launcher
+from shadowcore_nexus.utils import log_rotation
+from shadowcore_nexus.utils.log_index import (SparseIndex, format_record, main, parse_record, parse_when,
+                                              query, read_index, rebuild_index)
+from shadowcore_nexus.utils.log_rotation import RotationPolicy, rotate_file, wait_for_compression
+from shadowcore_nexus.utils.log_sink import LogSink
+
+BASE = 1_750_000_000.0
+RITUALS = ("netmap_ritual", "scry", "harvest")
+
+
+def write_log(path, n=20000, every=4096):
+    """``n`` records one second apart, written through LogSink with an index."""
+    sink = LogSink(path, max_queue=200, index=SparseIndex(path, every=every))
+    for i in range(n):
+        sink.write(format_record(f"event {i} port {i % 1024}", RITUALS[i % 3], ts=BASE + i))
+    sink.close()
+
+
+def test_record_round_trip_escapes_control_characters():
+    line = format_record("a\\b\nc\rd\te", "scry", "WARNING", ts=BASE + 0.123456)
+    assert line.count("\n") == 1
+    record = parse_record(line)
+    assert record["message"] == "a\\b\nc\rd\te"
+    assert (record["level"], record["ritual"]) == ("WARNING", "scry")
+    assert record["ts"] == pytest.approx(BASE + 0.123456, abs=1e-6)
+    assert parse_record("plain old line\n") is None
+
+
+def test_indexed_query_matches_a_full_scan(tmp_path):
+    path = tmp_path / "daemon.log"
+    write_log(path)
+    assert len(read_index(path, path.stat().st_ino)) > 50
+    cases = [dict(since=BASE + 5000, until=BASE + 5100),
+             dict(since=BASE + 19990),
+             dict(until=BASE + 10, ritual="scry"),
+             dict(since=BASE + 100, until=BASE + 900, grep=r"port 500\b")]
+    for case in cases:
+        fast = list(query(path, **case))
+        full = list(query(path, use_index=False, **case))
+        assert fast == full and fast
+    window = list(query(path, since=BASE + 5000, until=BASE + 5100))
+    assert [r["message"].split()[1] for r in window] == [str(i) for i in range(5000, 5101)]
+
+
+def test_index_of_a_rotated_file_is_ignored(tmp_path):
+    path = tmp_path / "daemon.log"
+    write_log(path, n=2000)
+    stale = (tmp_path / "daemon.log.idx").read_bytes()
+    path.rename(tmp_path / "old.log")
+    path.write_text(format_record("fresh", "scry", ts=BASE + 10**6))
+    (tmp_path / "daemon.log.idx").write_bytes(stale)
+    assert read_index(path, path.stat().st_ino) is None
+    assert [r["message"] for r in query(path, since=BASE + 10**6 - 1)] == ["fresh"]
+
+
+def test_unstructured_lines_only_match_unfiltered_queries(tmp_path):
+    path = tmp_path / "daemon.log"
+    path.write_text("legacy line\n" + format_record("new", "scry", ts=BASE))
+    assert [r["message"] for r in query(path)] == ["legacy line", "new"]
+    assert [r["message"] for r in query(path, since=BASE - 1)] == ["new"]
+    assert [r["message"] for r in query(path, ritual="scry")] == ["new"]
+
+
+def test_rotated_segments_are_searched_on_request(tmp_path, monkeypatch):
+    monkeypatch.setattr(log_rotation, "SETTLE_SECONDS", 0.0)
+    path = tmp_path / "daemon.log"
+    path.write_text(format_record("old", "scry", ts=BASE))
+    rotate_file(path, RotationPolicy(compression="gzip"))
+    assert wait_for_compression(10)
+    path.write_text(format_record("new", "scry", ts=BASE + 1))
+    assert [r["message"] for r in query(path, ritual="scry")] == ["new"]
+    assert [r["message"] for r in query(path, ritual="scry", rotated=True)] == ["old", "new"]
+
+
+def test_rebuild_index(tmp_path):
+    path = tmp_path / "daemon.log"
+    write_log(path, n=5000)
+    (tmp_path / "daemon.log.idx").unlink()
+    assert rebuild_index(path, every=4096) > 10
+    assert list(query(path, since=BASE + 4000, until=BASE + 4001))[0]["message"].startswith("event 4000 ")
+
+
+def test_parse_when():
+    assert parse_when("2h") == pytest.approx(time.time() - 7200, abs=5)
+    assert parse_when("2026-10-01T12:00") == pytest.approx(
+        time.mktime((2026, 10, 1, 12, 0, 0, 0, 0, -1)))
+
+
+def test_cli_takes_file_after_the_subcommand(tmp_path, capsys):
+    path = tmp_path / "daemon.log"
+    write_log(path, n=300)
+    main(["query", "--file", str(path), "--ritual", "harvest", "--limit", "2", "--json"])
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [r["message"] for r in records] == ["event 2 port 2", "event 5 port 5"]
+    main(["index", "--file", str(path)])
+    assert capsys.readouterr().out.startswith(f"[+] Indexed {path}:")
+
+
+def test_launcher_dispatches_logs_subcommand(tmp_path, capsys, monkeypatch):
+    path = tmp_path / "daemon.log"
+    write_log(path, n=10)
+    monkeypatch.setattr(sys, "argv", ["shadowcore_nexus", "logs", "query", "--file", str(path),
+                                      "--grep", "event 7 "])
+    launcher.main()
+    out = capsys.readouterr().out.splitlines()
+    assert len(out) == 1 and out[0].endswith("scry: event 7 port 7")
@@ -0,0 +1,197 @@
+import json
+import logging
+import threading
+import time
+
+import pytest
+
+from shadowcore_nexus.utils import log_rotation, result_sink
+from shadowcore_nexus.utils.log_rotation import (RotatingLogHandler, RotationPolicy, apply_retention,
+                                                 follow, follow_batches, open_segment, rotate_file,
+                                                 rotated_segments, wait_for_compression)
+from shadowcore_nexus.utils.log_sink import LogSink
+
+
+@pytest.fixture(autouse=True)
+def no_settle(monkeypatch):
+    monkeypatch.setattr(log_rotation, "SETTLE_SECONDS", 0.0)
+
+
+def read_all(path):
+    lines = []
+    for segment in rotated_segments(path) + [path]:
+        if segment.exists():
+            with open_segment(segment) as f:
+                lines += f.read().splitlines()
+    return lines
+
+
+def append(path, text):
+    with open(path, "a") as f:
+        f.write(text)
+
+
+def test_policy_due_by_size_and_age():
+    policy = RotationPolicy(max_bytes=100, max_age=60)
+    assert not policy.due(0, opened_at=0, now=10**9)
+    assert policy.due(100, opened_at=time.time())
+    assert not policy.due(99, opened_at=1000, now=1059)
+    assert policy.due(1, opened_at=1000, now=1060)
+    assert not RotationPolicy(max_bytes=None, max_age=None).due(10**9, opened_at=0)
+    with pytest.raises(ValueError):
+        RotationPolicy(compression="zip")
+
+
+def test_segments_sort_in_rotation_order_within_one_second(tmp_path):
+    path = tmp_path / "daemon.log"
+    policy = RotationPolicy(compression=None, keep=100)
+    for i in range(5):
+        path.write_text(f"{i}\n")
+        rotate_file(path, policy)
+    wait_for_compression(5)
+    assert [s.read_text() for s in rotated_segments(path)] == [f"{i}\n" for i in range(5)]
+    assert rotate_file(path, policy) is None  # nothing to rotate
+
+
+@pytest.mark.parametrize("compression, suffix", [("gzip", ".gz"), ("lzma", ".xz")])
+def test_closed_segments_are_compressed_and_retention_applied(tmp_path, compression, suffix):
+    if compression == "lzma" and log_rotation.lzma is None:
+        pytest.skip("no lzma")
+    path = tmp_path / "daemon.log"
+    policy = RotationPolicy(compression=compression, keep=3)
+    for i in range(6):
+        path.write_text(f"segment {i}\n" * 100)
+        rotate_file(path, policy)
+    assert wait_for_compression(10)
+    segments = rotated_segments(path)
+    assert [s.suffix for s in segments] == [suffix] * 3
+    with open_segment(segments[0]) as f:
+        assert f.readline() == "segment 3\n"
+
+
+def test_retention_by_total_bytes(tmp_path):
+    path = tmp_path / "app.log"
+    for stamp in ("20240101-000000", "20240102-000000", "20240103-000000"):
+        path.with_name(f"app.log.{stamp}").write_text("x" * 100)
+    removed = apply_retention(path, RotationPolicy(keep=10, max_total_bytes=250))
+    assert [p.name for p in removed] == ["app.log.20240101-000000"]
+
+
+def test_log_sink_rotates_without_losing_lines(tmp_path):
+    path = tmp_path / "daemon.log"
+    # A small queue keeps batches small; rotation happens between batches.
+    sink = LogSink(path, max_queue=100, batch_lines=50,
+                   rotation=RotationPolicy(max_bytes=4096, keep=1000))
+    for i in range(5000):
+        sink.write(f"line {i:05d}\n")
+    sink.close()
+    assert sink.rotations > 5
+    assert wait_for_compression(10)
+    assert read_all(path) == [f"line {i:05d}" for i in range(5000)]
+
+
+def test_rotating_log_handler_for_stdlib_logging(tmp_path):
+    path = tmp_path / "app.log"
+    handler = RotatingLogHandler(path, RotationPolicy(max_bytes=2048, compression=None, keep=1000))
+    log = logging.getLogger("scn.test.rotation")
+    log.propagate = False
+    log.addHandler(handler)
+    logging.disable(logging.NOTSET)
+    try:
+        for i in range(500):
+            log.warning("record %04d", i)
+    finally:
+        log.removeHandler(handler)
+        handler.close()
+    assert len(rotated_segments(path)) >= 2
+    assert read_all(path) == [f"record {i:04d}" for i in range(500)]
+
+
+def test_follow_reads_across_rotations(tmp_path):
+    path = tmp_path / "daemon.log"
+    path.write_text("")
+    stop = threading.Event()
+    seen = []
+
+    def reader():
+        for line in follow(path, from_end=True, poll_interval=0.02, stop=stop):
+            seen.append(line)
+            if len(seen) == 3000:
+                stop.set()
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    time.sleep(0.1)
+    sink = LogSink(path, max_queue=100, batch_lines=100,
+                   rotation=RotationPolicy(max_bytes=4096, keep=1000))
+    for i in range(3000):
+        sink.write(f"{i}\n")
+    sink.close()
+    assert sink.rotations >= 2
+    thread.join(timeout=15)
+    stop.set()
+    assert seen == [str(i) for i in range(3000)]
+
+
+def test_result_logger_rotates_its_jsonl_file(tmp_path):
+    path = tmp_path / "results.jsonl"
+    handler = result_sink.JsonlBatchHandler(path, batch_records=10)
+    handler.policy = RotationPolicy(max_bytes=1024, compression=None, keep=1000)
+    for i in range(200):
+        handler.emit(result_sink.ResultRecord("r", {"i": i}, echo=False, json_mode=True))
+    handler.close()
+    assert len(rotated_segments(path)) > 3
+    assert [json.loads(l)["i"] for l in read_all(path)] == list(range(200))
+
+
+def test_file_created_after_the_follower_started(tmp_path):
+    path = tmp_path / "daemon.log"
+    stop = threading.Event()
+    seen = []
+
+    def reader():
+        for line in follow(path, poll_interval=0.02, stop=stop):
+            seen.append(line)
+            stop.set()
+
+    thread = threading.Thread(target=reader, daemon=True)
+    thread.start()
+    time.sleep(0.1)
+    path.write_text("first\n")
+    thread.join(timeout=5)
+    stop.set()
+    assert seen == ["first"]
+
+
+def test_slow_reader_catches_up_on_several_rotations_including_compressed_ones(tmp_path):
+    path = tmp_path / "daemon.log"
+    path.write_text("")
+    gate = threading.Event()
+    seen = []
+    stop = threading.Event()
+
+    def slow_reader():
+        for batch in follow_batches(path, poll_interval=0.02, stop=stop):
+            seen.extend(batch)
+            gate.wait()
+
+    thread = threading.Thread(target=slow_reader, daemon=True)
+    thread.start()
+    time.sleep(0.1)
+    expected = []
+    for segment in range(4):
+        lines = [f"{segment}-{i}" for i in range(50)]
+        expected += lines
+        append(path, "".join(l + "\n" for l in lines))
+        time.sleep(0.05)  # the reader takes the first batch, then stalls
+        rotate_file(path, RotationPolicy(compression="gzip" if segment < 2 else None, keep=100))
+    wait_for_compression(10)
+    assert any(p.suffix == ".gz" for p in tmp_path.iterdir())
+    append(path, "live\n")
+    gate.set()
+    deadline = time.monotonic() + 5
+    while len(seen) < len(expected) + 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    stop.set()
+    thread.join(timeout=5)
+    assert seen == expected + ["live"]
@@ -0,0 +1,124 @@
+import importlib
+import os
+import threading
+
+import pytest
+
+from shadowcore_nexus.core.paths import ensure_root_on_path
+from shadowcore_nexus.utils import log_sink
+from shadowcore_nexus.utils import logging as scn_logging
+from shadowcore_nexus.utils.log_index import parse_record
+from shadowcore_nexus.utils.log_sink import LogSink
+
+
+def test_lines_from_many_threads_are_all_written_in_per_thread_order(tmp_path):
+    sink = LogSink(tmp_path / "daemon.log", max_queue=64, batch_lines=32)
+
+    def produce(t):
+        for i in range(1000):
+            sink.write(f"{t} {i}\n")
+
+    threads = [threading.Thread(target=produce, args=(t,)) for t in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sink.flush(timeout=10)
+    sink.close()
+    lines = (tmp_path / "daemon.log").read_text().splitlines()
+    assert len(lines) == 8000 and sink.lost == 0
+    for t in range(8):
+        assert [int(l.split()[1]) for l in lines if l.startswith(f"{t} ")] == list(range(1000))
+    assert sink.batches < 8000
+
+
+def test_full_queue_is_written_without_waiting_for_the_interval(tmp_path):
+    sink = LogSink(tmp_path / "daemon.log", max_queue=10, batch_lines=512, flush_interval=60)
+    done = threading.Event()
+
+    def produce():
+        for i in range(100):
+            sink.write(f"{i}\n")
+        done.set()
+
+    threading.Thread(target=produce, daemon=True).start()
+    assert done.wait(5)
+    sink.close()
+    assert len((tmp_path / "daemon.log").read_text().splitlines()) == 100
+
+
+def test_flush_makes_queued_lines_readable_for_every_durability(tmp_path):
+    for durability in ("none", "flush", "fsync"):
+        path = tmp_path / f"{durability}.log"
+        sink = LogSink(path, durability=durability, flush_interval=60)
+        sink.write("one\n")
+        sink.write("two\n")
+        assert sink.flush(timeout=5)
+        assert path.read_text() == "one\ntwo\n"
+        sink.close()
+    with pytest.raises(ValueError):
+        LogSink(tmp_path / "x.log", durability="sometimes")
+
+
+def test_close_writes_pending_lines_and_sink_can_restart(tmp_path):
+    path = tmp_path / "daemon.log"
+    sink = LogSink(path, flush_interval=60, batch_lines=10**6)
+    sink.write("pending\n")
+    sink.close()
+    assert path.read_text() == "pending\n"
+    sink.write("again\n")
+    sink.close()
+    assert path.read_text() == "pending\nagain\n"
+
+
+def test_unwritable_path_counts_lines_as_lost(tmp_path):
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("")
+    sink = LogSink(blocker / "daemon.log")
+    sink.write("x\n")
+    assert sink.flush(timeout=5)
+    sink.close()
+    assert sink.lost == 1
+
+
+@pytest.fixture
+def shared_sink(tmp_path, monkeypatch):
+    path = tmp_path / "daemon.log"
+    sink = LogSink(path)
+    monkeypatch.setattr(log_sink, "_sink", sink)
+    yield sink
+    sink.close()
+
+
+def test_log_event_queues_a_structured_record(shared_sink):
+    scn_logging.log_event("Port 22 open\nsecond line", level="WARNING")
+    scn_logging.log_event("done", ritual="netmap_ritual")
+    shared_sink.flush(timeout=5)
+    records = [parse_record(l) for l in shared_sink.path.read_text().splitlines()]
+    assert [(r["level"], r["ritual"], r["message"]) for r in records] == [
+        ("WARNING", "test_log_sink", "Port 22 open\nsecond line"),
+        ("INFO", "netmap_ritual", "done"),
+    ]
+
+
+def test_ritual_log_event_goes_through_the_shared_sink(shared_sink, monkeypatch):
+    ensure_root_on_path()
+    encoding = importlib.import_module("rituals.encoding")  # from core.logger import log_event, ...
+    monkeypatch.setattr(encoding, "log_history", lambda *args: None)
+    encoding.run()
+    shared_sink.flush(timeout=5)
+    records = [parse_record(l) for l in shared_sink.path.read_text().splitlines()]
+    assert [(r["ritual"], r["message"]) for r in records] == [
+        ("encoding", "Encoding Ritual Failed - No input specified."),
+    ]
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_forked_child_does_not_inherit_the_shared_sink(shared_sink):
+    shared_sink.write("parent\n")
+    pid = os.fork()
+    if pid == 0:
+        os._exit(0 if log_sink._sink is None else 1)
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 0
+    assert log_sink._sink is shared_sink
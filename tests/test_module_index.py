@@ -0,0 +1,60 @@
+import os
+import time
+
+from shadowcore_nexus.core.module_index import ModuleIndex
+from shadowcore_nexus.core.module_loader import ModuleLoader
+
+
+def build_tree(write_module):
+    write_module("plain.py", "X = 1\n")
+    write_module("pkg/__init__.py", "from .impl import VALUE\ndef main():\n    return VALUE\n")
+    write_module("pkg/impl.py", "VALUE = 'pkg'\n")
+    write_module("bundle/main.py", "def main():\n    return 'bundle'\n")
+    write_module("bundle/helpers.py", "")
+    write_module("recon/deep/scanner.py", "def main():\n    return 'deep'\n")
+    write_module("_private.py", "raise SystemExit\n")
+    write_module("recon/__pycache__/junk.py", "")
+    (write_module.root / "notes.txt").write_text("not a module")
+
+
+def test_index_finds_files_packages_and_categories(write_module):
+    build_tree(write_module)
+    index = ModuleIndex(write_module.root)
+    index.build()
+    kinds = {r.key: r.kind for r in index.sorted_records()}
+    assert kinds == {"plain": "file", "pkg": "package", "bundle": "package",
+                     "recon.deep.scanner": "file"}
+    bundle = index.get("bundle")
+    assert bundle.entry.endswith("main.py") and len(bundle.files) == 2
+
+
+def test_incremental_update_matches_a_fresh_build(write_module):
+    build_tree(write_module)
+    index = ModuleIndex(write_module.root)
+    index.build()
+
+    time.sleep(0.01)
+    (write_module.root / "pkg" / "impl.py").write_text("VALUE = 'changed'\n")
+    write_module("recon/new_tool.py", "")
+    os.remove(write_module.root / "plain.py")
+    delta = index.refresh()
+    assert (delta.added, delta.changed, delta.removed) == ({"recon.new_tool"}, {"pkg"}, {"plain"})
+    assert not index.refresh()
+
+    fresh = ModuleIndex(write_module.root)
+    fresh.build()
+    assert index._signatures() == fresh._signatures()
+
+    delta = index.update([str(write_module.root / "bundle" / "helpers.py")])
+    assert not delta  # nothing changed on disk
+
+
+def test_loader_runs_package_and_nested_modules(write_module):
+    build_tree(write_module)
+    loader = ModuleLoader(write_module.root, lazy=True, use_cache=False)
+    loader.discover_all()
+    assert loader.last_discovery["packages"] == 2
+    for key, expected in (("pkg", "pkg"), ("bundle", "bundle"), ("recon.deep.scanner", "deep")):
+        entry = loader.get_entry(key)
+        assert loader.ensure_loaded(entry)
+        assert entry.module.main() == expected
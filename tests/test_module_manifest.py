@@ -0,0 +1,53 @@
+from pathlib import Path
+
+from shadowcore_nexus.core.module_loader import ModuleLoader
+from shadowcore_nexus.core.module_manifest import parse_manifest
+
+
+def test_manifest_reads_meta_entrypoints_and_imports_without_executing():
+    manifest = parse_manifest(
+        "import json\n"
+        "from core.paths import LOGS_DIR\n"
+        "from . import sibling\n"
+        "MODULE_META = {'name': 'Scanner', 'version': '2'}\n"
+        "raise SystemExit('never run')\n"
+        "def main():\n    pass\n", Path("scanner.py"))
+    assert manifest.error is None
+    assert manifest.meta == {"name": "Scanner", "version": "2"}
+    assert manifest.has_main and manifest.is_runnable
+    assert manifest.imports == {"json", "core.paths"}
+    assert manifest.display_metadata("scanner")["name"] == "Scanner"
+
+
+def test_manifest_flags_dynamic_meta_and_syntax_errors():
+    dynamic = parse_manifest("MODULE_META = build()\n", Path("m.py"))
+    assert dynamic.meta_dynamic and dynamic.has_meta
+    broken = parse_manifest("def main(:\n", Path("m.py"))
+    assert broken.error.startswith("SyntaxError")
+
+
+def test_lazy_discovery_imports_nothing_until_first_run(write_module, tmp_path):
+    marker = tmp_path / "imported"
+    write_module("alpha.py", f"""
+        open({str(marker)!r}, "w").close()
+        MODULE_META = {{"name": "Alpha"}}
+        def main():
+            return "alpha ran"
+        """)
+    loader = ModuleLoader(write_module.root, lazy=True, use_cache=False)
+    loader.discover_all()
+
+    entry = loader.get_entry("alpha")
+    assert [name for _, name, _ in loader.get_list()] == ["Alpha"]
+    assert not entry.loaded and not marker.exists()
+
+    assert loader.ensure_loaded(entry)
+    assert marker.exists() and entry.module.main() == "alpha ran"
+
+
+def test_eager_discovery_imports_everything(write_module):
+    write_module("alpha.py", "def main():\n    return 1\n")
+    write_module("beta.py", "def main():\n    return 2\n")
+    loader = ModuleLoader(write_module.root, lazy=False, use_cache=False)
+    loader.discover_all()
+    assert all(entry.loaded for entry in loader.entries.values())
@@ -0,0 +1,76 @@
+import select
+import time
+
+import pytest
+
+from shadowcore_nexus.core.module_runner import ModuleRunPool
+
+
+def wait(pool, handles, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not all(h.done for h in handles) and time.monotonic() < deadline:
+        pool.check_timeouts()
+        ready, _, _ = select.select([w.fileno() for w in pool.workers], [], [], 0.05)
+        for fd in ready:
+            pool.handle_ready(fd)
+    assert all(h.done for h in handles)
+
+
+@pytest.fixture
+def pool():
+    pool = ModuleRunPool(size=2, preload=()).start()
+    yield pool
+    pool.shutdown()
+
+
+def test_run_streams_output_and_returns_the_result(pool, write_module):
+    path = write_module("echo_mod.py", """
+        import os, sys
+        def main(name="hub"):
+            print("hello", name)
+            sys.stderr.write("warn\\n")
+            os.system("echo from-subprocess")
+            return 42
+        """)
+    output = []
+    handle = pool.submit("echo_mod", path, kwargs={"name": "pool"},
+                         on_output=lambda h, stream, text: output.append((stream, text)))
+    wait(pool, [handle])
+    assert (handle.state, handle.result) == ("done", "42")
+    stdout = "".join(text for stream, text in output if stream == "stdout")
+    assert "hello pool" in stdout and "from-subprocess" in stdout
+    assert ("stderr", "warn\n") in output
+
+
+def test_failures_timeouts_and_cancels_leave_the_pool_usable(pool, write_module):
+    failing = write_module("failing.py", "def main():\n    raise ValueError('nope')\n")
+    slow = write_module("slow.py", "import time\ndef main():\n    time.sleep(30)\n")
+    quick = write_module("quick.py", "def main():\n    return 'ok'\n")
+
+    failed = pool.submit("failing", failing)
+    timed_out = pool.submit("slow", slow, timeout=0.3)
+    queued = pool.submit("slow", slow)  # waits: both workers are busy
+    assert queued.state == "queued"
+    wait(pool, [failed, timed_out])
+    assert failed.state == "failed" and "ValueError: nope" in failed.error
+    assert timed_out.state == "timeout"
+
+    queued.cancel()  # running by now: its worker is replaced
+    assert queued.state == "cancelled"
+    after = [pool.submit("quick", quick) for _ in range(3)]
+    wait(pool, after)
+    assert [h.result for h in after] == ["'ok'"] * 3
+    assert len(pool.workers) == 2
+
+
+def test_tui_imports():
+    pytest.importorskip("urwid")
+    from shadowcore_nexus.interfaces.tui import ShadowCoreTUI
+    assert ShadowCoreTUI.run_module
+
+
+def test_hub_modules_can_import_core_absolutely(pool, write_module):
+    path = write_module("uses_core.py", "from core.paths import ROOT_DIR\ndef main():\n    return ROOT_DIR.name\n")
+    handle = pool.submit("uses_core", path)
+    wait(pool, [handle])
+    assert (handle.state, handle.result) == ("done", "'shadowcore_nexus'")
@@ -0,0 +1,115 @@
+import importlib.util
+import json
+import os
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+from shadowcore_nexus.core import daemon_ops
+from shadowcore_nexus.core.intel_csv import read_records
+from shadowcore_nexus.core.output_formatter import OutputFormatter
+from shadowcore_nexus.core.paths import ensure_root_on_path
+
+PACKAGE = Path(__file__).resolve().parent.parent / "src" / "shadowcore_nexus"
+
+
+def intel(i):
+    return {"entity": f"corp-{i}", "emails": [f"ops@corp-{i}.example"], "legal_cases": [],
+            "financial_trail": {"revenue": i, "currency": "USD"}}
+
+
+def test_streaming_run_writes_one_ndjson_and_one_csv_plus_manifest(tmp_path, capsys):
+    out = tmp_path / "dumps"
+    with OutputFormatter(str(out) + "/") as formatter:
+        for i in range(500):
+            formatter.save_json(intel(i), f"corp-{i}")
+            formatter.save_csv(intel(i), f"corp-{i}")
+        formatter.save_json({"entity": "x"}, "alias")  # record tagged with the entity it was saved as
+    run = formatter.run_id
+    names = sorted(os.listdir(out))
+    assert names == sorted([f"intel_{run}.ndjson", f"intel_{run}.csv", f"intel_{run}.schema.json",
+                            f"intel_{run}.emails.csv", f"intel_{run}.legal_cases.csv",
+                            f"intel_{run}.manifest.json"])
+    lines = (out / f"intel_{run}.ndjson").read_text().splitlines()
+    assert [json.loads(l) for l in lines[:2]] == [intel(0), intel(1)]
+    assert json.loads(lines[-1]) == {"entity": "x", "_entity": "alias"}
+    assert list(read_records(str(out / f"intel_{run}.csv"))) == [intel(i) for i in range(500)]
+    manifest = json.loads((out / f"intel_{run}.manifest.json").read_text())
+    assert manifest["files"]["ndjson"]["records"] == 501
+    assert manifest["files"]["csv"] == {"path": f"intel_{run}.csv", "records": 500,
+                                        "bytes": (out / f"intel_{run}.csv").stat().st_size}
+    assert manifest["entities"] == 501
+    assert manifest["csv_tables"]["emails"]["rows"] == 500
+    assert capsys.readouterr().out.count("[+] Streaming intel to") == 2
+
+
+def test_records_reach_disk_at_each_flush_interval(tmp_path):
+    formatter = OutputFormatter(str(tmp_path) + "/", flush_interval=0)
+    formatter.save_json(intel(1), "corp-1")
+    path = Path(formatter.paths["ndjson"])
+    assert json.loads(path.read_text()) == intel(1)  # before close()
+    formatter.close()
+    formatter.close()  # idempotent
+    with pytest.raises(ValueError):
+        formatter.save_json(intel(2), "corp-2")
+
+
+def test_split_per_entity_keeps_the_old_layout(tmp_path):
+    out = str(tmp_path) + "/"
+    with OutputFormatter(out, split_per_entity=True) as formatter:
+        formatter.save_json(intel(1), "corp-1")
+        formatter.save_csv(intel(1), "corp-1")
+    names = sorted(os.listdir(tmp_path))
+    assert [n.split("_intel_")[0] for n in names] == ["corp-1", "corp-1"]
+    assert {Path(n).suffix for n in names} == {".json", ".csv"}
+
+
+def load_scry(monkeypatch, relpath, records):
+    ensure_root_on_path()
+    harvester = types.ModuleType("core.intel_harvester")  # the real one needs requests
+
+    class IntelHarvester:
+        def __init__(self, targets):
+            self.targets = targets
+
+        def run_recon(self):
+            for target in self.targets:
+                yield dict(records[target["entity"]])
+
+    harvester.IntelHarvester = IntelHarvester
+    monkeypatch.setitem(sys.modules, "core.intel_harvester", harvester)
+    spec = importlib.util.spec_from_file_location("scry_under_test", PACKAGE / relpath)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize("relpath", ["modules/scry.py", "rituals/scry.py"])
+def test_scry_ignores_the_hub_argv_and_takes_its_own_flags(tmp_path, monkeypatch, relpath):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "targets.csv").write_text("entity,ecocide_index\ncorp-1,1\ncorp-2,9\n")
+    scry = load_scry(monkeypatch, relpath, {f"corp-{i}": intel(i) for i in (1, 2)})
+    dumps = tmp_path / "artifacts" / "intel_dumps"
+    monkeypatch.setattr(sys, "argv", ["shadowcore_nexus", "--debug", "--run-workers", "4"])
+    scry.main()  # as the hub calls it
+    manifest = json.loads(next(dumps.glob("*.manifest.json")).read_text())
+    assert manifest["files"]["ndjson"]["records"] == 2
+    for p in dumps.iterdir():
+        p.unlink()
+    scry.main(["--split-per-entity"])
+    assert sorted(p.name.split("_intel_")[0] for p in dumps.iterdir()) == ["corp-1", "corp-1",
+                                                                            "corp-2", "corp-2"]
+
+
+def test_execute_ritual_gives_the_ritual_its_own_argv(tmp_path, monkeypatch):
+    (tmp_path / "echo_argv.py").write_text(
+        "import sys, json\n"
+        f"open({str(tmp_path / 'argv.json')!r}, 'w').write(json.dumps(sys.argv))\n")
+    monkeypatch.setattr(daemon_ops, "RITUALS_DIR", tmp_path)
+    cli_argv = ["daemon_ops", "--run", "echo_argv", "--params", "{}"]
+    monkeypatch.setattr(sys, "argv", list(cli_argv))
+    daemon_ops.execute_ritual("echo_argv", {})
+    assert json.loads((tmp_path / "argv.json").read_text()) == [str(tmp_path / "echo_argv.py")]
+    assert sys.argv == cli_argv
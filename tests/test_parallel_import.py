@@ -0,0 +1,31 @@
+from shadowcore_nexus.core.module_loader import ModuleLoader
+
+
+def test_failures_are_isolated_on_the_thread_pool(write_module):
+    for i in range(8):
+        write_module(f"good_{i}.py", f"VALUE = {i}\ndef main():\n    return VALUE\n")
+    write_module("broken_raise.py", "raise RuntimeError('boom')\n")
+    write_module("broken_exit.py", "import sys\nsys.exit(1)\n")
+    write_module("broken_syntax.py", "def main(:\n")
+
+    loader = ModuleLoader(write_module.root, lazy=True, use_cache=False, workers=4)
+    loader.discover_all()
+    results = loader.load_entries(list(loader.entries.values()))
+
+    assert {k for k, ok in results.items() if not ok} == {"broken_raise", "broken_exit", "broken_syntax"}
+    assert all(loader.get_entry(f"good_{i}").module.main() == i for i in range(8))
+    assert [key for key, _, _ in loader.get_list()] == sorted(loader.entries)
+
+
+def test_sibling_import_waits_for_its_dependency(write_module):
+    write_module("base_helper.py", "import time\ntime.sleep(0.05)\nREADY = True\n")
+    for i in range(4):
+        write_module(f"user_{i}.py", "from base_helper import READY\ndef main():\n    return READY\n")
+
+    loader = ModuleLoader(write_module.root, lazy=False, use_cache=False, workers=4)
+    loader.discover_all()
+
+    waves = loader._load_waves(list(loader.entries.values()))
+    assert [e.key for e in waves[0]] == ["base_helper"]
+    assert all(loader.get_entry(f"user_{i}").module.main() is True for i in range(4))
+    assert loader.last_discovery["workers"] == 4
@@ -0,0 +1,89 @@
+import gc
+import sys
+import tracemalloc
+import types
+
+import pytest
+
+from shadowcore_nexus.core.module_loader import ModuleLoader
+
+MODULE_SOURCE = '''\
+import sys
+import types
+
+import scn_test_registry
+
+_PAYLOAD = [bytes(1024) for _ in range(64)]
+
+_sub = types.ModuleType(__name__ + ".state")
+_sub.table = [bytes(512) for _ in range(32)]
+sys.modules[_sub.__name__] = _sub
+
+def _on_event(data):
+    return len(_PAYLOAD)
+
+scn_test_registry.CALLBACKS.append(_on_event)
+
+def main():
+    return len(scn_test_registry.CALLBACKS)
+{teardown}
+'''
+
+TEARDOWN = '''
+def teardown():
+    scn_test_registry.CALLBACKS.remove(_on_event)
+'''
+
+
+@pytest.fixture
+def registry():
+    registry = sys.modules["scn_test_registry"] = types.ModuleType("scn_test_registry")
+    registry.CALLBACKS = []
+    yield registry
+
+
+def reload_growth(write_module, teardown, cycles, warmup):
+    write_module("reload_me.py", MODULE_SOURCE.format(teardown=TEARDOWN if teardown else ""))
+    loader = ModuleLoader(write_module.root, lazy=False, use_cache=False)
+    loader.discover_all()
+    entry = loader.get_entry("reload_me")
+    tracemalloc.start()
+    try:
+        for cycle in range(1, cycles + 1):
+            loader.load_entries([entry])
+            if cycle == warmup:
+                gc.collect()
+                baseline = tracemalloc.get_traced_memory()[0]
+        gc.collect()
+        final = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+        loader.unload_all()
+    return final - baseline
+
+
+def test_reloading_with_teardown_does_not_grow_memory(write_module, registry):
+    growth = reload_growth(write_module, teardown=True, cycles=300, warmup=30)
+    assert growth < 256 * 1024, f"memory grew {growth / 1024:.1f} KiB over 270 reloads"
+    assert registry.CALLBACKS == []
+
+
+def test_the_check_catches_a_leaking_module(write_module, registry):
+    # Without teardown() every old copy stays reachable from the registry.
+    growth = reload_growth(write_module, teardown=False, cycles=60, warmup=10)
+    assert growth > 2 * 1024 * 1024
+    assert len(registry.CALLBACKS) == 61  # discover_all + 60 reloads
+
+
+def test_unload_drops_submodules_and_removed_modules_are_torn_down(write_module, registry):
+    path = write_module("reload_me.py", MODULE_SOURCE.format(teardown=TEARDOWN))
+    loader = ModuleLoader(write_module.root, lazy=False, use_cache=False)
+    loader.discover_all()
+    assert {"reload_me", "reload_me.state"} <= set(sys.modules)
+    assert len(registry.CALLBACKS) == 1
+
+    path.unlink()
+    loader.reload_if_changed()
+    assert "reload_me" not in loader.entries
+    assert not {"reload_me", "reload_me.state"} & set(sys.modules)
+    assert registry.CALLBACKS == []
@@ -0,0 +1,128 @@
+import importlib.util
+import json
+import logging
+import os
+import signal
+import threading
+from pathlib import Path
+
+import pytest
+
+from shadowcore_nexus.utils import result_sink
+
+MODULES = Path(__file__).resolve().parent.parent / "src" / "shadowcore_nexus" / "modules"
+
+
+@pytest.fixture
+def result_logger():
+    yield result_sink
+    result_sink.close_all()
+
+
+def read_jsonl(path):
+    return [json.loads(line) for line in Path(path).read_text().splitlines()]
+
+
+def test_records_are_written_once_as_timestamped_jsonl(tmp_path, result_logger):
+    path = tmp_path / "netmap.jsonl"
+    log = result_logger.Logger(str(path), echo=False)
+    record = {"host": "10.0.0.1", "port": 22, "banner": "SSH-2.0\nOpenSSH", "tags": ["ssh"]}
+    log.log(record)
+    record["port"] = 23  # the logger copied it
+    log.flush()
+    rows = read_jsonl(path)
+    assert len(rows) == 1 and rows[0]["port"] == 22 and rows[0]["tags"] == ["ssh"]
+    assert rows[0]["banner"] == "SSH-2.0\nOpenSSH" and "timestamp" in rows[0]
+    log.close()
+
+
+def test_concurrent_loggers_share_one_file_without_loss(tmp_path, result_logger):
+    path = tmp_path / "shared.jsonl"
+
+    def scan(t):
+        log = result_logger.Logger(str(path), echo=False)
+        for i in range(2000):
+            log.log({"thread": t, "i": i})
+        log.close()
+
+    threads = [threading.Thread(target=scan, args=(t,)) for t in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    rows = read_jsonl(path)
+    assert len(rows) == 12000
+    for t in range(6):
+        assert [r["i"] for r in rows if r["thread"] == t] == list(range(2000))
+    assert result_logger._sinks == {}  # last user closed the sink
+
+
+def test_global_logging_config_is_left_alone(tmp_path, result_logger):
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    log = result_logger.Logger(str(tmp_path / "r.jsonl"), echo=False)
+    log.log({"x": 1})
+    log.close()
+    assert root.handlers == handlers and root.level == level
+    assert not log._logger.propagate
+
+
+def test_console_echo_is_rate_limited_and_summarised(tmp_path, result_logger, capsys):
+    path = tmp_path / "r.jsonl"
+    log = result_logger.Logger(str(path), echo=True, echo_rate=5)
+    for i in range(100):
+        log.log({"i": i})
+    log.close()
+    out = capsys.readouterr().out.splitlines()
+    echoed = [line for line in out if line.startswith("[") and "i: " in line]
+    assert 1 <= len(echoed) <= 10
+    assert out[-1].startswith("[...] ") and out[-1].endswith(f"more results not echoed (see {path})")
+    assert len(read_jsonl(path)) == 100
+
+
+def test_json_mode_echo_and_no_echo(tmp_path, result_logger, capsys):
+    log = result_logger.Logger(str(tmp_path / "a.jsonl"), json_mode=True, echo=True)
+    log.log({"host": "h"})
+    log.flush()
+    assert json.loads(capsys.readouterr().out)["host"] == "h"
+    quiet = result_logger.Logger(str(tmp_path / "b.jsonl"), echo=False)
+    quiet.log({"host": "h"})
+    quiet.flush()
+    assert capsys.readouterr().out == ""
+    log.close()
+    quiet.close()
+
+
+@pytest.mark.parametrize("relpath", ["logger.py", "net_mapper/logger.py"])
+def test_module_loggers_share_the_package_sinks(tmp_path, relpath, result_logger):
+    spec = importlib.util.spec_from_file_location("scn_result_logger", MODULES / relpath)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    assert module.Logger is result_logger.Logger
+    a = module.Logger(str(tmp_path / "r.jsonl"), echo=False)
+    b = result_logger.Logger(str(tmp_path / "r.jsonl"), echo=False)
+    assert a._sink is b._sink
+    a.close()
+    b.close()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_forked_child_writes_through_its_own_sink(tmp_path, result_logger):
+    path = tmp_path / "r.jsonl"
+    inherited = result_logger.Logger(str(path), echo=False)
+    inherited.log({"who": "parent"})
+    inherited.flush()
+    pid = os.fork()
+    if pid == 0:
+        signal.alarm(10)  # flush() on the parent's sink would never return
+        child = result_logger.Logger(str(path), echo=False)
+        child.log({"who": "child"})
+        inherited.log({"who": "inherited"})
+        child.flush()
+        inherited.flush()
+        os._exit(0 if child._sink is inherited._sink else 1)
+    _, status = os.waitpid(pid, 0)
+    assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+    inherited.log({"who": "parent again"})
+    inherited.close()
+    assert sorted(r["who"] for r in read_jsonl(path)) == ["child", "inherited", "parent", "parent again"]
@@ -0,0 +1,48 @@
+import json
+
+import pytest
+
+from shadowcore_nexus.core.module_loader import ModuleLoader
+from shadowcore_nexus.core.startup_profiler import (NullProfiler, get_profiler, start_profiling,
+                                                    stop_profiling)
+
+
+@pytest.fixture
+def profiler():
+    profiler = start_profiling()
+    yield profiler
+    stop_profiling()
+
+
+def test_profiler_is_a_no_op_unless_started():
+    assert isinstance(get_profiler(), NullProfiler)
+    with get_profiler().span("ignored"):
+        pass
+
+
+def test_module_loads_are_profiled_and_reported(profiler, write_module, tmp_path):
+    write_module("heavy.py", "DATA = [bytes(4096) for _ in range(256)]\nimport time\ntime.sleep(0.02)\n")
+    write_module("light.py", "X = 1\n")
+    with profiler.span("discover_all"):
+        loader = ModuleLoader(write_module.root, lazy=False, use_cache=False)
+        loader.discover_all()
+
+    slowest = profiler.slowest("module", 1)[0]
+    assert slowest.name == "load heavy" and slowest.wall >= 0.02
+    assert slowest.peak >= 256 * 4096
+    nested = next(s for s in profiler.spans if s.name == "load light")
+    assert nested.depth == 1  # inside "discover_all"
+    assert "load heavy" in profiler.report()
+
+    paths = profiler.write(tmp_path / "out")
+    trace = json.loads(paths["trace"].read_text())
+    names = {event["name"] for event in trace["traceEvents"]}
+    assert {"discover_all", "load heavy", "load light", "scan heavy"} <= names
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in trace["traceEvents"])
+    assert paths["report"].read_text().startswith("   wall ms")
+
+
+def test_stop_profiling_restores_the_null_profiler(profiler):
+    assert get_profiler() is profiler
+    assert stop_profiling() is profiler
+    assert isinstance(get_profiler(), NullProfiler)
@@ -0,0 +1,89 @@
+import gc
+
+import pytest
+
+from shadowcore_nexus.core.event_system import EventBus
+from shadowcore_nexus.core.topics import TopicTrie, validate_pattern
+
+
+@pytest.mark.parametrize("pattern, topic, matches", [
+    ("scan.host.up", "scan.host.up", True),
+    ("scan.host.up", "scan.host.down", False),
+    ("scan.*", "scan.host", True),
+    ("scan.*", "scan", False),
+    ("scan.*", "scan.host.up", False),
+    ("*.host.*", "scan.host.up", True),
+    ("scan.#", "scan", True),
+    ("scan.#", "scan.host.up", True),
+    ("scan.#", "scanner.host", False),
+    ("#", "anything.at.all", True),
+    ("scan.#.up", "scan.up", True),
+    ("scan.#.up", "scan.a.b.up", True),
+    ("scan.#.up", "scan.a.b.down", False),
+])
+def test_wildcard_matching(pattern, topic, matches):
+    trie = TopicTrie()
+    trie.add(pattern, "item")
+    assert (trie.match(topic) == ("item",)) is matches
+
+
+def test_items_come_back_once_in_registration_order():
+    trie = TopicTrie()
+    for pattern, item in [("scan.#", "a"), ("scan.host.up", "b"), ("scan.*.up", "c"), ("#.up", "d")]:
+        trie.add(pattern, item)
+    # "scan.#" and "#.up" can match the topic along several paths
+    assert trie.match("scan.host.up") == ("a", "b", "c", "d")
+    assert len(trie) == 4
+
+
+def test_dispatch_cache_is_reset_on_add_and_remove():
+    trie = TopicTrie()
+    trie.add("scan.*", "a")
+    assert trie.match("scan.host") == ("a",)
+    trie.add("scan.host", "b")
+    assert trie.match("scan.host") == ("a", "b")
+    assert trie.remove("scan.*", "a")
+    assert trie.match("scan.host") == ("b",)
+    assert not trie.remove("scan.*", "a")
+    assert trie.remove("scan.host", "b")
+    assert len(trie) == 0 and trie.match("scan.host") == ()
+    assert list(trie.items()) == []
+
+
+@pytest.mark.parametrize("bad", ["", "scan..up", "scan.ho*", "scan.#x"])
+def test_invalid_patterns_are_rejected(bad):
+    with pytest.raises(ValueError):
+        validate_pattern(bad)
+
+
+def test_event_bus_wildcards_and_unsubscribe():
+    bus = EventBus()
+    seen = []
+    bus.subscribe("scan.#", lambda data: seen.append(("all", data)))
+    handler = lambda data: seen.append(("up", data))  # noqa: E731
+    bus.subscribe("scan.*.up", handler)
+    bus.publish("scan.host.up", 1)
+    bus.publish("scan.port", 2)
+    assert bus.unsubscribe("scan.*.up", handler)
+    assert not bus.unsubscribe("scan.*.up", handler)
+    bus.publish("scan.host.up", 3)
+    assert seen == [("all", 1), ("up", 1), ("all", 2), ("all", 3)]
+
+
+def test_weak_subscribers_go_away_with_their_owner():
+    bus = EventBus()
+    seen = []
+
+    class Module:
+        def on_event(self, data):
+            seen.append(data)
+
+    module = Module()
+    bus.subscribe("scan.#", module.on_event, weak=True)
+    bus.publish("scan.host", 1)
+    del module
+    gc.collect()
+    bus.publish("scan.host", 2)
+    assert seen == [1]
+    bus.subscribe("other", print)  # purges the dead listener
+    assert len(bus.listeners) == 1